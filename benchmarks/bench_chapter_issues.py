@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for the chapter sequence validators on adversarial sequences.
+
+Times chapter_issues.detect_issues and epub_builder.detect_chapter_issues
+against the previous quadratic implementations, kept below as references,
+and checks that both return identical messages. The sequences are those
+that made the references quadratic:
+
+* one long run of the same number (each repeat rescanned the prefix and
+  walked the rest of the run),
+* many chapters repeated many times, as in an omnibus with duplicated
+  headings,
+* numbers jumping back and forth over a wide gap, which revisited the same
+  missing range on every jump.
+
+Usage:
+    python benchmarks/bench_chapter_issues.py [--size 10000] [--skip-reference]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager.chapter_issues import detect_issues  # noqa: E402
+from enchant_book_manager.epub_builder import detect_chapter_issues  # noqa: E402
+
+
+def reference_detect_issues(seq: list[int]) -> list[str]:
+    """The previous chapter_issues.detect_issues."""
+    if not seq:
+        return []
+
+    issues = []
+    start, end = seq[0], seq[-1]
+    prev_expected = start
+    seen = set()
+    reported_missing = set()
+
+    for idx, v in enumerate(seq):
+        if v in seen:
+            try:
+                pred = next(x for x in reversed(seq[:idx]) if x != v)
+            except StopIteration:
+                pred = seq[0] if idx > 0 and seq[0] != v else 0
+            run_len = 1
+            j = idx
+            while j + 1 < len(seq) and seq[j + 1] == v:
+                run_len += 1
+                j += 1
+            t = "times" if run_len > 1 else "time"
+            issues.append((idx, f"number {v} is repeated {run_len} {t} after number {pred}"))
+        else:
+            seen.add(v)
+
+        if v > prev_expected:
+            for m in range(prev_expected, v):
+                if m not in reported_missing:
+                    issues.append((idx, f"number {m} is missing"))
+                    reported_missing.add(m)
+            prev_expected = v + 1
+        elif v == prev_expected:
+            prev_expected += 1
+        else:
+            if idx > 0 and abs(seq[idx - 1] - v) == 1 and v < seq[idx - 1]:
+                a, b = min(v, seq[idx - 1]), max(v, seq[idx - 1])
+                issues.append((idx, f"number {a} is switched in place with number {b}"))
+                issues.append((idx, f"number {b} is switched in place with number {a}"))
+            else:
+                issues.append((idx, f"number {v} is out of place after number {seq[idx - 1]}"))
+            prev_expected = v + 1
+
+    for m in range(prev_expected, end + 1):
+        if m not in reported_missing:
+            issues.append((len(seq), f"number {m} is missing"))
+
+    issues.sort(key=lambda x: x[0])
+    return [msg for _, msg in issues]
+
+
+def reference_detect_chapter_issues(seq: list[int]) -> list[tuple[int, str]]:
+    """The previous epub_builder.detect_chapter_issues."""
+    issues: list[tuple[int, str]] = []
+    if not seq:
+        return issues
+
+    start, end = seq[0], seq[-1]
+    prev_expected = start
+    seen = set()
+    reported_missing = set()
+
+    for idx, v in enumerate(seq):
+        if v in seen:
+            pred = None
+            for x in reversed(seq[:idx]):
+                if x != v:
+                    pred = x
+                    break
+            if pred is not None:
+                run_len = 1
+                j = idx
+                while j + 1 < len(seq) and seq[j + 1] == v:
+                    run_len += 1
+                    j += 1
+                t = "times" if run_len > 1 else "time"
+                issues.append((idx, f"Chapter {v} is repeated {run_len} {t} after Chapter {pred}"))
+        else:
+            seen.add(v)
+
+        if v > prev_expected:
+            for m in range(prev_expected + 1, v):
+                if m not in reported_missing:
+                    issues.append((idx, f"Chapter {m} is missing"))
+                    reported_missing.add(m)
+            prev_expected = v + 1
+        elif v == prev_expected:
+            prev_expected += 1
+        else:
+            if idx > 0 and abs(seq[idx - 1] - v) == 1 and v < seq[idx - 1]:
+                a, b = min(v, seq[idx - 1]), max(v, seq[idx - 1])
+                issues.append((idx, f"Chapter {a} is switched in place with Chapter {b}"))
+                issues.append((idx, f"Chapter {b} is switched in place with Chapter {a}"))
+            else:
+                issues.append((idx, f"Chapter {v} is out of place after Chapter {seq[idx - 1]}"))
+            prev_expected = v + 1
+
+    for m in range(prev_expected, end + 1):
+        if m not in reported_missing:
+            issues.append((len(seq), f"Chapter {m} is missing"))
+
+    issues.sort(key=lambda x: x[0])
+    return issues
+
+
+def adversarial_sequences(size: int) -> dict[str, list[int]]:
+    """Build the sequences described in the module docstring."""
+    duplicated = [number for number in range(1, size // 20 + 1) for _ in range(20)]
+    half = size // 2
+    return {
+        "single long run": [1] * size,
+        "omnibus duplicates": duplicated,
+        "back-and-forth jumps": [value for i in range(1, half + 1) for value in (i, half + i)],
+    }
+
+
+def timed(function: Callable[[list[int]], Any], seq: list[int]) -> tuple[float, Any]:
+    """Return the run time and the result of function(seq)."""
+    start = time.perf_counter()
+    result = function(seq)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10_000, help="Length of each sequence")
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the linear implementations")
+    args = parser.parse_args()
+
+    pairs = [
+        ("detect_issues", detect_issues, reference_detect_issues),
+        ("detect_chapter_issues", detect_chapter_issues, reference_detect_chapter_issues),
+    ]
+    for name, seq in adversarial_sequences(args.size).items():
+        print(f"{name} ({len(seq)} chapters)")
+        for label, function, reference in pairs:
+            linear_time, result = timed(function, seq)
+            line = f"  {label:22s} {linear_time:8.3f} s"
+            if not args.skip_reference:
+                reference_time, expected = timed(reference, seq)
+                assert result == expected, f"{label} differs from the previous implementation on {name}"
+                line += f"   previous {reference_time:8.3f} s   speedup {reference_time / max(linear_time, 1e-9):7.1f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
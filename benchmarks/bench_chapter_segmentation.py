@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for large-file chapter segmentation.
+
+Compares the SQLite implementation (epub_db_optimized) with the in-memory
+engine (chapter_segmenter) on a synthetic novel with the given number of
+lines, and checks that both return the same chapters.
+
+Usage:
+    python benchmarks/bench_chapter_segmentation.py [--lines 600000] [--chapters 1500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager import chapter_segmenter, epub_db_optimized  # noqa: E402
+from enchant_book_manager.chapter_patterns import HEADING_RE  # noqa: E402
+from enchant_book_manager.chapter_validators import is_valid_chapter_line, parse_num  # noqa: E402
+
+
+def build_corpus(lines: int, chapters: int) -> str:
+    """Build a novel with prose lines, blank lines and chapter headings."""
+    rng = random.Random(7)
+    prose = [
+        "He looked at the sky and sighed.",
+        "The chapter master nodded slowly.",
+        "“Read the next chapter,” she said.",
+        "Wind swept across the valley.",
+        "",
+    ]
+    heading_every = max(lines // max(chapters, 1), 1)
+    out: list[str] = []
+    number = 0
+    for i in range(lines):
+        if i % heading_every == 0:
+            number += 1
+            out.append(f"Chapter {number}: The Journey Continues")
+        else:
+            out.append(rng.choice(prose))
+    return "\n".join(out)
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=600_000, help="Number of lines in the corpus")
+    parser.add_argument("--chapters", type=int, default=1500, help="Number of chapter headings")
+    args = parser.parse_args()
+
+    text = build_corpus(args.lines, args.chapters)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = epub_db_optimized.process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line)
+    sqlite_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = chapter_segmenter.process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line)
+    memory_time = time.perf_counter() - start
+
+    assert result == expected, "in-memory engine differs from the SQLite implementation"
+
+    print(f"Corpus: {args.lines} lines, {len(text)} characters, {len(result[0])} chapters")
+    print(f"SQLite    {sqlite_time:8.3f} s")
+    print(f"In-memory {memory_time:8.3f} s   speedup {sqlite_time / memory_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
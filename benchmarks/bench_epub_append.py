@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for appending chapters to a large EPUB.
+
+Builds a serial with write_new_epub, then times extend_epub adding a few new
+chapters against rebuilding the whole book with them.
+
+Usage:
+    python benchmarks/bench_epub_append.py [--chapters 4000] [--new 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager.epub_builders import paragraphize  # noqa: E402
+from enchant_book_manager.epub_generator import extend_epub, write_new_epub  # noqa: E402
+
+
+def build_chapters(start: int, count: int) -> list[tuple[str, str]]:
+    """Build chapters of about 20 KB of prose each, already paragraphized."""
+    paragraph = "The disciples gathered in the courtyard while the elder spoke of the old sect wars. " * 6
+    return [(f"Chapter {number}", paragraphize("\n\n".join(f"{number}. {paragraph}" for _ in range(40)))) for number in range(start, start + count)]
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=4000, help="Chapters in the existing EPUB")
+    parser.add_argument("--new", type=int, default=5, help="Chapters appended")
+    args = parser.parse_args()
+
+    existing = build_chapters(1, args.chapters)
+    new = build_chapters(args.chapters + 1, args.new)
+
+    with tempfile.TemporaryDirectory() as td:
+        epub = Path(td) / "serial.epub"
+        write_new_epub(existing, epub, "Serial", "Author", None)
+        size = epub.stat().st_size
+
+        start = time.perf_counter()
+        write_new_epub(existing + new, Path(td) / "rebuilt.epub", "Serial", "Author", None)
+        rebuild_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        extend_epub(epub, new)
+        append_time = time.perf_counter() - start
+
+        with zipfile.ZipFile(epub) as z:
+            assert z.testzip() is None
+            assert f"OEBPS/Text/chapter{args.chapters + args.new}.xhtml" in z.namelist()
+
+    print(f"EPUB: {args.chapters} chapters, {size / 1024 / 1024:.1f} MB, appending {args.new}")
+    print(f"Full rebuild {rebuild_time:8.3f} s")
+    print(f"Append       {append_time:8.3f} s   speedup {rebuild_time / append_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
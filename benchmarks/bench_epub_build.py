@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for parallel EPUB chapter rendering and compression.
+
+Builds the same synthetic book with write_new_epub serially and with a pool
+of worker threads, and checks that every entry has the same content.
+
+Usage:
+    python benchmarks/bench_epub_build.py [--chapters 3000] [--threads 4] [--level 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager.epub_builders import paragraphize  # noqa: E402
+from enchant_book_manager.epub_generator import write_new_epub  # noqa: E402
+
+
+def build_chapters(count: int) -> list[tuple[str, str]]:
+    """Build chapters of about 15 KB of prose each, already paragraphized."""
+    rng = random.Random(11)
+    words = "the cultivator raised his sword and the sect elders watched in silence as thunder rolled".split()
+    chapters = []
+    for number in range(1, count + 1):
+        paragraphs = [" ".join(rng.choice(words) for _ in range(rng.randint(20, 80))).capitalize() + "." for _ in range(40)]
+        chapters.append((f"Chapter {number}: Trial", paragraphize("\n\n".join(paragraphs))))
+    return chapters
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=3000, help="Number of chapters")
+    parser.add_argument("--threads", type=int, default=4, help="Worker threads for the parallel build")
+    parser.add_argument("--level", type=int, default=6, help="zlib compression level")
+    args = parser.parse_args()
+
+    chapters = build_chapters(args.chapters)
+
+    with tempfile.TemporaryDirectory() as td:
+        timings = {}
+        for threads in (1, args.threads):
+            out = Path(td) / f"book_{threads}.epub"
+            start = time.perf_counter()
+            write_new_epub(chapters, out, "Benchmark", "Author", None, threads=threads, compression_level=args.level)
+            timings[threads] = time.perf_counter() - start
+
+        with zipfile.ZipFile(Path(td) / "book_1.epub") as serial, zipfile.ZipFile(Path(td) / f"book_{args.threads}.epub") as parallel:
+            for name in serial.namelist():
+                if name in ("OEBPS/content.opf", "OEBPS/toc.ncx"):
+                    continue  # These carry the random book uid
+                assert serial.read(name) == parallel.read(name), f"{name} differs"
+
+    print(f"Book: {args.chapters} chapters, compression level {args.level}")
+    print(f"Serial              {timings[1]:8.3f} s")
+    print(f"{args.threads} threads           {timings[args.threads]:8.3f} s   speedup {timings[1] / timings[args.threads]:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for building an EPUB from a directory of chunk files.
+
+Times build_epub_from_directory, which streams the files through the chapter
+segmenter into the EPUB, and measures its peak memory with tracemalloc
+against the size of the whole text, which the previous implementation held
+(several times) in memory.
+
+Usage:
+    python benchmarks/bench_epub_directory.py [--files 2000] [--chapters-per-file 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager.epub_builder import build_epub_from_directory  # noqa: E402
+
+
+def write_chunk_files(directory: Path, files: int, chapters_per_file: int) -> int:
+    """Write chunk files of about 12 KB each and return the total text size."""
+    rng = random.Random(3)
+    words = "the cultivator raised his sword and the sect elders watched in silence as thunder rolled".split()
+    total = 0
+    chapter = 1
+    for number in range(1, files + 1):
+        parts = []
+        for _ in range(chapters_per_file):
+            paragraphs = [" ".join(rng.choice(words) for _ in range(rng.randint(20, 60))).capitalize() + "." for _ in range(20)]
+            parts.append(f"Chapter {chapter}: Trial\n\n" + "\n\n".join(paragraphs))
+            chapter += 1
+        text = "\n\n".join(parts)
+        (directory / f"Benchmark by Author - Chapter {number}.txt").write_text(text, encoding="utf-8")
+        total += len(text)
+    return total
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=2000, help="Number of chunk files")
+    parser.add_argument("--chapters-per-file", type=int, default=2, help="Chapters in each chunk file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        directory = Path(td) / "chunks"
+        directory.mkdir()
+        total = write_chunk_files(directory, args.files, args.chapters_per_file)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        success, issues = build_epub_from_directory(directory, Path(td) / "book.epub", logger=logging.getLogger("bench"))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert success, issues
+
+    print(f"Book: {args.files} files, {args.files * args.chapters_per_file} chapters, {total / 1e6:.1f} MB of text")
+    print(f"build_epub_from_directory  {elapsed:8.3f} s   peak memory {peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
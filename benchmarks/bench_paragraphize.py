@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark for epub_builders.paragraphize on a large chapter text.
+
+Times the shared paragraphize in both formats against the previous per-line
+implementations of epub_builders and epub_builder, kept below as
+references, and checks that the output is identical. paragraphize is called
+once per chapter, so the text is a chapter and each timing is the best
+average over repeated calls.
+
+Usage:
+    python benchmarks/bench_paragraphize.py [--paragraphs 150] [--calls 200] [--skip-reference]
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from enchant_book_manager.epub_builders import paragraphize  # noqa: E402
+
+
+def reference_paragraphize(txt: str) -> str:
+    """The previous epub_builders.paragraphize."""
+    out, buf = [], []
+    for ln in txt.splitlines():
+        if ln.rstrip():
+            buf.append(html.escape(ln.rstrip()))
+        elif buf:
+            out.append("<p>" + "<br/>".join(buf) + "</p>")
+            buf.clear()
+    if buf:
+        out.append("<p>" + "<br/>".join(buf) + "</p>")
+    return "\n".join(out)
+
+
+def reference_paragraphize_joined(text: str) -> str:
+    """The previous epub_builder.paragraphize."""
+    paragraphs = []
+    current = []
+
+    for line in text.split("\n"):
+        line = line.strip()
+        if line:
+            current.append(html.escape(line))
+        elif current:
+            paragraphs.append("<p>" + " ".join(current) + "</p>")
+            current = []
+
+    if current:
+        paragraphs.append("<p>" + " ".join(current) + "</p>")
+
+    return "\n".join(paragraphs)
+
+
+def make_text(paragraphs: int) -> str:
+    """Build a novel-like text: mostly one-line paragraphs, some dialogue and line breaks."""
+    rng = random.Random(3)
+    words = "the cultivator raised his sword and the sect elders watched in silence as thunder rolled".split()
+    out = []
+    for _ in range(paragraphs):
+        roll = rng.random()
+        if roll < 0.3:
+            out.append('"' + " ".join(rng.choice(words) for _ in range(rng.randint(2, 8))).capitalize() + '!"')
+        elif roll < 0.35:
+            out.append("\n".join(f"<{rng.choice(words)}> & {rng.choice(words)}" for _ in range(3)))
+        else:
+            out.append(" ".join(rng.choice(words) for _ in range(rng.randint(3, 30))).capitalize() + ".")
+    return "\n\n".join(out)
+
+
+def timed(function: Callable[[str], str], text: str, calls: int) -> float:
+    """Return the best average time of one call over seven rounds of calls."""
+    return min(timeit.repeat(lambda: function(text), number=calls, repeat=7)) / calls
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=150, help="Number of paragraphs in the text")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per timing")
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the shared implementation")
+    args = parser.parse_args()
+
+    text = make_text(args.paragraphs)
+    print(f"Chapter: {args.paragraphs} paragraphs, {len(text) / 1e3:.1f} KB")
+    cases: list[tuple[str, Callable[[str], str], Callable[[str], str]]] = [
+        ("<br/> lines", paragraphize, reference_paragraphize),
+        ("joined lines", lambda t: paragraphize(t, join_lines=True), reference_paragraphize_joined),
+    ]
+    for label, function, reference in cases:
+        new_time = timed(function, text, args.calls)
+        line = f"  {label:14s} {new_time * 1e3:8.3f} ms"
+        if not args.skip_reference:
+            assert function(text) == reference(text), f"{label} differs from the previous implementation"
+            reference_time = timed(reference, text, args.calls)
+            line += f"   previous {reference_time * 1e3:8.3f} ms   speedup {reference_time / max(new_time, 1e-9):5.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
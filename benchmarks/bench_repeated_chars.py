@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmark for the repeated-character engine.
+
+Compares limit_repeated_chars and clean_repeated_chars with the character
+loop and per-match callback implementations they replaced, on a translation
+sized chunk of mixed Chinese/English text.
+
+Usage:
+    python benchmarks/bench_repeated_chars.py [--chars 12000] [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from enchant_book_manager.text_processing import limit_repeated_chars  # noqa: E402
+from enchant_book_manager.text_validators import clean_repeated_chars  # noqa: E402
+from repeated_chars_reference import reference_cap, reference_limit  # noqa: E402
+
+
+def build_chunk(chars: int) -> str:
+    """Build a realistic chunk: prose with occasional repeated punctuation."""
+    rng = random.Random(42)
+    words = ["他", "说道", "：", "“", "好", "！", "”", "然后", "走了", "。", "Hello", " ", "world", "\n\n", "……", "！！！", "哈哈哈哈", "。。。"]
+    parts: list[str] = []
+    while sum(len(p) for p in parts) < chars:
+        parts.append(rng.choice(words))
+    return "".join(parts)[:chars]
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chars", type=int, default=12000, help="Chunk size in characters")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    chunk = build_chunk(args.chars)
+    assert limit_repeated_chars(chunk) == reference_limit(chunk)
+    assert clean_repeated_chars(chunk) == reference_cap(chunk)
+
+    cases: list[tuple[str, Callable[[str], str], Callable[[str], str]]] = [
+        ("limit_repeated_chars", reference_limit, limit_repeated_chars),
+        ("clean_repeated_chars", reference_cap, clean_repeated_chars),
+    ]
+    print(f"Chunk size: {len(chunk)} characters, {args.repeat} iterations")
+    for name, legacy, current in cases:
+        legacy_time = min(timeit.repeat(lambda: legacy(chunk), number=args.repeat, repeat=3)) / args.repeat
+        current_time = min(timeit.repeat(lambda: current(chunk), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{name:22s} legacy {legacy_time * 1000:8.3f} ms   current {current_time * 1000:8.3f} ms   speedup {legacy_time / current_time:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
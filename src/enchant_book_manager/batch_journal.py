@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: append-only JSONL journal of the batch progress,
+#   replayed on resume and compacted into the batch history on completion
+#
+
+"""
+batch_journal.py - Append-only journal of the batch progress
+============================================================
+
+The batch progress used to be rewritten as a whole YAML file after every
+change of a file entry, which costs O(files) per update and leaves a
+truncated file behind if the process dies in the middle of a write.
+
+The journal is a JSON Lines file instead. The first line is a "batch" event
+holding the full progress at the start of the run (created, input_folder
+and every file entry); every later line is one change of one file entry:
+
+* started - the file is being processed (status processing, start_time)
+* completed - the file was processed (status completed, end_time)
+* failed - processing failed (status failed/skipped, error, retry_count,
+  end_time)
+* skipped - the file is out of retries (status failed/skipped)
+* released - the file was locked by another process and goes back to
+  planned (end_time)
+
+Each line is appended and flushed to disk on its own, so a crash loses at
+most the line being written, and replay ignores a torn last line. Replaying
+the journal (see BatchJournal.load) rebuilds the same progress dict the
+batch handlers keep in memory. When the batch is complete the handlers
+append that progress to translations_chronology.yml and delete the journal.
+
+A translation_batch_progress.yml left by an older version is migrated by
+load_batch_progress: it becomes the "batch" event of a new journal.
+"""
+
+from __future__ import annotations
+
+import copy
+import datetime as dt
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from .common_yaml_utils import load_safe_yaml
+
+# Journal of the batch in the current directory
+JOURNAL_FILE = "translation_batch_progress.jsonl"
+
+# YAML progress file written by older versions
+LEGACY_PROGRESS_FILE = "translation_batch_progress.yml"
+
+
+def apply_event(item: dict[str, Any], event: dict[str, Any]) -> None:
+    """
+    Apply one journal event to the file entry it names.
+
+    Args:
+        item: File entry of the batch progress
+        event: Journal event (see the module docstring)
+
+    Raises:
+        ValueError: If the event kind is unknown
+    """
+    kind = event.get("event")
+    if kind == "started":
+        item["status"] = "processing"
+        item["start_time"] = event["time"]
+    elif kind == "completed":
+        item["status"] = "completed"
+        item["end_time"] = event["time"]
+    elif kind == "failed":
+        item["status"] = "failed/skipped"
+        item["error"] = event["error"]
+        item["retry_count"] = event["retry_count"]
+        item["end_time"] = event["time"]
+    elif kind == "skipped":
+        item["status"] = "failed/skipped"
+    elif kind == "released":
+        item["status"] = "planned"
+        item["end_time"] = event["time"]
+    else:
+        raise ValueError(f"Unknown journal event {kind!r}")
+
+
+class BatchJournal:
+    """Append-only JSONL journal of one batch."""
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: Path of the journal file
+        """
+        self.path = path
+
+    def exists(self) -> bool:
+        """Return True if the journal file exists."""
+        return self.path.exists()
+
+    def begin(self, progress: dict[str, Any]) -> None:
+        """
+        Start a new journal with the full progress as its first event.
+
+        Args:
+            progress: Batch progress
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        event = {"event": "batch", "time": dt.datetime.now().isoformat(), "progress": progress}
+        with self.path.open("w", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, item: dict[str, Any], kind: str, **fields: Any) -> None:
+        """
+        Apply an event to a file entry and append it to the journal.
+
+        Args:
+            item: File entry of the batch progress
+            kind: Event kind (see the module docstring)
+            **fields: Further fields of the event (error and retry_count
+                for failed)
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        event = {"event": kind, "path": item["path"], "time": dt.datetime.now().isoformat(), **fields}
+        apply_event(item, event)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self, logger: logging.Logger | None = None) -> dict[str, Any] | None:
+        """
+        Rebuild the batch progress by replaying the journal.
+
+        Lines that cannot be decoded (a line torn by a crash) and events for
+        files not in the batch are skipped with a warning.
+
+        Args:
+            logger: Logger for the skipped lines
+
+        Returns:
+            The batch progress, or None if there is no journal or it has no
+            "batch" event
+        """
+        if not self.path.exists():
+            return None
+        logger = logger or logging.getLogger(__name__)
+
+        progress: dict[str, Any] | None = None
+        items: dict[str, dict[str, Any]] = {}
+        with self.path.open(encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                    if event.get("event") == "batch":
+                        progress = copy.deepcopy(event["progress"])
+                        items = {item["path"]: item for item in progress.get("files", [])}
+                    elif event.get("path") in items:
+                        apply_event(items[event["path"]], event)
+                    else:
+                        logger.warning(f"Ignoring journal line {number} of {self.path}: no such file in the batch")
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    logger.warning(f"Ignoring journal line {number} of {self.path}: {e}")
+        return progress
+
+    def remove(self) -> None:
+        """
+        Delete the journal file.
+
+        Raises:
+            FileNotFoundError: If there is no journal
+            PermissionError: If the file cannot be deleted
+        """
+        self.path.unlink()
+
+
+def load_batch_progress(journal: BatchJournal, input_path: Path, logger: logging.Logger, legacy_file: Path | None = None) -> dict[str, Any]:
+    """
+    Load the progress of the batch to resume, or start a new one.
+
+    The journal is replayed if there is one. Otherwise a YAML progress file
+    of an older version is migrated, or a new batch is planned with every
+    *.txt file of input_path. A new or migrated batch is written as the
+    first event of a new journal.
+
+    Args:
+        journal: Journal of the batch
+        input_path: Directory of the novels
+        logger: Logger instance
+        legacy_file: YAML progress file of older versions
+            (default: LEGACY_PROGRESS_FILE in the current directory)
+
+    Returns:
+        The batch progress
+
+    Raises:
+        OSError: If the journal cannot be written
+    """
+    legacy_file = legacy_file or Path(LEGACY_PROGRESS_FILE)
+    progress = journal.load(logger)
+    resumed = progress is not None and bool(progress.get("files"))
+
+    if progress is None and legacy_file.exists():
+        try:
+            progress = load_safe_yaml(legacy_file) or None
+        except ValueError as e:
+            logger.error(f"Error loading YAML from {legacy_file}: {e}")
+    if not progress:
+        progress = {
+            "created": dt.datetime.now().isoformat(),
+            "input_folder": str(input_path.resolve()),
+            "files": [],
+        }
+
+    # Populate file list if not resuming
+    if not progress.get("files"):
+        progress["files"] = [
+            {
+                "path": str(file.resolve()),
+                "status": "planned",
+                "end_time": None,
+                "retry_count": 0,
+            }
+            for file in sorted(input_path.glob("*.txt"), key=lambda x: x.name)
+        ]
+
+    if not resumed and progress["files"]:
+        journal.begin(progress)
+    if legacy_file.exists():
+        try:
+            legacy_file.unlink()
+        except OSError as e:
+            logger.error(f"Error deleting progress file: {e}")
+    return progress
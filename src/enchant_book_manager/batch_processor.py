@@ -20,6 +20,9 @@
 # - Added progress tracking with YAML
 # - Added batch cost summary generation
 # - Added file locking for concurrent access prevention
+# - Batch progress is kept in an append-only journal (batch_journal) instead
+#   of rewriting the whole YAML file after every change
+# - A skip event that cannot be saved no longer aborts the batch
 #
 
 """Batch processing utilities for translating multiple novels."""
@@ -34,6 +37,7 @@ from typing import Any, Optional
 import filelock
 import yaml
 
+from .batch_journal import JOURNAL_FILE, BatchJournal, load_batch_progress
 from .book_importer import import_book_from_txt
 from .translation_orchestrator import save_translated_book
 from .common_yaml_utils import load_safe_yaml as load_yaml_safe
@@ -97,31 +101,10 @@ def process_batch(
     # Add file locking to prevent concurrent access
     lock_path = Path("translation_batch.lock")
     with filelock.FileLock(str(lock_path)):
-        # Load or create batch progress
-        progress_file = Path("translation_batch_progress.yml")
+        # Replay the journal of an interrupted batch or plan a new one
+        journal = BatchJournal(Path(JOURNAL_FILE))
         history_file = Path("translations_chronology.yml")
-
-        if progress_file.exists():
-            progress = load_safe_yaml(progress_file, logger) or {}
-        else:
-            progress = {
-                "created": dt.datetime.now().isoformat(),
-                "input_folder": str(input_path.resolve()),
-                "files": [],
-            }
-
-        # Populate file list if not resuming
-        if not progress.get("files"):
-            files_sorted = sorted(input_path.glob("*.txt"), key=lambda x: x.name)
-            for file in files_sorted:
-                progress["files"].append(
-                    {
-                        "path": str(file.resolve()),
-                        "status": "planned",
-                        "end_time": None,
-                        "retry_count": 0,
-                    }
-                )
+        progress = load_batch_progress(journal, input_path, logger)
 
         max_retries = 3
 
@@ -131,15 +114,16 @@ def process_batch(
                 continue
             if item.get("retry_count", 0) >= max_retries:
                 logger.warning(f"Skipping {item['path']} after {max_retries} failed attempts.")
-                item["status"] = "failed/skipped"
+                try:
+                    journal.record(item, "skipped")
+                except OSError as e:
+                    logger.error(f"Error saving progress of {item['path']}: {e}")
+                    # Don't re-raise: the next run skips the file again
                 continue
 
-            item["status"] = "processing"
-            item["start_time"] = dt.datetime.now().isoformat()
             try:
-                with progress_file.open("w") as f:
-                    yaml.safe_dump(progress, f)
-            except (OSError, yaml.YAMLError) as e:
+                journal.record(item, "started")
+            except OSError as e:
                 logger.error(f"Error saving progress file: {e}")
                 raise
 
@@ -153,36 +137,33 @@ def process_batch(
                     create_epub=create_epub,
                     logger=logger,
                 )
-                item["status"] = "completed"
             except Exception as e:
                 logger.error(f"Failed to translate {item['path']}: {str(e)}")
-                item["status"] = "failed/skipped"
-                item["error"] = str(e)
-                item["retry_count"] = item.get("retry_count", 0) + 1
-            finally:
-                item["end_time"] = dt.datetime.now().isoformat()
-                try:
-                    with progress_file.open("w") as f:
-                        yaml.safe_dump(progress, f)
-                except (OSError, yaml.YAMLError) as e:
-                    logger.error(f"Error saving progress file in finally block: {e}")
-                    # Don't re-raise in finally block to avoid masking original exception
-
-                # Move completed batch to history
-                if all(file["status"] in ("completed", "failed/skipped") for file in progress["files"]):
-                    try:
-                        with history_file.open("a", encoding="utf-8") as f:
-                            f.write("---\n")
-                            yaml.safe_dump(progress, f, allow_unicode=True)
-                    except (OSError, yaml.YAMLError) as e:
-                        logger.error(f"Error writing to history file: {e}")
-                        # Continue anyway - don't fail the whole batch for history logging
-
-                    try:
-                        progress_file.unlink()
-                    except (FileNotFoundError, PermissionError) as e:
-                        logger.error(f"Error deleting progress file: {e}")
-                        # Continue anyway - file will be overwritten next time
+                kind, fields = "failed", {"error": str(e), "retry_count": item.get("retry_count", 0) + 1}
+            else:
+                kind, fields = "completed", {}
+
+            try:
+                journal.record(item, kind, **fields)
+            except OSError as e:
+                logger.error(f"Error saving progress of {item['path']}: {e}")
+                # Don't re-raise: the file itself was processed
+
+        # Compact the journal into the history once the batch is complete
+        if progress["files"] and all(file["status"] in ("completed", "failed/skipped") for file in progress["files"]):
+            try:
+                with history_file.open("a", encoding="utf-8") as f:
+                    f.write("---\n")
+                    yaml.safe_dump(progress, f, allow_unicode=True)
+            except (OSError, yaml.YAMLError) as e:
+                logger.error(f"Error writing to history file: {e}")
+                # Continue anyway - don't fail the whole batch for history logging
+
+            try:
+                journal.remove()
+            except (FileNotFoundError, PermissionError) as e:
+                logger.error(f"Error deleting progress file: {e}")
+                # Continue anyway - a finished journal is replaced next time
 
     # Save batch cost summary for remote translations
     if translator and translator.is_remote and translator.request_count > 0:
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: SQLite lease queue for batches shared by several
+#   translation hosts
+# - Novels are keyed by their path relative to the batch directory, so hosts
+#   that mount the shared directory at different paths share the rows
+#
+
+"""
+batch_queue.py - Lease-based work queue of a distributed batch
+==============================================================
+
+With --distributed, every translation host runs the same batch command on
+a directory they all share (NFS or similar). Instead of a coordinator
+process, the hosts share one SQLite database in that directory
+(QUEUE_FILE), and every worker takes novels from it:
+
+* claim - a worker leases the first queued novel for lease_seconds and
+  gets a random token. Every claim counts as an attempt.
+* heartbeat - while it processes the novel the worker extends its lease.
+  A heartbeat whose token no longer matches tells the worker that it lost
+  the lease.
+* lease expiry - a worker that dies stops sending heartbeats. Once its lease
+  expires, the next claim puts the novel back in the queue, or marks it
+  failed if it is out of attempts.
+* complete - the result is committed with the token of the lease. A
+  repeated commit of the same lease changes nothing. A commit for a lease
+  that has been taken over by another worker is ignored. A failed novel
+  is queued again until it is out of attempts.
+* release - a novel that turned out to be locked by another process is
+  returned without using up an attempt. It is only offered again after
+  retry_seconds.
+
+Every change runs in its own short BEGIN IMMEDIATE transaction on a fresh
+connection, so it is atomic across processes and hosts. The database uses
+the default rollback journal: WAL mode needs shared memory and does not
+work on network file systems. Lease times are wall-clock times, so the
+clocks of the hosts must agree to well within lease_seconds.
+
+Novels are keyed by their path relative to the batch directory, because
+the hosts may mount the shared directory at different paths. Every host
+resolves the paths of its leases against its own mount.
+
+When the last novel is completed or failed, finish_batch hands the final
+progress to exactly one worker, which archives it.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import sqlite3
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Queue database in the shared novel directory
+QUEUE_FILE = ".enchant_batch_queue.sqlite3"
+
+# Seconds a lease lasts without a heartbeat
+DEFAULT_LEASE_SECONDS = 300
+
+# Seconds to wait for a lock on the database
+_BUSY_TIMEOUT = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS novels (
+    path TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    token TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    start_time TEXT,
+    end_time TEXT
+);
+CREATE TABLE IF NOT EXISTS batch (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+@dataclass
+class Lease:
+    """A novel leased by one worker."""
+
+    path: str  # Relative to the batch directory
+    token: str
+    worker: str
+    attempt: int  # 1 for the first claim of the novel
+
+
+class LeaseQueue:
+    """SQLite queue of the novels of a distributed batch."""
+
+    def __init__(self, db_path: Path, max_attempts: int = 3) -> None:
+        """
+        Args:
+            db_path: Path of the queue database
+            max_attempts: Claims of a novel after which it is failed
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction on a fresh connection."""
+        conn = sqlite3.connect(str(self.db_path), timeout=_BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def enqueue(self, paths: Iterable[Path], input_folder: Path) -> int:
+        """
+        Create the queue if needed and add the novels not yet in it.
+
+        Every host calls this on start, so adding a novel twice is a no-op,
+        also when the hosts see the directory under different paths.
+
+        Args:
+            paths: Novel files inside input_folder
+            input_folder: Directory of the batch
+
+        Returns:
+            Number of novels added
+
+        Raises:
+            ValueError: If a novel is not inside input_folder
+        """
+        with self._transaction() as conn:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute("INSERT OR IGNORE INTO batch (key, value) VALUES ('created', ?)", (dt.datetime.now().isoformat(),))
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO novels (path) VALUES (?)", [(_relative_path(path, input_folder),) for path in paths])
+            added = conn.total_changes - before
+            if added:
+                # New novels reopen a finished batch
+                conn.execute("DELETE FROM batch WHERE key = 'archived'")
+            return added
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float) -> list[tuple[str, str]]:
+        """
+        Return the novels of expired leases to the queue, or fail them.
+
+        Args:
+            conn: Connection inside a write transaction
+            now: Current time
+
+        Returns:
+            (path, worker) of every expired lease
+        """
+        expired = [(row["path"], row["worker"], row["attempts"]) for row in conn.execute("SELECT path, worker, attempts FROM novels WHERE status = 'leased' AND lease_expires < ?", (now,))]
+        for path, worker, attempts in expired:
+            status = "failed" if attempts >= self.max_attempts else "queued"
+            conn.execute(
+                "UPDATE novels SET status = ?, token = NULL, lease_expires = NULL, available_at = ?, error = ?, end_time = ? WHERE path = ?",
+                (status, now, f"Lease of {worker} expired", dt.datetime.now().isoformat(), path),
+            )
+        return [(path, worker) for path, worker, _ in expired]
+
+    def claim(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> tuple[Lease | None, list[tuple[str, str]]]:
+        """
+        Lease the next queued novel.
+
+        Args:
+            worker: Name of the worker
+            lease_seconds: Seconds the lease lasts without a heartbeat
+
+        Returns:
+            The lease (None if no novel is available now) and the
+            (path, worker) of the expired leases requeued on the way
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            expired = self._requeue_expired(conn, now)
+            row = conn.execute("SELECT path, attempts FROM novels WHERE status = 'queued' AND available_at <= ? ORDER BY path LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None, expired
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE novels SET status = 'leased', attempts = attempts + 1, worker = ?, token = ?, lease_expires = ?, start_time = ?, end_time = NULL WHERE path = ?",
+                (worker, token, now + lease_seconds, dt.datetime.now().isoformat(), row["path"]),
+            )
+            return Lease(row["path"], token, worker, row["attempts"] + 1), expired
+
+    def heartbeat(self, lease: Lease, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """
+        Extend a lease.
+
+        Args:
+            lease: Lease to extend
+            lease_seconds: Seconds from now the lease lasts
+
+        Returns:
+            False if the lease was lost (expired and requeued or taken over)
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE novels SET lease_expires = ? WHERE path = ? AND token = ? AND status = 'leased'",
+                (time.time() + lease_seconds, lease.path, lease.token),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, lease: Lease, success: bool, error: str | None = None) -> bool:
+        """
+        Commit the result of a leased novel.
+
+        The result is accepted if the lease is still held, or if it expired
+        and nobody has claimed the novel since. Committing the same
+        lease again changes nothing.
+
+        Args:
+            lease: Lease of the novel
+            success: Whether the novel was processed
+            error: Error message of a failure
+
+        Returns:
+            True if the result is recorded, False if another worker holds
+            the novel now
+        """
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status, token, attempts FROM novels WHERE path = ?", (lease.path,)).fetchone()
+            if row is None:
+                return False
+            if row["token"] == lease.token and row["status"] != "leased":
+                # Repeated commit
+                return True
+            if row["token"] not in (lease.token, None):
+                return False
+            if success:
+                status, error = "completed", None
+            else:
+                status = "failed" if row["attempts"] >= self.max_attempts else "queued"
+            conn.execute(
+                "UPDATE novels SET status = ?, worker = ?, token = ?, lease_expires = NULL, available_at = 0, error = ?, end_time = ? WHERE path = ?",
+                (status, lease.worker, lease.token, error, dt.datetime.now().isoformat(), lease.path),
+            )
+            return True
+
+    def release(self, lease: Lease, retry_seconds: float) -> bool:
+        """
+        Return a leased novel without using up an attempt.
+
+        Args:
+            lease: Lease of the novel
+            retry_seconds: Seconds before the novel is offered again
+
+        Returns:
+            False if the lease was already lost
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE novels SET status = 'queued', attempts = attempts - 1, token = NULL, lease_expires = NULL, available_at = ? WHERE path = ? AND token = ? AND status = 'leased'",
+                (time.time() + retry_seconds, lease.path, lease.token),
+            )
+            return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        """
+        Return the number of novels per status.
+
+        Returns:
+            Dict of queued, leased, completed and failed counts
+        """
+        counts = dict.fromkeys(("queued", "leased", "completed", "failed"), 0)
+        with self._transaction() as conn:
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM novels GROUP BY status"):
+                counts[row["status"]] = row["n"]
+        return counts
+
+    def finish_batch(self, input_folder: Path) -> dict[str, Any] | None:
+        """
+        Hand the final progress of a finished batch to one caller.
+
+        Args:
+            input_folder: Directory of the batch on the host of the caller
+
+        Returns:
+            The progress in the format of the batch history, to the first
+            caller after every novel is completed or failed; None otherwise
+        """
+        with self._transaction() as conn:
+            unfinished = conn.execute("SELECT COUNT(*) FROM novels WHERE status IN ('queued', 'leased')").fetchone()[0]
+            meta = {row["key"]: row["value"] for row in conn.execute("SELECT key, value FROM batch")}
+            if unfinished or "archived" in meta:
+                return None
+            conn.execute("INSERT INTO batch (key, value) VALUES ('archived', ?)", (dt.datetime.now().isoformat(),))
+            files = [
+                {
+                    "path": str((input_folder / row["path"]).resolve()),
+                    "status": "completed" if row["status"] == "completed" else "failed/skipped",
+                    "retry_count": row["attempts"] - 1 if row["status"] == "completed" else row["attempts"],
+                    "worker": row["worker"],
+                    "start_time": row["start_time"],
+                    "end_time": row["end_time"],
+                    **({"error": row["error"]} if row["error"] else {}),
+                }
+                for row in conn.execute("SELECT * FROM novels ORDER BY path")
+            ]
+            return {"created": meta.get("created"), "input_folder": str(input_folder.resolve()), "distributed": True, "files": files}
+
+
+def _relative_path(path: Path, input_folder: Path) -> str:
+    """Return the key of a novel: its path relative to the batch directory."""
+    try:
+        relative = path.relative_to(input_folder)
+    except ValueError:
+        relative = path.resolve().relative_to(input_folder.resolve())
+    return relative.as_posix()
@@ -20,6 +20,12 @@
 # - Added foreign book title parsing
 # - Added book import with chunk creation
 # - Integrated with models module
+# - Added multi-process preprocessing for large imports (workers)
+# - Added balanced chunk packing option
+# - Chunk boundaries snap to Chinese chapter headings (chapter_aware) and the
+#   chapter to chunk map is stored in Book.chapter_map
+# - The chunking parameters are stored in Book.chunking
+# - rechunk_book splits an imported book again with other chunking parameters
 #
 
 """Book import utilities for the EnChANT Book Manager."""
@@ -30,9 +36,11 @@ import uuid
 from pathlib import Path
 from typing import Optional, Any
 
-from .models import Book, Chunk, Variation
+from .chinese_headings import ChapterSpan
+from .models import Book, Chunk, Variation, CHUNK_DB, VARIATION_DB
 from .file_handler import decode_input_file_content
 from .text_processor import remove_excess_empty_lines
+from .parallel_import import split_chinese_text_in_parts_parallel
 from .text_splitter import split_chinese_text_in_parts, DEFAULT_MAX_CHARS
 
 
@@ -92,11 +100,58 @@ def foreign_book_title_splitter(
     )
 
 
+def _create_chunks(book_id: str, chunks: list[str], logger: Optional[Any]) -> None:
+    """
+    Create a chunk entry and an original variation for every text chunk of a book.
+
+    Args:
+        book_id: ID of the book the chunks belong to
+        chunks: Text of every chunk, in order
+        logger: Optional logger for debug output
+    """
+    # for each chunk create a new chunk entry and a new orig variation in database
+    for index, chunk_content in enumerate(chunks, start=1):
+        new_chunk_id = str(uuid.uuid4())
+        new_variation_id = str(uuid.uuid4())
+        try:
+            Chunk.create(
+                chunk_id=new_chunk_id,
+                book_id=book_id,
+                chunk_number=index,
+                original_variation_id=new_variation_id,
+            )
+        except Exception as e:
+            if logger is not None:
+                logger.debug(f"An exception happened when creating chunk n.{index} with ID {new_variation_id}. ")
+                logger.debug("ERROR: " + str(e))
+        else:
+            try:
+                Variation.create(
+                    variation_id=new_variation_id,
+                    book_id=book_id,
+                    chunk_id=new_chunk_id,
+                    chunk_number=index,
+                    language="original",
+                    category="original",
+                    text_content=chunk_content,
+                )
+            except Exception as e:
+                chunk_number = index if "index" in locals() else "unknown"
+                if logger is not None:
+                    logger.debug(f"An exception happened when creating a new variation original for chunk n.{chunk_number}:")
+                    logger.debug("ERROR: " + str(e))
+        finally:
+            pass  # No commit needed for in-memory storage
+
+
 def import_book_from_txt(
     file_path: str | Path,
     encoding: str = "utf-8",
     max_chars: int = DEFAULT_MAX_CHARS,
     logger: Optional[Any] = None,
+    workers: int = 1,
+    balanced: bool = False,
+    chapter_aware: bool = True,
 ) -> str:
     """
     Import a book from text file and split into chunks.
@@ -106,6 +161,10 @@ def import_book_from_txt(
         encoding: File encoding (unused, auto-detected)
         max_chars: Maximum characters per chunk
         logger: Optional logger for debug output
+        workers: Worker processes for text preprocessing (1 = sequential)
+        balanced: Pack paragraphs into near-equal chunks instead of greedily
+        chapter_aware: Snap chunk boundaries to Chinese chapter headings and
+            record the chapter to chunk map in Book.chapter_map
 
     Returns:
         The book_id of the imported book
@@ -130,7 +189,11 @@ def import_book_from_txt(
     total_book_characters = len(book_content)
 
     # SPLIT THE BOOK IN CHUNKS
-    splitted_chunks = split_chinese_text_in_parts(book_content, max_chars, logger=logger)
+    chapter_map: list[ChapterSpan] | None = [] if chapter_aware else None
+    if workers > 1:
+        splitted_chunks = split_chinese_text_in_parts_parallel(book_content, max_chars, workers=workers, logger=logger, balanced=balanced, chapters=chapter_map)
+    else:
+        splitted_chunks = split_chinese_text_in_parts(book_content, max_chars, logger=logger, balanced=balanced, chapters=chapter_map)
 
     # Create new book entry in database
     new_book_id = str(uuid.uuid4())
@@ -167,39 +230,57 @@ def import_book_from_txt(
         pass  # No commit needed for in-memory storage
 
     book = Book.get_by_id(new_book_id)
+    book.chunking = {"max_chars": max_chars, "balanced": balanced, "chapter_aware": chapter_aware}
+    if chapter_map:
+        book.chapter_map = chapter_map
+        if logger is not None:
+            logger.debug(f"Found {len(chapter_map)} chapter headings in {len(splitted_chunks)} chunks")
 
-    # for each chunk create a new chunk entry and a new orig variation in database
-    for index, chunk_content in enumerate(splitted_chunks, start=1):
-        new_chunk_id = str(uuid.uuid4())
-        new_variation_id = str(uuid.uuid4())
-        try:
-            Chunk.create(
-                chunk_id=new_chunk_id,
-                book_id=new_book_id,
-                chunk_number=index,
-                original_variation_id=new_variation_id,
-            )
-        except Exception as e:
-            if logger is not None:
-                logger.debug(f"An exception happened when creating chunk n.{index} with ID {new_variation_id}. ")
-                logger.debug("ERROR: " + str(e))
-        else:
-            try:
-                Variation.create(
-                    variation_id=new_variation_id,
-                    book_id=new_book_id,
-                    chunk_id=new_chunk_id,
-                    chunk_number=index,
-                    language="original",
-                    category="original",
-                    text_content=chunk_content,
-                )
-            except Exception as e:
-                chunk_number = index if "index" in locals() else "unknown"
-                if logger is not None:
-                    logger.debug(f"An exception happened when creating a new variation original for chunk n.{chunk_number}:")
-                    logger.debug("ERROR: " + str(e))
-        finally:
-            pass  # No commit needed for in-memory storage
+    _create_chunks(new_book_id, splitted_chunks, logger)
 
     return new_book_id
+
+
+def rechunk_book(
+    book: Book,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    balanced: bool = False,
+    chapter_aware: bool = False,
+    logger: Optional[Any] = None,
+) -> bool:
+    """
+    Split an imported book again with other chunking parameters.
+
+    The chunks hold the cleaned paragraphs of the import, so splitting their
+    joined text gives the chunks an import with these parameters would have
+    made. Book.chapter_map and Book.chunking are updated, the chunks are
+    replaced only if the split differs.
+
+    Args:
+        book: The imported book
+        max_chars: Maximum characters per chunk
+        balanced: Pack paragraphs into near-equal chunks instead of greedily
+        chapter_aware: Snap chunk boundaries to Chinese chapter headings
+        logger: Optional logger for debug output
+
+    Returns:
+        True if the chunks of the book changed
+    """
+    old_chunks = sorted(book.chunks, key=lambda chunk: chunk.chunk_number)
+    old_texts = [VARIATION_DB[chunk.original_variation_id].text_content for chunk in old_chunks]
+
+    chapter_map: list[ChapterSpan] | None = [] if chapter_aware else None
+    texts = split_chinese_text_in_parts("".join(old_texts), max_chars, logger=logger, balanced=balanced, chapters=chapter_map)
+    book.chunking = {"max_chars": max_chars, "balanced": balanced, "chapter_aware": chapter_aware}
+    book.chapter_map = chapter_map or []
+    if texts == old_texts:
+        return False
+
+    for chunk in old_chunks:
+        CHUNK_DB.pop(chunk.chunk_id, None)
+        VARIATION_DB.pop(chunk.original_variation_id, None)
+    book.chunks = []
+    _create_chunks(book.book_id, texts, logger)
+    if logger is not None:
+        logger.debug(f"Split {book.title} again in {len(texts)} chunks instead of {len(old_texts)}")
+    return True
@@ -40,6 +40,10 @@ from .chapter_parser import (
     split_text,
 )
 
+from .chapter_segmenter import (
+    ChapterScanStats,
+)
+
 from .chapter_issues import (
     detect_issues,
 )
@@ -58,4 +62,6 @@ __all__ = [
     "split_text_db",
     "split_text",
     "detect_issues",
+    # From chapter_segmenter
+    "ChapterScanStats",
 ]
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: persistent chapter index sidecar for EPUB rebuilds
+#
+
+"""
+chapter_index.py - Persistent chapter index for translated text files
+=====================================================================
+
+Heading detection over a full translated novel is the slowest part of an
+EPUB build, and it gives the same answer every time the text is unchanged.
+The detected chapters (titles and UTF-8 byte offsets of their bodies), the
+chapter number sequence and the detect_issues output are stored in a JSON
+sidecar next to the text file, e.g. ``translated_X.txt.chapters.json``.
+
+An index is only reused when both of these still match:
+
+* the SHA-256 of the text, and
+* the parser fingerprint, a hash of HEADING_RE and of the source of the
+  chapter detection and validation modules, so any change to the patterns or
+  validators invalidates every index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from . import chapter_issues, chapter_parser, chapter_patterns, chapter_segmenter, chapter_validators, epub_constants
+from .chapter_patterns import HEADING_RE
+
+# Bump when the sidecar layout changes
+INDEX_FORMAT_VERSION = 1
+
+# Suffix appended to the text file name to form the sidecar name
+INDEX_SUFFIX = ".chapters.json"
+
+# Modules whose code decides where chapters start and which issues are found
+_PARSER_MODULES: tuple[ModuleType, ...] = (
+    chapter_patterns,
+    chapter_validators,
+    chapter_parser,
+    chapter_segmenter,
+    chapter_issues,
+    epub_constants,
+)
+
+
+@dataclass
+class ChapterIndex:
+    """Chapters, sequence and issues restored from a sidecar index."""
+
+    chapters: list[tuple[str, str]]
+    sequence: list[int]
+    issues: list[str]
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """
+    Hash of everything that influences chapter detection.
+
+    Returns:
+        Hex digest combining HEADING_RE and the parser module sources
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{INDEX_FORMAT_VERSION}\0{HEADING_RE.pattern}\0{HEADING_RE.flags}\0".encode())
+    for module in _PARSER_MODULES:
+        if module.__file__:
+            digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def index_path_for(txt_file_path: Path) -> Path:
+    """Return the sidecar path used for txt_file_path."""
+    return txt_file_path.with_name(txt_file_path.name + INDEX_SUFFIX)
+
+
+def load_chapter_index(txt_file_path: Path, text: str) -> ChapterIndex | None:
+    """
+    Load the chapter index of a text file if it is still valid.
+
+    Args:
+        txt_file_path: Path of the text file the index belongs to
+        text: Current content of the text file
+
+    Returns:
+        The restored index, or None if it is missing, stale or unreadable
+    """
+    try:
+        data: dict[str, Any] = json.loads(index_path_for(txt_file_path).read_text(encoding="utf-8"))
+        if data.get("format_version") != INDEX_FORMAT_VERSION or data.get("parser") != parser_fingerprint():
+            return None
+
+        raw = text.encode("utf-8")
+        if data.get("content_sha256") != hashlib.sha256(raw).hexdigest():
+            return None
+
+        chapters = [(str(title), raw[start:end].decode("utf-8")) for title, start, end in data["chapters"]]
+        return ChapterIndex(chapters=chapters, sequence=[int(n) for n in data["sequence"]], issues=[str(i) for i in data["issues"]])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def save_chapter_index(
+    txt_file_path: Path,
+    text: str,
+    chapters: list[tuple[str, str]],
+    sequence: list[int],
+    issues: list[str],
+) -> bool:
+    """
+    Store the chapters detected in a text file in its sidecar index.
+
+    Chapter bodies are stored as byte offsets, so they must be verbatim
+    substrings of text, in order. Otherwise nothing is written.
+
+    Args:
+        txt_file_path: Path of the text file the index belongs to
+        text: Text the chapters were detected in
+        chapters: (title, content) pairs returned by split_text
+        sequence: Chapter number sequence returned by split_text
+        issues: detect_issues output for the sequence
+
+    Returns:
+        True if the index was written
+    """
+    raw = text.encode("utf-8")
+    entries: list[tuple[str, int, int]] = []
+    char_pos = 0
+    byte_pos = 0
+    for title, content in chapters:
+        start = text.find(content, char_pos)
+        if start == -1:
+            return False
+        # Convert character offsets to byte offsets incrementally
+        byte_pos += len(text[char_pos:start].encode("utf-8"))
+        byte_start = byte_pos
+        byte_pos += len(content.encode("utf-8"))
+        char_pos = start + len(content)
+        entries.append((title, byte_start, byte_pos))
+
+    data = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "parser": parser_fingerprint(),
+        "content_sha256": hashlib.sha256(raw).hexdigest(),
+        "chapters": entries,
+        "sequence": sequence,
+        "issues": issues,
+    }
+
+    index_path = index_path_for(txt_file_path)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
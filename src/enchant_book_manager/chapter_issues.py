@@ -5,6 +5,9 @@
 # - Created new module from chapter_detector.py refactoring
 # - Contains issue detection logic for chapter sequences
 # - Includes detect_issues function
+# - detect_issues runs in linear time: predecessors and run lengths are
+#   precomputed in one sweep and missing numbers are skipped with
+#   MissingNumberTracker instead of rescanning the sequence
 #
 
 """
@@ -17,6 +20,72 @@ including missing numbers, repeats, swaps, and out-of-place chapters.
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from itertools import groupby
+
+
+def predecessors_and_run_lengths(seq: list[int]) -> tuple[list[int | None], list[int]]:
+    """
+    Precompute, in one sweep, what repeat reports need for every position.
+
+    Args:
+        seq: Chapter numbers in order of appearance
+
+    Returns:
+        Tuple (predecessors, run_lengths): predecessors[i] is the nearest
+        value before position i that differs from seq[i] (None if there is
+        none), run_lengths[i] the number of consecutive copies of seq[i]
+        starting at position i
+    """
+    predecessors: list[int | None] = []
+    run_lengths: list[int] = []
+    previous: int | None = None
+    for value, run in groupby(seq):
+        length = sum(1 for _ in run)
+        predecessors.extend([previous] * length)
+        run_lengths.extend(range(length, 0, -1))
+        previous = value
+    return predecessors, run_lengths
+
+
+class MissingNumberTracker:
+    """
+    Report every missing number once, skipping those already reported.
+
+    Reported numbers are linked to the next number with path compression,
+    so walking a range costs the new numbers in it plus a near-constant
+    overhead, however often the same range is revisited.
+    """
+
+    def __init__(self) -> None:
+        self._next: dict[int, int] = {}
+
+    def _first_unreported(self, number: int) -> int:
+        """Return the smallest number >= number that was not reported yet."""
+        root = number
+        while root in self._next:
+            root = self._next[root]
+        while number != root:
+            self._next[number], number = root, self._next[number]
+        return root
+
+    def take(self, start: int, stop: int) -> Iterator[int]:
+        """
+        Yield the numbers in range(start, stop) not reported yet, marking them reported.
+
+        Args:
+            start: First number of the range
+            stop: Number after the last one of the range
+
+        Yields:
+            Newly reported numbers in increasing order
+        """
+        number = self._first_unreported(start)
+        while number < stop:
+            yield number
+            self._next[number] = number + 1
+            number = self._first_unreported(number + 1)
+
 
 def detect_issues(seq: list[int]) -> list[str]:
     """
@@ -30,24 +99,17 @@ def detect_issues(seq: list[int]) -> list[str]:
     start, end = seq[0], seq[-1]
     prev_expected = start
     seen = set()
-    reported_missing = set()
+    missing = MissingNumberTracker()
+    predecessors, run_lengths = predecessors_and_run_lengths(seq)
 
     for idx, v in enumerate(seq):
         # 1) Repeats: only on second+ occurrence
         if v in seen:
-            # find nearest non-identical predecessor
-            try:
-                pred = next(x for x in reversed(seq[:idx]) if x != v)
-            except StopIteration:
-                # No non-identical predecessor found (all previous values are the same)
-                # Use the first value in sequence, or 0 if this is the first
-                pred = seq[0] if idx > 0 and seq[0] != v else 0
-            # count run length from here
-            run_len = 1
-            j = idx
-            while j + 1 < len(seq) and seq[j + 1] == v:
-                run_len += 1
-                j += 1
+            # nearest non-identical predecessor, 0 if all previous values are the same
+            pred = predecessors[idx]
+            if pred is None:
+                pred = 0
+            run_len = run_lengths[idx]
             t = "times" if run_len > 1 else "time"
             issues.append((idx, f"number {v} is repeated {run_len} {t} after number {pred}"))
         else:
@@ -55,10 +117,8 @@ def detect_issues(seq: list[int]) -> list[str]:
 
         # 2) Missing: jumped past some values
         if v > prev_expected:
-            for m in range(prev_expected, v):
-                if m not in reported_missing:
-                    issues.append((idx, f"number {m} is missing"))
-                    reported_missing.add(m)
+            for m in missing.take(prev_expected, v):
+                issues.append((idx, f"number {m} is missing"))
             prev_expected = v + 1
 
         # 3) Exact hit
@@ -76,9 +136,8 @@ def detect_issues(seq: list[int]) -> list[str]:
             prev_expected = v + 1
 
     # tail missing
-    for m in range(prev_expected, end + 1):
-        if m not in reported_missing:
-            issues.append((len(seq), f"number {m} is missing"))
+    for m in missing.take(prev_expected, end + 1):
+        issues.append((len(seq), f"number {m} is missing"))
 
     issues.sort(key=lambda x: x[0])
     return [msg for _, msg in issues]
@@ -5,6 +5,9 @@
 # - Created new module from chapter_detector.py refactoring
 # - Contains main parsing functions for chapter detection
 # - Includes split_text_db, split_text, and detect_issues
+# - split_text_db uses the in-memory chapter_segmenter engine instead of SQLite
+# - split_text runs HEADING_PREFILTER_RE before HEADING_RE, splits lines once
+#   and can report ChapterScanStats counters
 #
 
 """
@@ -20,27 +23,29 @@ from __future__ import annotations
 import re
 from typing import Optional, Callable
 
-from .chapter_patterns import HEADING_RE, DB_OPTIMIZATION_THRESHOLD
+from .chapter_patterns import HEADING_RE, HEADING_PREFILTER_RE, DB_OPTIMIZATION_THRESHOLD
 from .chapter_validators import has_part_notation, parse_num, is_valid_chapter_line
 
-# Import database module for fast chapter indexing
-try:
-    from .epub_db_optimized import process_text_optimized
+# In-memory two-stage engine for large files; same output as the former
+# SQLite implementation in epub_db_optimized
+from .chapter_segmenter import ChapterScanStats, process_text_optimized
 
-    DB_OPTIMIZED = True
-except ImportError:
-    # Database optimization not available
-    DB_OPTIMIZED = False
+# Set to False to send large files through the regular line loop instead
+DB_OPTIMIZED = True
 
 
 def split_text_db(
     text: str,
     detect_headings: bool,
     log_issue_func: Optional[Callable[[str], None]] = None,
+    stats: ChapterScanStats | None = None,
 ) -> tuple[list[tuple[str, str]], list[int]]:
     """
-    Database-optimized version for fast chapter parsing.
-    Uses SQLite with indexes for efficient processing of large files.
+    Fast chapter parsing for large files.
+
+    Uses the in-memory two-stage search of chapter_segmenter: a compiled
+    prefilter picks candidate lines, HEADING_RE validates them and chapter
+    bodies are cut as slices of the text.
     """
     if not detect_headings:
         return [("Content", text)], []
@@ -48,19 +53,24 @@ def split_text_db(
     try:
         if DB_OPTIMIZED:
             # Use new optimized approach with two-stage search
-            return process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line)
+            return process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line, stats=stats)
         else:
-            # Database optimization not available, fallback to regular processing
-            return split_text(text, detect_headings, force_no_db=True)
+            # Fast path disabled, fallback to regular processing
+            return split_text(text, detect_headings, force_no_db=True, stats=stats)
 
     except Exception as e:
         # Log error and fallback to non-database method
         if log_issue_func:
             log_issue_func(f"Database processing failed: {e}")
-        return split_text(text, detect_headings, force_no_db=True)
+        return split_text(text, detect_headings, force_no_db=True, stats=stats)
 
 
-def split_text(text: str, detect_headings: bool, force_no_db: bool = False) -> tuple[list[tuple[str, str]], list[int]]:
+def split_text(
+    text: str,
+    detect_headings: bool,
+    force_no_db: bool = False,
+    stats: ChapterScanStats | None = None,
+) -> tuple[list[tuple[str, str]], list[int]]:
     """
     Enhanced version with:
     1. Position/quote checking for chapter patterns
@@ -73,12 +83,14 @@ def split_text(text: str, detect_headings: bool, force_no_db: bool = False) -> t
         text: The text to split
         detect_headings: Whether to detect chapter headings
         force_no_db: Force non-database processing (used for fallback)
+        stats: Optional counters (lines scanned, prefilter hits, regex matches)
+            updated by the scan
     """
     # Use database optimization for large files (unless forced not to)
     lines = text.splitlines()
     if not force_no_db and len(lines) > DB_OPTIMIZATION_THRESHOLD:
         try:
-            return split_text_db(text, detect_headings)
+            return split_text_db(text, detect_headings, stats=stats)
         except Exception:
             # Fallback to regular processing if database fails
             pass
@@ -102,13 +114,26 @@ def split_text(text: str, detect_headings: bool, force_no_db: bool = False) -> t
     last_chapter_num = None
     last_chapter_text = None
 
-    lines = text.splitlines()
+    # Counters for ChapterScanStats
+    prefilter_hits = 0
+    regex_matches = 0
+
     for line_idx, line in enumerate(lines):
-        m = HEADING_RE.match(line.strip())
+        # Cheap first-characters check; lines failing it can never match HEADING_RE
+        if HEADING_PREFILTER_RE.match(line) is None:
+            buf.append(line)
+            if blank_only and line and not line.isspace():
+                blank_only = False
+            continue
+
+        prefilter_hits += 1
+        current_text = line.strip()
+        m = HEADING_RE.match(current_text)
         if m:
+            regex_matches += 1
             # Additional validation for chapter patterns
             # Only validate lines that start with "Chapter" (not abbreviations or other patterns)
-            stripped_line = line.strip().lower()
+            stripped_line = current_text.lower()
             if (stripped_line.startswith("chapter ") or stripped_line.startswith("chapter\t")) and not is_valid_chapter_line(line):
                 # Skip false positive (dialogue, mid-sentence, etc.)
                 buf.append(line)
@@ -125,7 +150,6 @@ def split_text(text: str, detect_headings: bool, force_no_db: bool = False) -> t
 
             # Smart duplicate detection
             lines_since_last = line_idx - last_chapter_line
-            current_text = line.strip()
 
             # Skip if same text within 4 lines (true duplicate)
             if lines_since_last <= 4 and current_text == last_chapter_text:
@@ -161,14 +185,17 @@ def split_text(text: str, detect_headings: bool, force_no_db: bool = False) -> t
                 buf.clear()
 
             # Use the original line text as the chapter title
-            cur_title = line.strip()
+            cur_title = current_text
             cur_num = num  # Save the current chapter's number
             seq.append(num)
         else:
             buf.append(line)
-            if line.strip():
+            if current_text:
                 blank_only = False
 
+    if stats is not None:
+        stats.add(len(lines), prefilter_hits, regex_matches, len(seq))
+
     if cur_title:
         raw_chapters.append((cur_title, "\n".join(buf).strip(), cur_num))
     elif buf:
@@ -5,6 +5,7 @@
 # - Created new module from chapter_detector.py refactoring
 # - Contains regex patterns and constants for chapter detection
 # - Includes HEADING_RE, PART_PATTERNS, and DB_OPTIMIZATION_THRESHOLD
+# - Added HEADING_PREFILTER_RE, a cheap necessary condition for HEADING_RE
 #
 
 """
@@ -40,6 +41,12 @@ HEADING_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Cheap first-characters check run before HEADING_RE. Every line HEADING_RE
+# accepts starts, after leading non-word characters, with "ch" (chapter, ch.,
+# chap), part, section, book or a digit ("§ 42" is covered by the digit), so
+# lines failing this test can skip the full regex. Works on unstripped lines.
+HEADING_PREFILTER_RE = re.compile(r"[^\w]*(?:ch|part|section|book|\d)", re.IGNORECASE)
+
 # Regex patterns for detecting part notation in chapter titles
 PART_PATTERNS = [
     # Fraction patterns: 1/3, 2/3, [1/3], (1 of 3)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: in-memory two-stage chapter segmentation engine
+# - Replaces the SQLite round-trip of epub_db_optimized for large texts
+# - Added ChapterScanStats counters
+#
+
+"""
+chapter_segmenter.py - In-memory chapter segmentation for large texts
+=====================================================================
+
+Does the same two-stage job as epub_db_optimized.process_text_optimized
+without a database:
+
+1. A compiled prefilter scans the whole text once and finds the few lines
+   that can contain a chapter keyword (the same case-insensitive "chapter",
+   "ch." and "chap" test as the SQLite LIKE query).
+2. Only those lines go through HEADING_RE and the validators.
+
+Line numbers are counted between candidate lines, and chapter bodies are cut
+as slices of the text, so no per-line objects are ever created. The output is
+identical to the database path.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from re import Pattern
+
+# Case-insensitive ASCII test equivalent to the stage 1 LIKE query of
+# epub_db_optimized ("chapter", "Ch.", "Chap" and their case variants)
+CHAPTER_PREFILTER_RE = re.compile(r"ch(?:\.|ap)", re.IGNORECASE | re.ASCII)
+
+# Every line boundary recognized by str.splitlines, other than "\n"
+_OTHER_LINE_BREAKS_RE = re.compile("\r\n|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# Match groups that may carry the chapter number, in priority order
+NUMBER_GROUPS = ("num_d", "num_r", "num_w", "part_d", "part_r", "part_w", "sec_d", "hash_d")
+
+
+@dataclass
+class ChapterScanStats:
+    """Counters filled by a chapter scan, for tuning the prefilters."""
+
+    lines_scanned: int = 0  # Lines in the text
+    prefilter_hits: int = 0  # Lines that passed the cheap prefilter
+    regex_matches: int = 0  # Lines matched by the full heading regex
+    headings: int = 0  # Lines accepted as chapter headings
+
+    def add(self, lines_scanned: int, prefilter_hits: int, regex_matches: int, headings: int) -> None:
+        """Accumulate the counts of one scan."""
+        self.lines_scanned += lines_scanned
+        self.prefilter_hits += prefilter_hits
+        self.regex_matches += regex_matches
+        self.headings += headings
+
+
+@dataclass(frozen=True)
+class HeadingLine:
+    """A validated chapter heading found by the segmenter."""
+
+    line_number: int  # 1-based, as in the database path
+    start: int  # Offset of the first character of the line
+    end: int  # Offset just past the last character of the line
+    title: str
+    number: int
+
+
+def normalize_line_breaks(text: str) -> str:
+    """
+    Replace every str.splitlines boundary with a single newline.
+
+    After this, text.split("\\n") gives the same lines as text.splitlines()
+    (plus one trailing empty string when the text ends with a newline).
+
+    Args:
+        text: Text with arbitrary line boundaries
+
+    Returns:
+        Text whose only line boundary is "\\n"
+    """
+    if _OTHER_LINE_BREAKS_RE.search(text) is None:
+        return text
+    return _OTHER_LINE_BREAKS_RE.sub("\n", text)
+
+
+def extract_number_text(match: re.Match[str]) -> str | None:
+    """Return the first non-empty chapter number group of a heading match."""
+    for group in NUMBER_GROUPS:
+        try:
+            value = match.group(group)
+        except IndexError:
+            # Custom heading patterns may not define every group
+            continue
+        if value:
+            return value
+    return None
+
+
+def find_heading_lines(
+    text: str,
+    heading_regex: Pattern[str],
+    parse_num_func: Callable[[str | None], int | None],
+    is_valid_func: Callable[[str], bool],
+    prefilter: Pattern[str] = CHAPTER_PREFILTER_RE,
+    stats: ChapterScanStats | None = None,
+) -> list[HeadingLine]:
+    """
+    Find validated chapter heading lines with a two-stage search.
+
+    Args:
+        text: Text whose only line boundary is "\\n"
+        heading_regex: Compiled heading pattern, matched against stripped lines
+        parse_num_func: Converts the matched number text to an int
+        is_valid_func: Extra validation on the raw line
+        prefilter: Cheap pattern a line must contain to be considered
+        stats: Optional counters to update
+
+    Returns:
+        Heading lines in text order
+    """
+    headings: list[HeadingLine] = []
+    prefilter_hits = 0
+    regex_matches = 0
+    last_chapter_line = -10
+    last_chapter_text: str | None = None
+
+    line_number = 1
+    counted_to = 0
+    search_from = 0
+    while True:
+        hit = prefilter.search(text, search_from)
+        if hit is None:
+            break
+        start = text.rfind("\n", 0, hit.start()) + 1
+        end = text.find("\n", hit.end())
+        if end == -1:
+            end = len(text)
+        # Continue after this line so every line is considered only once
+        search_from = end + 1
+
+        line_number += text.count("\n", counted_to, start)
+        counted_to = start
+        prefilter_hits += 1
+
+        line = text[start:end]
+        content = line.strip()
+
+        # Skip duplicate heading text within the 4-line window
+        if line_number - last_chapter_line <= 4 and content == last_chapter_text:
+            continue
+
+        match = heading_regex.match(content)
+        if not match:
+            continue
+        regex_matches += 1
+        if not is_valid_func(line):
+            continue
+
+        num_str = extract_number_text(match)
+        number = parse_num_func(num_str) if num_str else None
+        if number is None:
+            continue
+
+        headings.append(HeadingLine(line_number, start, end, content, number))
+        last_chapter_line = line_number
+        last_chapter_text = content
+
+    if stats is not None:
+        lines_scanned = text.count("\n") + 1 if text else 0
+        if text.endswith("\n"):
+            lines_scanned -= 1
+        stats.add(lines_scanned, prefilter_hits, regex_matches, len(headings))
+    return headings
+
+
+def build_chapters(text: str, headings: list[HeadingLine]) -> tuple[list[tuple[str, str]], list[int]]:
+    """
+    Cut chapter bodies out of the text as slices.
+
+    Each chapter runs from its heading line (included) to the line before the
+    next heading; the last one runs to the end of the text.
+
+    Args:
+        text: Text whose only line boundary is "\\n"
+        headings: Heading lines found by find_heading_lines
+
+    Returns:
+        Tuple of (chapters, sequence) where chapters are (title, content) pairs
+    """
+    # A trailing newline ends the last line, it does not start an empty one
+    text_end = len(text) - 1 if text.endswith("\n") else len(text)
+
+    if not headings:
+        return [("Content", text[:text_end])], []
+
+    chapters = []
+    for heading, following in zip(headings, headings[1:]):
+        chapters.append((heading.title, text[heading.start : following.start - 1]))
+    last = headings[-1]
+    chapters.append((last.title, text[last.start : text_end]))
+
+    return chapters, [heading.number for heading in headings]
+
+
+def process_text_optimized(
+    text: str,
+    heading_regex: Pattern[str],
+    parse_num_func: Callable[[str | None], int | None],
+    is_valid_func: Callable[[str], bool],
+    stats: ChapterScanStats | None = None,
+) -> tuple[list[tuple[str, str]], list[int]]:
+    """
+    In-memory drop-in replacement for epub_db_optimized.process_text_optimized.
+
+    Args:
+        text: The text to split into chapters
+        heading_regex: Compiled heading pattern
+        parse_num_func: Converts the matched number text to an int
+        is_valid_func: Extra validation on the raw line
+        stats: Optional counters to update
+
+    Returns:
+        Tuple of (chapters, sequence), identical to the database path
+    """
+    # The database path imports nothing for blank text
+    if not text or not text.strip():
+        return [("Content", "")], []
+
+    text = normalize_line_breaks(text)
+    headings = find_heading_lines(text, heading_regex, parse_num_func, is_valid_func, stats=stats)
+    return build_chapters(text, headings)
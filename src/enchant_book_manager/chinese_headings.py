@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: Chinese chapter heading detection for the importer,
+#   with Chinese numeral parsing and the ChapterSpan record of the
+#   chapter to chunk map
+#
+
+"""
+chinese_headings.py - Chinese chapter headings in the source text
+=================================================================
+
+The importer looks for chapter headings in the Chinese text before it is cut
+into translation chunks, so chunk boundaries can snap to chapter starts and
+the book model can record which chunks every chapter covers.
+
+A heading is the first line of a paragraph of the form 第N章, 第N回, 第N节
+(or 節) or 第N卷, optionally followed by a title, where N is written with
+Arabic digits, full-width digits or Chinese numerals (第十二章, 第一百零五回,
+第两千章, 第一〇五章, 第叁拾章).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+# Values of the Chinese digits, including the financial forms
+_DIGITS = {
+    "零": 0,
+    "〇": 0,
+    "一": 1,
+    "壹": 1,
+    "二": 2,
+    "贰": 2,
+    "貳": 2,
+    "两": 2,
+    "兩": 2,
+    "三": 3,
+    "叁": 3,
+    "參": 3,
+    "四": 4,
+    "肆": 4,
+    "五": 5,
+    "伍": 5,
+    "六": 6,
+    "陆": 6,
+    "陸": 6,
+    "七": 7,
+    "柒": 7,
+    "八": 8,
+    "捌": 8,
+    "九": 9,
+    "玖": 9,
+}
+
+# Multipliers inside a group of four digits
+_SMALL_UNITS = {"十": 10, "拾": 10, "百": 100, "佰": 100, "千": 1000, "仟": 1000}
+
+# Multipliers that close a group of four digits
+_LARGE_UNITS = {"万": 10_000, "萬": 10_000, "亿": 100_000_000, "億": 100_000_000}
+
+_NUMERAL_CHARS = "".join([*_DIGITS, *_SMALL_UNITS, *_LARGE_UNITS])
+
+# Heading units: chapter, chapter of a classical novel, section, volume
+HEADING_UNITS = "章回节節卷"
+
+# 第三回合 (third round) and 第三节课 (third class) are not headings
+CHINESE_HEADING_RE = re.compile(rf"^\s*第\s*(?P<num>[0-9０-９]+|[{_NUMERAL_CHARS}]+)\s*(?P<unit>[{HEADING_UNITS}])(?![合课課])(?P<rest>.*)$")
+
+# Longer first lines are sentences that happen to start with 第N章
+HEADING_MAX_CHARS = 50
+
+
+@dataclass
+class ChineseHeading:
+    """A chapter heading found in the Chinese text."""
+
+    number: int
+    unit: str  # One of HEADING_UNITS
+    title: str  # The stripped heading line
+
+
+@dataclass
+class ChapterSpan:
+    """Where one chapter of the source text ended up after chunking."""
+
+    number: int
+    unit: str
+    title: str  # The original Chinese heading line
+    first_chunk: int  # 1-based chunk_number of the chunk holding the heading
+    last_chunk: int  # 1-based chunk_number of the chunk holding the chapter end
+    paragraph: int  # Index of the heading paragraph in the first chunk (0 = starts the chunk)
+
+
+def parse_chinese_number(text: str) -> int | None:
+    """
+    Convert a Chinese, Arabic or full-width number to an int.
+
+    Handles positional numerals (一〇五 = 105), the unit forms with
+    十/百/千/万/亿 (一百零五 = 105, 十二 = 12, 两千 = 2000) and the
+    financial characters (叁拾 = 30).
+
+    Args:
+        text: The number as written in the heading
+
+    Returns:
+        The value, or None if text is not a number
+    """
+    text = text.strip()
+    if not text:
+        return None
+    if text.isdecimal():
+        # int() accepts full-width digits too
+        return int(text)
+    if any(char not in _DIGITS and char not in _SMALL_UNITS and char not in _LARGE_UNITS for char in text):
+        return None
+
+    # Digits only: read them positionally
+    if all(char in _DIGITS for char in text):
+        value = 0
+        for char in text:
+            value = value * 10 + _DIGITS[char]
+        return value
+
+    total = 0  # Value of the closed groups
+    section = 0  # Value of the current group of four digits
+    digit = 0
+    for char in text:
+        if char in _DIGITS:
+            digit = _DIGITS[char]
+        elif char in _SMALL_UNITS:
+            # A bare unit counts one of it (十二 = 12)
+            section += (digit or 1) * _SMALL_UNITS[char]
+            digit = 0
+        else:
+            unit = _LARGE_UNITS[char]
+            section += digit
+            if unit > 10_000:
+                total = (total + (section or 1)) * unit
+            else:
+                total += (section or 1) * unit
+            section = digit = 0
+    return total + section + digit
+
+
+def match_chinese_heading(paragraph: str) -> ChineseHeading | None:
+    """
+    Check whether a paragraph starts with a Chinese chapter heading.
+
+    Only the first line is looked at: a heading followed by the chapter text
+    without a blank line still counts.
+
+    Args:
+        paragraph: A paragraph of the source text
+
+    Returns:
+        The heading, or None if the paragraph does not start with one
+    """
+    line = paragraph.lstrip().split("\n", 1)[0].strip()
+    if not line.startswith("第") or len(line) > HEADING_MAX_CHARS:
+        return None
+    match = CHINESE_HEADING_RE.match(line)
+    if match is None:
+        return None
+    number = parse_chinese_number(match.group("num"))
+    if number is None:
+        return None
+    return ChineseHeading(number, match.group("unit"), line)
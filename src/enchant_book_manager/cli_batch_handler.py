@@ -6,6 +6,21 @@
 # - Extracted batch processing logic for orchestration
 # - Handles progress tracking and file locking for batch operations
 # - Works with workflow_orchestrator for unified processing
+# - Added --batch-workers: novels run concurrently in a process pool, each
+#   under its own lock; the directory lock only guards against a second
+#   batch controller
+# - Batch progress is kept in an append-only journal (batch_journal) instead
+#   of rewriting the whole YAML file after every change
+# - Added --distributed: hosts sharing the novel directory take novels from
+#   a lease queue (batch_queue) instead of serializing on the directory lock
+# - Added --pipeline: renaming, translation and EPUB generation run in
+#   separate worker pools, so the stages of different novels overlap
+# - Worker pools set up logging in their processes (init_worker_logging)
+# - Distributed workers resolve the novel paths of the queue, which are
+#   relative to the batch directory, against their own input directory
+# - A skip event that cannot be saved no longer aborts the batch
+# - Entries out of retries that are already failed/skipped are not written
+#   to the journal again, which may have been archived and deleted
 #
 
 """
@@ -15,22 +30,79 @@ cli_batch_handler.py - Batch novel processing for CLI orchestration
 Handles batch processing of multiple novel files with progress tracking,
 resume capability, and file locking to prevent concurrent access.
 This module works with the workflow orchestrator for unified processing.
+
+Locking works on two levels. translation_batch.lock in the current
+directory is held by the batch controller for the whole run, so a second
+controller on the same directory waits. Every novel is processed under its
+own lock file, kept in the .enchant_locks directory of the novel's
+directory (see get_book_lock_path); a novel whose lock is held elsewhere,
+for example by a single-file run, is left for a later run without counting
+as a failed attempt.
+
+With --batch-workers N, up to N novels are processed at the same time, each
+in its own worker process (the translation module keeps per-run globals and
+installs a signal handler, so it cannot run in threads). The batch progress
+is only ever touched by the controller thread: a novel is marked processing
+when it is handed to a worker and its result is recorded when the worker
+returns. Workers started with spawn do not inherit the logging handlers, so
+every pool repeats the logging setup of the main process in its workers
+(see cli_setup.init_worker_logging).
+
+Every change of the progress is appended to the batch journal
+(translation_batch_progress.jsonl, see batch_journal) instead of rewriting
+the whole progress file, and a resumed batch replays the journal. When all
+files are completed or skipped the progress is appended to
+translations_chronology.yml and the journal is deleted.
+
+With --distributed, several hosts work on one batch in a shared directory.
+The directory lock and the journal are not used: every worker (one per host,
+or --batch-workers per host) leases novels from the SQLite queue in the
+novel directory (see batch_queue), extends its lease from a heartbeat
+thread while the novel is processed, and commits the result with the lease
+token. Novels of workers that died are picked up by the others once their
+leases expire. The worker that commits the last result appends the batch to
+translations_chronology.yml in the novel directory.
+
+With --pipeline, the three phases of process_novel_unified run as stages
+(see workflow_orchestrator) in three process pools sized by
+--rename-workers, --translate-workers and --epub-workers. A novel moves to
+the next stage's pool as soon as its current stage returns, so novel N+1
+is renamed while novel N translates and novel N-1 gets its EPUB. The
+controller holds the novel's lock from its first stage to its last, and
+admits only as many novels as there are stage workers. Each stage updates
+the novel's own progress file as before.
 """
 
 from __future__ import annotations
 
 import argparse
-import datetime as dt
 import logging
+import os
+import socket
+import sqlite3
 import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
 import filelock
 import yaml
 
-from .common_yaml_utils import load_safe_yaml
-from .workflow_orchestrator import process_novel_unified
+from .batch_journal import JOURNAL_FILE, BatchJournal, load_batch_progress
+from .batch_queue import DEFAULT_LEASE_SECONDS, QUEUE_FILE, Lease, LeaseQueue
+from .cli_setup import get_logging_config, init_worker_logging
+from .workflow_orchestrator import process_novel_unified, run_epub_stage, run_rename_stage, run_translation_stage
+from .workflow_progress import get_book_lock_path
+
+# Failed attempts after which a file is skipped
+MAX_BATCH_RETRIES = 3
+
+# Stages of --pipeline in order, with the argument holding their worker count
+PIPELINE_STAGES = (("rename", "rename_workers"), ("translate", "translate_workers"), ("epub", "epub_workers"))
 
 
 def process_batch(args: argparse.Namespace, logger: logging.Logger) -> None:
@@ -45,91 +117,461 @@ def process_batch(args: argparse.Namespace, logger: logging.Logger) -> None:
         logger.error("Batch processing requires an existing directory path.")
         sys.exit(1)
 
-    # Add file locking to prevent concurrent access
+    if getattr(args, "distributed", False) is True:
+        _process_batch_distributed(input_path, args, logger)
+        return
+
+    # Keep a second batch controller off this directory; the novels
+    # themselves are guarded by their own locks
     lock_path = Path("translation_batch.lock")
     with filelock.FileLock(str(lock_path)):
-        # Load or create batch progress
-        progress_file = Path("translation_batch_progress.yml")
+        # Replay the journal of an interrupted batch or plan a new one
+        journal = BatchJournal(Path(JOURNAL_FILE))
         history_file = Path("translations_chronology.yml")
+        progress = load_batch_progress(journal, input_path, logger)
 
-        if progress_file.exists():
-            progress = load_safe_yaml(progress_file) or {}
+        workers = get_batch_workers(args)
+        if getattr(args, "pipeline", False) is True:
+            _process_files_pipelined(progress, args, journal, history_file, logger)
+        elif workers > 1:
+            _process_files_parallel(progress, workers, args, journal, history_file, logger)
         else:
-            progress = {
-                "created": dt.datetime.now().isoformat(),
-                "input_folder": str(input_path.resolve()),
-                "files": [],
-            }
-
-        # Populate file list if not resuming
-        if not progress.get("files"):
-            files_sorted = sorted(input_path.glob("*.txt"), key=lambda x: x.name)
-            for file in files_sorted:
-                progress["files"].append(
-                    {
-                        "path": str(file.resolve()),
-                        "status": "planned",
-                        "end_time": None,
-                        "retry_count": 0,
-                    }
-                )
-
-        max_retries = 3
-
-        # Process files
-        for item in progress["files"]:
-            if item["status"] == "completed":
-                continue
-            if item.get("retry_count", 0) >= max_retries:
-                logger.warning(f"Skipping {item['path']} after {max_retries} failed attempts.")
-                item["status"] = "failed/skipped"
-                continue
+            _process_files_sequential(progress, args, journal, history_file, logger)
+
+
+def get_batch_workers(args: argparse.Namespace) -> int:
+    """Return the number of novels to process at the same time.
+
+    Args:
+        args: Command-line arguments
+
+    Returns:
+        args.batch_workers if it is an int above 1, otherwise 1
+    """
+    workers = getattr(args, "batch_workers", 1)
+    return workers if isinstance(workers, int) and workers > 1 else 1
+
+
+def get_stage_workers(args: argparse.Namespace) -> dict[str, int]:
+    """Return the number of workers of each --pipeline stage.
+
+    Args:
+        args: Command-line arguments
+
+    Returns:
+        Workers per stage name; 1 for a missing or invalid count
+    """
+    workers = {}
+    for stage, option in PIPELINE_STAGES:
+        value = getattr(args, option, 1)
+        workers[stage] = value if isinstance(value, int) and value > 1 else 1
+    return workers
+
+
+def _worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool whose workers log like the main process.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        The pool; each worker runs init_worker_logging on start
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker_logging, initargs=(get_logging_config(),))
+
+
+def _process_book(file_path: Path, args: argparse.Namespace, logger: logging.Logger) -> bool | None:
+    """Process one novel while holding its lock.
 
-            item["status"] = "processing"
-            item["start_time"] = dt.datetime.now().isoformat()
-            _save_batch_progress(progress_file, progress, logger)
+    Runs in a worker process with --batch-workers, so it must stay a
+    module-level function.
 
+    Args:
+        file_path: Path to the novel file
+        args: Command-line arguments
+        logger: Logger instance
+
+    Returns:
+        The result of process_novel_unified, or None if the novel is locked
+        by another process
+    """
+    try:
+        with filelock.FileLock(str(get_book_lock_path(file_path)), timeout=0):
+            return process_novel_unified(file_path, args, logger)
+    except filelock.Timeout:
+        return None
+
+
+def _pending_items(progress: dict[str, Any], journal: BatchJournal, logger: logging.Logger) -> Iterator[dict[str, Any]]:
+    """Yield the file entries still to process, skipping those out of retries."""
+    for item in progress["files"]:
+        if item["status"] == "completed":
+            continue
+        if item.get("retry_count", 0) >= MAX_BATCH_RETRIES:
+            logger.warning(f"Skipping {item['path']} after {MAX_BATCH_RETRIES} failed attempts.")
+            # A failed entry is already failed/skipped in the journal, which
+            # may have been archived and deleted by now
+            if item["status"] == "failed/skipped":
+                continue
             try:
-                logger.info(f"Processing: {Path(item['path']).name}")
+                journal.record(item, "skipped")
+            except OSError as e:
+                logger.error(f"Error saving progress of {item['path']}: {e}")
+                # Don't re-raise: the next run skips the file again
+            continue
+        yield item
+
+
+def _start_item(item: dict[str, Any], journal: BatchJournal, logger: logging.Logger) -> None:
+    """Mark a file entry as processing in the journal."""
+    _record_event(journal, item, "started", logger)
+    logger.info(f"Processing: {Path(item['path']).name}")
+
+
+def _finish_item(
+    item: dict[str, Any],
+    success: bool | None,
+    error: str | None,
+    journal: BatchJournal,
+    history_file: Path,
+    progress: dict[str, Any],
+    logger: logging.Logger,
+) -> None:
+    """Record the result of a file entry in the journal and archive a finished batch.
+
+    Args:
+        item: File entry of the progress
+        success: Result of _process_book (None = the novel was locked)
+        error: Message of the exception raised while processing, if any
+        journal: Journal of the batch
+        history_file: Path to history file
+        progress: Batch progress
+        logger: Logger instance
+    """
+    if success is None and error is None:
+        logger.warning(f"{Path(item['path']).name} is locked by another process; leaving it for a later run.")
+        _record_event(journal, item, "released", logger)
+    elif success:
+        _record_event(journal, item, "completed", logger)
+    else:
+        error = error or "One or more phases failed"
+        logger.error(f"Failed to process {item['path']}: {error}")
+        _record_event(journal, item, "failed", logger, error=error, retry_count=item.get("retry_count", 0) + 1)
+
+    # Compact the journal into the history once the batch is complete
+    if all(file["status"] in ("completed", "failed/skipped") for file in progress["files"]):
+        _archive_batch_history(history_file, progress, logger)
+        _cleanup_progress_file(journal.path, logger)
+
+
+def _process_files_sequential(
+    progress: dict[str, Any],
+    args: argparse.Namespace,
+    journal: BatchJournal,
+    history_file: Path,
+    logger: logging.Logger,
+) -> None:
+    """Process the pending files one after another.
+
+    Args:
+        progress: Batch progress
+        args: Command-line arguments
+        journal: Journal of the batch
+        history_file: Path to history file
+        logger: Logger instance
+    """
+    for item in _pending_items(progress, journal, logger):
+        _start_item(item, journal, logger)
+        success: bool | None = False
+        error = None
+        try:
+            success = _process_book(Path(item["path"]), args, logger)
+        except Exception as e:
+            error = str(e)
+        _finish_item(item, success, error, journal, history_file, progress, logger)
+
+
+def _process_files_parallel(
+    progress: dict[str, Any],
+    workers: int,
+    args: argparse.Namespace,
+    journal: BatchJournal,
+    history_file: Path,
+    logger: logging.Logger,
+) -> None:
+    """Process the pending files in a pool of worker processes.
+
+    At most workers files are handed out at a time, so the entries marked
+    processing are exactly those running in a worker.
+
+    Args:
+        progress: Batch progress
+        workers: Number of worker processes
+        args: Command-line arguments
+        journal: Journal of the batch
+        history_file: Path to history file
+        logger: Logger instance
+    """
+    pending = _pending_items(progress, journal, logger)
+    running: dict[Future[bool | None], dict[str, Any]] = {}
+    with _worker_pool(workers) as executor:
+
+        def submit_next() -> None:
+            item = next(pending, None)
+            if item is not None:
+                _start_item(item, journal, logger)
+                running[executor.submit(_process_book, Path(item["path"]), args, logger)] = item
+
+        for _ in range(workers):
+            submit_next()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                success: bool | None = False
+                error = None
+                try:
+                    success = future.result()
+                except Exception as e:
+                    error = str(e)
+                _finish_item(item, success, error, journal, history_file, progress, logger)
+                submit_next()
+
+
+def _process_files_pipelined(
+    progress: dict[str, Any],
+    args: argparse.Namespace,
+    journal: BatchJournal,
+    history_file: Path,
+    logger: logging.Logger,
+) -> None:
+    """Process the pending files in a pipeline of rename, translation and EPUB pools.
+
+    Each novel holds its lock from its rename stage to the end of its EPUB
+    stage. At most as many novels as there are stage workers are admitted
+    at a time, so a fast stage cannot mark the whole batch processing.
+
+    Args:
+        progress: Batch progress
+        args: Command-line arguments
+        journal: Journal of the batch
+        history_file: Path to history file
+        logger: Logger instance
+    """
+    stage_workers = get_stage_workers(args)
+    capacity = sum(stage_workers.values())
+    pending = _pending_items(progress, journal, logger)
+    running: dict[Future[Any], tuple[str, dict[str, Any], filelock.FileLock]] = {}
 
-                # Use unified processor
-                success = process_novel_unified(Path(item["path"]), args, logger)
+    with ExitStack() as stack:
+        pools = {stage: stack.enter_context(_worker_pool(workers)) for stage, workers in stage_workers.items()}
 
-                if success:
-                    item["status"] = "completed"
+        def admit_next() -> bool:
+            """Start the next pending novel; False when none is left."""
+            for item in pending:
+                _start_item(item, journal, logger)
+                lock = filelock.FileLock(str(get_book_lock_path(Path(item["path"]))), timeout=0)
+                try:
+                    lock.acquire()
+                except filelock.Timeout:
+                    _finish_item(item, None, None, journal, history_file, progress, logger)
+                    continue
+                running[pools["rename"].submit(run_rename_stage, Path(item["path"]), args, logger)] = ("rename", item, lock)
+                return True
+            return False
+
+        while len(running) < capacity and admit_next():
+            pass
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            # Hand finished stages on in admission order, not in set order
+            for future in [future for future in running if future in done]:
+                stage, item, lock = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    lock.release()
+                    _finish_item(item, False, f"{stage} stage: {e}", journal, history_file, progress, logger)
+                    continue
+                if stage == "rename":
+                    running[pools["translate"].submit(run_translation_stage, result, args, logger)] = ("translate", item, lock)
+                elif stage == "translate":
+                    running[pools["epub"].submit(run_epub_stage, result, args, logger)] = ("epub", item, lock)
                 else:
-                    raise Exception("One or more phases failed")
+                    lock.release()
+                    _finish_item(item, result, None, journal, history_file, progress, logger)
+            while len(running) < capacity and admit_next():
+                pass
+
+
+def get_worker_id(args: argparse.Namespace) -> str:
+    """Return the name of this host's worker in a distributed batch.
+
+    Args:
+        args: Command-line arguments
+
+    Returns:
+        args.worker_id, or host name and process id
+    """
+    worker_id = getattr(args, "worker_id", None)
+    return worker_id if isinstance(worker_id, str) and worker_id else f"{socket.gethostname()}-{os.getpid()}"
+
+
+def get_lease_seconds(args: argparse.Namespace) -> float:
+    """Return the lease length of a distributed batch.
+
+    Args:
+        args: Command-line arguments
+
+    Returns:
+        args.lease_seconds if it is a positive number, otherwise DEFAULT_LEASE_SECONDS
+    """
+    lease_seconds = getattr(args, "lease_seconds", None)
+    return float(lease_seconds) if isinstance(lease_seconds, (int, float)) and lease_seconds > 0 else float(DEFAULT_LEASE_SECONDS)
+
 
+def _process_batch_distributed(input_path: Path, args: argparse.Namespace, logger: logging.Logger) -> None:
+    """Work on a batch shared with other hosts through the lease queue.
+
+    Args:
+        input_path: Shared directory of the novels
+        args: Command-line arguments
+        logger: Logger instance
+    """
+    queue = LeaseQueue(input_path / QUEUE_FILE, max_attempts=MAX_BATCH_RETRIES)
+    added = queue.enqueue(sorted(input_path.glob("*.txt"), key=lambda x: x.name), input_path)
+    logger.info(f"Distributed batch: {added} novel(s) added to {queue.db_path}")
+
+    worker = get_worker_id(args)
+    lease_seconds = get_lease_seconds(args)
+    history_file = input_path / "translations_chronology.yml"
+    workers = get_batch_workers(args)
+    if workers > 1:
+        with _worker_pool(workers) as executor:
+            futures = [executor.submit(run_queue_worker, queue, input_path, f"{worker}-{index}", args, logger, lease_seconds, history_file) for index in range(1, workers + 1)]
+            processed = sum(future.result() for future in futures)
+    else:
+        processed = run_queue_worker(queue, input_path, worker, args, logger, lease_seconds, history_file)
+
+    counts = queue.counts()
+    logger.info(f"Distributed batch: {processed} novel(s) processed here; {counts['completed']} completed, {counts['failed']} failed, {counts['queued'] + counts['leased']} left in the queue")
+
+
+def run_queue_worker(
+    queue: LeaseQueue,
+    input_folder: Path,
+    worker: str,
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    lease_seconds: float,
+    history_file: Path,
+) -> int:
+    """Lease and process novels until the queue has nothing left for this worker.
+
+    The worker stays while other workers hold leases, so it can take over
+    their novels if they die, and stops once no novel is queued or leased.
+    Runs in a worker process with --batch-workers, so it must stay a
+    module-level function.
+
+    Args:
+        queue: Queue of the batch
+        input_folder: Directory of the batch on this host; the paths in the
+            queue are relative to it
+        worker: Name of this worker
+        args: Command-line arguments
+        logger: Logger instance
+        lease_seconds: Seconds a lease lasts without a heartbeat
+        history_file: Path to history file
+
+    Returns:
+        Number of novels whose result this worker committed
+    """
+    processed = 0
+    while True:
+        lease, expired = queue.claim(worker, lease_seconds)
+        for path, dead_worker in expired:
+            logger.warning(f"Lease of {dead_worker} on {Path(path).name} expired; returning it to the queue.")
+        if lease is None:
+            if queue.counts()["leased"] == 0:
+                return processed
+            # Wait in case a worker holding a lease dies
+            time.sleep(min(lease_seconds / 4, 30.0))
+            continue
+
+        name = Path(lease.path).name
+        logger.info(f"[{worker}] Processing: {name} (attempt {lease.attempt})")
+        success: bool | None = False
+        error = None
+        with _heartbeat(queue, lease, lease_seconds, logger):
+            try:
+                success = _process_book((input_folder / lease.path).resolve(), args, logger)
             except Exception as e:
-                logger.error(f"Failed to process {item['path']}: {str(e)}")
-                item["status"] = "failed/skipped"
-                item["error"] = str(e)
-                item["retry_count"] = item.get("retry_count", 0) + 1
-            finally:
-                item["end_time"] = dt.datetime.now().isoformat()
-                _save_batch_progress(progress_file, progress, logger)
+                error = str(e)
+
+        if success is None and error is None:
+            logger.warning(f"{name} is locked by another process; leaving it for a later run.")
+            queue.release(lease, retry_seconds=lease_seconds)
+            continue
+        if not success:
+            error = error or "One or more phases failed"
+            logger.error(f"Failed to process {lease.path}: {error}")
+        if not queue.complete(lease, bool(success), error):
+            logger.warning(f"{name} was taken over by another worker after the lease of {worker} expired; discarding this result.")
+            continue
+        processed += 1
 
-                # Move completed batch to history
-                if all(file["status"] in ("completed", "failed/skipped") for file in progress["files"]):
-                    _archive_batch_history(history_file, progress, logger)
-                    _cleanup_progress_file(progress_file, logger)
+        # Exactly one worker gets the progress of the finished batch
+        progress = queue.finish_batch(input_folder)
+        if progress is not None:
+            _archive_batch_history(history_file, progress, logger)
 
 
-def _save_batch_progress(progress_file: Path, progress: dict[str, Any], logger: logging.Logger) -> None:
-    """Save batch progress to file.
+@contextmanager
+def _heartbeat(queue: LeaseQueue, lease: Lease, lease_seconds: float, logger: logging.Logger) -> Iterator[None]:
+    """Extend a lease from a background thread while the body runs.
 
     Args:
-        progress_file: Path to progress file
-        progress: Progress data
+        queue: Queue of the batch
+        lease: Lease to keep alive
+        lease_seconds: Seconds a lease lasts without a heartbeat
         logger: Logger instance
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(lease_seconds / 3):
+            try:
+                if not queue.heartbeat(lease, lease_seconds):
+                    logger.warning(f"Lost the lease on {Path(lease.path).name}; another worker may take it over.")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"Heartbeat for {Path(lease.path).name} failed: {e}")
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{lease.worker}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _record_event(journal: BatchJournal, item: dict[str, Any], kind: str, logger: logging.Logger, **fields: Any) -> None:
+    """Apply an event to a file entry and append it to the batch journal.
+
+    Args:
+        journal: Journal of the batch
+        item: File entry of the progress
+        kind: Event kind (see batch_journal)
+        logger: Logger instance
+        **fields: Further fields of the event
 
     Raises:
-        Exception: If save fails (critical for batch processing)
+        OSError: If the journal cannot be written (critical for batch processing)
     """
     try:
-        with progress_file.open("w") as f:
-            yaml.safe_dump(progress, f)
-    except (OSError, yaml.YAMLError) as e:
+        journal.record(item, kind, **fields)
+    except OSError as e:
         logger.error(f"Error saving batch progress: {e}")
         # Re-raise as this is critical for batch processing
         raise
@@ -153,10 +595,10 @@ def _archive_batch_history(history_file: Path, progress: dict[str, Any], logger:
 
 
 def _cleanup_progress_file(progress_file: Path, logger: logging.Logger) -> None:
-    """Remove progress file after batch completion.
+    """Remove the batch journal after batch completion.
 
     Args:
-        progress_file: Path to progress file
+        progress_file: Path to the journal
         logger: Logger instance
     """
     try:
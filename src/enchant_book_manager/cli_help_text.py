@@ -4,6 +4,10 @@
 # HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
 # - Created new module to hold CLI help text
 # - Extracted from cli_parser.py to reduce file size
+# - Added the --check-epubs example
+# - Added the --batch-workers example
+# - Added the --distributed example
+# - Added the --pipeline example
 #
 
 """
@@ -53,6 +57,15 @@ BATCH PROCESSING:
   Batch with custom encoding:
     $ enchant-cli novels/ --batch --encoding gb18030
 
+  Process four novels at a time:
+    $ enchant-cli novels/ --batch --batch-workers 4
+
+  Rename, translate and build EPUBs of different novels at the same time:
+    $ enchant-cli novels/ --batch --pipeline --translate-workers 2 --epub-workers 2
+
+  Share one batch between hosts that mount the same directory (run on each):
+    $ enchant-cli /mnt/shared/novels/ --batch --distributed
+
 ADVANCED OPTIONS:
 
   Use remote API (OpenRouter) instead of local:
@@ -108,6 +121,12 @@ EPUB OPTIONS:
   Strict validation mode:
     $ enchant-cli --translated novel.txt --epub-strict
 
+  Build the EPUB while translating (partial EPUB readable early):
+    $ enchant-cli "Novel by Author.txt" --skip-renaming --progressive-epub
+
+  Check the structure of finished EPUBs (files or directories) with a JSON report:
+    $ enchant-cli --check-epubs library/ --check-report qa.json --check-workers 8
+
 PHASE COMBINATIONS:
 
   Rename only:
@@ -133,7 +152,8 @@ PROCESSING PHASES:
 
   3. EPUB: Generate EPUB from translated novel
      Options: --epub-title, --epub-author, --cover, --epub-language, --custom-css,
-              --epub-metadata, --no-toc, --no-validate, --epub-strict, --validate-only
+              --epub-metadata, --no-toc, --no-validate, --epub-strict, --validate-only,
+              --progressive-epub, --check-epubs, --check-report, --check-workers
 
 SKIP FLAGS:
   --skip-renaming     Skip phase 1 (file renaming)
@@ -9,6 +9,15 @@
 # - Added _add_basic_args, _add_phase_args, _add_api_args, _add_rename_args, _add_epub_args
 # - Reduced create_parser from 359 lines to ~40 lines
 # - Moved help text to cli_help_text.py to reduce file size
+# - Added --progressive-epub, defaulting to epub.progressive
+# - Added --check-epubs, --check-report and --check-workers; filepath is not
+#   required with --check-epubs
+# - Added --batch-workers
+# - Added --distributed, --worker-id and --lease-seconds
+# - Added --pipeline, --translate-workers and --epub-workers; --rename-workers
+#   sets the renaming workers of the pipeline
+# - --batch-workers is rejected with --pipeline, whose stage worker options
+#   replace it
 #
 
 """
@@ -87,6 +96,53 @@ def _add_basic_args(parser: argparse.ArgumentParser, config: dict[str, Any]) ->
         help="Batch mode: process all .txt files in the specified directory. Tracks progress automatically",
     )
 
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=1,
+        help="Novels processed at the same time in batch mode, each in its own process (default: 1). With --pipeline use --rename-workers, --translate-workers and --epub-workers instead",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Batch mode: run renaming, translation and EPUB generation as separate stages, so one novel is renamed while another translates and a third gets its EPUB",
+    )
+
+    parser.add_argument(
+        "--translate-workers",
+        type=int,
+        default=1,
+        help="Novels translated at the same time with --pipeline (default: 1)",
+    )
+
+    parser.add_argument(
+        "--epub-workers",
+        type=int,
+        default=1,
+        help="EPUBs built at the same time with --pipeline (default: 1)",
+    )
+
+    parser.add_argument(
+        "--distributed",
+        action="store_true",
+        help="Share the batch with other hosts that run the same command on the same (network) directory, through a lease queue in that directory",
+    )
+
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        default=None,
+        help="Name of this host's worker in a distributed batch (default: host name and process id)",
+    )
+
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=300,
+        help="Seconds a worker keeps a novel of a distributed batch without a heartbeat before other workers may take it over (default: 300)",
+    )
+
     parser.add_argument(
         "--remote",
         action="store_true",
@@ -190,7 +246,8 @@ def _add_rename_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--rename-workers",
         type=int,
-        help="Number of parallel workers for batch renaming (default: CPU count)",
+        default=1,
+        help="Novels renamed at the same time with --pipeline (default: 1)",
     )
 
     parser.add_argument(
@@ -200,11 +257,12 @@ def _add_rename_args(parser: argparse.ArgumentParser) -> None:
     )
 
 
-def _add_epub_args(parser: argparse.ArgumentParser) -> None:
+def _add_epub_args(parser: argparse.ArgumentParser, config: dict[str, Any]) -> None:
     """Add EPUB generation arguments to the parser.
 
     Args:
         parser: ArgumentParser instance to add arguments to
+        config: Configuration dictionary for default values
     """
     parser.add_argument(
         "--epub-title",
@@ -273,6 +331,33 @@ def _add_epub_args(parser: argparse.ArgumentParser) -> None:
         help="Just scan and validate chapters without creating EPUB",
     )
 
+    parser.add_argument(
+        "--progressive-epub",
+        action="store_true",
+        default=config.get("epub", {}).get("progressive", False),
+        help="Build the EPUB chapter by chapter while translating, so a partial EPUB is readable before the book is finished",
+    )
+
+    parser.add_argument(
+        "--check-epubs",
+        type=str,
+        nargs="+",
+        metavar="PATH",
+        help="Check the structure of finished EPUB files (directories are searched recursively) and exit",
+    )
+
+    parser.add_argument(
+        "--check-report",
+        type=str,
+        help="Write the --check-epubs results to this JSON file",
+    )
+
+    parser.add_argument(
+        "--check-workers",
+        type=int,
+        help="Worker processes for --check-epubs (default: CPU count)",
+    )
+
 
 def create_parser(config: dict[str, Any]) -> argparse.ArgumentParser:
     """Create the argument parser with all command-line options.
@@ -294,7 +379,7 @@ def create_parser(config: dict[str, Any]) -> argparse.ArgumentParser:
     _add_phase_args(parser)
     _add_api_args(parser)
     _add_rename_args(parser)
-    _add_epub_args(parser)
+    _add_epub_args(parser, config)
 
     return parser
 
@@ -322,8 +407,28 @@ def validate_args(args: argparse.Namespace, parser: argparse.ArgumentParser) ->
         if not translated_path.is_file():
             parser.error(f"Translated path is not a file: {args.translated}")
 
+    batch_workers = getattr(args, "batch_workers", 1)
+    if isinstance(batch_workers, int) and batch_workers < 1:
+        parser.error("--batch-workers must be at least 1")
+    for option in ("rename_workers", "translate_workers", "epub_workers"):
+        value = getattr(args, option, 1)
+        if isinstance(value, int) and value < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+    if getattr(args, "distributed", False) is True and not getattr(args, "batch", False):
+        parser.error("--distributed requires --batch")
+    if getattr(args, "pipeline", False) is True:
+        if not getattr(args, "batch", False):
+            parser.error("--pipeline requires --batch")
+        if getattr(args, "distributed", False) is True:
+            parser.error("--pipeline cannot be combined with --distributed")
+        if isinstance(batch_workers, int) and batch_workers > 1:
+            parser.error("--batch-workers cannot be combined with --pipeline; use --rename-workers, --translate-workers and --epub-workers")
+    lease_seconds = getattr(args, "lease_seconds", 300)
+    if isinstance(lease_seconds, (int, float)) and lease_seconds <= 0:
+        parser.error("--lease-seconds must be positive")
+
     # Check if filepath is required
-    if not args.filepath:
+    if not args.filepath and not getattr(args, "check_epubs", None):
         # filepath is optional when using --translated
         if not args.translated:
             parser.error("filepath is required unless using --translated option")
@@ -5,6 +5,8 @@
 # - Initial creation from enchant_cli.py refactoring
 # - Extracted configuration and initialization logic
 # - Contains setup functions for configuration, logging, and global services
+# - setup_logging remembers its configuration, and init_worker_logging
+#   repeats it in spawned worker processes
 #
 
 """
@@ -30,6 +32,9 @@ from .icloud_sync import ICloudSync
 # Global services
 icloud_sync: ICloudSync | None = None
 
+# Configuration of the last setup_logging call, for worker processes
+_logging_config: dict[str, Any] | None = None
+
 
 def setup_configuration() -> Tuple[ConfigManager, dict[str, Any]]:
     """Load and validate configuration from config file.
@@ -71,6 +76,9 @@ def setup_logging(config: dict[str, Any]) -> logging.Logger:
     Returns:
         Configured logger instance
     """
+    global _logging_config
+    _logging_config = {"logging": dict(config["logging"])}
+
     log_level = getattr(logging, config["logging"]["level"], logging.INFO)
     log_format = config["logging"]["format"]
 
@@ -91,6 +99,27 @@ def setup_logging(config: dict[str, Any]) -> logging.Logger:
     return logger
 
 
+def get_logging_config() -> dict[str, Any] | None:
+    """Return the configuration setup_logging was last called with, if any."""
+    return _logging_config
+
+
+def init_worker_logging(config: dict[str, Any] | None) -> None:
+    """Pool initializer: set up logging in a worker process.
+
+    A worker started with spawn (the default on macOS and Windows) does not
+    inherit the handlers of the main process, so its log records would be
+    lost. A forked worker, or a worker thread, already has the handlers and
+    is left alone, so no record is written twice.
+
+    Args:
+        config: Configuration returned by get_logging_config in the main process
+    """
+    if config is None or logging.getLogger().handlers:
+        return
+    setup_logging(config)
+
+
 def setup_global_services(config: dict[str, Any]) -> None:
     """Initialize global services like iCloud sync.
 
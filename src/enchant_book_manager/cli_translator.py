@@ -19,6 +19,9 @@
 # - Refactored into smaller modules for better maintainability
 # - Extracted models, text processing, file handling, and orchestration
 # - Main module now focuses on configuration and entry point
+# - import_workers setting is coerced to an int of at least 1
+# - translate_novel passes an optional progressive EPUB builder through
+# - Passes text_processing.chapter_aware_chunks to the importer
 #
 
 from __future__ import annotations
@@ -29,6 +32,7 @@ import sys
 from pathlib import Path
 from typing import (
     Any,
+    Optional,
 )
 
 from .common_print_utils import safe_print
@@ -36,6 +40,7 @@ from .config_manager import ConfigManager
 from .cost_tracker import global_cost_tracker
 from .icloud_sync import ICloudSync
 from .translation_service import ChineseAITranslator
+from .progressive_epub import ProgressiveEpubBuilder
 
 # Import from new modules
 from .book_importer import import_book_from_txt
@@ -87,6 +92,26 @@ def save_translated_book(book_id: str, resume: bool = False, create_epub: bool =
 MAXCHARS = DEFAULT_MAX_CHARS  # Default value, will be updated from config in main()
 
 
+def get_import_workers(text_config: dict[str, Any], logger: logging.Logger | None = None) -> int:
+    """
+    Read the number of import worker processes from the text_processing config.
+
+    Args:
+        text_config: The text_processing configuration section
+        logger: Optional logger for invalid value warnings
+
+    Returns:
+        Number of worker processes, at least 1
+    """
+    value = text_config.get("import_workers", 1)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        if logger:
+            logger.warning(f"Invalid text_processing.import_workers value {value!r}, using 1")
+        return 1
+
+
 def translate_novel(
     file_path: str,
     encoding: str = "utf-8",
@@ -94,6 +119,7 @@ def translate_novel(
     resume: bool = False,
     create_epub: bool = False,
     remote: bool = False,
+    epub_builder: Optional[ProgressiveEpubBuilder] = None,
 ) -> bool:
     """
     Translate a Chinese novel to English.
@@ -106,6 +132,7 @@ def translate_novel(
         create_epub: (Deprecated) Kept for backward compatibility, ignored.
                      EPUB generation is handled by enchant_cli.py orchestrator
         remote: Use remote API instead of local
+        epub_builder: Optional progressive EPUB builder fed with every translated chunk
 
     Returns:
         bool: True if translation completed successfully, False otherwise
@@ -199,7 +226,15 @@ def translate_novel(
 
     try:
         # Call the import_book_from_txt function to process the text file
-        new_book_id = import_book_from_txt(file_path, encoding=encoding, max_chars=max_chars, logger=tolog)
+        new_book_id = import_book_from_txt(
+            file_path,
+            encoding=encoding,
+            max_chars=max_chars,
+            logger=tolog,
+            workers=get_import_workers(config["text_processing"], tolog),
+            balanced=config["text_processing"].get("balanced_chunks", False),
+            chapter_aware=config["text_processing"].get("chapter_aware_chunks", True),
+        )
         tolog.info(f"Book imported successfully. Book ID: {new_book_id}")
         safe_print(f"[bold green]Book imported successfully. Book ID: {new_book_id}[/bold green]")
     except Exception:
@@ -215,6 +250,7 @@ def translate_novel(
             create_epub=create_epub,
             logger=tolog,
             module_config=_module_config,
+            epub_builder=epub_builder,
         )
         tolog.info("Translated book saved successfully.")
         safe_print("[bold green]Translated book saved successfully.[/bold green]")
@@ -22,6 +22,7 @@ This module provides unified file encoding detection and content decoding
 with configurable behavior for different use cases.
 """
 
+import codecs
 import logging
 from pathlib import Path
 from typing import Any
@@ -265,6 +266,81 @@ def decode_file_preview(
     )
 
 
+def _decode_prefix_bytes(raw_data: bytes, encoding: str, final: bool) -> tuple[str, int]:
+    """
+    Decode a byte prefix, leaving any incomplete trailing multibyte sequence undecoded.
+
+    Uses the codec's incremental decoder so that a prefix cut in the middle
+    of a GB18030/Big5/UTF-8 character is not treated as a decoding error.
+
+    Returns: (text, bytes_consumed) tuple
+
+    Raises: UnicodeDecodeError if the bytes are not valid in this encoding
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    text = decoder.decode(raw_data, final=final)
+    pending, _ = decoder.getstate()
+    return text, len(raw_data) - len(pending)
+
+
+def decode_file_prefix(
+    file_path: Path,
+    max_bytes: int,
+    confidence_threshold: float = 0.7,
+    fallback_encodings: list[str] | None = None,
+    logger: logging.Logger | None = None,
+) -> tuple[str, int]:
+    """
+    Read and decode only the first max_bytes of a file.
+
+    Unlike decode_file_content in 'preview' mode, this never touches the rest
+    of the file (encoding detection runs on the same prefix) and cuts the
+    text cleanly at a character boundary for multibyte encodings.
+
+    Parameters:
+    - file_path: Path to the file to decode
+    - max_bytes: Maximum number of bytes to read from the file start
+    - confidence_threshold: Minimum chardet confidence to trust detection
+    - fallback_encodings: List of encodings to try if detection fails
+    - logger: Logger instance (uses module logger if None)
+
+    Returns: (content, bytes_read) tuple, where bytes_read counts only the
+    bytes that were actually decoded into content
+
+    Raises: OSError if the file cannot be read
+    """
+    if logger is None:
+        logger = globals()["logger"]
+
+    if fallback_encodings is None:
+        fallback_encodings = ["gb18030", "gbk", "utf-8", "utf-16", "big5"]
+
+    with file_path.open("rb") as f:
+        raw_data = f.read(max_bytes)
+        # Only a short read means we reached the end of the file
+        at_eof = len(raw_data) < max_bytes or not f.read(1)
+
+    result = chardet.detect(raw_data)
+    encoding = result.get("encoding")
+    confidence = result.get("confidence") or 0.0
+    logger.debug(f"chardet.detect on prefix: {encoding} (confidence: {confidence})")
+
+    candidates = list(fallback_encodings)
+    if encoding and confidence >= confidence_threshold:
+        candidates.insert(0, encoding)
+
+    for enc in candidates:
+        try:
+            content, bytes_read = _decode_prefix_bytes(raw_data, enc, final=at_eof)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        logger.debug(f"Read {bytes_read} bytes from '{file_path}' as {enc}")
+        return content, bytes_read
+
+    logger.warning(f"All encodings failed, using {fallback_encodings[0]} with error replacement")
+    return raw_data.decode(fallback_encodings[0], errors="replace"), len(raw_data)
+
+
 def safe_write_file(
     file_path: str | Path,
     content: str | dict[str, Any] | Any,
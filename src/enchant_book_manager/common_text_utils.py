@@ -49,6 +49,7 @@ from .text_processing import (
     replace_repeated_chars,
     limit_repeated_chars,
     remove_excess_empty_lines,
+    iter_without_excess_empty_lines,
     normalize_spaces,
     clean_adverts,
 )
@@ -80,6 +81,7 @@ __all__ = [
     "replace_repeated_chars",
     "limit_repeated_chars",
     "remove_excess_empty_lines",
+    "iter_without_excess_empty_lines",
     "normalize_spaces",
     "clean_adverts",
     # HTML processing functions
@@ -206,6 +206,19 @@ text_processing:
   # Maximum characters per translation chunk (default: 11999)
   max_chars_per_chunk: 11999
 
+  # Worker processes for cleaning and splitting very large novels on import.
+  # Only used for texts over one million characters (default: 1)
+  import_workers: 1
+
+  # Spread paragraphs so all chunks of a book are near-equal in size instead
+  # of filling each chunk greedily and leaving a small last chunk (default: false)
+  balanced_chunks: false
+
+  # Snap chunk boundaries to Chinese chapter headings (第N章/回/节/卷) so a
+  # chapter is not split across chunks, and let the progressive EPUB cut
+  # chapters from the chunk map instead of scanning the text (default: true)
+  chapter_aware_chunks: true
+
   # File encoding (auto-detected if not specified)
   # Common values: utf-8, gb2312, gb18030, big5
   # (default: utf-8)
@@ -253,6 +266,29 @@ epub:
   # Strict mode - abort on validation issues (default: false)
   strict_mode: false
 
+  # Worker threads that render and compress chapters in parallel while
+  # building an EPUB. Useful for books with thousands of chapters (default: 1)
+  threads: 1
+
+  # zlib compression level for EPUB entries, from 0 (fastest) to 9
+  # (smallest file) (default: 6)
+  compression_level: 6
+
+  # Chapters larger than this many KB are split at paragraph boundaries into
+  # several XHTML files, which e-readers load and paginate faster. The table
+  # of contents points at the first part. 0 disables splitting (default: 256)
+  max_chapter_kb: 256
+
+  # Build the EPUB chapter by chapter while the translation is running,
+  # so a readable partial EPUB is available before the book is finished.
+  # Can also be enabled with --progressive-epub (default: false)
+  progressive: false
+
+  # Skip rebuilding an EPUB when the translated text, cover, CSS, metadata,
+  # options and generator version are unchanged since the last build. The
+  # hashes are kept in a <book>.epub.build.json file (default: true)
+  build_cache: true
+
 # Batch Processing Settings
 # ------------------------
 batch:
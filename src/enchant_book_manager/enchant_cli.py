@@ -24,6 +24,8 @@
 # - Maintained iCloud sync, pricing manager integration
 # - Refactored into smaller modules: cli_parser, workflow_orchestrator,
 #   cli_batch_handler, cli_setup
+# - --check-epubs checks finished EPUBs and exits
+# - A single-file run holds the book lock of the novel, like a batch worker
 #
 
 from __future__ import annotations
@@ -32,6 +34,8 @@ import logging
 import sys
 from pathlib import Path
 
+import filelock
+
 from .common_print_utils import safe_print
 from .cli_parser import create_parser, validate_args
 from .cli_setup import (
@@ -43,6 +47,8 @@ from .cli_setup import (
 )
 from .workflow_orchestrator import process_novel_unified
 from .cli_batch_handler import process_batch
+from .workflow_epub import check_epub_files
+from .workflow_progress import get_book_lock_path
 
 APP_NAME = "EnChANT - English-Chinese Automatic Novel Translator"
 APP_VERSION = "1.0.0"  # Semantic version (major.minor.patch)
@@ -83,6 +89,14 @@ def main() -> None:
     # Validate arguments
     validate_args(args, parser)
 
+    # Structural check of finished EPUBs, no processing
+    if args.check_epubs:
+        if check_epub_files(args, tolog):
+            safe_print("[bold green]All EPUB files passed the structure check[/bold green]")
+            return
+        safe_print("[bold red]Some EPUB files failed the structure check. Check logs for details.[/bold red]")
+        sys.exit(1)
+
     # Log if --translated was provided
     if args.translated:
         tolog.info("--translated option provided, automatically skipping renaming and translation phases")
@@ -116,7 +130,9 @@ def main() -> None:
     tolog.info(f"Starting unified processing for file: {file_path}")
 
     try:
-        success = process_novel_unified(file_path, args, tolog)
+        # A batch worker or another single-file run may be processing this novel
+        with filelock.FileLock(str(get_book_lock_path(file_path)), timeout=0):
+            success = process_novel_unified(file_path, args, tolog)
 
         if success:
             safe_print("[bold green]Novel processing completed successfully![/bold green]")
@@ -124,6 +140,10 @@ def main() -> None:
             safe_print("[bold yellow]Novel processing completed with some issues. Check logs for details.[/bold yellow]")
             sys.exit(1)
 
+    except filelock.Timeout:
+        tolog.error(f"{file_path} is being processed by another run")
+        safe_print(f"[bold red]{file_path} is being processed by another run[/bold red]")
+        sys.exit(1)
     except Exception as e:
         tolog.exception("Fatal error during novel processing")
         safe_print(f"[bold red]Fatal error: {e}[/bold red]")
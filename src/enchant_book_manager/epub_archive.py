@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: streaming EPUB archive writer
+# - Added compress_entry and write_compressed for entries deflated in
+#   worker threads
+# - Added copy_entry to copy entries of another archive without
+#   recompressing them
+# - Added write_stream to compress a text entry while it is being generated
+#
+
+"""
+epub_archive.py - Streaming writer for the EPUB ZIP container
+=============================================================
+
+Writes each generated part of an EPUB straight into the ZIP archive as it is
+built, instead of staging the whole book in a temporary directory and zipping
+it afterwards. The writer enforces the OCF rules for the container: the
+``mimetype`` entry comes first and is stored uncompressed, and every other
+entry is deflated.
+
+Entries can also be deflated ahead of time with compress_entry, which only
+calls zlib and can therefore run in worker threads, and then be added with
+write_compressed. The result is byte-identical to writing the same data with
+write_bytes at the same compression level.
+
+copy_entry copies an entry of an existing archive as is, without
+decompressing and recompressing it, so appending to an EPUB costs time
+proportional to the new content only.
+
+write_stream compresses a text entry while it is generated piece by piece,
+such as the table of contents of a very long book, so the entry never has to
+be held in memory as one string.
+"""
+
+from __future__ import annotations
+
+import stat
+import struct
+import time
+import zipfile
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+
+from .epub_constants import ENCODING, MIMETYPE
+
+# Permission bits recorded for generated entries, the same as ZipFile.write
+# records for a regular file created with the default umask
+_ENTRY_ATTR = (stat.S_IFREG | 0o644) << 16
+
+# ZIP local file header (PKWARE APPNOTE 4.3.7); the last two fields are the
+# file name and extra field lengths
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+# General purpose flag bit set on encrypted entries
+_FLAG_ENCRYPTED = 0x1
+
+# Characters of a streamed entry collected before they are compressed
+_STREAM_BUFFER_CHARS = 1 << 16
+
+
+@dataclass(frozen=True)
+class CompressedEntry:
+    """An entry deflated ahead of time by compress_entry."""
+
+    file_size: int  # Size of the uncompressed data
+    crc: int  # CRC-32 of the uncompressed data
+    data: bytes  # Raw deflate stream, as stored in the archive
+
+
+def read_raw_entry(source: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    """
+    Read the data of an entry as stored in the archive, without decompressing it.
+
+    Args:
+        source: Archive opened for reading
+        info: Entry of source to read
+
+    Returns:
+        The stored data, compress_size bytes long
+
+    Raises:
+        ValueError: If the entry is encrypted or its local header is corrupt
+    """
+    if info.flag_bits & _FLAG_ENCRYPTED:
+        raise ValueError(f"Cannot copy encrypted entry {info.filename}")
+    fp = source.fp
+    if fp is None:
+        raise ValueError("Attempt to read from a closed archive")
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise ValueError(f"Bad local header for entry {info.filename}")
+    fp.seek(header[-2] + header[-1], 1)
+    data = fp.read(info.compress_size)
+    if len(data) != info.compress_size:
+        raise ValueError(f"Truncated data for entry {info.filename}")
+    return data
+
+
+def compress_entry(data: bytes, compresslevel: int | None = None) -> CompressedEntry:
+    """
+    Deflate entry data the way ZipFile does, for use with write_compressed.
+
+    zlib releases the GIL while compressing, so this can run in worker threads.
+
+    Args:
+        data: Uncompressed entry data
+        compresslevel: zlib level (None = zlib default)
+
+    Returns:
+        The compressed entry
+    """
+    level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return CompressedEntry(len(data), zlib.crc32(data), compressor.compress(data) + compressor.flush())
+
+
+class EpubArchiveWriter:
+    """Write an EPUB container entry by entry, without a staging directory."""
+
+    def __init__(self, path: Path, compresslevel: int | None = None) -> None:
+        """
+        Open the archive and write the mimetype entry.
+
+        Args:
+            path: Output path of the EPUB file
+            compresslevel: zlib level for deflated entries (None = zlib default)
+        """
+        self.path = path
+        self.compresslevel = compresslevel
+        self.zip = zipfile.ZipFile(path, "w")
+        # mimetype must be the first entry and must not be compressed
+        self.zip.writestr(self._entry_info("mimetype", zipfile.ZIP_STORED), MIMETYPE)
+
+    def __enter__(self) -> EpubArchiveWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Write the central directory and close the archive."""
+        self.zip.close()
+
+    def _entry_info(self, arcname: str, compress_type: int = zipfile.ZIP_DEFLATED) -> zipfile.ZipInfo:
+        """Build the ZipInfo for a generated entry."""
+        info = zipfile.ZipInfo(arcname, date_time=time.localtime(time.time())[:6])
+        info.compress_type = compress_type
+        info.external_attr = _ENTRY_ATTR
+        return info
+
+    def write_text(self, arcname: str, text: str) -> None:
+        """Add a text entry encoded as UTF-8."""
+        self.write_bytes(arcname, text.encode(ENCODING))
+
+    def write_bytes(self, arcname: str, data: bytes) -> None:
+        """Add a binary entry."""
+        self.zip.writestr(self._entry_info(arcname), data, compresslevel=self.compresslevel)
+
+    def write_stream(self, arcname: str, pieces: Iterable[str]) -> None:
+        """
+        Add a text entry produced piece by piece, compressing it as it arrives.
+
+        The result is the same as write_text on the joined pieces.
+
+        Args:
+            arcname: Name of the entry in the archive
+            pieces: Text of the entry, in order
+        """
+        info = self._entry_info(arcname)
+        # ZipFile.open takes the level from the entry (compress_level since
+        # Python 3.13, which keeps _compresslevel as an alias)
+        setattr(info, "_compresslevel", self.compresslevel)
+        buffer: list[str] = []
+        buffered = 0
+        with self.zip.open(info, "w") as dest:
+            for piece in pieces:
+                buffer.append(piece)
+                buffered += len(piece)
+                if buffered >= _STREAM_BUFFER_CHARS:
+                    dest.write("".join(buffer).encode(ENCODING))
+                    buffer.clear()
+                    buffered = 0
+            if buffer:
+                dest.write("".join(buffer).encode(ENCODING))
+
+    def write_file(self, arcname: str, source: Path) -> None:
+        """Add an entry streamed from an existing file, such as a cover image."""
+        self.zip.write(source, arcname, zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel)
+
+    def write_compressed(self, arcname: str, entry: CompressedEntry) -> None:
+        """Add an entry deflated ahead of time by compress_entry."""
+        self._write_raw(self._entry_info(arcname), entry.file_size, entry.crc, entry.data)
+
+    def copy_entry(self, source: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+        """
+        Copy an entry of another archive without recompressing it.
+
+        The name, timestamp, compression method and permissions are kept.
+
+        Args:
+            source: Archive opened for reading
+            info: Entry of source to copy
+        """
+        copy = zipfile.ZipInfo(info.filename, info.date_time)
+        copy.compress_type = info.compress_type
+        copy.create_system = info.create_system
+        copy.external_attr = info.external_attr
+        self._write_raw(copy, info.file_size, info.CRC, read_raw_entry(source, info))
+
+    def _write_raw(self, info: zipfile.ZipInfo, file_size: int, crc: int, data: bytes) -> None:
+        """
+        Add an entry whose data is already in its stored form.
+
+        ZipFile has no public API for adding raw data, so the local header and
+        the data are written directly and the entry is registered for the
+        central directory written by close().
+        """
+        info.file_size = file_size
+        info.compress_size = len(data)
+        info.CRC = crc
+
+        fp = self.zip.fp
+        if fp is None:
+            raise ValueError("Attempt to write to a closed EPUB archive")
+        fp.seek(self.zip.start_dir)
+        info.header_offset = fp.tell()
+        fp.write(info.FileHeader())
+        fp.write(data)
+        self.zip.filelist.append(info)
+        self.zip.NameToInfo[info.filename] = info
+        self.zip.start_dir = fp.tell()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: build manifest used to skip unchanged EPUB rebuilds
+#
+
+"""
+epub_build_manifest.py - Skip EPUB rebuilds whose inputs did not change
+=======================================================================
+
+Every successful build stores a JSON manifest next to the EPUB, e.g.
+``Book.epub.build.json``, with SHA-256 hashes of everything the EPUB is made
+from:
+
+* the translated text file,
+* the cover image bytes,
+* the custom CSS,
+* the metadata dict,
+* the other build options (title, author, language, TOC and validation
+  settings, compression level, chapter size limit), and
+* the generator fingerprint, a hash of the package version, of the EPUB
+  generation module sources and of the chapter parser fingerprint.
+
+When a later build has the same hashes and the EPUB is still the file the
+manifest was written for, create_epub_with_config returns the stored result
+instead of building the book again. The worker thread count is not part of
+the inputs because it does not change the output.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from . import __version__, epub_archive, epub_builders, epub_constants, epub_generator, epub_toc_enhanced, make_epub
+from .chapter_index import parser_fingerprint
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT_VERSION = 1
+
+# Suffix appended to the EPUB file name to form the manifest name
+MANIFEST_SUFFIX = ".build.json"
+
+# Read size used when hashing input files
+_HASH_BLOCK_SIZE = 1 << 20
+
+# Modules whose code decides what goes into the EPUB
+_GENERATOR_MODULES: tuple[ModuleType, ...] = (
+    make_epub,
+    epub_generator,
+    epub_builders,
+    epub_archive,
+    epub_toc_enhanced,
+    epub_constants,
+)
+
+# Build options that change the output, with their create_epub_with_config defaults
+_OPTION_DEFAULTS: dict[str, Any] = {
+    "title": None,
+    "author": None,
+    "language": "en",
+    "generate_toc": True,
+    "validate": True,
+    "strict_mode": False,
+    "compression_level": None,
+    "max_chapter_kb": 256,
+}
+
+
+@dataclass
+class BuildManifest:
+    """Result of a previous build whose inputs are unchanged."""
+
+    build_seconds: float
+    issues: list[str]
+
+
+@lru_cache(maxsize=1)
+def generator_fingerprint() -> str:
+    """
+    Hash of everything in the code that influences the EPUB content.
+
+    Returns:
+        Hex digest combining the package version, the EPUB module sources
+        and the chapter parser fingerprint
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{MANIFEST_FORMAT_VERSION}\0{__version__}\0{parser_fingerprint()}\0".encode())
+    for module in _GENERATOR_MODULES:
+        if module.__file__:
+            digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def manifest_path_for(output_path: Path) -> Path:
+    """Return the manifest path used for the EPUB at output_path."""
+    return output_path.with_name(output_path.name + MANIFEST_SUFFIX)
+
+
+def _hash_file(path: Path) -> str:
+    """Return the SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_json(value: Any) -> str:
+    """Return the SHA-256 of a JSON-serializable value, independent of dict order."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def compute_build_inputs(txt_file_path: Path, config: dict[str, Any]) -> dict[str, str | None]:
+    """
+    Hash every input of an EPUB build.
+
+    Args:
+        txt_file_path: Path to the translated text file
+        config: Configuration dictionary passed to create_epub_with_config
+
+    Returns:
+        Dict of input name to hex digest (None for an absent cover or CSS)
+
+    Raises:
+        OSError: If the text file or the cover cannot be read
+    """
+    cover_path = config.get("cover_path")
+    custom_css = config.get("custom_css")
+    return {
+        "generator": generator_fingerprint(),
+        "text": _hash_file(Path(txt_file_path)),
+        "cover": _hash_file(Path(cover_path)) if cover_path else None,
+        "custom_css": hashlib.sha256(custom_css.encode("utf-8")).hexdigest() if custom_css else None,
+        "metadata": _hash_json(config.get("metadata")),
+        "options": _hash_json({key: config.get(key, default) for key, default in _OPTION_DEFAULTS.items()}),
+    }
+
+
+def _output_signature(output_path: Path) -> list[int]:
+    """Size and modification time of the EPUB, to notice it being replaced."""
+    stat = output_path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def check_build_manifest(output_path: Path, inputs: dict[str, str | None]) -> BuildManifest | None:
+    """
+    Return the previous build result if the EPUB is up to date.
+
+    Args:
+        output_path: Path of the EPUB
+        inputs: Hashes returned by compute_build_inputs for the new build
+
+    Returns:
+        The stored result, or None if the EPUB must be built
+    """
+    try:
+        data: dict[str, Any] = json.loads(manifest_path_for(output_path).read_text(encoding="utf-8"))
+        if data.get("format_version") != MANIFEST_FORMAT_VERSION or data.get("inputs") != inputs:
+            return None
+        if data.get("output") != _output_signature(output_path):
+            return None
+        return BuildManifest(build_seconds=float(data["build_seconds"]), issues=[str(issue) for issue in data["issues"]])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def save_build_manifest(output_path: Path, inputs: dict[str, str | None], build_seconds: float, issues: list[str]) -> bool:
+    """
+    Store the inputs and the result of a successful build next to the EPUB.
+
+    Args:
+        output_path: Path of the EPUB that was built
+        inputs: Hashes returned by compute_build_inputs before the build
+        build_seconds: Time the build took
+        issues: Validation issues returned by the build
+
+    Returns:
+        True if the manifest was written
+    """
+    manifest_path = manifest_path_for(output_path)
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    try:
+        data = {
+            "format_version": MANIFEST_FORMAT_VERSION,
+            "inputs": inputs,
+            "output": _output_signature(output_path),
+            "build_seconds": build_seconds,
+            "issues": issues,
+        }
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def remove_build_manifest(output_path: Path) -> None:
+    """Delete the manifest of an EPUB, so the next build is never skipped."""
+    try:
+        manifest_path_for(output_path).unlink(missing_ok=True)
+    except OSError:
+        pass
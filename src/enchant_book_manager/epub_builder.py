@@ -19,25 +19,38 @@
 # - Extracted shared constants and utilities to epub_constants.py to avoid duplication with make_epub.py
 # - Removed duplicated conversion tables and functions (roman_to_int, words_to_int, parse_num)
 # - Now imports shared utilities from epub_constants module
+# - create_epub_from_chapters streams entries with EpubArchiveWriter instead of
+#   staging the book in a temporary directory
+# - build_epub_from_directory streams the chapter files through iter_chapters
+#   into the EPUB instead of concatenating them into one string
+# - create_epub_from_chapters splits chapters over max_chapter_bytes into
+#   sequential XHTML files; the TOC points at the first part
+# - detect_chapter_issues runs in linear time with the chapter_issues helpers
+# - paragraphize delegates to the shared epub_builders.paragraphize
+# - create_epub_from_chapters writes the book with epub_generator.write_epub
+#   (flat TOC) instead of its own f-string templates, so it gets the same
+#   layout, the cover media type from the image suffix, and the threads and
+#   compression_level options
+# - build_epub_from_directory takes threads and compression_level
 #
 
 """
 epub_builder.py - Module for building EPUB files from translated novel chapters
 """
 
+import os
 import re
-import html
-import tempfile
-import zipfile
-import uuid
-from datetime import datetime, timezone
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 import logging
 
+from .chapter_issues import MissingNumberTracker, predecessors_and_run_lengths
+from .epub_builders import DEFAULT_MAX_CHAPTER_BYTES, paragraphize as shared_paragraphize
+from .epub_generator import flat_toc, write_epub
+
 # Import shared constants and utilities
 from .epub_constants import (
     ENCODING,
-    MIMETYPE,
     WORD_NUMS,
     FILENAME_RE,
     roman_to_int,
@@ -62,24 +75,16 @@ def detect_chapter_issues(seq: list[int]) -> list[tuple[int, str]]:
     start, end = seq[0], seq[-1]
     prev_expected = start
     seen = set()
-    reported_missing = set()
+    missing = MissingNumberTracker()
+    predecessors, run_lengths = predecessors_and_run_lengths(seq)
 
     for idx, v in enumerate(seq):
         # Check for repeats
         if v in seen:
-            # Find nearest non-identical predecessor
-            pred = None
-            for x in reversed(seq[:idx]):
-                if x != v:
-                    pred = x
-                    break
+            # Nearest non-identical predecessor
+            pred = predecessors[idx]
             if pred is not None:
-                # Count run length
-                run_len = 1
-                j = idx
-                while j + 1 < len(seq) and seq[j + 1] == v:
-                    run_len += 1
-                    j += 1
+                run_len = run_lengths[idx]
                 t = "times" if run_len > 1 else "time"
                 issues.append((idx, f"Chapter {v} is repeated {run_len} {t} after Chapter {pred}"))
         else:
@@ -87,10 +92,8 @@ def detect_chapter_issues(seq: list[int]) -> list[tuple[int, str]]:
 
         # Check for missing chapters
         if v > prev_expected:
-            for m in range(prev_expected + 1, v):
-                if m not in reported_missing:
-                    issues.append((idx, f"Chapter {m} is missing"))
-                    reported_missing.add(m)
+            for m in missing.take(prev_expected + 1, v):
+                issues.append((idx, f"Chapter {m} is missing"))
             prev_expected = v + 1
 
         # Exact hit
@@ -108,40 +111,40 @@ def detect_chapter_issues(seq: list[int]) -> list[tuple[int, str]]:
             prev_expected = v + 1
 
     # Check for missing chapters at the end
-    for m in range(prev_expected, end + 1):
-        if m not in reported_missing:
-            issues.append((len(seq), f"Chapter {m} is missing"))
+    for m in missing.take(prev_expected, end + 1):
+        issues.append((len(seq), f"Chapter {m} is missing"))
 
     issues.sort(key=lambda x: x[0])
     return issues
 
 
-def split_text(text: str, detect_headings: bool = True) -> tuple[list[tuple[str, str, str]], list[int]]:
-    """
-    Split text into chapters based on headings.
-    Returns: ([(toc_title, original_heading, chapter_text), ...], [chapter_numbers])
+def iter_chapters(lines: Iterable[str], chapter_nums: list[int]) -> Iterator[tuple[str, str, str]]:
     """
-    if not detect_headings:
-        return [("Full Text", "", text)], []
+    Split lines into chapters based on headings, yielding each chapter as soon as it ends.
+
+    Only the lines of the current chapter are kept in memory.
+
+    Args:
+        lines: Lines of the text, without line terminators
+        chapter_nums: List the number of every chapter heading is appended to
 
-    chapters = []
-    chapter_nums = []
+    Yields:
+        (toc_title, original_heading, chapter_text) tuples, as in split_text
+    """
     current_toc_title = None
     current_original_heading = ""
     current_text: list[str] = []
 
-    for line in text.split("\n"):
+    for line in lines:
         # Check if line is a chapter heading
         match = HEADING_RE.match(line.strip())
         if match:
             # Save previous chapter if exists
             if current_toc_title is not None:
-                chapters.append(
-                    (
-                        current_toc_title,
-                        current_original_heading,
-                        "\n".join(current_text),
-                    )
+                yield (
+                    current_toc_title,
+                    current_original_heading,
+                    "\n".join(current_text),
                 )
 
             # Extract chapter number
@@ -174,31 +177,28 @@ def split_text(text: str, detect_headings: bool = True) -> tuple[list[tuple[str,
 
     # Save last chapter
     if current_toc_title is not None:
-        chapters.append((current_toc_title, current_original_heading, "\n".join(current_text)))
+        yield (current_toc_title, current_original_heading, "\n".join(current_text))
     elif current_text:
         # No chapters detected, return full text
-        chapters.append(("Full Text", "", "\n".join(current_text)))
-
-    return chapters, chapter_nums
+        yield ("Full Text", "", "\n".join(current_text))
 
 
-def paragraphize(text: str) -> str:
-    """Convert plain text to HTML paragraphs."""
-    paragraphs = []
-    current = []
+def split_text(text: str, detect_headings: bool = True) -> tuple[list[tuple[str, str, str]], list[int]]:
+    """
+    Split text into chapters based on headings.
+    Returns: ([(toc_title, original_heading, chapter_text), ...], [chapter_numbers])
+    """
+    if not detect_headings:
+        return [("Full Text", "", text)], []
 
-    for line in text.split("\n"):
-        line = line.strip()
-        if line:
-            current.append(html.escape(line))
-        elif current:
-            paragraphs.append("<p>" + " ".join(current) + "</p>")
-            current = []
+    chapter_nums: list[int] = []
+    chapters = list(iter_chapters(text.split("\n"), chapter_nums))
+    return chapters, chapter_nums
 
-    if current:
-        paragraphs.append("<p>" + " ".join(current) + "</p>")
 
-    return "\n".join(paragraphs)
+def paragraphize(text: str) -> str:
+    """Convert plain text to HTML paragraphs, joining the lines of each with spaces."""
+    return shared_paragraphize(text, join_lines=True)
 
 
 def collect_chapter_files(input_dir: Path) -> dict[int, Path]:
@@ -215,147 +215,65 @@ def collect_chapter_files(input_dir: Path) -> dict[int, Path]:
 
 
 def create_epub_from_chapters(
-    chapters: list[tuple[str, str, str]],
+    chapters: Iterable[tuple[str, str, str]],
     output_path: Path,
     title: str,
     author: str,
     cover_path: Path | None = None,
     language: str = "en",
+    max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
+    threads: int = 1,
+    compression_level: int | None = None,
 ) -> None:
-    """Create EPUB file from chapter list with (toc_title, original_heading, html_content)."""
-    book_id = str(uuid.uuid4())
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmppath = Path(tmpdir)
-
-        # Create directory structure
-        (tmppath / "META-INF").mkdir()
-        (tmppath / "OEBPS").mkdir()
-
-        # Write mimetype
-        (tmppath / "mimetype").write_text(MIMETYPE, encoding="ascii")
-
-        # Write container.xml
-        container_xml = """<?xml version="1.0" encoding="UTF-8"?>
-<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
-    <rootfiles>
-        <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
-    </rootfiles>
-</container>"""
-        (tmppath / "META-INF" / "container.xml").write_text(container_xml, encoding=ENCODING)
-
-        # Generate spine and manifest items
-        manifest_items = []
-        spine_items = []
-
-        # Add cover if provided
-        if cover_path and cover_path.exists():
-            ext = cover_path.suffix.lower()
-            mime = "image/jpeg" if ext in [".jpg", ".jpeg"] else "image/png"
-            (tmppath / "OEBPS" / "cover.jpg").write_bytes(cover_path.read_bytes())
-            manifest_items.append(f'<item id="cover-image" href="cover.jpg" media-type="{mime}"/>')
-
-            # Create cover HTML
-            cover_html = """<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <title>Cover</title>
-    <style type="text/css">
-        img { max-width: 100%; }
-    </style>
-</head>
-<body>
-    <div><img src="cover.jpg" alt="Cover"/></div>
-</body>
-</html>"""
-            (tmppath / "OEBPS" / "cover.xhtml").write_text(cover_html, encoding=ENCODING)
-            manifest_items.append('<item id="cover" href="cover.xhtml" media-type="application/xhtml+xml"/>')
-            spine_items.append('<itemref idref="cover"/>')
-
-        # Write chapters
-        toc_items = []
-        for i, (toc_title, original_heading, chap_html) in enumerate(chapters):
-            chap_id = f"chapter{i + 1}"
-            chap_file = f"{chap_id}.xhtml"
-
-            # Use original heading if available, otherwise use TOC title
-            display_heading = original_heading if original_heading else toc_title
-
-            chap_content = f"""<!DOCTYPE html>
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <title>{html.escape(toc_title)}</title>
-</head>
-<body>
-    <h1>{html.escape(display_heading)}</h1>
-    {chap_html}
-</body>
-</html>"""
-            (tmppath / "OEBPS" / chap_file).write_text(chap_content, encoding=ENCODING)
-
-            manifest_items.append(f'<item id="{chap_id}" href="{chap_file}" media-type="application/xhtml+xml"/>')
-            spine_items.append(f'<itemref idref="{chap_id}"/>')
-            toc_items.append((chap_id, toc_title))
-
-        # Write NCX (table of contents)
-        ncx_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">
-    <head>
-        <meta name="dtb:uid" content="{book_id}"/>
-        <meta name="dtb:depth" content="1"/>
-        <meta name="dtb:totalPageCount" content="0"/>
-        <meta name="dtb:maxPageNumber" content="0"/>
-    </head>
-    <docTitle>
-        <text>{html.escape(title)}</text>
-    </docTitle>
-    <navMap>"""
-
-        for i, (chap_id, chap_title) in enumerate(toc_items):
-            ncx_content += f"""
-        <navPoint id="navPoint-{i + 1}" playOrder="{i + 1}">
-            <navLabel>
-                <text>{html.escape(chap_title)}</text>
-            </navLabel>
-            <content src="{chap_id}.xhtml"/>
-        </navPoint>"""
-
-        ncx_content += """
-    </navMap>
-</ncx>"""
-        (tmppath / "OEBPS" / "toc.ncx").write_text(ncx_content, encoding=ENCODING)
-        manifest_items.append('<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>')
-
-        # Write content.opf
-        opf_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<package xmlns="http://www.idpf.org/2007/opf" unique-identifier="BookId" version="2.0">
-    <metadata xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:opf="http://www.idpf.org/2007/opf">
-        <dc:identifier id="BookId">{book_id}</dc:identifier>
-        <dc:title>{html.escape(title)}</dc:title>
-        <dc:creator>{html.escape(author)}</dc:creator>
-        <dc:language>{language}</dc:language>
-        <dc:date>{datetime.now(timezone.utc).strftime("%Y-%m-%d")}</dc:date>
-        <meta name="generator" content="EnChANT"/>
-    </metadata>
-    <manifest>
-        {" ".join(manifest_items)}
-    </manifest>
-    <spine toc="ncx">
-        {" ".join(spine_items)}
-    </spine>
-</package>"""
-        (tmppath / "OEBPS" / "content.opf").write_text(opf_content, encoding=ENCODING)
-
-        # Create EPUB zip
-        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            # mimetype must be first and uncompressed
-            zf.write(tmppath / "mimetype", "mimetype", compress_type=zipfile.ZIP_STORED)
-
-            # Add all other files
-            for file_path in tmppath.rglob("*"):
-                if file_path.is_file() and file_path.name != "mimetype":
-                    arc_name = str(file_path.relative_to(tmppath))
-                    zf.write(file_path, arc_name)
+    """
+    Create EPUB file from chapters with (toc_title, original_heading, html_content).
+
+    The book is written by epub_generator.write_epub with the flat TOC.
+    chapters can be a generator: each chapter is written as soon as it is
+    produced. The original heading (the TOC title if empty) is the <h1> of
+    the chapter. A chapter whose HTML is larger than max_chapter_bytes
+    (0 = never split) is written as chapterN.xhtml, chapterN_part2.xhtml, ...
+    and the TOC points at the first file.
+    """
+    write_epub(
+        chapters,
+        output_path,
+        title,
+        author,
+        cover_path if cover_path and cover_path.exists() else None,
+        language,
+        threads=threads,
+        compression_level=compression_level,
+        max_chapter_bytes=max_chapter_bytes,
+        toc=flat_toc,
+    )
+
+
+def _iter_chapter_file_lines(
+    chapters_dict: dict[int, Path],
+    strict: bool,
+    read_errors: list[str],
+    logger: logging.Logger,
+) -> Iterator[str]:
+    """
+    Yield the lines of the chapter files in chapter order, one file at a time.
+
+    The lines are those of the files joined with a newline after each one.
+    A file that cannot be read is skipped, or ends the lines in strict mode;
+    its error is appended to read_errors.
+    """
+    for num in sorted(chapters_dict.keys()):
+        try:
+            chapter_text = chapters_dict[num].read_text(encoding=ENCODING)
+        except Exception as e:
+            logger.error(f"Error reading chapter {num}: {e}")
+            if strict:
+                read_errors.append(f"Error reading chapter {num}: {e}")
+                return
+            continue
+        yield from chapter_text.split("\n")
+    # The newline after the last file ends an empty line
+    yield ""
 
 
 def build_epub_from_directory(
@@ -367,9 +285,13 @@ def build_epub_from_directory(
     detect_toc: bool = True,
     strict: bool = True,
     logger: logging.Logger | None = None,
+    threads: int = 1,
+    compression_level: int | None = None,
 ) -> tuple[bool, list[str]]:
     """
     Build EPUB from directory of chapter files.
+
+    threads and compression_level are passed to create_epub_from_chapters.
     Returns: (success, list_of_issues)
     """
     if logger is None:
@@ -380,34 +302,6 @@ def build_epub_from_directory(
     if not chapters_dict:
         return False, ["No chapter files found in directory"]
 
-    # Read and combine chapters
-    full_text = ""
-    for num in sorted(chapters_dict.keys()):
-        try:
-            chapter_text = chapters_dict[num].read_text(encoding=ENCODING)
-            full_text += chapter_text + "\n"
-        except Exception as e:
-            logger.error(f"Error reading chapter {num}: {e}")
-            if strict:
-                return False, [f"Error reading chapter {num}: {e}"]
-
-    # Split text and detect chapters
-    chapter_blocks, chapter_nums = split_text(full_text, detect_toc)
-    chapters = [(toc_title, original_heading, paragraphize(text)) for toc_title, original_heading, text in chapter_blocks]
-
-    # Detect issues
-    issues = []
-    if chapter_nums:
-        issue_list = detect_chapter_issues(chapter_nums)
-        issues = [msg for _, msg in issue_list]
-
-        if issues:
-            for issue in issues:
-                logger.warning(f"Chapter issue: {issue}")
-
-            if strict:
-                return False, issues
-
     # Extract default title/author from first file if not provided
     if not title or not author:
         first_file = chapters_dict[min(chapters_dict.keys())]
@@ -419,10 +313,45 @@ def build_epub_from_directory(
             title = title or "Unknown Title"
             author = author or "Unknown Author"
 
-    # Create EPUB
+    # Stream the chapter files through the segmenter into the EPUB, so only
+    # one file and the current chapter are in memory at a time
+    read_errors: list[str] = []
+    chapter_nums: list[int] = []
+    lines = _iter_chapter_file_lines(chapters_dict, strict, read_errors, logger)
+    chapter_blocks: Iterator[tuple[str, str, str]]
+    if detect_toc:
+        chapter_blocks = iter_chapters(lines, chapter_nums)
+    else:
+        chapter_blocks = iter([("Full Text", "", "\n".join(lines))])
+    chapters = ((toc_title, original_heading, paragraphize(text)) for toc_title, original_heading, text in chapter_blocks)
+
+    # Write to a temporary file and keep it only if the build succeeds
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
     try:
-        create_epub_from_chapters(chapters, output_path, title, author, cover_path)
-        return True, issues
+        create_epub_from_chapters(chapters, tmp_path, title, author, cover_path, threads=threads, compression_level=compression_level)
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         logger.error(f"Error creating EPUB: {e}")
+        issues = [msg for _, msg in detect_chapter_issues(chapter_nums)]
         return False, issues + [f"Error creating EPUB: {e}"]
+
+    if read_errors and strict:
+        tmp_path.unlink(missing_ok=True)
+        return False, read_errors
+
+    # Detect issues
+    issues = []
+    if chapter_nums:
+        issue_list = detect_chapter_issues(chapter_nums)
+        issues = [msg for _, msg in issue_list]
+
+        if issues:
+            for issue in issues:
+                logger.warning(f"Chapter issue: {issue}")
+
+            if strict:
+                tmp_path.unlink(missing_ok=True)
+                return False, issues
+
+    os.replace(tmp_path, output_path)
+    return True, issues
@@ -6,6 +6,13 @@
 # - Contains XHTML/XML builders for EPUB components
 # - Includes functions for building chapters, TOC, OPF, container.xml
 # - Added proper XML generation using ElementTree
+# - Added split_chapter_html to split oversized chapters at paragraph
+#   boundaries, and a heading flag to build_chap_xhtml for continuation parts
+# - paragraphize escapes the whole text once and splits paragraphs with
+#   str methods; join_lines gives the epub_builder format, so both EPUB
+#   paths share it
+# - build_chap_xhtml takes a display_heading for the <h1>, and
+#   cover_media_type gives the media type of a cover image from its suffix
 #
 
 """
@@ -20,38 +27,105 @@ Uses ElementTree for proper XML generation and escaping.
 from __future__ import annotations
 
 import html
+import mimetypes
+import re
+from itertools import repeat
+from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any
 from io import StringIO
 import xml.etree.ElementTree as ET
 
+# Largest chapter body, in UTF-8 bytes, written to a single XHTML file;
+# e-readers load and paginate bigger files slowly or not at all
+DEFAULT_MAX_CHAPTER_BYTES = 256 * 1024
 
-def paragraphize(txt: str) -> str:
+# Newline between two paragraphs of a chapter body (see paragraphize)
+_PARAGRAPH_BOUNDARY_RE = re.compile(r"(?<=</p>)\n")
+
+# Media types of the image formats EPUB reading systems must support
+COVER_MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+}
+
+
+def paragraphize(txt: str, join_lines: bool = False) -> str:
     """
     Convert plain text to HTML paragraphs.
 
     Groups lines into paragraphs, preserving line breaks within paragraphs.
     Empty lines separate paragraphs.
 
+    The whole text is escaped with one html.escape call instead of line by
+    line; escaping adds no whitespace or line breaks, so the lines of the
+    escaped text are the escaped lines. Blank lines are empty once stripped,
+    so paragraphs are split on "\n\n" and no Python code runs per line.
+
     Args:
         txt: Plain text to convert
+        join_lines: Join the lines of a paragraph with a space instead of
+            <br/>, as the chunk directory builder of epub_builder does; lines
+            then end at "\n" only and are stripped on both sides
 
     Returns:
         HTML with paragraph tags
     """
-    out, buf = [], []
-    for ln in txt.splitlines():
-        if ln.rstrip():
-            buf.append(html.escape(ln.rstrip()))
-        elif buf:
-            out.append("<p>" + "<br/>".join(buf) + "</p>")
-            buf.clear()
-    if buf:
-        out.append("<p>" + "<br/>".join(buf) + "</p>")
-    return "\n".join(out)
-
-
-def build_chap_xhtml(title: str, body_html: str) -> str:
+    escaped = html.escape(txt)
+    if join_lines:
+        lines = map(str.strip, escaped.split("\n"))
+        line_break = " "
+    else:
+        lines = map(str.rstrip, escaped.splitlines())
+        line_break = "<br/>"
+
+    body = "\n".join(lines).strip("\n")
+    while "\n\n\n" in body:
+        body = body.replace("\n\n\n", "\n\n")
+    if not body:
+        return ""
+    paragraphs = map(str.replace, body.split("\n\n"), repeat("\n"), repeat(line_break))
+    return "<p>" + "</p>\n<p>".join(paragraphs) + "</p>"
+
+
+def split_chapter_html(body_html: str, max_bytes: int) -> list[str]:
+    """
+    Split a chapter body into parts of at most max_bytes at paragraph boundaries.
+
+    Paragraphs are packed greedily in order. A single paragraph larger than
+    max_bytes is never cut and becomes a part of its own.
+
+    Args:
+        body_html: Chapter body as produced by paragraphize
+        max_bytes: Largest part size in UTF-8 bytes (0 or less disables splitting)
+
+    Returns:
+        The body parts in reading order (the body itself if no split is needed)
+    """
+    # A character takes at most 4 bytes, so short bodies need no encoding
+    if max_bytes <= 0 or len(body_html) * 4 <= max_bytes or len(body_html.encode("utf-8")) <= max_bytes:
+        return [body_html]
+
+    parts: list[str] = []
+    current: list[str] = []
+    current_size = 0
+    for paragraph in _PARAGRAPH_BOUNDARY_RE.split(body_html):
+        size = len(paragraph.encode("utf-8")) + 1
+        if current and current_size + size > max_bytes:
+            parts.append("\n".join(current))
+            current, current_size = [], 0
+        current.append(paragraph)
+        current_size += size
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def build_chap_xhtml(title: str, body_html: str, heading: bool = True, display_heading: str | None = None) -> str:
     """
     Build chapter XHTML using ElementTree for proper XML handling.
 
@@ -60,6 +134,10 @@ def build_chap_xhtml(title: str, body_html: str) -> str:
     Args:
         title: Chapter title
         body_html: HTML content for chapter body
+        heading: Whether to start the body with an <h1>; False for the
+            continuation parts of a split chapter
+        display_heading: Text of the <h1>, e.g. the heading as written in
+            the source (default: the title)
 
     Returns:
         Complete XHTML document as string
@@ -82,8 +160,9 @@ def build_chap_xhtml(title: str, body_html: str) -> str:
 
     # Body section
     body = ET.SubElement(html_elem, "{http://www.w3.org/1999/xhtml}body")
-    h1 = ET.SubElement(body, "{http://www.w3.org/1999/xhtml}h1")
-    h1.text = title
+    if heading:
+        h1 = ET.SubElement(body, "{http://www.w3.org/1999/xhtml}h1")
+        h1.text = display_heading or title
 
     # Parse body HTML and append
     # We need to wrap in a div to parse the HTML fragments
@@ -115,6 +194,24 @@ def build_chap_xhtml(title: str, body_html: str) -> str:
     return result
 
 
+def cover_media_type(cover: Path) -> str:
+    """
+    Return the media type of a cover image from its file suffix.
+
+    Args:
+        cover: Path to the cover image
+
+    Returns:
+        The media type, e.g. "image/png"; "application/octet-stream" if the
+        suffix is not a known image type
+    """
+    suffix = cover.suffix.lower()
+    if suffix in COVER_MEDIA_TYPES:
+        return COVER_MEDIA_TYPES[suffix]
+    guessed, _ = mimetypes.guess_type(cover.name)
+    return guessed or "application/octet-stream"
+
+
 def build_cover_xhtml(img_rel: str) -> str:
     """
     Build cover XHTML using ElementTree.
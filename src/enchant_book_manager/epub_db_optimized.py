@@ -21,6 +21,8 @@
 # - Fixed equality comparison to True (use truthy check instead)
 # - Added proper error handling for empty text in import_text_optimized
 # - Removed inefficient io.StringIO usage, using direct splitlines() instead
+# - No longer used by chapter_parser: chapter_segmenter gives the same output
+#   without a database. Kept as the reference implementation for benchmarks
 #
 
 """
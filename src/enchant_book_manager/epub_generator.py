@@ -5,6 +5,24 @@
 # - Initial creation from make_epub.py refactoring
 # - Contains EPUB creation functions: write_new_epub and extend_epub
 # - Manages EPUB file structure and ZIP packaging
+# - write_new_epub streams every part into the archive with EpubArchiveWriter
+#   instead of staging the book in a temporary directory
+# - write_new_epub can render and deflate chapters in worker threads
+#   (threads) and takes a zlib compression level
+# - extend_epub copies the existing entries raw and regenerates only
+#   content.opf and toc.ncx instead of extracting and rezipping the book
+# - extend_epub numbers new navPoints after nested ones too
+# - write_new_epub and extend_epub split chapters over max_chapter_bytes into
+#   sequential XHTML spine items; the TOC points at the first part
+# - The enhanced NCX is streamed into the archive with write_stream
+# - write_epub is the one builder engine: it takes any iterable of chapters,
+#   an optional display heading per chapter and a TOC strategy
+#   (hierarchical_toc or flat_toc). write_new_epub and
+#   epub_builder.create_epub_from_chapters are thin wrappers around it
+# - The cover media type comes from the image suffix (cover_media_type)
+# - extend_epub can regenerate toc.ncx with a TOC strategy (toc, toc_chapters)
+# - write_epub builds into a temporary sibling and replaces the output only
+#   when the build succeeds
 #
 
 """
@@ -13,38 +31,250 @@ epub_generator.py - EPUB file generation and extension
 
 Handles creation of new EPUB files and extending existing ones with additional chapters.
 Manages the EPUB file structure including META-INF, OEBPS directories and proper ZIP packaging.
+
+write_epub is the engine behind every EPUB this package writes, whether from
+make_epub, epub_utils.create_epub_with_config, the progressive builder or
+epub_builder.build_epub_from_directory. The table of contents is produced by
+a TocStrategy: hierarchical_toc (parts, books and sections) or flat_toc.
 """
 
 from __future__ import annotations
 
+import html
+import io
 import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 import re
-import shutil
-import tempfile
 import uuid
 import zipfile
 from pathlib import Path
 from typing import Any
 import xml.etree.ElementTree as ET
 
-from .epub_constants import ENCODING, MIMETYPE
+from .epub_archive import CompressedEntry, EpubArchiveWriter, compress_entry
+from .epub_constants import ENCODING
 from .epub_builders import (
+    DEFAULT_MAX_CHAPTER_BYTES,
+    split_chapter_html,
     build_container_xml,
     build_style_css,
     build_content_opf,
     build_toc_ncx,
     build_chap_xhtml,
     build_cover_xhtml,
+    cover_media_type,
 )
 
 # Import enhanced TOC builder
 try:
-    from .epub_toc_enhanced import build_enhanced_toc_ncx
+    from .epub_toc_enhanced import iter_enhanced_toc_ncx
 
     TOC_ENHANCED = True
 except ImportError:
     TOC_ENHANCED = False
 
+# Chapters queued per worker thread ahead of the one being written
+RENDER_QUEUE_PER_THREAD = 4
+
+# Writes toc.ncx from the (title, content) pairs of the chapters, the book
+# title, the author and the unique id; only the titles are read
+TocStrategy = Callable[[list[tuple[str, str]], str, str, str], Iterable[str]]
+
+
+def flat_toc(chapters: list[tuple[str, str]], title: str, author: str, uid: str) -> Iterator[str]:
+    """TOC strategy: one navPoint per chapter."""
+    nav = [f"<navPoint id='nav{idx}' playOrder='{idx}'><navLabel><text>{html.escape(chapter_title)}</text></navLabel><content src='Text/chapter{idx}.xhtml'/></navPoint>" for idx, (chapter_title, _) in enumerate(chapters, 1)]
+    yield build_toc_ncx(title, author, nav, uid)
+
+
+def hierarchical_toc(chapters: list[tuple[str, str]], title: str, author: str, uid: str) -> Iterable[str]:
+    """TOC strategy: parts, books and sections nest their chapters (flat without epub_toc_enhanced)."""
+    if not TOC_ENHANCED:
+        return flat_toc(chapters, title, author, uid)
+    return iter_enhanced_toc_ncx(chapters, title, author, uid, hierarchical=True)
+
+
+@dataclass
+class _SpineItem:
+    """One XHTML file of a chapter; chapters over the size limit have several."""
+
+    index: int  # Chapter number in the book
+    part: int  # 1 for the file the TOC points at, then 2, 3, ...
+    title: str
+    body_html: str
+    heading: str = ""  # Text of the <h1> if it is not the title
+
+    @property
+    def href(self) -> str:
+        """Path of the file relative to OEBPS."""
+        if self.part == 1:
+            return f"Text/chapter{self.index}.xhtml"
+        return f"Text/chapter{self.index}_part{self.part}.xhtml"
+
+    @property
+    def item_id(self) -> str:
+        """Manifest id of the file."""
+        return f"chap{self.index}" if self.part == 1 else f"chap{self.index}_part{self.part}"
+
+    def render(self) -> str:
+        """Return the XHTML document; only the first part repeats the heading."""
+        if self.part > 1:
+            return build_chap_xhtml(self.title, self.body_html, heading=False)
+        if self.heading:
+            return build_chap_xhtml(self.title, self.body_html, display_heading=self.heading)
+        return build_chap_xhtml(self.title, self.body_html)
+
+
+def _iter_spine_items(chaps: Iterable[tuple[str, str, str]], first_index: int, max_chapter_bytes: int) -> Iterator[_SpineItem]:
+    """
+    Yield the XHTML files of chapters in spine order.
+
+    Args:
+        chaps: (title, heading, html_content) tuples; an empty heading means
+            the title
+        first_index: Chapter number of the first chapter
+        max_chapter_bytes: Largest chapter body per file (0 = never split)
+
+    Yields:
+        One item per file, the parts of a split chapter in order
+    """
+    for idx, (title_, heading, body_html) in enumerate(chaps, first_index):
+        for part, part_html in enumerate(split_chapter_html(body_html, max_chapter_bytes), 1):
+            yield _SpineItem(idx, part, title_, part_html, heading)
+
+
+def _render_chapter(item: _SpineItem, compresslevel: int | None) -> CompressedEntry:
+    """Worker: render one chapter file to XHTML and deflate it."""
+    return compress_entry(item.render().encode(ENCODING), compresslevel)
+
+
+def _render_chapters_parallel(
+    items: Iterable[_SpineItem],
+    threads: int,
+    compresslevel: int | None,
+) -> Iterator[tuple[_SpineItem, CompressedEntry]]:
+    """
+    Render and deflate chapter files in a thread pool, yielding them in order.
+
+    At most RENDER_QUEUE_PER_THREAD files per thread are in flight, so
+    memory stays bounded however long the book is.
+
+    Args:
+        items: Chapter files in spine order
+        threads: Number of worker threads
+        compresslevel: zlib level for the chapter entries
+
+    Yields:
+        (item, compressed entry) tuples in spine order
+    """
+    pending: deque[tuple[_SpineItem, Future[CompressedEntry]]] = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for item in items:
+            pending.append((item, executor.submit(_render_chapter, item, compresslevel)))
+            if len(pending) >= threads * RENDER_QUEUE_PER_THREAD:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def write_epub(
+    chapters: Iterable[tuple[str, str, str]],
+    out: Path,
+    title: str,
+    author: str,
+    cover: Path | None = None,
+    language: str = "en",
+    custom_css: str | None = None,
+    metadata: dict[str, Any] | None = None,
+    threads: int = 1,
+    compression_level: int | None = None,
+    max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
+    toc: TocStrategy = hierarchical_toc,
+    toc_chapters: list[tuple[str, str]] | None = None,
+) -> None:
+    """Write an EPUB, streaming each chapter into the archive as it is produced.
+
+    chapters can be a generator: only the chapters being rendered and the
+    titles for the TOC are kept in memory. A chapter whose body is larger
+    than max_chapter_bytes is written as several XHTML files split at
+    paragraph boundaries; its TOC entry points at the first one. The book
+    is built next to out and replaces it only once it is complete.
+
+    Args:
+        chapters: (title, heading, html_content) tuples; the title goes into
+            the TOC and <title>, the heading (the title if empty) into <h1>
+        out: Output path for the EPUB file
+        title: Book title
+        author: Book author
+        cover: Optional path to cover image
+        language: Language code (default: 'en')
+        custom_css: Optional custom CSS content
+        metadata: Optional metadata dict with keys like 'publisher', 'description', etc.
+        threads: Worker threads rendering and deflating chapters (1 = serial)
+        compression_level: zlib level for deflated entries (None = zlib default)
+        max_chapter_bytes: Largest chapter body per XHTML file (0 = never split)
+        toc: TOC strategy writing toc.ncx
+        toc_chapters: (title, content) pairs handed to the TOC strategy
+            (default: the chapter titles, collected while writing)
+    """
+    uid = str(uuid.uuid4())
+    # A failed build must not replace an existing EPUB
+    tmp_epub = out.with_suffix(".tmp.epub")
+    try:
+        with EpubArchiveWriter(tmp_epub, compresslevel=compression_level) as archive:
+            archive.write_text("META-INF/container.xml", build_container_xml())
+            archive.write_text("OEBPS/Styles/style.css", build_style_css(custom_css))
+
+            manifest = [
+                "<item id='ncx' href='toc.ncx' media-type='application/x-dtbncx+xml'/>",
+                "<item id='css' href='Styles/style.css' media-type='text/css'/>",
+            ]
+            spine: list[str] = []
+            titles: list[tuple[str, str]] = []
+            cover_id = None
+
+            if cover:
+                cover_id = "cover-img"
+                img_rel = f"Images/{cover.name}"
+                archive.write_file(f"OEBPS/{img_rel}", cover)
+                manifest.append(f"<item id='{cover_id}' href='{img_rel}' media-type='{cover_media_type(cover)}'/>")
+                archive.write_text("OEBPS/Text/cover.xhtml", build_cover_xhtml(img_rel))
+                manifest.append("<item id='coverpage' href='Text/cover.xhtml' media-type='application/xhtml+xml'/>")
+                spine.append("<itemref idref='coverpage' linear='yes'/>")
+
+            def add_to_spine(item: _SpineItem) -> None:
+                manifest.append(f"<item id='{item.item_id}' href='{item.href}' media-type='application/xhtml+xml'/>")
+                spine.append(f"<itemref idref='{item.item_id}'/>")
+                if item.part == 1:
+                    titles.append((item.title, ""))
+
+            # Chapters are written in spine order whether rendered here or in workers
+            items = _iter_spine_items(chapters, 1, max_chapter_bytes)
+            if threads > 1:
+                for item, entry in _render_chapters_parallel(items, threads, compression_level):
+                    archive.write_compressed(f"OEBPS/{item.href}", entry)
+                    add_to_spine(item)
+            else:
+                for item in items:
+                    archive.write_text(f"OEBPS/{item.href}", item.render())
+                    add_to_spine(item)
+
+            archive.write_text(
+                "OEBPS/content.opf",
+                build_content_opf(title, author, manifest, spine, uid, cover_id, language, metadata),
+            )
+            # The NCX is compressed while the strategy generates it
+            archive.write_stream("OEBPS/toc.ncx", toc(titles if toc_chapters is None else toc_chapters, title, author, uid))
+    except BaseException:
+        tmp_epub.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_epub, out)
+
 
 def write_new_epub(
     chaps: list[tuple[str, str]],
@@ -55,8 +285,11 @@ def write_new_epub(
     language: str = "en",
     custom_css: str | None = None,
     metadata: dict[str, Any] | None = None,
+    threads: int = 1,
+    compression_level: int | None = None,
+    max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
 ) -> None:
-    """Create a new EPUB file from chapters.
+    """Create a new EPUB file from chapters, with the hierarchical TOC.
 
     Args:
         chaps: List of (title, html_content) tuples for each chapter
@@ -67,147 +300,148 @@ def write_new_epub(
         language: Language code (default: 'en')
         custom_css: Optional custom CSS content
         metadata: Optional metadata dict with keys like 'publisher', 'description', etc.
+        threads: Worker threads rendering and deflating chapters (1 = serial)
+        compression_level: zlib level for deflated entries (None = zlib default)
+        max_chapter_bytes: Largest chapter body per XHTML file (0 = never split)
     """
-    uid = str(uuid.uuid4())
-    with tempfile.TemporaryDirectory() as td:
-        tmp = Path(td)
-        (tmp / "META-INF").mkdir()
-        oebps = tmp / "OEBPS"
-        (oebps / "Text").mkdir(parents=True)
-        (oebps / "Styles").mkdir()
-        if cover:
-            (oebps / "Images").mkdir()
-
-        (tmp / "META-INF" / "container.xml").write_text(build_container_xml(), ENCODING)
-        (oebps / "Styles" / "style.css").write_text(build_style_css(custom_css), ENCODING)
-
-        manifest = [
-            "<item id='ncx' href='toc.ncx' media-type='application/x-dtbncx+xml'/>",
-            "<item id='css' href='Styles/style.css' media-type='text/css'/>",
-        ]
-        spine, nav = [], []
-        cover_id = None
-
-        if cover:
-            cover_id = "cover-img"
-            img_rel = f"Images/{cover.name}"
-            shutil.copy2(cover, oebps / img_rel)
-            mime = "image/jpeg" if cover.suffix.lower() in {".jpg", ".jpeg"} else "image/png"
-            manifest.append(f"<item id='{cover_id}' href='{img_rel}' media-type='{mime}'/>")
-            (oebps / "Text" / "cover.xhtml").write_text(build_cover_xhtml(img_rel), ENCODING)
-            manifest.append("<item id='coverpage' href='Text/cover.xhtml' media-type='application/xhtml+xml'/>")
-            spine.append("<itemref idref='coverpage' linear='yes'/>")
-
-        for idx, (title_, body_html) in enumerate(chaps, 1):
-            xhtml = f"Text/chapter{idx}.xhtml"
-            (oebps / xhtml).write_text(build_chap_xhtml(title_, body_html), ENCODING)
-            manifest.append(f"<item id='chap{idx}' href='{xhtml}' media-type='application/xhtml+xml'/>")
-            spine.append(f"<itemref idref='chap{idx}'/>")
-            import html
-
-            nav.append(f"<navPoint id='nav{idx}' playOrder='{idx}'><navLabel><text>{html.escape(title_)}</text></navLabel><content src='{xhtml}'/></navPoint>")
-
-        (oebps / "content.opf").write_text(
-            build_content_opf(title, author, manifest, spine, uid, cover_id, language, metadata),
-            ENCODING,
-        )
+    write_epub(
+        ((chapter_title, "", body_html) for chapter_title, body_html in chaps),
+        out,
+        title,
+        author,
+        cover,
+        language,
+        custom_css,
+        metadata,
+        threads,
+        compression_level,
+        max_chapter_bytes,
+        toc=hierarchical_toc,
+        # The chapters are in memory already
+        toc_chapters=chaps,
+    )
 
-        # Use enhanced TOC builder if available
-        if TOC_ENHANCED:
-            # Pass full chapter data for hierarchical analysis
-            toc_content = build_enhanced_toc_ncx(chaps, title, author, uid, hierarchical=True)
-            (oebps / "toc.ncx").write_text(toc_content, ENCODING)
-        else:
-            (oebps / "toc.ncx").write_text(build_toc_ncx(title, author, nav, uid), ENCODING)
-
-        with zipfile.ZipFile(out, "w") as z:
-            z.writestr("mimetype", MIMETYPE, zipfile.ZIP_STORED)
-            for root, _, files in os.walk(tmp):
-                for f in files:
-                    fp = Path(root) / f
-                    rel = fp.relative_to(tmp).as_posix()
-                    if rel == "mimetype":
-                        continue
-                    z.write(fp, rel, zipfile.ZIP_DEFLATED)
 
+# Entries of an existing EPUB that extend_epub regenerates instead of copying
+_REGENERATED_ENTRIES = frozenset({"mimetype", "OEBPS/content.opf", "OEBPS/toc.ncx"})
 
-def extend_epub(epub: Path, new: list[tuple[str, str]]) -> None:
+# First parts only: continuation parts are named chapterN_partM.xhtml
+_CHAPTER_ENTRY_RE = re.compile(r"OEBPS/Text/chapter(\d+)\.xhtml")
+
+
+def extend_epub(
+    epub: Path,
+    new: list[tuple[str, str]],
+    compression_level: int | None = None,
+    max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
+    toc: TocStrategy | None = None,
+    toc_chapters: list[tuple[str, str]] | None = None,
+) -> None:
     """Extend an existing EPUB with new chapters.
 
+    Existing entries are copied into the new archive without being
+    decompressed, and only content.opf and toc.ncx are regenerated, so the
+    cost of an append is proportional to the new chapters. New chapters are
+    split like in write_new_epub.
+
+    Without toc, a flat navPoint is appended to the NCX for every new
+    chapter. With toc, the NCX is written again by that strategy, with the
+    title, author and unique id of the existing one.
+
     Args:
         epub: Path to existing EPUB file
         new: List of (title, html_content) tuples for new chapters
+        compression_level: zlib level for the new entries (None = zlib default)
+        max_chapter_bytes: Largest chapter body per XHTML file (0 = never split)
+        toc: Optional TOC strategy writing toc.ncx
+        toc_chapters: (title, content) pairs of every chapter of the extended
+            book, handed to toc; required with toc
 
     Raises:
-        ValueError: If EPUB structure is invalid
+        ValueError: If EPUB structure is invalid, or toc is given without toc_chapters
     """
-    with tempfile.TemporaryDirectory() as td:
-        tmp = Path(td)
-        with zipfile.ZipFile(epub) as z:
-            z.extractall(tmp)
-
-        oebps = tmp / "OEBPS"
-        textdir = oebps / "Text"
+    if toc is not None and toc_chapters is None:
+        raise ValueError("extend_epub needs toc_chapters with a TOC strategy")
+    tmp_epub = epub.with_suffix(".tmp.epub")
+    with zipfile.ZipFile(epub) as z:
         next_idx = 1 + max(
-            (int(m.group(1)) for p in textdir.glob("chapter*.xhtml") if (m := re.search(r"chapter(\d+)\.xhtml", p.name))),
+            (int(m.group(1)) for name in z.namelist() if (m := _CHAPTER_ENTRY_RE.fullmatch(name))),
             default=0,
         )
 
         ns_opf = {"opf": "http://www.idpf.org/2007/opf"}
         ns_ncx = {"ncx": "http://www.daisy.org/z3986/2005/ncx/"}
-        opf = ET.parse(oebps / "content.opf")
+        opf = ET.ElementTree(ET.fromstring(z.read("OEBPS/content.opf")))
         manifest = opf.find("opf:manifest", ns_opf)
         spine = opf.find("opf:spine", ns_opf)
-        ncx = ET.parse(oebps / "toc.ncx")
+        ncx = ET.ElementTree(ET.fromstring(z.read("OEBPS/toc.ncx")))
         navmap = ncx.find("ncx:navMap", ns_ncx)
 
         if manifest is None or spine is None or navmap is None:
             raise ValueError("Invalid EPUB structure: missing manifest, spine, or navMap")
 
         play = max(
-            (int(n.get("playOrder", "0")) for n in navmap.findall("ncx:navPoint", ns_ncx)),
+            (int(n.get("playOrder", "0")) for n in navmap.findall(".//ncx:navPoint", ns_ncx)),
             default=0,
         )
 
-        for title_, body_html in new:
-            xhtml = f"Text/chapter{next_idx}.xhtml"
-            (oebps / xhtml).write_text(build_chap_xhtml(title_, body_html), ENCODING)
-            ET.SubElement(
-                manifest,
-                "{http://www.idpf.org/2007/opf}item",
-                {
-                    "id": f"chap{next_idx}",
-                    "href": xhtml,
-                    "media-type": "application/xhtml+xml",
-                },
-            )
-            ET.SubElement(
-                spine,
-                "{http://www.idpf.org/2007/opf}itemref",
-                {"idref": f"chap{next_idx}"},
-            )
-            play += 1
-            np = ET.SubElement(
-                navmap,
-                "{http://www.daisy.org/z3986/2005/ncx/}navPoint",
-                {"id": f"nav{next_idx}", "playOrder": str(play)},
-            )
-            nl = ET.SubElement(np, "{http://www.daisy.org/z3986/2005/ncx/}navLabel")
-            ET.SubElement(nl, "{http://www.daisy.org/z3986/2005/ncx/}text").text = title_
-            ET.SubElement(np, "{http://www.daisy.org/z3986/2005/ncx/}content", {"src": xhtml})
-            next_idx += 1
-
-        opf.write(oebps / "content.opf", ENCODING, xml_declaration=True)
-        ncx.write(oebps / "toc.ncx", ENCODING, xml_declaration=True)
-
-        tmp_epub = epub.with_suffix(".tmp.epub")
-        with zipfile.ZipFile(tmp_epub, "w") as z:
-            z.writestr("mimetype", MIMETYPE, zipfile.ZIP_STORED)
-            for root, _, files in os.walk(tmp):
-                for f in files:
-                    fp = Path(root) / f
-                    rel = fp.relative_to(tmp).as_posix()
-                    if rel == "mimetype":
+        try:
+            with EpubArchiveWriter(tmp_epub, compresslevel=compression_level) as archive:
+                for info in z.infolist():
+                    if info.filename not in _REGENERATED_ENTRIES:
+                        archive.copy_entry(z, info)
+
+                new_chapters = ((chapter_title, "", body_html) for chapter_title, body_html in new)
+                for item in _iter_spine_items(new_chapters, next_idx, max_chapter_bytes):
+                    archive.write_text(f"OEBPS/{item.href}", item.render())
+                    ET.SubElement(
+                        manifest,
+                        "{http://www.idpf.org/2007/opf}item",
+                        {
+                            "id": item.item_id,
+                            "href": item.href,
+                            "media-type": "application/xhtml+xml",
+                        },
+                    )
+                    ET.SubElement(
+                        spine,
+                        "{http://www.idpf.org/2007/opf}itemref",
+                        {"idref": item.item_id},
+                    )
+                    if item.part > 1 or toc is not None:
                         continue
-                    z.write(fp, rel, zipfile.ZIP_DEFLATED)
-        shutil.move(tmp_epub, epub)
+                    play += 1
+                    np = ET.SubElement(
+                        navmap,
+                        "{http://www.daisy.org/z3986/2005/ncx/}navPoint",
+                        {"id": f"nav{item.index}", "playOrder": str(play)},
+                    )
+                    nl = ET.SubElement(np, "{http://www.daisy.org/z3986/2005/ncx/}navLabel")
+                    ET.SubElement(nl, "{http://www.daisy.org/z3986/2005/ncx/}text").text = item.title
+                    ET.SubElement(np, "{http://www.daisy.org/z3986/2005/ncx/}content", {"src": item.href})
+
+                archive.write_bytes("OEBPS/content.opf", _serialize_xml(opf))
+                if toc is not None and toc_chapters is not None:
+                    uid = ncx.find("ncx:head/ncx:meta[@name='dtb:uid']", ns_ncx)
+                    archive.write_stream(
+                        "OEBPS/toc.ncx",
+                        toc(
+                            toc_chapters,
+                            ncx.findtext("ncx:docTitle/ncx:text", "", ns_ncx),
+                            ncx.findtext("ncx:docAuthor/ncx:text", "", ns_ncx),
+                            (uid.get("content", "") if uid is not None else "").removeprefix("urn:uuid:"),
+                        ),
+                    )
+                else:
+                    archive.write_bytes("OEBPS/toc.ncx", _serialize_xml(ncx))
+        except BaseException:
+            tmp_epub.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_epub, epub)
+
+
+def _serialize_xml(tree: ET.ElementTree) -> bytes:
+    """Serialize a document the way ElementTree.write does with an XML declaration."""
+    buffer = io.BytesIO()
+    tree.write(buffer, ENCODING, xml_declaration=True)
+    return buffer.getvalue()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: structural EPUB validator for batch QA, checking many
+#   books concurrently and writing a JSON report
+#
+
+"""
+epub_structure.py - Fast structural validation of finished EPUB files
+=====================================================================
+
+epub_validation checks the inputs of a build; this module checks its
+outputs. A book is validated from its ZIP central directory and four small
+entries only: mimetype, META-INF/container.xml, the OPF package and the NCX
+table of contents. Chapter files are never decompressed, so a check takes
+milliseconds whatever the size of the book.
+
+Errors (the book is broken for some reading systems):
+
+* the mimetype entry is missing, not first, compressed or wrong,
+* container.xml, the OPF or the NCX is missing or not well-formed XML,
+* a manifest id is duplicated or a manifest href is not in the archive,
+* a spine itemref names no manifest item, or the spine is empty,
+* the spine toc attribute names no NCX item,
+* an NCX navPoint points at a file not in the archive,
+* NCX playOrder values are not integers, do not count up from 1 without
+  gaps in document order, or two targets share one value.
+
+Warnings (legal but suspicious): spine items that are not XHTML or are
+listed twice, XHTML files missing from the spine and navPoints pointing
+outside the spine.
+
+check_epubs validates many books in worker processes, and build_report /
+write_json_report turn the results into a JSON report.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import posixpath
+import time
+import zipfile
+import zlib
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+import xml.etree.ElementTree as ET
+
+MIMETYPE = b"application/epub+zip"
+CONTAINER_PATH = "META-INF/container.xml"
+NCX_MEDIA_TYPE = "application/x-dtbncx+xml"
+XHTML_MEDIA_TYPE = "application/xhtml+xml"
+
+_NS = {
+    "container": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+    "ncx": "http://www.daisy.org/z3986/2005/ncx/",
+}
+
+# Books handed to a worker process at a time
+_CHUNKSIZE = 4
+
+
+@dataclass
+class EpubCheckResult:
+    """Outcome of the structural check of one EPUB."""
+
+    path: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    entries: int = 0
+    spine_items: int = 0
+    nav_points: int = 0
+    seconds: float = 0.0
+
+    @property
+    def valid(self) -> bool:
+        """True if no error was found (warnings are allowed)."""
+        return not self.errors
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a JSON-serializable dict."""
+        return {"valid": self.valid, **asdict(self)}
+
+
+class _StructureError(Exception):
+    """A problem after which the rest of the book cannot be checked."""
+
+
+def _resolve(base_dir: str, href: str) -> str:
+    """Return the archive name an href relative to base_dir points at."""
+    path = unquote(href.split("#", 1)[0])
+    return posixpath.normpath(posixpath.join(base_dir, path)) if base_dir else posixpath.normpath(path)
+
+
+def _read_xml(archive: zipfile.ZipFile, names: set[str], name: str, what: str) -> ET.Element:
+    """Read and parse one XML entry of the archive."""
+    if name not in names:
+        raise _StructureError(f"{what} {name} is missing")
+    try:
+        return ET.fromstring(archive.read(name))
+    except ET.ParseError as e:
+        raise _StructureError(f"{what} {name} is not well-formed: {e}") from e
+
+
+def _check_mimetype(archive: zipfile.ZipFile, infos: list[zipfile.ZipInfo], result: EpubCheckResult) -> None:
+    """The mimetype entry must come first, be stored and hold the EPUB media type."""
+    if not infos or infos[0].filename != "mimetype":
+        if any(info.filename == "mimetype" for info in infos):
+            result.errors.append("mimetype is not the first entry")
+        else:
+            result.errors.append("mimetype entry is missing")
+        return
+    if infos[0].compress_type != zipfile.ZIP_STORED:
+        result.errors.append("mimetype entry is compressed")
+        return
+    if archive.read(infos[0]) != MIMETYPE:
+        result.errors.append("mimetype entry does not contain application/epub+zip")
+
+
+def _find_opf_path(archive: zipfile.ZipFile, names: set[str]) -> str:
+    """Return the OPF path named by container.xml."""
+    container = _read_xml(archive, names, CONTAINER_PATH, "Container")
+    rootfile = container.find("container:rootfiles/container:rootfile", _NS)
+    full_path = rootfile.get("full-path") if rootfile is not None else None
+    if not full_path:
+        raise _StructureError("container.xml names no rootfile")
+    return full_path
+
+
+def _check_package(archive: zipfile.ZipFile, names: set[str], opf_path: str, result: EpubCheckResult) -> tuple[str | None, set[str]]:
+    """
+    Check the manifest and the spine of the OPF.
+
+    Returns:
+        The archive name of the NCX (None if the book has none) and the
+        archive names of the spine items
+    """
+    opf = _read_xml(archive, names, opf_path, "Package")
+    opf_dir = posixpath.dirname(opf_path)
+    manifest = opf.find("opf:manifest", _NS)
+    spine = opf.find("opf:spine", _NS)
+    if manifest is None or spine is None:
+        raise _StructureError("Package has no manifest or no spine")
+
+    # Manifest: unique ids, every file present
+    items: dict[str, tuple[str, str]] = {}
+    for item in manifest.iterfind("opf:item", _NS):
+        item_id, href = item.get("id"), item.get("href")
+        if not item_id or not href:
+            result.errors.append("Manifest item without id or href")
+            continue
+        if item_id in items:
+            result.errors.append(f"Manifest id {item_id} is used twice")
+            continue
+        target = _resolve(opf_dir, href)
+        items[item_id] = (target, item.get("media-type", ""))
+        if target not in names:
+            result.errors.append(f"Manifest item {item_id} points at missing file {target}")
+
+    # Spine: every itemref in the manifest
+    spine_targets: list[str] = []
+    for itemref in spine.iterfind("opf:itemref", _NS):
+        idref = itemref.get("idref", "")
+        if idref not in items:
+            result.errors.append(f"Spine itemref {idref} is not in the manifest")
+            continue
+        target, media_type = items[idref]
+        if media_type != XHTML_MEDIA_TYPE:
+            result.warnings.append(f"Spine item {idref} has media type {media_type or 'none'}")
+        spine_targets.append(target)
+    result.spine_items = len(spine_targets)
+    if not spine_targets:
+        result.errors.append("Spine is empty")
+
+    spine_set = set(spine_targets)
+    if len(spine_set) < len(spine_targets):
+        result.warnings.append(f"{len(spine_targets) - len(spine_set)} spine item(s) listed more than once")
+    unlisted = sorted(target for target, media_type in items.values() if media_type == XHTML_MEDIA_TYPE and target not in spine_set)
+    if unlisted:
+        result.warnings.append(f"{len(unlisted)} XHTML file(s) not in the spine, first: {unlisted[0]}")
+
+    # The NCX named by the spine
+    toc_id = spine.get("toc")
+    if toc_id is None:
+        return None, spine_set
+    if toc_id not in items or items[toc_id][1] != NCX_MEDIA_TYPE:
+        result.errors.append(f"Spine toc {toc_id} is not an NCX item of the manifest")
+        return None, spine_set
+    return items[toc_id][0], spine_set
+
+
+def _check_ncx(archive: zipfile.ZipFile, names: set[str], ncx_path: str, spine_targets: set[str], result: EpubCheckResult) -> None:
+    """Check the targets and the playOrder sequence of the NCX navPoints."""
+    ncx = _read_xml(archive, names, ncx_path, "NCX")
+    ncx_dir = posixpath.dirname(ncx_path)
+
+    # navPoints in document order, as iter() walks the tree
+    highest = 0
+    targets_by_order: dict[int, str] = {}
+    outside_spine = 0
+    for nav_point in ncx.iter(f"{{{_NS['ncx']}}}navPoint"):
+        result.nav_points += 1
+        label = nav_point.get("id", f"#{result.nav_points}")
+        content = nav_point.find("ncx:content", _NS)
+        src = content.get("src") if content is not None else None
+        if not src:
+            result.errors.append(f"navPoint {label} has no content src")
+            continue
+        target = _resolve(ncx_dir, src)
+        if target not in names:
+            result.errors.append(f"navPoint {label} points at missing file {target}")
+        elif target not in spine_targets:
+            outside_spine += 1
+
+        try:
+            order = int(nav_point.get("playOrder", ""))
+        except ValueError:
+            result.errors.append(f"navPoint {label} has playOrder {nav_point.get('playOrder')!r}, not an integer")
+            continue
+        # A navPoint repeats an earlier value only for the same target;
+        # otherwise the values count up from 1 without gaps
+        if order in targets_by_order:
+            if targets_by_order[order] != target:
+                result.errors.append(f"navPoint {label} reuses playOrder {order} for another target")
+            continue
+        if order != highest + 1:
+            result.errors.append(f"navPoint {label} has playOrder {order}, expected {highest + 1}")
+        targets_by_order[order] = target
+        highest = max(highest, order)
+
+    if outside_spine:
+        result.warnings.append(f"{outside_spine} navPoint(s) point outside the spine")
+
+
+def check_epub_structure(epub_path: Path) -> EpubCheckResult:
+    """
+    Check the structure of one EPUB without decompressing its chapters.
+
+    Args:
+        epub_path: Path to the EPUB file
+
+    Returns:
+        The errors and warnings found (see the module docstring)
+    """
+    start = time.perf_counter()
+    result = EpubCheckResult(path=str(epub_path))
+    try:
+        with zipfile.ZipFile(epub_path) as archive:
+            infos = archive.infolist()
+            names = {info.filename for info in infos}
+            result.entries = len(infos)
+            _check_mimetype(archive, infos, result)
+            opf_path = _find_opf_path(archive, names)
+            ncx_path, spine_targets = _check_package(archive, names, opf_path, result)
+            if ncx_path is None:
+                result.warnings.append("Package has no NCX table of contents")
+            else:
+                _check_ncx(archive, names, ncx_path, spine_targets, result)
+    except _StructureError as e:
+        result.errors.append(str(e))
+    except (OSError, EOFError, zipfile.BadZipFile, zipfile.LargeZipFile, zlib.error, RuntimeError, NotImplementedError) as e:
+        # zlib.error: corrupt deflate stream; RuntimeError: encrypted entry;
+        # NotImplementedError: unsupported compression method
+        result.errors.append(f"Cannot read the archive: {e}")
+    result.seconds = round(time.perf_counter() - start, 6)
+    return result
+
+
+def collect_epub_paths(inputs: Iterable[Path]) -> list[Path]:
+    """
+    Expand directories into the EPUB files below them.
+
+    Args:
+        inputs: EPUB files and directories
+
+    Returns:
+        Sorted, de-duplicated EPUB paths
+    """
+    paths: set[Path] = set()
+    for item in inputs:
+        if item.is_dir():
+            paths.update(path for path in item.rglob("*.epub") if path.is_file())
+        else:
+            paths.add(item)
+    return sorted(paths)
+
+
+def check_epubs(paths: list[Path], workers: int | None = None) -> list[EpubCheckResult]:
+    """
+    Check many EPUBs concurrently.
+
+    Args:
+        paths: EPUB files to check
+        workers: Worker processes (None = CPU count, 1 = in this process)
+
+    Returns:
+        One result per path, in the order of paths
+    """
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(paths) <= 1:
+        return [check_epub_structure(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+        return list(executor.map(check_epub_structure, paths, chunksize=_CHUNKSIZE))
+
+
+def build_report(results: list[EpubCheckResult]) -> dict[str, Any]:
+    """
+    Summarize check results as a JSON-serializable report.
+
+    Args:
+        results: Results of check_epubs
+
+    Returns:
+        Dict with the counts of checked, valid and invalid books and every result
+    """
+    invalid = sum(1 for result in results if not result.valid)
+    return {
+        "checked": len(results),
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "with_warnings": sum(1 for result in results if result.warnings),
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def write_json_report(results: list[EpubCheckResult], report_path: Path) -> None:
+    """
+    Write the report of build_report to a JSON file.
+
+    Args:
+        results: Results of check_epubs
+        report_path: Path of the JSON file
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    report_path.write_text(json.dumps(build_report(results), ensure_ascii=False, indent=2), encoding="utf-8")
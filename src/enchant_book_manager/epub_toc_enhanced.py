@@ -21,19 +21,49 @@
 # - Added proper XML escaping for special characters
 # - Added EPUB3 navigation document support
 # - Added backward compatibility with flat TOC structure
+# - Part/book/section patterns are compiled once at module level
+# - NCX and nav documents are generated as streams of pieces (iter_* methods
+#   and iter_enhanced_toc_ncx) in linear time; the build_* functions join them
 #
 
 """
 Enhanced TOC generation for EPUB files.
 Supports hierarchical structure and better chapter organization.
+
+The NCX and navigation documents are produced by generators that yield the
+document piece by piece, so the EPUB writer can compress them straight into
+the archive; the build_* functions return the same documents as strings.
 """
 
 from __future__ import annotations
 
 import re
 import html
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 
+# Titles that open a part, a book or a section of the hierarchical TOC
+PART_PATTERN = re.compile(r"^Part\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
+BOOK_PATTERN = re.compile(r"^Book\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
+SECTION_PATTERN = re.compile(r"^Section\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
+
+
+def _ncx_head(title: str, author: str, uid: str, depth: int) -> str:
+    """Return the NCX document up to the opening navMap tag."""
+    return f"""<?xml version='1.0' encoding='utf-8'?>
+<!DOCTYPE ncx PUBLIC '-//NISO//DTD ncx 2005-1//EN' 'http://www.daisy.org/z3986/2005/ncx-2005-1.dtd'>
+<ncx xmlns='http://www.daisy.org/z3986/2005/ncx/' version='2005-1'>
+<head>
+  <meta name='dtb:uid' content='urn:uuid:{uid}'/>
+  <meta name='dtb:depth' content='{depth}'/>
+  <meta name='dtb:totalPageCount' content='0'/>
+  <meta name='dtb:maxPageNumber' content='0'/>
+</head>
+<docTitle><text>{html.escape(title)}</text></docTitle>
+<docAuthor><text>{html.escape(author)}</text></docAuthor>
+<navMap>
+"""
+
 
 @dataclass
 class TocEntry:
@@ -45,35 +75,32 @@ class TocEntry:
     level: int = 1
     children: list[TocEntry] = field(default_factory=list)
 
-    def to_ncx_navpoint(self, depth: int = 0) -> str:
-        """Convert to NCX navPoint XML"""
+    def iter_ncx_navpoint(self, depth: int = 0) -> Iterator[str]:
+        """Yield the NCX navPoint XML of this entry and its children"""
         indent = "  " * depth
-        nav_id = f"nav{self.play_order}"
-
-        result = f'{indent}<navPoint id="{nav_id}" playOrder="{self.play_order}">\n'
-        result += f"{indent}  <navLabel><text>{html.escape(self.title)}</text></navLabel>\n"
-        result += f'{indent}  <content src="{self.href}"/>\n'
-
-        # Add children
+        yield f'{indent}<navPoint id="nav{self.play_order}" playOrder="{self.play_order}">\n{indent}  <navLabel><text>{html.escape(self.title)}</text></navLabel>\n{indent}  <content src="{self.href}"/>\n'
         for child in self.children:
-            result += child.to_ncx_navpoint(depth + 1)
+            yield from child.iter_ncx_navpoint(depth + 1)
+        yield f"{indent}</navPoint>\n"
 
-        result += f"{indent}</navPoint>\n"
-        return result
+    def to_ncx_navpoint(self, depth: int = 0) -> str:
+        """Convert to NCX navPoint XML"""
+        return "".join(self.iter_ncx_navpoint(depth))
 
-    def to_nav_li(self, depth: int = 0) -> str:
-        """Convert to EPUB3 nav HTML list item"""
+    def iter_nav_li(self, depth: int = 0) -> Iterator[str]:
+        """Yield the EPUB3 nav HTML list item of this entry and its children"""
         indent = "  " * depth
-        result = f'{indent}<li><a href="{self.href}">{html.escape(self.title)}</a>'
-
+        yield f'{indent}<li><a href="{self.href}">{html.escape(self.title)}</a>'
         if self.children:
-            result += f"\n{indent}  <ol>\n"
+            yield f"\n{indent}  <ol>\n"
             for child in self.children:
-                result += child.to_nav_li(depth + 2)
-            result += f"{indent}  </ol>\n{indent}"
+                yield from child.iter_nav_li(depth + 2)
+            yield f"{indent}  </ol>\n{indent}"
+        yield "</li>\n"
 
-        result += "</li>\n"
-        return result
+    def to_nav_li(self, depth: int = 0) -> str:
+        """Convert to EPUB3 nav HTML list item"""
+        return "".join(self.iter_nav_li(depth))
 
 
 class EnhancedTocBuilder:
@@ -92,17 +119,11 @@ class EnhancedTocBuilder:
         current_part: TocEntry | None = None
         current_book: TocEntry | None = None
 
-        # Patterns for different levels
-        part_pattern = re.compile(r"^Part\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
-        book_pattern = re.compile(r"^Book\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
-        section_pattern = re.compile(r"^Section\s+(\w+)(?:\s*[:\-–—]\s*(.+))?", re.IGNORECASE)
-
         for idx, (title, _content) in enumerate(chapters, 1):
             href = f"Text/chapter{idx}.xhtml"
 
             # Check for part
-            part_match = part_pattern.match(title)
-            if part_match:
+            if PART_PATTERN.match(title):
                 current_part = TocEntry(title=title, href=href, play_order=self.play_order, level=1)
                 self.play_order += 1
                 toc_entries.append(current_part)
@@ -110,8 +131,7 @@ class EnhancedTocBuilder:
                 continue
 
             # Check for book
-            book_match = book_pattern.match(title)
-            if book_match:
+            if BOOK_PATTERN.match(title):
                 current_book = TocEntry(title=title, href=href, play_order=self.play_order, level=2)
                 self.play_order += 1
 
@@ -122,8 +142,7 @@ class EnhancedTocBuilder:
                 continue
 
             # Check for section
-            section_match = section_pattern.match(title)
-            if section_match:
+            if SECTION_PATTERN.match(title):
                 section_entry = TocEntry(title=title, href=href, play_order=self.play_order, level=3)
                 self.play_order += 1
 
@@ -149,41 +168,24 @@ class EnhancedTocBuilder:
 
         return toc_entries
 
-    def build_ncx_toc(self, chapters: list[tuple[str, str]], title: str, author: str, uid: str) -> str:
-        """Build NCX format TOC with hierarchical structure"""
+    def iter_ncx_toc(self, chapters: list[tuple[str, str]], title: str, author: str, uid: str) -> Iterator[str]:
+        """Yield the NCX format TOC with hierarchical structure piece by piece"""
         toc_entries = self.analyze_chapters(chapters)
 
-        # Calculate max depth
-        max_depth = self._calculate_max_depth(toc_entries)
-
-        nav_map_content = ""
+        yield _ncx_head(title, author, uid, self._calculate_max_depth(toc_entries))
         for entry in toc_entries:
-            nav_map_content += entry.to_ncx_navpoint(1)
+            yield from entry.iter_ncx_navpoint(1)
+        yield "</navMap>\n</ncx>"
 
-        return f"""<?xml version='1.0' encoding='utf-8'?>
-<!DOCTYPE ncx PUBLIC '-//NISO//DTD ncx 2005-1//EN' 'http://www.daisy.org/z3986/2005/ncx-2005-1.dtd'>
-<ncx xmlns='http://www.daisy.org/z3986/2005/ncx/' version='2005-1'>
-<head>
-  <meta name='dtb:uid' content='urn:uuid:{uid}'/>
-  <meta name='dtb:depth' content='{max_depth}'/>
-  <meta name='dtb:totalPageCount' content='0'/>
-  <meta name='dtb:maxPageNumber' content='0'/>
-</head>
-<docTitle><text>{html.escape(title)}</text></docTitle>
-<docAuthor><text>{html.escape(author)}</text></docAuthor>
-<navMap>
-{nav_map_content}</navMap>
-</ncx>""".strip()
+    def build_ncx_toc(self, chapters: list[tuple[str, str]], title: str, author: str, uid: str) -> str:
+        """Build NCX format TOC with hierarchical structure"""
+        return "".join(self.iter_ncx_toc(chapters, title, author, uid))
 
-    def build_nav_xhtml(self, chapters: list[tuple[str, str]], title: str) -> str:
-        """Build EPUB3 navigation document with hierarchical structure"""
+    def iter_nav_xhtml(self, chapters: list[tuple[str, str]], title: str) -> Iterator[str]:
+        """Yield the EPUB3 navigation document with hierarchical structure piece by piece"""
         toc_entries = self.analyze_chapters(chapters)
 
-        nav_content = ""
-        for entry in toc_entries:
-            nav_content += entry.to_nav_li(2)
-
-        return f"""<?xml version="1.0" encoding="utf-8"?>
+        yield f"""<?xml version="1.0" encoding="utf-8"?>
 <!DOCTYPE html>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
 <head>
@@ -194,11 +196,18 @@ class EnhancedTocBuilder:
   <nav epub:type="toc" id="toc">
     <h1>Table of Contents</h1>
     <ol>
-{nav_content}    </ol>
+"""
+        for entry in toc_entries:
+            yield from entry.iter_nav_li(2)
+        yield """    </ol>
   </nav>
 </body>
 </html>"""
 
+    def build_nav_xhtml(self, chapters: list[tuple[str, str]], title: str) -> str:
+        """Build EPUB3 navigation document with hierarchical structure"""
+        return "".join(self.iter_nav_xhtml(chapters, title))
+
     def _calculate_max_depth(self, entries: list[TocEntry], current_depth: int = 1) -> int:
         """Calculate maximum depth of TOC hierarchy"""
         max_depth = current_depth
@@ -221,15 +230,15 @@ class EnhancedTocBuilder:
         return nav_points
 
 
-def build_enhanced_toc_ncx(
+def iter_enhanced_toc_ncx(
     chapters: list[tuple[str, str]],
     title: str,
     author: str,
     uid: str,
     hierarchical: bool = True,
-) -> str:
+) -> Iterator[str]:
     """
-    Build TOC in NCX format with optional hierarchical structure.
+    Yield the TOC in NCX format piece by piece, for EpubArchiveWriter.write_stream.
 
     Args:
         chapters: List of (title, content) tuples
@@ -238,28 +247,40 @@ def build_enhanced_toc_ncx(
         uid: Unique identifier
         hierarchical: Whether to build hierarchical TOC (default: True)
 
-    Returns:
-        NCX formatted TOC string
+    Yields:
+        Consecutive pieces of the NCX document
     """
     builder = EnhancedTocBuilder()
 
     if hierarchical:
-        return builder.build_ncx_toc(chapters, title, author, uid)
+        yield from builder.iter_ncx_toc(chapters, title, author, uid)
     else:
         # Fallback to flat structure for compatibility
-        nav_points = builder.get_flat_nav_points(chapters)
-        return f"""<?xml version='1.0' encoding='utf-8'?>
-<!DOCTYPE ncx PUBLIC '-//NISO//DTD ncx 2005-1//EN' 'http://www.daisy.org/z3986/2005/ncx-2005-1.dtd'>
-<ncx xmlns='http://www.daisy.org/z3986/2005/ncx/' version='2005-1'>
-<head>
-  <meta name='dtb:uid' content='urn:uuid:{uid}'/>
-  <meta name='dtb:depth' content='1'/>
-  <meta name='dtb:totalPageCount' content='0'/>
-  <meta name='dtb:maxPageNumber' content='0'/>
-</head>
-<docTitle><text>{html.escape(title)}</text></docTitle>
-<docAuthor><text>{html.escape(author)}</text></docAuthor>
-<navMap>
-  {"  ".join(nav_points)}
-</navMap>
-</ncx>""".strip()
+        yield _ncx_head(title, author, uid, 1)
+        yield "  "
+        for index, nav_point in enumerate(builder.get_flat_nav_points(chapters)):
+            yield f"  {nav_point}" if index else nav_point
+        yield "\n</navMap>\n</ncx>"
+
+
+def build_enhanced_toc_ncx(
+    chapters: list[tuple[str, str]],
+    title: str,
+    author: str,
+    uid: str,
+    hierarchical: bool = True,
+) -> str:
+    """
+    Build TOC in NCX format with optional hierarchical structure.
+
+    Args:
+        chapters: List of (title, content) tuples
+        title: Book title
+        author: Book author
+        uid: Unique identifier
+        hierarchical: Whether to build hierarchical TOC (default: True)
+
+    Returns:
+        NCX formatted TOC string
+    """
+    return "".join(iter_enhanced_toc_ncx(chapters, title, author, uid, hierarchical))
@@ -15,6 +15,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Added threads and compression_level options, read from the epub config
+#   section and coerced by get_epub_build_threads/get_epub_compression_level
+# - create_epub_with_config skips the build when the build manifest shows
+#   unchanged inputs (build_cache option)
+# - Added max_chapter_kb option, coerced by get_epub_max_chapter_bytes, to
+#   split oversized chapters into several XHTML files
+#
+
 """
 Common EPUB generation utilities for EnChANT.
 Provides a unified interface for EPUB creation with configuration support.
@@ -23,16 +32,88 @@ Provides a unified interface for EPUB creation with configuration support.
 from pathlib import Path
 from typing import Any
 import logging
+import time
+
+# Range of zlib compression levels accepted for epub.compression_level
+MIN_COMPRESSION_LEVEL = 0
+MAX_COMPRESSION_LEVEL = 9
+
+# Default of epub.max_chapter_kb, matching DEFAULT_MAX_CHAPTER_BYTES of epub_builders
+DEFAULT_MAX_CHAPTER_KB = 256
 
 # Import the make_epub module functions
 try:
     from .make_epub import create_epub_from_txt_file
 
+    from .epub_build_manifest import check_build_manifest, compute_build_inputs, remove_build_manifest, save_build_manifest
+
     epub_available = True
 except ImportError:
     epub_available = False
 
 
+def get_epub_build_threads(config: dict[str, Any], logger: logging.Logger | None = None) -> int:
+    """
+    Read the number of EPUB build threads from the EPUB configuration.
+
+    Args:
+        config: EPUB configuration dictionary
+        logger: Optional logger for invalid values
+
+    Returns:
+        Number of threads, at least 1
+    """
+    value = config.get("threads", 1)
+    try:
+        return max(1, int(value if value is not None else 1))
+    except (TypeError, ValueError):
+        if logger:
+            logger.warning(f"Invalid epub.threads value {value!r}, using 1")
+        return 1
+
+
+def get_epub_compression_level(config: dict[str, Any], logger: logging.Logger | None = None) -> int | None:
+    """
+    Read the zlib compression level for EPUB entries from the EPUB configuration.
+
+    Args:
+        config: EPUB configuration dictionary
+        logger: Optional logger for invalid values
+
+    Returns:
+        Level clamped to 0-9, or None for the zlib default
+    """
+    value = config.get("compression_level")
+    if value is None:
+        return None
+    try:
+        return min(MAX_COMPRESSION_LEVEL, max(MIN_COMPRESSION_LEVEL, int(value)))
+    except (TypeError, ValueError):
+        if logger:
+            logger.warning(f"Invalid epub.compression_level value {value!r}, using the zlib default")
+        return None
+
+
+def get_epub_max_chapter_bytes(config: dict[str, Any], logger: logging.Logger | None = None) -> int:
+    """
+    Read the chapter size above which chapters are split from the EPUB configuration.
+
+    Args:
+        config: EPUB configuration dictionary
+        logger: Optional logger for invalid values
+
+    Returns:
+        Size in bytes, 0 if splitting is disabled
+    """
+    value = config.get("max_chapter_kb", DEFAULT_MAX_CHAPTER_KB)
+    try:
+        return max(0, int(value if value is not None else 0)) * 1024
+    except (TypeError, ValueError):
+        if logger:
+            logger.warning(f"Invalid epub.max_chapter_kb value {value!r}, using {DEFAULT_MAX_CHAPTER_KB}")
+        return DEFAULT_MAX_CHAPTER_KB * 1024
+
+
 def create_epub_with_config(
     txt_file_path: Path,
     output_path: Path,
@@ -58,6 +139,11 @@ def create_epub_with_config(
             - strict_mode: Whether to abort on validation issues (default: False)
             - custom_css: Optional custom CSS content
             - metadata: Optional additional metadata dict
+            - threads: Worker threads rendering chapters (default: 1)
+            - compression_level: zlib level for EPUB entries (default: zlib default)
+            - max_chapter_kb: Split chapters larger than this into several files,
+              0 to never split (default: 256)
+            - build_cache: Skip the build when its inputs are unchanged (default: True)
         logger: Optional logger instance
 
     Returns:
@@ -90,6 +176,23 @@ def create_epub_with_config(
     language = config.get("language", "en")
     custom_css = config.get("custom_css", None)
     metadata = config.get("metadata", None)
+    threads = get_epub_build_threads(config, logger)
+    compression_level = get_epub_compression_level(config, logger)
+    max_chapter_bytes = get_epub_max_chapter_bytes(config, logger)
+
+    # Skip the build if nothing changed since the last successful one
+    build_inputs = None
+    if config.get("build_cache", True):
+        try:
+            build_inputs = compute_build_inputs(txt_file_path, config)
+        except OSError:
+            build_inputs = None  # The build below reports the missing file
+        if build_inputs is not None and output_path.exists():
+            previous = check_build_manifest(output_path, build_inputs)
+            if previous is not None:
+                if logger:
+                    logger.info(f"EPUB inputs unchanged, skipping rebuild of {output_path} (saved about {previous.build_seconds:.1f}s)")
+                return True, previous.issues
 
     # Log configuration
     if logger:
@@ -97,6 +200,7 @@ def create_epub_with_config(
         logger.debug(f"EPUB configuration: generate_toc={generate_toc}, validate={validate}, strict_mode={strict_mode}, language={language}")
 
     try:
+        build_start = time.perf_counter()
         # Call the make_epub function
         success, issues = create_epub_from_txt_file(
             txt_file_path=txt_file_path,
@@ -110,8 +214,17 @@ def create_epub_with_config(
             language=language,
             custom_css=custom_css,
             metadata=metadata,
+            threads=threads,
+            compression_level=compression_level,
+            max_chapter_bytes=max_chapter_bytes,
         )
 
+        # Record the inputs of a successful build, forget them otherwise
+        if success and build_inputs is not None and output_path.exists():
+            save_build_manifest(output_path, build_inputs, time.perf_counter() - build_start, issues)
+        else:
+            remove_build_manifest(output_path)
+
         # Log results
         if logger:
             if success:
@@ -168,6 +281,10 @@ def get_epub_config_from_book_info(book_info: dict[str, Any], epub_settings: dic
         config["validate"] = epub_settings.get("validate_chapters", True)
         config["strict_mode"] = epub_settings.get("strict_mode", False)
         config["language"] = epub_settings.get("language", "en")
+        config["threads"] = epub_settings.get("threads", 1)
+        config["compression_level"] = epub_settings.get("compression_level")
+        config["max_chapter_kb"] = epub_settings.get("max_chapter_kb", DEFAULT_MAX_CHAPTER_KB)
+        config["build_cache"] = epub_settings.get("build_cache", True)
 
         # Custom CSS if provided
         if epub_settings.get("custom_css"):
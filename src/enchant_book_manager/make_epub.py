@@ -23,6 +23,9 @@
 # - Simplified database fallback logic
 # - Split into smaller modules (chapter_detector, epub_builders, epub_generator, epub_validation)
 # - This file now serves as the main API module, importing from the smaller modules
+# - create_epub_from_txt_file reuses the chapter_index sidecar when the text is unchanged
+# - create_epub_from_txt_file passes threads and compression_level to write_new_epub
+# - create_epub_from_txt_file takes max_chapter_bytes to split oversized chapters
 #
 
 """
@@ -57,11 +60,13 @@ from pathlib import Path
 from typing import Any
 
 # Import from refactored modules
+from .chapter_index import load_chapter_index, save_chapter_index
 from .chapter_detector import (
     split_text,
     detect_issues,
 )
 from .epub_builders import (
+    DEFAULT_MAX_CHAPTER_BYTES,
     paragraphize,
 )
 from .epub_generator import (
@@ -140,6 +145,9 @@ def create_epub_from_txt_file(
     language: str = "en",
     custom_css: str | None = None,
     metadata: dict[str, Any] | None = None,
+    threads: int = 1,
+    compression_level: int | None = None,
+    max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
 ) -> tuple[bool, list[str]]:
     """
     Create an EPUB from a complete translated text file.
@@ -161,6 +169,10 @@ def create_epub_from_txt_file(
             - description: Book description
             - series: Series name
             - series_index: Position in series
+        threads: Worker threads rendering and deflating chapters (1 = serial)
+        compression_level: zlib level for EPUB entries (None = zlib default)
+        max_chapter_bytes: Chapters with a larger body are split into several
+            XHTML files (0 = never split)
 
     Returns:
         Tuple of (success: bool, issues: List[str])
@@ -178,14 +190,23 @@ def create_epub_from_txt_file(
     except Exception as e:
         raise ValidationError(f"Error reading input file: {e}") from e
 
-    # Split text into chapters and detect headings
-    chap_blocks, chapter_sequence = split_text(full_text, detect_headings=generate_toc)
+    # Split text into chapters and detect headings, reusing the sidecar index
+    # from a previous build when the text and the parser are unchanged
+    index = load_chapter_index(txt_file_path, full_text) if generate_toc else None
+    if index is not None:
+        chap_blocks, chapter_sequence, sequence_issues = index.chapters, index.sequence, index.issues
+    else:
+        chap_blocks, chapter_sequence = split_text(full_text, detect_headings=generate_toc)
+        sequence_issues = []
+        if generate_toc:
+            sequence_issues = detect_issues(chapter_sequence)
+            save_chapter_index(txt_file_path, full_text, chap_blocks, chapter_sequence, sequence_issues)
     chapters = [(title, paragraphize(content)) for title, content in chap_blocks]
 
     # Validate chapter sequence if requested
     issues = []
     if validate and generate_toc:
-        issues = detect_issues(chapter_sequence)
+        issues = list(sequence_issues)
         for issue in issues:
             log_issue(issue, {"file": str(txt_file_path), "issue": issue})
 
@@ -211,6 +232,9 @@ def create_epub_from_txt_file(
             language=language,
             custom_css=custom_css,
             metadata=metadata,
+            threads=threads,
+            compression_level=compression_level,
+            max_chapter_bytes=max_chapter_bytes,
         )
         return True, issues
     except Exception as e:
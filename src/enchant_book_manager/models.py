@@ -21,6 +21,8 @@
 # - Added Book, Chunk, Variation classes
 # - Added Field descriptor class
 # - Added in-memory database dictionaries
+# - Book.chapter_map records the chunks every chapter of the source covers
+# - Book.chunking records the parameters the text was split with
 #
 
 """Data models for the EnChANT Book Manager translation system."""
@@ -29,7 +31,10 @@ from __future__ import annotations
 
 import enum
 import threading
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .chinese_headings import ChapterSpan
 
 
 class TranslationState(enum.Enum):
@@ -107,6 +112,10 @@ class Book:
         self.source_file = source_file
         self.total_characters = total_characters
         self.chunks: list[Chunk] = []  # List to hold Chunk instances
+        # Chapter to chunk map of the import, empty if no heading was found
+        self.chapter_map: list[ChapterSpan] = []
+        # Parameters the text was split with (max_chars, balanced, chapter_aware)
+        self.chunking: dict[str, Any] = {}
 
     @classmethod
     def create(cls, **kwargs: Any) -> Book:
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2025 Emasoft
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# CHANGELOG:
+# - Initial creation: multi-process paragraph splitting for large imports
+# - Workers write their paragraphs to a file and return only lengths
+# - split_chinese_text_in_parts_parallel passes the chapters list through
+#
+
+"""
+parallel_import.py - Multi-process text preprocessing for very large imports
+===========================================================================
+
+Advert cleaning and paragraph splitting are pure functions of the text, so a
+large novel can be cut into segments at blank-line boundaries and each segment
+processed in its own process. The decoded text is written once to a
+memory-mapped temporary file; workers receive only byte offsets instead of
+pickled multi-megabyte strings. Each worker writes its cleaned paragraphs,
+joined, to its own output file and returns just their lengths, so no paragraph
+text crosses the process boundary in either direction. Paragraph lists are
+merged in order and packed with the same greedy packer as the sequential path,
+so chunking is identical.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+from .chinese_headings import ChapterSpan
+from .text_processing import clean_adverts
+from .text_splitter import (
+    DEFAULT_MAX_CHARS,
+    pack_paragraphs_balanced,
+    pack_paragraphs_in_parts,
+    split_text_by_actual_paragraphs,
+)
+
+# Texts shorter than this are always processed in the calling process
+PARALLEL_IMPORT_MIN_CHARS = 1_000_000
+
+# Characters on each side of a cut point that are checked for adverts
+# straddling the cut
+ADVERT_CHECK_WINDOW = 512
+
+# A run of whitespace containing at least one empty line
+_BLANK_LINE_RUN_RE = re.compile(r"\n\s*\n\s*")
+
+
+def _normalize_newlines(text: str) -> str:
+    """Apply the newline normalization done by split_text_by_actual_paragraphs."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text.replace("\u2029", "\n\n").replace("\u2028", "\n")
+
+
+def _is_safe_cut(text: str, pos: int) -> bool:
+    """Check that no advert pattern matches across the cut at pos."""
+    left = text[max(0, pos - ADVERT_CHECK_WINDOW) : pos]
+    right = text[pos : pos + ADVERT_CHECK_WINDOW]
+    return clean_adverts(left + right) == clean_adverts(left) + clean_adverts(right)
+
+
+def find_segment_boundaries(text: str, segments: int) -> list[int]:
+    """
+    Find cut points that split text into roughly equal segments.
+
+    Cuts are only placed right after a run of whitespace containing an empty
+    line (a paragraph break), and only where advert cleaning gives the same
+    result on both sides of the cut as on the joined text.
+
+    Args:
+        text: Text with normalized newlines
+        segments: Desired number of segments
+
+    Returns:
+        Sorted list of offsets, starting with 0 and ending with len(text)
+    """
+    boundaries = [0]
+    length = len(text)
+    for k in range(1, segments):
+        search_from = max(k * length // segments, boundaries[-1] + 1)
+        while search_from < length:
+            match = _BLANK_LINE_RUN_RE.search(text, search_from)
+            if match is None or match.end() >= length:
+                search_from = length
+                break
+            if _is_safe_cut(text, match.end()):
+                boundaries.append(match.end())
+                break
+            search_from = match.end()
+        if search_from >= length:
+            break
+    boundaries.append(length)
+    return boundaries
+
+
+def _split_mapped_segment(mapped_path: str, start: int, end: int, output_path: str) -> list[int]:
+    """
+    Worker: split one segment of the mapped file into paragraphs.
+
+    The paragraphs are written, joined, to output_path as UTF-8 and only their
+    lengths are returned to the parent.
+    """
+    with open(mapped_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        segment = mapped[start:end].decode("utf-8")
+    paragraphs = split_text_by_actual_paragraphs(segment)
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        out.write("".join(paragraphs))
+    return [len(paragraph) for paragraph in paragraphs]
+
+
+def _read_paragraphs(output_path: str, lengths: list[int]) -> list[str]:
+    """Slice the paragraphs written by _split_mapped_segment back out of its output file."""
+    with open(output_path, encoding="utf-8", newline="") as f:
+        joined = f.read()
+    paragraphs = []
+    offset = 0
+    for length in lengths:
+        paragraphs.append(joined[offset : offset + length])
+        offset += length
+    return paragraphs
+
+
+def split_text_by_actual_paragraphs_parallel(text: str, workers: int, logger: Optional[Any] = None) -> list[str]:
+    """
+    Parallel equivalent of split_text_by_actual_paragraphs.
+
+    Args:
+        text: Text to split into paragraphs
+        workers: Number of worker processes
+        logger: Optional logger for debug output
+
+    Returns:
+        List of paragraphs with trailing double newlines, identical to
+        split_text_by_actual_paragraphs(text)
+    """
+    if workers <= 1 or len(text) < PARALLEL_IMPORT_MIN_CHARS:
+        return split_text_by_actual_paragraphs(text)
+
+    text = _normalize_newlines(text)
+    boundaries = find_segment_boundaries(text, workers)
+    if len(boundaries) <= 2:
+        return split_text_by_actual_paragraphs(text)
+
+    # Write every segment once to a temp file and hand out byte offsets
+    work_dir = tempfile.mkdtemp(prefix="enchant_import_")
+    try:
+        mapped_path = os.path.join(work_dir, "input.txt")
+        byte_ranges: list[tuple[int, int]] = []
+        offset = 0
+        with open(mapped_path, "wb") as f:
+            for start, end in zip(boundaries, boundaries[1:]):
+                encoded = text[start:end].encode("utf-8")
+                f.write(encoded)
+                byte_ranges.append((offset, offset + len(encoded)))
+                offset += len(encoded)
+
+        if logger is not None:
+            logger.debug(f"Splitting {len(text)} characters in {len(byte_ranges)} segments with {workers} workers")
+
+        output_paths = [os.path.join(work_dir, f"segment_{index}.txt") for index in range(len(byte_ranges))]
+        paragraphs: list[str] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_split_mapped_segment, mapped_path, start, end, output_path) for (start, end), output_path in zip(byte_ranges, output_paths)]
+            for future, output_path in zip(futures, output_paths):
+                paragraphs.extend(_read_paragraphs(output_path, future.result()))
+        return paragraphs
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def split_chinese_text_in_parts_parallel(
+    text: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    workers: int = 1,
+    logger: Optional[Any] = None,
+    balanced: bool = False,
+    chapters: Optional[list[ChapterSpan]] = None,
+) -> list[str]:
+    """
+    Parallel equivalent of split_chinese_text_in_parts.
+
+    Args:
+        text: The Chinese text to split
+        max_chars: Maximum characters per chunk
+        workers: Number of worker processes (1 = sequential)
+        logger: Optional logger for debug output
+        balanced: Spread paragraphs so chunks are near-equal in size
+        chapters: If given, chunk boundaries snap to Chinese chapter headings
+            and one ChapterSpan per heading is appended to this list
+
+    Returns:
+        List of text chunks, identical to the sequential splitter
+    """
+    paragraphs = split_text_by_actual_paragraphs_parallel(text, workers, logger=logger)
+    if balanced:
+        return pack_paragraphs_balanced(paragraphs, max_chars, logger=logger, chapters=chapters)
+    return pack_paragraphs_in_parts(paragraphs, max_chars, logger=logger, chapters=chapters)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: EPUB that grows while a book is being translated
+# - Oversized chapters are split like in write_new_epub (max_chapter_bytes)
+# - use_chapter_map: chapters are cut by the chapter to chunk map of the
+#   import, so chunks starting a chapter are never scanned for headings
+# - mapped_chapter_cuts is a module function, also used to index the chapters
+#   of the translated text file
+# - Completed chapters are published in batches that double the chapters
+#   written, so the appends copy the archive O(log N) times, and every
+#   published EPUB gets the hierarchical TOC of write_epub
+#
+
+"""
+progressive_epub.py - Build an EPUB while translation is still running
+======================================================================
+
+The translation orchestrator feeds every translated chunk, in order, to a
+ProgressiveEpubBuilder. A chapter is complete as soon as the next chapter
+heading has been translated. The first complete chapter is written right
+away with write_new_epub, so a readable partial EPUB is available after the
+first few chunks. Later chapters are collected and appended through
+extend_epub once there are as many of them as chapters already written (and
+by finish), so the archive, which every append copies, is copied O(log N)
+times for N chapters. Each append rewrites the NCX with hierarchical_toc over
+all chapter titles, the TOC strategy of write_new_epub. No full-text
+reparse is needed at the end.
+
+Only the text after the last heading seen so far is kept in memory and
+scanned again when the next chunk arrives. Headings are found with the same
+HEADING_RE and validators as split_text; the multi-part sub-numbering of
+split_text needs the whole book and is not applied.
+
+When the importer found Chinese chapter headings, use_chapter_map hands the
+builder the chapter to chunk map (Book.chapter_map) and add_chunk gets the
+chunk numbers. A chunk without a chapter start then only extends the current
+chapter, and a chunk that starts with a chapter closes it; neither is
+scanned. Only chunks holding chapters that start after their first
+paragraph are searched for the translated headings, and only their own
+text. Chapter numbers come from the Chinese headings.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from .chapter_issues import detect_issues
+from .chapter_patterns import HEADING_RE
+from .chapter_segmenter import find_heading_lines, normalize_line_breaks
+from .chapter_validators import is_valid_chapter_line, parse_num
+from .chinese_headings import ChapterSpan
+from .epub_builders import DEFAULT_MAX_CHAPTER_BYTES, paragraphize
+from .epub_generator import extend_epub, hierarchical_toc, write_new_epub
+
+
+# Tokens every line accepted by HEADING_RE contains (see HEADING_PREFILTER_RE);
+# used with search, so unlike HEADING_PREFILTER_RE it must not span lines
+_HEADING_TOKEN_RE = re.compile(r"ch|part|section|book|\d", re.IGNORECASE)
+
+
+def _is_valid_heading(line: str) -> bool:
+    """Apply the extra validation split_text does on "Chapter ..." lines."""
+    stripped = line.strip().lower()
+    if stripped.startswith("chapter ") or stripped.startswith("chapter\t"):
+        return is_valid_chapter_line(line)
+    return True
+
+
+@dataclass
+class ChapterCut:
+    """A chapter heading in a piece of translated text."""
+
+    title: str
+    number: int
+    start: int  # Offset of the heading line
+    body_start: int  # Offset where the chapter body starts
+
+
+def mapped_chapter_cuts(text: str, spans: list[ChapterSpan], logger: Optional[Any] = None) -> list[ChapterCut]:
+    """
+    Find where the chapters starting in a chunk begin in its translation.
+
+    A chapter at the start of the chunk begins at its first non-blank
+    line. Chapters further in are found by scanning this chunk only; if
+    the scan does not find one heading per chapter, the chapter numbers
+    of the headings found are used instead of those of the map.
+
+    Args:
+        text: Translated text of the chunk, with "\n" line breaks only
+        spans: Chapters whose heading is in this chunk, in order
+        logger: Optional logger
+
+    Returns:
+        One cut per chapter start, in text order
+    """
+    cuts: list[ChapterCut] = []
+    inner = [span for span in spans if span.paragraph > 0]
+    if len(inner) < len(spans):
+        start = len(text) - len(text.lstrip())
+        end = text.find("\n", start)
+        end = len(text) if end == -1 else end
+        cuts.append(ChapterCut(text[start:end].strip() or spans[0].title, spans[0].number, start, end))
+    if inner:
+        found = [heading for heading in find_heading_lines(text, HEADING_RE, parse_num, _is_valid_heading, prefilter=_HEADING_TOKEN_RE) if not cuts or heading.start > cuts[0].start]
+        numbers = [span.number for span in inner]
+        if len(found) != len(inner):
+            if logger:
+                logger.debug(f"Chunk {inner[0].first_chunk}: expected {len(inner)} translated headings, found {len(found)}")
+            numbers = [heading.number for heading in found]
+        cuts.extend(ChapterCut(heading.title, number, heading.start, heading.end) for heading, number in zip(found, numbers))
+    return cuts
+
+
+class ProgressiveEpubBuilder:
+    """Append chapters to an EPUB as the translated chunks covering them arrive."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        title: str,
+        author: str,
+        cover_path: Path | None = None,
+        language: str = "en",
+        custom_css: str | None = None,
+        metadata: dict[str, Any] | None = None,
+        compression_level: int | None = None,
+        max_chapter_bytes: int = DEFAULT_MAX_CHAPTER_BYTES,
+        logger: Optional[Any] = None,
+    ) -> None:
+        """
+        Set up a builder; nothing is written until the first chapter is complete.
+
+        Args:
+            output_path: Path of the EPUB to create
+            title: Book title
+            author: Book author
+            cover_path: Optional path to cover image
+            language: Language code for the book
+            custom_css: Optional custom CSS content
+            metadata: Optional metadata dict for the OPF
+            compression_level: zlib level for EPUB entries (None = zlib default)
+            max_chapter_bytes: Largest chapter body per XHTML file (0 = never split)
+            logger: Optional logger
+        """
+        self.output_path = output_path
+        self.title = title
+        self.author = author
+        self.cover_path = cover_path
+        self.language = language
+        self.custom_css = custom_css
+        self.metadata = metadata
+        self.compression_level = compression_level
+        self.max_chapter_bytes = max_chapter_bytes
+        self.logger = logger
+
+        self.chapters_written = 0
+        # Complete chapters not yet in the EPUB, and the titles of all chapters
+        self._unwritten: list[tuple[str, str]] = []
+        self._toc_titles: list[tuple[str, str]] = []
+        self.sequence: list[int] = []
+        self.issues: list[str] = []
+        self.failed = False
+        self.completed = False
+
+        # Text not yet written, starting at the heading of the current chapter
+        self._pending = ""
+        # The chapter whose heading starts _pending, None before the first heading
+        self._current: ChapterCut | None = None
+
+        # Chapter map mode: chapters starting in each chunk, and the title
+        # (None before the first heading) and body pieces of the open chapter
+        self._starts_by_chunk: dict[int, list[ChapterSpan]] = {}
+        self._mapped = False
+        self._title: str | None = None
+        self._body: list[str] = []
+
+    def use_chapter_map(self, chapter_map: list[ChapterSpan]) -> None:
+        """
+        Cut chapters by the chapter to chunk map instead of scanning the text.
+
+        Must be called before the first chunk; add_chunk must then be given
+        the chunk numbers.
+
+        Args:
+            chapter_map: Book.chapter_map of the book being translated
+        """
+        self._starts_by_chunk = {}
+        for span in chapter_map:
+            self._starts_by_chunk.setdefault(span.first_chunk, []).append(span)
+
+    def add_chunk(self, text: str, chunk_number: int | None = None) -> None:
+        """
+        Add the next translated chunk and write every chapter it completes.
+
+        Args:
+            text: Translated text of the chunk
+            chunk_number: chunk_number of the chunk, needed with a chapter map
+        """
+        if self.failed or self.completed:
+            return
+        if self._starts_by_chunk and chunk_number is not None:
+            self._mapped = True
+            self._write_chapters(self._take_mapped_chapters(normalize_line_breaks(text), chunk_number))
+            return
+        if self._pending:
+            self._pending += "\n"
+        self._pending += f"\n{normalize_line_breaks(text)}\n"
+        self._write_chapters(self._take_complete_chapters())
+
+    def finish(self) -> bool:
+        """
+        Write the last chapter and check the chapter sequence.
+
+        Returns:
+            True if the EPUB is complete
+        """
+        if self.failed:
+            return False
+        if self.completed:
+            return True
+
+        if self._mapped:
+            chapters = [self._close_mapped_chapter(final=True)]
+        else:
+            chapters = self._take_complete_chapters()
+            segments = self._segments()
+            if segments:
+                last = segments[-1]
+                chapters.append((last.title, self._pending[last.body_start :].strip()))
+            else:
+                # No heading in the whole book, like split_text
+                chapters.append(("Content", self._pending.strip()))
+        self._pending = ""
+        self._write_chapters(chapters)
+        self._publish(final=True)
+        if self.failed:
+            return False
+
+        self.issues = detect_issues(self.sequence)
+        if self.logger:
+            self.logger.info(f"Progressive EPUB completed with {self.chapters_written} chapters: {self.output_path}")
+            if self.issues:
+                self.logger.warning(f"EPUB created with {len(self.issues)} validation warnings")
+                for issue in self.issues[:5]:
+                    self.logger.warning(f"  - {issue}")
+        self.completed = True
+        return True
+
+    def _segments(self) -> list[ChapterCut]:
+        """
+        Split _pending at its chapter headings.
+
+        Returns:
+            One segment per heading, starting with the current chapter if any
+        """
+        segments: list[ChapterCut] = []
+        if self._current is not None:
+            segments.append(ChapterCut(self._current.title, self._current.number, 0, self._current.body_start))
+
+        for heading in find_heading_lines(self._pending, HEADING_RE, parse_num, _is_valid_heading, prefilter=_HEADING_TOKEN_RE):
+            if segments and heading.start == segments[-1].start:
+                continue
+            if segments and heading.number == segments[-1].number and not self._pending[segments[-1].body_start : heading.start].strip():
+                # Same heading again after blank lines only: split_text keeps the first one
+                segments[-1].body_start = heading.end
+                continue
+            segments.append(ChapterCut(heading.title, heading.number, heading.start, heading.end))
+        return segments
+
+    def _take_complete_chapters(self) -> list[tuple[str, str]]:
+        """
+        Cut the chapters that are followed by another heading out of _pending.
+
+        Returns:
+            List of (title, plain text body) tuples ready to be written
+        """
+        segments = self._segments()
+        new_segments = segments[1:] if self._current is not None else segments
+        if not new_segments:
+            return []
+
+        chapters: list[tuple[str, str]] = []
+        if self._current is None:
+            front = self._pending[: segments[0].start].strip()
+            if front:
+                chapters.append(("Front Matter", front))
+        for segment, following in zip(segments, segments[1:]):
+            chapters.append((segment.title, self._pending[segment.body_start : following.start].strip()))
+
+        self.sequence.extend(segment.number for segment in new_segments)
+        last = segments[-1]
+        self._current = ChapterCut(last.title, last.number, 0, last.body_start - last.start)
+        self._pending = self._pending[last.start :]
+        return chapters
+
+    def _close_mapped_chapter(self, final: bool = False) -> tuple[str, str]:
+        """Return the open chapter of chapter map mode as (title, body)."""
+        body = "\n\n".join(self._body).strip()
+        self._body = []
+        if self._title is not None:
+            return (self._title, body)
+        # Text before the first heading, or a book without headings
+        return ("Content" if final and not self.sequence else "Front Matter", body)
+
+    def _take_mapped_chapters(self, text: str, chunk_number: int) -> list[tuple[str, str]]:
+        """
+        Add a chunk in chapter map mode and cut the chapters it completes.
+
+        Args:
+            text: Translated text of the chunk, with "\n" line breaks only
+            chunk_number: chunk_number of the chunk
+
+        Returns:
+            List of (title, plain text body) tuples ready to be written
+        """
+        spans = self._starts_by_chunk.get(chunk_number)
+        cuts = mapped_chapter_cuts(text, spans, self.logger) if spans else []
+        if not cuts:
+            self._body.append(text)
+            return []
+
+        self._body.append(text[: cuts[0].start])
+        chapters: list[tuple[str, str]] = []
+        for cut, following in zip(cuts, [*cuts[1:], None]):
+            title, body = self._close_mapped_chapter()
+            if self._title is not None or body:
+                chapters.append((title, body))
+            self._title = cut.title
+            self.sequence.append(cut.number)
+            self._body = [text[cut.body_start : following.start if following else len(text)]]
+        return chapters
+
+    def _write_chapters(self, chapters: list[tuple[str, str]]) -> None:
+        """Queue complete chapters and write them once the batch is large enough."""
+        if self.failed:
+            return
+        self._unwritten.extend(chapters)
+        self._publish()
+
+    def _publish(self, final: bool = False) -> None:
+        """
+        Write the queued chapters to the EPUB, creating it on the first call.
+
+        The EPUB is created with the first chapter; after that the queued
+        chapters are appended when there are as many of them as chapters in
+        the EPUB, or when the book is finished.
+
+        Args:
+            final: Write the queued chapters whatever their number
+        """
+        if self.failed or not self._unwritten:
+            return
+        if not final and len(self._unwritten) < max(1, self.chapters_written):
+            return
+
+        batch, self._unwritten = self._unwritten, []
+        html_chapters = [(title, paragraphize(body)) for title, body in batch]
+        toc_titles = [*self._toc_titles, *((title, "") for title, _ in batch)]
+        try:
+            if self.chapters_written == 0:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                write_new_epub(
+                    html_chapters,
+                    self.output_path,
+                    self.title,
+                    self.author,
+                    self.cover_path,
+                    language=self.language,
+                    custom_css=self.custom_css,
+                    metadata=self.metadata,
+                    compression_level=self.compression_level,
+                    max_chapter_bytes=self.max_chapter_bytes,
+                )
+            else:
+                extend_epub(
+                    self.output_path,
+                    html_chapters,
+                    compression_level=self.compression_level,
+                    max_chapter_bytes=self.max_chapter_bytes,
+                    toc=hierarchical_toc,
+                    toc_chapters=toc_titles,
+                )
+        except Exception as e:
+            # The EPUB phase will build the book from the full text instead
+            self.failed = True
+            if self.logger:
+                self.logger.warning(f"Progressive EPUB disabled after an error: {e}")
+            return
+
+        self._toc_titles = toc_titles
+        self.chapters_written += len(html_chapters)
+        if self.logger:
+            self.logger.info(f"Progressive EPUB: {self.chapters_written} chapters written to {self.output_path.name}")
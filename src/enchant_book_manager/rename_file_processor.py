@@ -24,7 +24,7 @@ from pathlib import Path
 from json import JSONDecodeError
 from typing import Any, cast
 
-from .common_file_utils import decode_full_file
+from .common_file_utils import decode_file_prefix, decode_full_file
 from .common_utils import sanitize_filename as common_sanitize_filename
 from .icloud_sync import ICloudSync, ICloudSyncError
 from .rename_api_client import RenameAPIClient
@@ -68,9 +68,12 @@ def decode_file_content(file_path: Path, kb_to_read: int, icloud_sync: ICloudSyn
     """
     Decode file content using common_file_utils with size limit.
 
+    Only the first kb_to_read KB of the file are read and decoded; the text is
+    cut at a character boundary so multibyte encodings are never split.
+
     Args:
         file_path: Path to the file to decode
-        kb_to_read: KB to read from file start
+        kb_to_read: KB to read from file start (0 reads the whole file)
         icloud_sync: iCloud sync handler
 
     Returns:
@@ -83,15 +86,12 @@ def decode_file_content(file_path: Path, kb_to_read: int, icloud_sync: ICloudSyn
         return None
 
     try:
-        # Use the common file utils with size limit
-        content = decode_full_file(synced_path, logger=logger)
-
-        if content and kb_to_read:
-            # Limit to requested size (approximate character limit)
-            char_limit = kb_to_read * 1024  # Rough character estimate
-            if len(content) > char_limit:
-                content = content[:char_limit]
+        if not kb_to_read:
+            return decode_full_file(synced_path, logger=logger)
 
+        # Read only the prefix we need instead of decoding the whole novel
+        content, bytes_read = decode_file_prefix(synced_path, kb_to_read * 1024, logger=logger)
+        logger.info(f"Read {bytes_read} bytes from '{synced_path.name}' for metadata extraction")
         return content
 
     except Exception as e:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# HERE IS THE CHANGELOG FOR THIS VERSION OF THE CODE:
+# - Initial creation: shared repeated-character engine
+# - Replaces the per-character loop of limit_repeated_chars and the
+#   per-match callback of clean_repeated_chars with precompiled rule tables
+#
+
+"""
+repeated_chars.py - Repeated character normalization engine
+===========================================================
+
+Both limit_repeated_chars (text_processing) and clean_repeated_chars
+(text_validators) run on every chunk. Their rules are turned into compiled
+regular expressions once, so the scan over the text happens inside the regex
+engine and Python code only runs for the rare runs that must be shortened.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from .text_constants import (
+    ALL_PUNCTUATION,
+    CHINESE_PUNCTUATION,
+    ENGLISH_PUNCTUATION,
+    PRESERVE_UNLIMITED,
+)
+from .translation_constants import PRESERVE_UNLIMITED as TRANSLATION_PRESERVE_UNLIMITED
+
+# Maximum repetitions kept by limit_repeated_chars for ordinary characters
+DEFAULT_MAX_REPEATS = 3
+
+
+def _char_class(chars: set[str] | frozenset[str]) -> str:
+    """Build the body of a regex character class matching any of chars."""
+    # Multi-character entries can never equal a single character, so skip them
+    return "".join(re.escape(char) for char in sorted(chars) if len(char) == 1)
+
+
+@dataclass(frozen=True)
+class RepeatedCharRules:
+    """Precompiled rules for one variant of limit_repeated_chars."""
+
+    limit_to_one: frozenset[str]
+    pattern: re.Pattern[str]
+
+    def apply(self, text: str) -> str:
+        """Normalize repeated character runs in text according to these rules."""
+        return self.pattern.sub(_limit_run, text)
+
+
+def _limit_run(match: re.Match[str]) -> str:
+    """Shorten one run found by a RepeatedCharRules pattern."""
+    punctuation = match.group(1)
+    if punctuation is not None:
+        return punctuation
+    char = match.group(2)
+    # Numbers in any script keep all their repetitions
+    if char.isnumeric():
+        return match.group(0)
+    return char * DEFAULT_MAX_REPEATS
+
+
+def build_limit_rules(force_chinese: bool = False, force_english: bool = False) -> RepeatedCharRules:
+    """
+    Compile the rules used by limit_repeated_chars.
+
+    Runs of non-exempt punctuation collapse to one character, characters in
+    PRESERVE_UNLIMITED and numbers are never touched, and every other run is
+    capped at DEFAULT_MAX_REPEATS.
+
+    Args:
+        force_chinese: Force Chinese punctuation to single occurrence
+        force_english: Force English punctuation to single occurrence
+
+    Returns:
+        Compiled rules for this variant
+    """
+    limit_to_one = set(ALL_PUNCTUATION)
+    if force_chinese:
+        limit_to_one |= CHINESE_PUNCTUATION
+    if force_english:
+        limit_to_one |= ENGLISH_PUNCTUATION
+    limit_to_one -= PRESERVE_UNLIMITED
+
+    excluded = limit_to_one | PRESERVE_UNLIMITED
+    pattern = re.compile(
+        f"([{_char_class(limit_to_one)}])\\1+|([^{_char_class(excluded)}])\\2{{{DEFAULT_MAX_REPEATS},}}",
+        re.DOTALL,
+    )
+    return RepeatedCharRules(limit_to_one=frozenset(limit_to_one), pattern=pattern)
+
+
+# Rule table for every force_chinese/force_english combination
+LIMIT_RULES: dict[tuple[bool, bool], RepeatedCharRules] = {(force_chinese, force_english): build_limit_rules(force_chinese, force_english) for force_chinese in (False, True) for force_english in (False, True)}
+
+# Compiled clean_repeated_chars patterns, keyed by max_allowed
+_CLEAN_PATTERNS: dict[int, re.Pattern[str]] = {}
+
+
+def limit_runs(text: str, force_chinese: bool = False, force_english: bool = False) -> str:
+    """Apply the limit_repeated_chars rules for the given variant."""
+    return LIMIT_RULES[(bool(force_chinese), bool(force_english))].apply(text)
+
+
+def cap_runs(text: str, max_allowed: int = 4) -> str:
+    """
+    Cap every run of a repeated character at max_allowed occurrences.
+
+    Characters in translation_constants.PRESERVE_UNLIMITED and newlines are
+    never touched. The replacement is a plain template, so no Python code runs
+    per match.
+
+    Args:
+        text: Text to clean
+        max_allowed: Maximum allowed repetitions
+
+    Returns:
+        Text with capped character runs
+    """
+    pattern = _CLEAN_PATTERNS.get(max_allowed)
+    if pattern is None:
+        excluded = _char_class(TRANSLATION_PRESERVE_UNLIMITED | {"\n"})
+        pattern = re.compile(f"([^{excluded}])\\1{{{max(max_allowed, 1)},}}")
+        _CLEAN_PATTERNS[max_allowed] = pattern
+    return pattern.sub(r"\1" * max(max_allowed, 0), text)
@@ -5,6 +5,8 @@
 # - Initial creation from common_text_utils.py refactoring
 # - Extracted text processing functions
 # - Contains functions for cleaning, normalizing, and processing text
+# - limit_repeated_chars now uses the precompiled rules of repeated_chars
+# - Added iter_without_excess_empty_lines for text written in pieces
 #
 
 """
@@ -16,12 +18,9 @@ functions used across multiple EnChANT modules.
 """
 
 import re
-from .text_constants import (
-    PRESERVE_UNLIMITED,
-    ALL_PUNCTUATION,
-    CHINESE_PUNCTUATION,
-    ENGLISH_PUNCTUATION,
-)
+from collections.abc import Iterable, Iterator
+
+from .repeated_chars import limit_runs
 
 
 def clean(text: str) -> str:
@@ -101,43 +100,7 @@ def limit_repeated_chars(text: str, force_chinese: bool = False, force_english:
         Text with normalized repeated characters
     """
 
-    # Determine which punctuation to limit
-    limit_to_one = ALL_PUNCTUATION.copy()
-
-    # Adjust based on force options
-    if force_chinese:
-        limit_to_one |= CHINESE_PUNCTUATION
-    if force_english:
-        limit_to_one |= ENGLISH_PUNCTUATION
-
-    # Remove exemptions
-    limit_to_one -= PRESERVE_UNLIMITED
-
-    # Process the text character by character
-    result = []
-    i = 0
-    while i < len(text):
-        char = text[i]
-
-        # Count consecutive occurrences
-        count = 1
-        while i + count < len(text) and text[i + count] == char:
-            count += 1
-
-        # Apply rules
-        if char in limit_to_one:
-            # Limit to 1 occurrence
-            result.append(char)
-        elif char.isnumeric() or char in PRESERVE_UNLIMITED:
-            # Preserve all occurrences
-            result.append(char * count)
-        else:
-            # Limit to 3 occurrences for other characters
-            result.append(char * min(count, 3))
-
-        i += count
-
-    return "".join(result)
+    return limit_runs(text, force_chinese=force_chinese, force_english=force_english)
 
 
 def remove_excess_empty_lines(text: str, max_empty_lines: int = 2) -> str:
@@ -157,6 +120,36 @@ def remove_excess_empty_lines(text: str, max_empty_lines: int = 2) -> str:
     return re.sub(pattern, replacement, text)
 
 
+def iter_without_excess_empty_lines(pieces: Iterable[str], max_empty_lines: int = 2) -> Iterator[str]:
+    """
+    Remove excessive empty lines from text given as a sequence of pieces.
+
+    The yielded strings concatenate to
+    remove_excess_empty_lines("".join(pieces), max_empty_lines), including
+    runs of newlines that span several pieces, but the joined text is never
+    built.
+
+    Args:
+        pieces: Consecutive pieces of the input text
+        max_empty_lines: Maximum number of consecutive empty lines to keep
+
+    Yields:
+        Consecutive pieces of the output text
+    """
+    # Newlines at the end of the pieces seen so far, not yet yielded
+    pending = 0
+    for piece in pieces:
+        body = piece.strip("\n")
+        if not body:
+            pending += len(piece)
+            continue
+        leading = len(piece) - len(piece.lstrip("\n"))
+        yield "\n" * min(pending + leading, max_empty_lines) + remove_excess_empty_lines(body, max_empty_lines)
+        pending = len(piece) - len(piece.rstrip("\n"))
+    if pending:
+        yield "\n" * min(pending, max_empty_lines)
+
+
 def normalize_spaces(text: str) -> str:
     """
     Normalize various types of spaces and whitespace characters.
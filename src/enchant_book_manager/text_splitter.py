@@ -21,6 +21,11 @@
 # - Added paragraph-based splitting
 # - Added buffer flushing utility
 # - Imported punctuation constants from common_text_utils
+# - Extracted paragraph packing into pack_paragraphs_in_parts
+# - Added balanced packing mode (pack_paragraphs_balanced)
+# - Oversized paragraphs are sub-split at sentence/clause punctuation
+# - Chunk boundaries can snap to Chinese chapter headings; the packers then
+#   fill a chapters list with the chapter to chunk map
 #
 
 """Text splitting utilities for Chinese novel processing."""
@@ -28,8 +33,11 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import Optional, Any
 
+from .chinese_headings import ChapterSpan, ChineseHeading, match_chinese_heading
 from .common_text_utils import (
     ALL_PUNCTUATION,
     CLOSING_QUOTES,
@@ -91,6 +99,102 @@ PRESERVE_UNLIMITED = {
     "$",
 }.union(PARAGRAPH_DELIMITERS)
 
+# Clause punctuation used to sub-split a sentence that is still over the limit
+CLAUSE_BREAKS = {"，", "、", "：", "；", ",", ":"}
+
+# Quotes and brackets that stay attached to the sentence they close
+_SENTENCE_CLOSERS = CLOSING_QUOTES | {"”", "’", "』", "）", ")"}
+
+
+def _punctuation_run_pattern(ending: set[str], closers: set[str]) -> re.Pattern[str]:
+    """Compile a pattern matching a run of ending punctuation plus its closers."""
+    ending_class = "".join(re.escape(char) for char in sorted(ending))
+    closers_class = "".join(re.escape(char) for char in sorted(closers))
+    return re.compile(f"[{ending_class}]+[{closers_class}]*")
+
+
+_SENTENCE_END_RE = _punctuation_run_pattern(SENTENCE_ENDING, _SENTENCE_CLOSERS)
+_CLAUSE_END_RE = _punctuation_run_pattern(CLAUSE_BREAKS, _SENTENCE_CLOSERS)
+
+
+def _split_after(pattern: re.Pattern[str], text: str) -> list[str]:
+    """Split text right after every match of pattern, keeping all characters."""
+    pieces = []
+    start = 0
+    for match in pattern.finditer(text):
+        if match.end() > start:
+            pieces.append(text[start : match.end()])
+            start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def split_oversized_paragraph(paragraph: str, max_chars: int) -> list[str]:
+    """
+    Sub-split a paragraph longer than max_chars into pieces that fit.
+
+    Splits after sentence-ending punctuation (with any closing quotes), then
+    after clause punctuation for sentences that are still too long, and as a
+    last resort cuts at max_chars. Joining the pieces gives back the
+    paragraph; only the last piece keeps the trailing paragraph break.
+
+    Args:
+        paragraph: Paragraph with trailing double newline
+        max_chars: Maximum characters per piece
+
+    Returns:
+        List of pieces, each at most max_chars characters long
+    """
+    if len(paragraph) <= max_chars:
+        return [paragraph]
+
+    body = paragraph.rstrip("\n")
+    ending = paragraph[len(body) :]
+    budget = max(1, max_chars - len(ending))
+
+    pieces: list[str] = []
+    for sentence in _split_after(_SENTENCE_END_RE, body):
+        if len(sentence) <= budget:
+            pieces.append(sentence)
+            continue
+        for clause in _split_after(_CLAUSE_END_RE, sentence):
+            if len(clause) <= budget:
+                pieces.append(clause)
+            else:
+                pieces.extend(clause[i : i + budget] for i in range(0, len(clause), budget))
+
+    pieces[-1] += ending
+    return pieces
+
+
+def split_oversized_paragraphs(paragraphs: list[str], max_chars: int) -> tuple[list[str], int]:
+    """
+    Replace every paragraph longer than max_chars by its sub-split pieces.
+
+    Args:
+        paragraphs: Paragraphs as returned by split_text_by_actual_paragraphs
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Tuple of (pieces, number of paragraphs that had to be sub-split)
+    """
+    pieces: list[str] = []
+    oversized = 0
+    for para in paragraphs:
+        if len(para) > max_chars:
+            oversized += 1
+            pieces.extend(split_oversized_paragraph(para, max_chars))
+        else:
+            pieces.append(para)
+    return pieces, oversized
+
+
+def _log_oversized(oversized: int, max_chars: int, logger: Optional[Any]) -> None:
+    """Report how many paragraphs needed sentence-level splitting."""
+    if logger is not None and oversized:
+        logger.info(f"{oversized} paragraph(s) longer than {max_chars} characters were split at sentence boundaries")
+
 
 def flush_buffer(buffer: str, paragraphs: list[str]) -> str:
     """
@@ -267,23 +371,175 @@ def split_text_by_actual_paragraphs(text: str) -> list[str]:
     return paragraphs
 
 
-def split_chinese_text_in_parts(text: str, max_chars: int = DEFAULT_MAX_CHARS, logger: Optional[Any] = None) -> list[str]:
+def split_chinese_text_in_parts(
+    text: str,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    logger: Optional[Any] = None,
+    balanced: bool = False,
+    chapters: Optional[list[ChapterSpan]] = None,
+) -> list[str]:
     """
     Split Chinese novel text into chunks of maximum character length.
 
-    Keeps paragraphs intact when splitting.
+    Keeps paragraphs intact when splitting, except paragraphs longer than
+    max_chars, which are sub-split at sentence boundaries.
 
     Args:
         text: The Chinese text to split
         max_chars: Maximum characters per chunk
         logger: Optional logger for debug output
+        balanced: Spread paragraphs so chunks are near-equal in size
+        chapters: If given, chunk boundaries snap to Chinese chapter headings
+            and one ChapterSpan per heading is appended to this list
 
     Returns:
         List of text chunks
     """
     # Always use the new function that splits on actual paragraph breaks
     paragraphs = split_text_by_actual_paragraphs(text)
+    if balanced:
+        return pack_paragraphs_balanced(paragraphs, max_chars, logger=logger, chapters=chapters)
+    return pack_paragraphs_in_parts(paragraphs, max_chars, logger=logger, chapters=chapters)
+
 
+def split_oversized_with_headings(paragraphs: list[str], max_chars: int) -> tuple[list[str], list[ChineseHeading | None], int]:
+    """
+    Sub-split oversized paragraphs and find the chapter heading of every piece.
+
+    Headings are detected on the whole paragraph, before it is sub-split, so
+    only the first piece of a paragraph can carry one.
+
+    Args:
+        paragraphs: Paragraphs as returned by split_text_by_actual_paragraphs
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Tuple of (pieces, heading or None for each piece, number of
+        paragraphs that had to be sub-split)
+    """
+    pieces: list[str] = []
+    headings: list[ChineseHeading | None] = []
+    oversized = 0
+    for para in paragraphs:
+        parts = [para]
+        if len(para) > max_chars:
+            oversized += 1
+            parts = split_oversized_paragraph(para, max_chars)
+        pieces.extend(parts)
+        headings.append(match_chinese_heading(para))
+        headings.extend([None] * (len(parts) - 1))
+    return pieces, headings, oversized
+
+
+def _snapped_boundaries(lengths: list[int], starts: list[int], max_chars: int) -> list[int]:
+    """
+    Place chunk boundaries greedily, snapping them back to chapter starts.
+
+    When the next paragraph does not fit, the chunk ends before the last
+    chapter start it holds (other than its first paragraph), so that chapter
+    moves whole to the next chunk. Without a chapter start the chunk ends at
+    the paragraph, as in pack_paragraphs_in_parts. A chapter that is larger
+    than max_chars on its own still starts a chunk and fills as many as it
+    needs.
+
+    Args:
+        lengths: Paragraph lengths; none may exceed max_chars
+        starts: Indices of the paragraphs that start a chapter, in order
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Paragraph indices where each chunk ends (exclusive), in order
+    """
+    prefix = list(accumulate(lengths, initial=0))
+    is_start = set(starts)
+    boundaries: list[int] = []
+    chunk_start = 0
+    last_start: int | None = None
+    for index in range(len(lengths)):
+        if index > chunk_start and prefix[index + 1] - prefix[chunk_start] > max_chars:
+            if last_start is not None:
+                boundaries.append(last_start)
+                chunk_start = last_start
+                last_start = None
+            if prefix[index + 1] - prefix[chunk_start] > max_chars:
+                boundaries.append(index)
+                chunk_start = index
+        if index > chunk_start and index in is_start:
+            last_start = index
+    boundaries.append(len(lengths))
+    return boundaries
+
+
+def _chapter_spans(boundaries: list[int], headings: list[ChineseHeading | None]) -> list[ChapterSpan]:
+    """
+    Map every chapter heading to the chunks its chapter covers.
+
+    Args:
+        boundaries: Paragraph indices where each chunk ends (exclusive)
+        headings: Heading or None for every paragraph
+
+    Returns:
+        One ChapterSpan per heading, in text order
+    """
+    starts = [(index, heading) for index, heading in enumerate(headings) if heading is not None]
+    spans: list[ChapterSpan] = []
+    for position, (index, heading) in enumerate(starts):
+        # The chapter runs to the paragraph before the next heading
+        end = starts[position + 1][0] - 1 if position + 1 < len(starts) else len(headings) - 1
+        first = bisect_right(boundaries, index)
+        chunk_start = boundaries[first - 1] if first else 0
+        spans.append(ChapterSpan(heading.number, heading.unit, heading.title, first + 1, bisect_right(boundaries, end) + 1, index - chunk_start))
+    return spans
+
+
+def _pack_by_chapters(
+    paragraphs: list[str],
+    max_chars: int,
+    chapters: list[ChapterSpan],
+    balanced: bool,
+    logger: Optional[Any],
+) -> list[str]:
+    """Pack paragraphs with boundaries snapped to chapter headings and record the chapter map."""
+    paragraphs, headings, oversized = split_oversized_with_headings(paragraphs, max_chars)
+    _log_oversized(oversized, max_chars, logger)
+
+    lengths = [len(para) for para in paragraphs]
+    starts = [index for index, heading in enumerate(headings) if heading is not None]
+    boundaries = _balanced_boundaries(lengths, max_chars, snap_to=starts) if balanced else _snapped_boundaries(lengths, starts, max_chars)
+
+    chunks: list[str] = []
+    start = 0
+    for end in boundaries:
+        chunks.append("".join(paragraphs[start:end]))
+        start = end
+    chapters.extend(_chapter_spans(boundaries, headings))
+
+    if logger is not None:
+        straddling = sum(1 for span in chapters if span.paragraph > 0 and span.last_chunk > span.first_chunk)
+        logger.debug(f"\n -> Import COMPLETE (chapter-aware).\n  Total number of paragraphs: {len(paragraphs)}\n  Total number of chunks: {len(chunks)}\n  Chapters: {len(chapters)}, starting mid-chunk and spanning chunks: {straddling}\n")
+
+    return chunks
+
+
+def pack_paragraphs_in_parts(
+    paragraphs: list[str],
+    max_chars: int = DEFAULT_MAX_CHARS,
+    logger: Optional[Any] = None,
+    chapters: Optional[list[ChapterSpan]] = None,
+) -> list[str]:
+    """
+    Pack already split paragraphs into chunks of maximum character length.
+
+    Args:
+        paragraphs: Paragraphs as returned by split_text_by_actual_paragraphs
+        max_chars: Maximum characters per chunk
+        logger: Optional logger for debug output
+        chapters: If given, chunk boundaries snap to Chinese chapter headings
+            and one ChapterSpan per heading is appended to this list
+
+    Returns:
+        List of text chunks
+    """
     chunks = list()
     chunks_counter = 1
     current_char_count = 0
@@ -295,6 +551,13 @@ def split_chinese_text_in_parts(text: str, max_chars: int = DEFAULT_MAX_CHARS, l
     if not paragraphs or all(not p.strip() for p in paragraphs):
         return [""]
 
+    if chapters is not None:
+        return _pack_by_chapters(paragraphs, max_chars, chapters, balanced=False, logger=logger)
+
+    # Paragraphs over the limit are cut at sentence boundaries first
+    paragraphs, oversized = split_oversized_paragraphs(paragraphs, max_chars)
+    _log_oversized(oversized, max_chars, logger)
+
     for para in paragraphs:
         # CHECK IF THE CURRENT PARAGRAPHS BUFFER HAS REACHED
         # THE CHARACTERS LIMIT AND IN SUCH CASE SAVE AND EMPTY THE PARAGRAPHS BUFFER
@@ -324,3 +587,125 @@ def split_chinese_text_in_parts(text: str, max_chars: int = DEFAULT_MAX_CHARS, l
         logger.debug(f"\n -> Import COMPLETE.\n  Total number of paragraphs: {str(paragraph_index)}\n  Total number of chunks: {str(chunks_counter)}\n")
 
     return chunks
+
+
+def _greedy_chunk_count(prefix: list[int], capacity: int) -> int:
+    """Count the chunks needed to cover prefix-summed lengths with a capacity."""
+    count = 0
+    start = 0
+    last = len(prefix) - 1
+    while start < last:
+        start = bisect_right(prefix, prefix[start] + capacity) - 1
+        count += 1
+    return count
+
+
+def _balanced_boundaries(lengths: list[int], max_chars: int, snap_to: Optional[list[int]] = None) -> list[int]:
+    """
+    Place chunk boundaries so chunks are near-equal in size.
+
+    Uses the smallest chunk count the greedy packer would need, then finds the
+    smallest capacity that still fits in that many chunks (linear partition
+    by binary search) and puts each boundary at the paragraph break closest to
+    its ideal position, without breaking the capacity of the later chunks.
+    With snap_to, a boundary moves to the closest of those paragraphs that
+    keeps every chunk within the capacity, if there is one.
+
+    Args:
+        lengths: Paragraph lengths; none may exceed max_chars
+        max_chars: Maximum characters per chunk
+        snap_to: Sorted paragraph indices preferred as boundaries (chapter starts)
+
+    Returns:
+        Paragraph indices where each chunk ends (exclusive), in order
+    """
+    prefix = list(accumulate(lengths, initial=0))
+    total = prefix[-1]
+    count = len(lengths)
+    chunks = _greedy_chunk_count(prefix, max_chars)
+    if chunks <= 1:
+        return [count]
+
+    # Smallest capacity that still fits everything in the same number of chunks
+    low = max(max(lengths), -(-total // chunks))
+    high = max_chars
+    while low < high:
+        middle = (low + high) // 2
+        if _greedy_chunk_count(prefix, middle) <= chunks:
+            high = middle
+        else:
+            low = middle + 1
+    capacity = low
+
+    # earliest[m]: first paragraph that the last m chunks can start from
+    earliest = [count]
+    for _ in range(chunks):
+        earliest.append(bisect_left(prefix, prefix[earliest[-1]] - capacity))
+
+    boundaries = []
+    previous = 0
+    for j in range(1, chunks):
+        lowest = max(earliest[chunks - j], previous + 1)
+        highest = min(bisect_right(prefix, prefix[previous] + capacity) - 1, count - (chunks - j))
+        target = total * j / chunks
+        index = bisect_left(prefix, target)
+        if index > 0 and target - prefix[index - 1] <= prefix[min(index, count)] - target:
+            index -= 1
+        previous = min(max(index, lowest), highest)
+        if snap_to:
+            # Closest preferred boundary on either side that still fits
+            position = bisect_left(snap_to, previous)
+            candidates = [start for start in snap_to[max(position - 1, 0) : position + 1] if lowest <= start <= highest]
+            if candidates:
+                previous = min(candidates, key=lambda start: abs(prefix[start] - target))
+        boundaries.append(previous)
+    boundaries.append(count)
+    return boundaries
+
+
+def pack_paragraphs_balanced(
+    paragraphs: list[str],
+    max_chars: int = DEFAULT_MAX_CHARS,
+    logger: Optional[Any] = None,
+    chapters: Optional[list[ChapterSpan]] = None,
+) -> list[str]:
+    """
+    Pack paragraphs into near-equal chunks of at most max_chars characters.
+
+    Produces as many chunks as the greedy packer but spreads the paragraphs
+    evenly, so there is no tiny final chunk and parallel requests finish at
+    about the same time.
+
+    Args:
+        paragraphs: Paragraphs as returned by split_text_by_actual_paragraphs
+        max_chars: Maximum characters per chunk
+        logger: Optional logger for debug output
+        chapters: If given, chunk boundaries snap to Chinese chapter headings
+            where the balance allows it, and one ChapterSpan per heading is
+            appended to this list
+
+    Returns:
+        List of text chunks
+    """
+    # Handle empty text
+    if not paragraphs or all(not p.strip() for p in paragraphs):
+        return [""]
+
+    if chapters is not None:
+        return _pack_by_chapters(paragraphs, max_chars, chapters, balanced=True, logger=logger)
+
+    # Paragraphs over the limit are cut at sentence boundaries first
+    paragraphs, oversized = split_oversized_paragraphs(paragraphs, max_chars)
+    _log_oversized(oversized, max_chars, logger)
+
+    chunks: list[str] = []
+    start = 0
+    for end in _balanced_boundaries([len(para) for para in paragraphs], max_chars):
+        chunks.append("".join(paragraphs[start:end]))
+        start = end
+
+    if logger is not None:
+        sizes = [len(chunk) for chunk in chunks]
+        logger.debug(f"\n -> Import COMPLETE (balanced).\n  Total number of paragraphs: {len(paragraphs)}\n  Total number of chunks: {len(chunks)}\n  Chunk sizes: {min(sizes)}-{max(sizes)} characters\n")
+
+    return chunks
@@ -5,6 +5,7 @@
 # - Initial creation from translation_service.py refactoring
 # - Extracted text validation and charset detection functions
 # - Contains utilities for character set detection and validation
+# - clean_repeated_chars now uses the precompiled patterns of repeated_chars
 #
 
 """
@@ -20,10 +21,8 @@ from __future__ import annotations
 import re
 import unicodedata
 from typing import Optional, Callable
-from .translation_constants import PRESERVE_UNLIMITED, ALLOWED_ASCII
-
-# Precompile the regular expression pattern for matching repeated characters.
-_repeated_chars = re.compile(r"(.)\1+")
+from .repeated_chars import cap_runs
+from .translation_constants import ALLOWED_ASCII
 
 
 def is_latin_char(char: str) -> bool:
@@ -101,18 +100,7 @@ def clean_repeated_chars(text: str, max_allowed: int = 4) -> str:
         Cleaned text with limited character repetitions
     """
 
-    def replace_func(match: re.Match[str]) -> str:
-        char = match.group(1)
-        full_match = match.group(0)
-
-        # Allow unlimited repetition for specific characters
-        if char in PRESERVE_UNLIMITED:
-            return full_match
-
-        # For other characters, limit to max_allowed repetitions
-        return char * min(len(full_match), max_allowed)
-
-    return _repeated_chars.sub(replace_func, text)
+    return cap_runs(text, max_allowed)
 
 
 def remove_thinking_block(text: str) -> str:
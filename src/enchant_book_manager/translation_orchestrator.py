@@ -8,6 +8,16 @@
 # - Refactored save_translated_book into smaller functions
 # - Added _prepare_book_directory, _get_existing_chunks, _translate_chunk, _save_final_book
 # - Reduced save_translated_book from 173 lines to ~60 lines
+# - save_translated_book feeds chunks to an optional progressive EPUB builder
+# - _save_final_book streams the chunks to the file instead of joining them
+# - The progressive EPUB builder gets the chapter map and the chunk numbers
+# - A resumed book is split with the chunking parameters of its existing
+#   chunks and only the chunks whose source text changed are translated
+#   again (CHUNKING_FILE in the book directory)
+# - CHUNKING_FILE is replaced atomically, every CHUNK_SOURCES_SAVE_INTERVAL
+#   translated chunks and at the end of the book
+# - The chapter map of the import is stored as the chapter index of the
+#   translated file, so the EPUB phase does not scan it for headings
 #
 
 """
@@ -20,24 +30,44 @@ Orchestrates the translation of books, managing chunks and saving results.
 from __future__ import annotations
 
 import errno
+import hashlib
+import json
 import logging
+import os
 import re
 import sys
 import time
 from pathlib import Path
+from collections.abc import Iterator
 from typing import Any, Optional
 
 from .translation_service import ChineseAITranslator
-from .common_text_utils import remove_excess_empty_lines
+from .chapter_index import save_chapter_index
+from .chapter_issues import detect_issues
+from .chapter_segmenter import normalize_line_breaks
+from .chinese_headings import ChapterSpan
+from .common_text_utils import iter_without_excess_empty_lines
 from .common_utils import sanitize_filename as common_sanitize_filename
 from .icloud_sync import prepare_for_write
 from .models import Book, VARIATION_DB
+from .book_importer import rechunk_book
 from .cost_logger import save_translation_cost_log
+from .progressive_epub import ProgressiveEpubBuilder, mapped_chapter_cuts
 
 # Default values for chunk retry configuration
 DEFAULT_MAX_CHUNK_RETRIES = 10
 MAX_RETRY_WAIT_SECONDS = 60
 
+# Chunking parameters of the chunk files, kept in the book directory
+CHUNKING_FILE = ".chunking.json"
+
+# Translated chunks between two saves of CHUNKING_FILE. Chunks translated
+# after the last save have no source digest and are reused unchecked
+CHUNK_SOURCES_SAVE_INTERVAL = 20
+
+# Chunking parameters of chunk files written before CHUNKING_FILE existed
+LEGACY_CHUNKING = {"balanced": False, "chapter_aware": False}
+
 
 def format_chunk_error_message(
     chunk_number: int,
@@ -134,6 +164,67 @@ def _get_existing_chunks(book_dir: Path, book: Book, logger: logging.Logger) ->
     return existing_chunk_nums
 
 
+def _source_digest(text: str) -> str:
+    """Digest of the source text of a chunk, as stored in CHUNKING_FILE."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _load_chunk_sources(book_dir: Path, book: Book, existing_chunk_nums: set[int], logger: logging.Logger) -> dict[str, str]:
+    """Split the book as its existing chunks were split and read their source digests.
+
+    Chunk files are reused by chunk number, so a resumed book keeps the
+    chunking parameters of CHUNKING_FILE, or LEGACY_CHUNKING for chunks of
+    a version that did not write it. Existing chunk files are never deleted.
+
+    Args:
+        book_dir: Directory containing translated chunks
+        book: Book instance with its chunking parameters
+        existing_chunk_nums: Chunk numbers found in book_dir
+        logger: Logger for output
+
+    Returns:
+        Digest of the source text of the existing chunks by chunk number,
+        without the chunks whose source text is not known
+    """
+    if not book.chunking or not existing_chunk_nums:
+        return {}
+
+    chunking_file = book_dir / CHUNKING_FILE
+    try:
+        record = json.loads(chunking_file.read_text(encoding="utf-8"))
+        parameters = {key: record["parameters"][key] for key in book.chunking}
+        sources = {str(key): str(value) for key, value in record["sources"].items()}
+    except FileNotFoundError:
+        parameters, sources = {**book.chunking, **LEGACY_CHUNKING}, {}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning(f"Cannot read {chunking_file.name}: {e}; reusing the existing chunks without checking their source text.")
+        return {}
+
+    if parameters != book.chunking:
+        changed = ", ".join(sorted(key for key in parameters if parameters[key] != book.chunking[key]))
+        if rechunk_book(book, parameters["max_chars"], parameters["balanced"], parameters["chapter_aware"], logger=logger):
+            logger.warning(f"Existing chunks were split with different parameters ({changed}); splitting the book the same way to reuse them.")
+    return sources
+
+
+def _save_chunk_sources(book_dir: Path, book: Book, sources: dict[str, str], logger: logging.Logger) -> None:
+    """Store the chunking parameters of the book and the source digest of its translated chunks.
+
+    Args:
+        book_dir: Directory containing translated chunks
+        book: Book instance with its chunking parameters
+        sources: Digest of the source text of every translated chunk by chunk number
+        logger: Logger for output
+    """
+    chunking_file = book_dir / CHUNKING_FILE
+    tmp_path = chunking_file.with_name(chunking_file.name + ".tmp")
+    try:
+        tmp_path.write_text(json.dumps({"parameters": book.chunking, "sources": sources}), encoding="utf-8")
+        os.replace(tmp_path, chunking_file)
+    except OSError as e:
+        logger.warning(f"Cannot save {CHUNKING_FILE}: {e}")
+
+
 def _translate_chunk(
     chunk_number: int,
     original_text: str,
@@ -228,14 +319,17 @@ def _save_final_book(
     book: Book,
     book_dir: Path,
     logger: logging.Logger,
+    chunk_offsets: Optional[list[int]] = None,
 ) -> Path:
-    """Combine and save all translated chunks into final book file.
+    """Save all translated chunks, in order, into the final book file.
 
     Args:
         translated_contents: List of translated text chunks
         book: Book instance with metadata
         book_dir: Directory to save book in
         logger: Logger for output
+        chunk_offsets: Optional list filled with one offset per chunk: the
+            end of the text written before the chunk
 
     Returns:
         Path to the saved book file
@@ -243,10 +337,6 @@ def _save_final_book(
     Raises:
         OSError: If file cannot be saved
     """
-    # Combine all translated chunks into one full text
-    full_translated_text = "\n".join(translated_contents)
-    full_translated_text = remove_excess_empty_lines(full_translated_text)
-
     # Save to a file named with the book metadata
     sanitized_title = common_sanitize_filename(book.translated_title, max_length=50)
     sanitized_author = common_sanitize_filename(book.translated_author, max_length=50)
@@ -256,8 +346,25 @@ def _save_final_book(
     output_filename = prepare_for_write(output_filename)
 
     try:
+        written = 0
+
+        def pieces() -> Iterator[str]:
+            for index, content in enumerate(translated_contents):
+                # Everything before this chunk has been counted when it is requested
+                if chunk_offsets is not None:
+                    chunk_offsets.append(written)
+                yield "\n" + content if index else content
+
+        def counted(output: Iterator[str]) -> Iterator[str]:
+            nonlocal written
+            for piece in output:
+                written += len(piece)
+                yield piece
+
         with open(output_filename, "w", encoding="utf-8") as f:
-            f.write(full_translated_text)
+            # Write the chunks one by one, as if joined with newlines, without
+            # building the full text in memory
+            f.writelines(counted(iter_without_excess_empty_lines(pieces())))
         logger.info(f"Translated book saved to {output_filename}")
         return output_filename
     except (OSError, PermissionError) as e:
@@ -265,6 +372,70 @@ def _save_final_book(
         raise
 
 
+def _save_chapter_map_index(
+    output_path: Path,
+    chunks: list[tuple[int, str]],
+    chunk_offsets: list[int],
+    chapter_map: list[ChapterSpan],
+    logger: logging.Logger,
+) -> bool:
+    """Store the chapters of the import's chapter map as the chapter index of the book file.
+
+    The translated headings are only looked for in the chunks the map puts
+    them in, and the EPUB phase then slices the chapters from the index
+    instead of scanning the whole text.
+
+    Args:
+        output_path: The saved book file
+        chunks: (chunk_number, translated text) of every chunk in the file, in order
+        chunk_offsets: Offset in the file after which each chunk starts
+        chapter_map: Book.chapter_map of the book
+        logger: Logger for output
+
+    Returns:
+        True if the index was written
+    """
+    try:
+        # newline="" keeps the offsets of the written text
+        with open(output_path, encoding="utf-8", newline="") as f:
+            text = f.read()
+    except OSError as e:
+        logger.warning(f"Cannot index the chapters of {output_path.name}: {e}")
+        return False
+
+    starts_by_chunk: dict[int, list[ChapterSpan]] = {}
+    for span in chapter_map:
+        starts_by_chunk.setdefault(span.first_chunk, []).append(span)
+
+    # (title, number, heading start, body start) of every chapter in text
+    headings: list[tuple[str, int, int, int]] = []
+    ends = [*chunk_offsets[1:], len(text)]
+    for (chunk_number, chunk_text), start, end in zip(chunks, chunk_offsets, ends):
+        spans = starts_by_chunk.get(chunk_number)
+        if not spans:
+            continue
+        chunk_text = normalize_line_breaks(chunk_text)
+        for cut in mapped_chapter_cuts(chunk_text, spans, logger):
+            line = chunk_text[cut.start : cut.body_start].strip()
+            at = text.find(line, start, end)
+            if not line or at == -1:
+                logger.debug(f"Chapter heading of chunk {chunk_number} not found in {output_path.name}; the EPUB phase will scan the text")
+                return False
+            headings.append((cut.title, cut.number, at, at + len(line)))
+            start = at + len(line)
+    if not headings:
+        return False
+
+    chapters: list[tuple[str, str]] = []
+    front = text[: headings[0][2]].strip()
+    if front:
+        chapters.append(("Front Matter", front))
+    for (title, _, _, body_start), following in zip(headings, [*headings[1:], None]):
+        chapters.append((title, text[body_start : following[2] if following else len(text)].strip()))
+    sequence = [number for _, number, _, _ in headings]
+    return save_chapter_index(output_path, text, chapters, sequence, detect_issues(sequence))
+
+
 def save_translated_book(
     book_id: str,
     translator: ChineseAITranslator,
@@ -272,6 +443,7 @@ def save_translated_book(
     create_epub: bool = False,
     logger: Optional[logging.Logger] = None,
     module_config: Optional[dict[str, Any]] = None,
+    epub_builder: Optional[ProgressiveEpubBuilder] = None,
 ) -> None:
     """
     Simulate translation of the book and save the translated text to a file.
@@ -287,6 +459,7 @@ def save_translated_book(
         create_epub: (Deprecated) Kept for backward compatibility
         logger: Logger instance for output
         module_config: Module configuration dictionary
+        epub_builder: Optional progressive EPUB builder fed with every chunk in order
     """
     # Ensure logger is available
     if logger is None:
@@ -308,10 +481,17 @@ def save_translated_book(
     existing_chunk_nums: set[int] = set()
     if resume:
         existing_chunk_nums = _get_existing_chunks(book_dir, book, logger)
+    # Digest of the source text of every translated chunk, by chunk number
+    sources = _load_chunk_sources(book_dir, book, existing_chunk_nums, logger)
+    unsaved_sources = 0
 
     translated_contents = []
+    # Chunk numbers and texts in the order of translated_contents
+    translated_chunks: list[tuple[int, str]] = []
     # Sort chunks by chunk_number
     sorted_chunks = sorted(book.chunks, key=lambda ch: ch.chunk_number)
+    if epub_builder is not None and book.chapter_map:
+        epub_builder.use_chapter_map(book.chapter_map)
 
     for chunk in sorted_chunks:
         # Retrieve the Variation corresponding to the original text
@@ -321,9 +501,12 @@ def save_translated_book(
 
         # Type annotation for translated_text to handle both str and Optional[str]
         translated_text: Optional[str]
+        digest = _source_digest(variation.text_content) if book.chunking else None
 
-        # Check if chunk already exists (resume mode)
-        if resume and chunk.chunk_number in existing_chunk_nums:
+        # Check if chunk already exists (resume mode) and its source text is unchanged
+        if resume and chunk.chunk_number in existing_chunk_nums and sources.get(str(chunk.chunk_number), digest) != digest:
+            logger.warning(f"The source text of chunk {chunk.chunk_number} changed; re-translating.")
+        elif resume and chunk.chunk_number in existing_chunk_nums:
             # Load existing translation
             sanitized_title = common_sanitize_filename(book.translated_title, max_length=50)
             sanitized_author = common_sanitize_filename(book.translated_author, max_length=50)
@@ -332,6 +515,11 @@ def save_translated_book(
                 translated_text = p_existing.read_text(encoding="utf-8")
                 logger.info(f"Skipping translation for chunk {chunk.chunk_number}; using existing translation.")
                 translated_contents.append(f"\n{translated_text}\n")
+                translated_chunks.append((chunk.chunk_number, translated_text))
+                if epub_builder is not None:
+                    epub_builder.add_chunk(translated_text, chunk.chunk_number)
+                if digest is not None:
+                    sources[str(chunk.chunk_number)] = digest
                 continue
             except FileNotFoundError:
                 logger.warning(f"Expected file {p_existing.name} not found; re-translating.")
@@ -377,13 +565,30 @@ def save_translated_book(
             book=book,
             logger=logger,
         )
+        if digest is not None:
+            sources[str(chunk.chunk_number)] = digest
+            unsaved_sources += 1
+            if unsaved_sources >= CHUNK_SOURCES_SAVE_INTERVAL:
+                _save_chunk_sources(book_dir, book, sources, logger)
+                unsaved_sources = 0
 
         # Log and append to contents
         logger.info(f"\nChunk {chunk.chunk_number:06d}:\n{translated_text}\n\n")
         translated_contents.append(f"\n{translated_text}\n")
+        translated_chunks.append((chunk.chunk_number, translated_text))
+        if epub_builder is not None:
+            epub_builder.add_chunk(translated_text, chunk.chunk_number)
+
+    if book.chunking:
+        _save_chunk_sources(book_dir, book, sources, logger)
 
     # Save the complete translated book
-    _save_final_book(translated_contents, book, book_dir, logger)
+    chunk_offsets: list[int] = []
+    output_path = _save_final_book(translated_contents, book, book_dir, logger, chunk_offsets)
+    if book.chapter_map and _save_chapter_map_index(output_path, translated_chunks, chunk_offsets, book.chapter_map, logger):
+        logger.info(f"Chapter index of {len(book.chapter_map)} chapters saved for {output_path.name}")
+    if epub_builder is not None:
+        epub_builder.finish()
 
     # Save cost log for remote translations
     save_translation_cost_log(book, translator, book_dir, len(sorted_chunks), logger)
@@ -5,6 +5,9 @@
 # - Initial creation from workflow_orchestrator.py refactoring
 # - Extracted EPUB-specific processing functions
 # - Contains functions for finding translated files and creating EPUBs
+# - Added start_progressive_epub and the shared path/config helpers
+# - start_progressive_epub passes the epub.max_chapter_kb limit to the builder
+# - Added check_epub_files for --check-epubs
 #
 
 """
@@ -16,6 +19,8 @@ Handles EPUB-specific operations including:
 - Creating EPUBs from translated text
 - Applying configuration overrides
 - Validation-only mode
+- Starting a progressive EPUB build during translation
+- Structural checks of finished EPUBs (--check-epubs)
 """
 
 from __future__ import annotations
@@ -28,7 +33,9 @@ from typing import Any
 
 from .common_utils import extract_book_info_from_path, sanitize_filename
 from .config_manager import get_config
-from .epub_utils import create_epub_with_config, get_epub_config_from_book_info
+from .epub_structure import check_epubs, collect_epub_paths, write_json_report
+from .epub_utils import create_epub_with_config, get_epub_compression_level, get_epub_config_from_book_info, get_epub_max_chapter_bytes
+from .progressive_epub import ProgressiveEpubBuilder
 
 
 def find_translated_file(current_path: Path, args: argparse.Namespace, logger: logging.Logger) -> Path | None:
@@ -97,27 +104,8 @@ def create_epub_from_translated(
     Returns:
         True if EPUB created successfully
     """
-    # Create EPUB output path
-    epub_name = sanitize_filename(book_title) + ".epub"
-    epub_path = current_path.parent / epub_name
-
-    # Get EPUB settings from configuration
-    config = get_config()
-    epub_settings = config.get("epub", {})
-
-    # Build book info for configuration
-    book_info_for_config = {
-        "title_english": book_title,
-        "author_english": book_author,
-        "title_chinese": book_info.get("title_chinese", ""),
-        "author_chinese": book_info.get("author_chinese", ""),
-    }
-
-    # Create EPUB configuration from book info and settings
-    epub_config = get_epub_config_from_book_info(book_info=book_info_for_config, epub_settings=epub_settings)
-
-    # Apply command-line overrides
-    apply_epub_overrides(epub_config, args, logger)
+    epub_path = get_epub_output_path(current_path, book_title)
+    epub_config = build_epub_config(book_title, book_author, book_info, args, logger)
 
     # Handle validate-only mode
     if hasattr(args, "validate_only") and args.validate_only:
@@ -154,6 +142,127 @@ def create_epub_from_translated(
     return success
 
 
+def get_epub_output_path(current_path: Path, book_title: str) -> Path:
+    """
+    Get the path of the EPUB created for a book.
+
+    Args:
+        current_path: Current file path
+        book_title: Book title
+
+    Returns:
+        Path of the EPUB next to the source file
+    """
+    return current_path.parent / (sanitize_filename(book_title) + ".epub")
+
+
+def build_epub_config(
+    book_title: str,
+    book_author: str,
+    book_info: dict[str, Any],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+) -> dict[str, Any]:
+    """
+    Build the EPUB configuration from the config file and command-line options.
+
+    Args:
+        book_title: Book title
+        book_author: Book author
+        book_info: Book metadata
+        args: Command-line arguments
+        logger: Logger instance
+
+    Returns:
+        Configuration dictionary for create_epub_with_config
+    """
+    # Get EPUB settings from configuration
+    config = get_config()
+    epub_settings = config.get("epub", {})
+
+    # Build book info for configuration
+    book_info_for_config = {
+        "title_english": book_title,
+        "author_english": book_author,
+        "title_chinese": book_info.get("title_chinese", ""),
+        "author_chinese": book_info.get("author_chinese", ""),
+    }
+
+    # Create EPUB configuration from book info and settings
+    epub_config = get_epub_config_from_book_info(book_info=book_info_for_config, epub_settings=epub_settings)
+
+    # Apply command-line overrides
+    apply_epub_overrides(epub_config, args, logger)
+    return epub_config
+
+
+def get_book_title_and_author(source_path: Path, current_path: Path, args: argparse.Namespace) -> tuple[str, str, dict[str, Any]]:
+    """
+    Get the title and author used for the EPUB, with command-line overrides.
+
+    Args:
+        source_path: File the book info is extracted from
+        current_path: Current file path, used as fallback title
+        args: Command-line arguments
+
+    Returns:
+        Tuple of (book_title, book_author, book_info)
+    """
+    book_info = extract_book_info_from_path(source_path)
+    book_title = book_info.get("title_english", current_path.stem)
+    book_author = book_info.get("author_english", "Unknown")
+
+    # Override with command line options
+    if hasattr(args, "epub_title") and args.epub_title:
+        book_title = args.epub_title
+    if hasattr(args, "epub_author") and args.epub_author:
+        book_author = args.epub_author
+    return book_title, book_author, book_info
+
+
+def start_progressive_epub(current_path: Path, args: argparse.Namespace, logger: logging.Logger) -> ProgressiveEpubBuilder | None:
+    """
+    Create the builder that writes the EPUB while the book is translated.
+
+    Progressive mode is only used when the EPUB phase would build the book
+    from this translation with the default options.
+
+    Args:
+        current_path: Current file path
+        args: Command-line arguments
+        logger: Logger instance
+
+    Returns:
+        ProgressiveEpubBuilder, or None if progressive mode does not apply
+    """
+    if not getattr(args, "progressive_epub", False):
+        return None
+    if getattr(args, "skip_epub", False) or getattr(args, "validate_only", False) or getattr(args, "translated", None):
+        return None
+
+    book_title, book_author, book_info = get_book_title_and_author(current_path, current_path, args)
+    epub_config = build_epub_config(book_title, book_author, book_info, args, logger)
+    if epub_config.get("strict_mode") or not epub_config.get("generate_toc", True):
+        # Strict mode must check the whole book before writing anything
+        logger.info("Progressive EPUB not used with strict mode or without a table of contents")
+        return None
+
+    epub_path = get_epub_output_path(current_path, book_title)
+    logger.info(f"Progressive EPUB enabled: {epub_path}")
+    return ProgressiveEpubBuilder(
+        epub_path,
+        title=book_title,
+        author=book_author,
+        cover_path=epub_config.get("cover_path"),
+        language=epub_config.get("language", "en"),
+        custom_css=epub_config.get("custom_css"),
+        metadata=epub_config.get("metadata"),
+        compression_level=get_epub_compression_level(epub_config, logger),
+        max_chapter_bytes=get_epub_max_chapter_bytes(epub_config, logger),
+        logger=logger,
+    )
+
+
 def apply_epub_overrides(epub_config: dict[str, Any], args: argparse.Namespace, logger: logging.Logger) -> None:
     """
     Apply command-line overrides to EPUB configuration.
@@ -286,15 +395,11 @@ def process_epub_generation(
         return False
 
     # Extract book info
-    book_info = extract_book_info_from_path(translated_file if hasattr(args, "translated") and args.translated else current_path)
-    book_title = book_info.get("title_english", current_path.stem)
-    book_author = book_info.get("author_english", "Unknown")
-
-    # Override with command line options
-    if hasattr(args, "epub_title") and args.epub_title:
-        book_title = args.epub_title
-    if hasattr(args, "epub_author") and args.epub_author:
-        book_author = args.epub_author
+    book_title, book_author, book_info = get_book_title_and_author(
+        translated_file if hasattr(args, "translated") and args.translated else current_path,
+        current_path,
+        args,
+    )
 
     # Create EPUB
     return create_epub_from_translated(
@@ -307,3 +412,41 @@ def process_epub_generation(
         progress,
         logger,
     )
+
+
+def check_epub_files(args: argparse.Namespace, logger: logging.Logger) -> bool:
+    """
+    Check the structure of the EPUBs named by --check-epubs.
+
+    Args:
+        args: Command line arguments (check_epubs, check_report, check_workers)
+        logger: Logger instance
+
+    Returns:
+        True if at least one EPUB was checked and none has errors
+    """
+    paths = collect_epub_paths(Path(path) for path in args.check_epubs)
+    if not paths:
+        logger.error("No EPUB files found to check")
+        return False
+
+    logger.info(f"Checking the structure of {len(paths)} EPUB file(s)")
+    results = check_epubs(paths, getattr(args, "check_workers", None))
+    for result in results:
+        for error in result.errors:
+            logger.error(f"{result.path}: {error}")
+        for warning in result.warnings:
+            logger.warning(f"{result.path}: {warning}")
+
+    invalid = sum(1 for result in results if not result.valid)
+    logger.info(f"EPUB check: {len(results) - invalid} valid, {invalid} with errors")
+
+    report = getattr(args, "check_report", None)
+    if report:
+        try:
+            write_json_report(results, Path(report))
+            logger.info(f"EPUB check report written to {report}")
+        except OSError as e:
+            logger.error(f"Cannot write EPUB check report {report}: {e}")
+            return False
+    return invalid == 0
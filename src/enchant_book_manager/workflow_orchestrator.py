@@ -5,6 +5,8 @@
 # - Refactored from 24KB into 3 smaller modules (workflow_progress, workflow_phases, workflow_epub)
 # - This file now serves as the main orchestrator importing from the new modules
 # - All original functionality is preserved
+# - Split process_novel_unified into rename, translation and EPUB stages that
+#   the pipelined batch runs in separate worker pools
 #
 
 """
@@ -20,13 +22,21 @@ This module now serves as the main orchestrator that delegates to:
 - workflow_progress.py: Progress tracking utilities
 - workflow_phases.py: Individual phase processors
 - workflow_epub.py: EPUB-specific operations
+
+process_novel_unified runs the three phases of one novel in a row. The
+pipelined batch (--pipeline) runs the same work as three stages in separate
+worker pools, handing a NovelState from one stage to the next:
+run_rename_stage, run_translation_stage and run_epub_stage. Each stage reads
+and writes the novel's progress file exactly as process_novel_unified does.
 """
 
 from __future__ import annotations
 
 import argparse
 import logging
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from .workflow_progress import (
     load_safe_yaml_wrapper,
@@ -40,13 +50,19 @@ from .workflow_phases import (
 )
 
 
-def process_novel_unified(file_path: Path, args: argparse.Namespace, logger: logging.Logger) -> bool:
-    """
-    Unified processing function for a single novel file with all three phases.
+@dataclass
+class NovelState:
+    """A novel between two stages of the pipelined batch."""
 
-    1. Renaming (unless --skip-renaming)
-    2. Translation (unless --skip-translating)
-    3. EPUB generation (unless --skip-epub)
+    file_path: Path  # The novel file as found in the batch directory
+    current_path: Path  # The novel file after renaming
+    progress: dict[str, Any]  # The novel's phase progress
+    progress_file: Path
+
+
+def run_rename_stage(file_path: Path, args: argparse.Namespace, logger: logging.Logger) -> NovelState:
+    """
+    Load or create the progress of a novel and run the renaming phase.
 
     Args:
         file_path: Path to the novel file
@@ -54,7 +70,7 @@ def process_novel_unified(file_path: Path, args: argparse.Namespace, logger: log
         logger: Logger instance
 
     Returns:
-        True if all enabled phases completed successfully
+        The state of the novel for the translation stage
     """
     current_path = file_path
 
@@ -77,22 +93,71 @@ def process_novel_unified(file_path: Path, args: argparse.Namespace, logger: log
 
     # Phase 1: Renaming
     current_path = process_renaming_phase(file_path, current_path, args, progress, progress_file, logger)
+    return NovelState(file_path, current_path, progress, progress_file)
+
 
+def run_translation_stage(state: NovelState, args: argparse.Namespace, logger: logging.Logger) -> NovelState:
+    """
+    Run the translation phase of a renamed novel.
+
+    Args:
+        state: State from run_rename_stage
+        args: Command-line arguments
+        logger: Logger instance
+
+    Returns:
+        The state of the novel for the EPUB stage
+    """
     # Phase 2: Translation
-    process_translation_phase(current_path, args, progress, progress_file, logger)
+    process_translation_phase(state.current_path, args, state.progress, state.progress_file, logger)
+    return state
+
+
+def run_epub_stage(state: NovelState, args: argparse.Namespace, logger: logging.Logger) -> bool:
+    """
+    Run the EPUB phase of a translated novel and clean up its progress file.
+
+    Args:
+        state: State from run_translation_stage
+        args: Command-line arguments
+        logger: Logger instance
 
+    Returns:
+        True if all enabled phases completed successfully
+    """
     # Phase 3: EPUB Generation
-    process_epub_phase(current_path, args, progress, progress_file, logger)
+    process_epub_phase(state.current_path, args, state.progress, state.progress_file, logger)
 
     # Clean up progress file if all phases completed successfully
-    all_completed = all(phase["status"] in ("completed", "skipped") for phase in progress["phases"].values())
+    all_completed = all(phase["status"] in ("completed", "skipped") for phase in state.progress["phases"].values())
 
-    if all_completed and progress_file.exists():
+    if all_completed and state.progress_file.exists():
         try:
-            progress_file.unlink()
+            state.progress_file.unlink()
             logger.info("All phases completed, removed progress file")
         except (FileNotFoundError, PermissionError) as e:
             logger.warning(f"Could not remove progress file: {e}")
             # Not critical - file will be overwritten next time
 
     return all_completed
+
+
+def process_novel_unified(file_path: Path, args: argparse.Namespace, logger: logging.Logger) -> bool:
+    """
+    Unified processing function for a single novel file with all three phases.
+
+    1. Renaming (unless --skip-renaming)
+    2. Translation (unless --skip-translating)
+    3. EPUB generation (unless --skip-epub)
+
+    Args:
+        file_path: Path to the novel file
+        args: Command-line arguments
+        logger: Logger instance
+
+    Returns:
+        True if all enabled phases completed successfully
+    """
+    state = run_rename_stage(file_path, args, logger)
+    state = run_translation_stage(state, args, logger)
+    return run_epub_stage(state, args, logger)
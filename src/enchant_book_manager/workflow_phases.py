@@ -5,6 +5,7 @@
 # - Initial creation from workflow_orchestrator.py refactoring
 # - Extracted phase processing functions
 # - Contains the three phase processing functions (rename, translate, epub)
+# - Translation phase can build the EPUB progressively (--progressive-epub)
 #
 
 """
@@ -133,6 +134,20 @@ def process_renaming_phase(
     return current_path
 
 
+def _start_progressive_epub(current_path: Path, args: argparse.Namespace, logger: logging.Logger) -> Any:
+    """Create the progressive EPUB builder if enabled, without failing the translation."""
+    if not getattr(args, "progressive_epub", False) or not epub_available:
+        return None
+    try:
+        # Import epub handler to avoid circular import
+        from .workflow_epub import start_progressive_epub
+
+        return start_progressive_epub(current_path, args, logger)
+    except Exception as e:
+        logger.warning(f"Progressive EPUB not started, the EPUB phase will build it: {e}")
+        return None
+
+
 def process_translation_phase(
     current_path: Path,
     args: argparse.Namespace,
@@ -164,6 +179,10 @@ def process_translation_phase(
             progress["phases"]["translation"]["error"] = "Module not available"
         else:
             try:
+                # Build the EPUB while translating when progressive mode is on
+                epub_builder = _start_progressive_epub(current_path, args, logger)
+                extra_args: dict[str, Any] = {"epub_builder": epub_builder} if epub_builder is not None else {}
+
                 # Call translation module
                 success = translate_novel(
                     str(current_path),
@@ -172,12 +191,18 @@ def process_translation_phase(
                     resume=args.resume,
                     create_epub=False,  # EPUB handled in phase 3
                     remote=getattr(args, "remote", False),
+                    **extra_args,
                 )
 
                 if success:
                     progress["phases"]["translation"]["status"] = "completed"
                     progress["phases"]["translation"]["result"] = "success"
                     logger.info(f"Translation completed for {current_path.name}")
+
+                    if epub_builder is not None and epub_builder.completed:
+                        # Phase 3 has nothing left to do
+                        progress["phases"]["epub"]["status"] = "completed"
+                        progress["phases"]["epub"]["result"] = str(epub_builder.output_path)
                 else:
                     progress["phases"]["translation"]["status"] = "failed"
                     progress["phases"]["translation"]["error"] = "Translation failed"
@@ -5,6 +5,9 @@
 # - Initial creation from workflow_orchestrator.py refactoring
 # - Extracted progress tracking and YAML utilities
 # - Contains functions for saving/loading workflow progress
+# - Added get_book_lock_path for the per-book batch locks
+# - Book locks are kept in one BOOK_LOCK_DIR per novel directory instead of
+#   next to each novel
 #
 
 """
@@ -25,6 +28,9 @@ import yaml
 
 from .common_yaml_utils import load_safe_yaml
 
+# Directory holding the per-book locks, in the directory of the novels
+BOOK_LOCK_DIR = ".enchant_locks"
+
 
 def load_safe_yaml_wrapper(path: Path, logger: logging.Logger) -> dict[str, Any] | None:
     """
@@ -125,3 +131,19 @@ def get_progress_file_path(file_path: Path) -> Path:
         Path to the progress file
     """
     return file_path.parent / f".{file_path.stem}_progress.yml"
+
+
+def get_book_lock_path(file_path: Path) -> Path:
+    """
+    Get the lock file path that guards the processing of a novel file.
+
+    filelock leaves its lock files behind on POSIX, so the locks of all the
+    novels of a directory are kept in one BOOK_LOCK_DIR there.
+
+    Args:
+        file_path: Path to the novel file
+
+    Returns:
+        Path to the lock file in the BOOK_LOCK_DIR of the novel's directory
+    """
+    return file_path.parent / BOOK_LOCK_DIR / f"{file_path.name}.lock"
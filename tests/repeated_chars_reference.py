@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reference implementations of the repeated-character rules.
+
+These are the character loop and per-match callback implementations that
+repeated_chars replaced. They are shared by test_repeated_chars and
+benchmarks/bench_repeated_chars.py so both compare against the same code.
+"""
+
+from __future__ import annotations
+
+import re
+
+from enchant_book_manager.text_constants import (
+    ALL_PUNCTUATION,
+    CHINESE_PUNCTUATION,
+    ENGLISH_PUNCTUATION,
+    PRESERVE_UNLIMITED,
+)
+from enchant_book_manager.translation_constants import PRESERVE_UNLIMITED as TRANSLATION_PRESERVE_UNLIMITED
+
+_REPEATED_CHARS = re.compile(r"(.)\1+")
+
+
+def reference_limit(text: str, force_chinese: bool = False, force_english: bool = False) -> str:
+    """Character loop implementation that limit_runs replaced."""
+    limit_to_one = ALL_PUNCTUATION.copy()
+    if force_chinese:
+        limit_to_one |= CHINESE_PUNCTUATION
+    if force_english:
+        limit_to_one |= ENGLISH_PUNCTUATION
+    limit_to_one -= PRESERVE_UNLIMITED
+    result: list[str] = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        count = 1
+        while i + count < len(text) and text[i + count] == char:
+            count += 1
+        if char in limit_to_one:
+            result.append(char)
+        elif char.isnumeric() or char in PRESERVE_UNLIMITED:
+            result.append(char * count)
+        else:
+            result.append(char * min(count, 3))
+        i += count
+    return "".join(result)
+
+
+def reference_cap(text: str, max_allowed: int = 4) -> str:
+    """Callback implementation that cap_runs replaced."""
+
+    def replace_func(match: re.Match[str]) -> str:
+        char = match.group(1)
+        if char in TRANSLATION_PRESERVE_UNLIMITED:
+            return match.group(0)
+        return char * min(len(match.group(0)), max_allowed)
+
+    return _REPEATED_CHARS.sub(replace_func, text)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for batch_journal module.
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.batch_journal import (
+    BatchJournal,
+    apply_event,
+    load_batch_progress,
+)
+
+
+def make_progress(*names):
+    """Return a new batch progress with one planned entry per name."""
+    return {
+        "created": "2024-01-01T10:00:00",
+        "input_folder": "/novels",
+        "files": [{"path": f"/novels/{name}", "status": "planned", "end_time": None, "retry_count": 0} for name in names],
+    }
+
+
+class TestApplyEvent:
+    """Test the event kinds."""
+
+    def test_event_kinds(self):
+        """Each event sets the status and fields of the entry."""
+        item = {"path": "a.txt", "status": "planned", "retry_count": 0}
+
+        apply_event(item, {"event": "started", "time": "t1"})
+        assert (item["status"], item["start_time"]) == ("processing", "t1")
+        apply_event(item, {"event": "failed", "time": "t2", "error": "Boom", "retry_count": 1})
+        assert (item["status"], item["error"], item["retry_count"], item["end_time"]) == ("failed/skipped", "Boom", 1, "t2")
+        apply_event(item, {"event": "released", "time": "t3"})
+        assert item["status"] == "planned"
+        apply_event(item, {"event": "completed", "time": "t4"})
+        assert (item["status"], item["end_time"]) == ("completed", "t4")
+        apply_event(item, {"event": "skipped", "time": "t5"})
+        assert item["status"] == "failed/skipped"
+
+    def test_unknown_event(self):
+        """An unknown event kind is an error."""
+        with pytest.raises(ValueError, match="Unknown journal event"):
+            apply_event({}, {"event": "exploded", "time": "t"})
+
+
+class TestBatchJournal:
+    """Test writing and replaying the journal."""
+
+    def test_replay_matches_memory(self, tmp_path):
+        """Replaying the journal rebuilds the progress kept in memory."""
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+        progress = make_progress("a.txt", "b.txt")
+        journal.begin(progress)
+        journal.record(progress["files"][0], "started")
+        journal.record(progress["files"][0], "completed")
+        journal.record(progress["files"][1], "started")
+        journal.record(progress["files"][1], "failed", error="Timeout", retry_count=1)
+
+        assert journal.load() == progress
+
+    def test_record_appends_one_line(self, tmp_path):
+        """An update appends one line instead of rewriting the progress."""
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+        progress = make_progress(*(f"{i}.txt" for i in range(50)))
+        journal.begin(progress)
+        header = journal.path.read_text(encoding="utf-8")
+
+        journal.record(progress["files"][7], "started")
+
+        content = journal.path.read_text(encoding="utf-8")
+        assert content.startswith(header)
+        event = json.loads(content[len(header) :])
+        assert (event["event"], event["path"]) == ("started", "/novels/7.txt")
+
+    def test_torn_and_foreign_lines_ignored(self, tmp_path):
+        """A line torn by a crash and events of unknown files are skipped."""
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+        progress = make_progress("a.txt")
+        journal.begin(progress)
+        journal.record(progress["files"][0], "started")
+        with journal.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "completed", "path": "/other.txt", "time": "t"}) + "\n")
+            f.write('{"event": "completed", "path": "/nov')
+        logger = Mock(spec=logging.Logger)
+
+        loaded = journal.load(logger)
+
+        assert loaded["files"][0]["status"] == "processing"
+        assert logger.warning.call_count == 2
+
+    def test_load_without_journal(self, tmp_path):
+        """There is nothing to replay without a journal."""
+        assert BatchJournal(tmp_path / "batch.jsonl").load() is None
+
+
+class TestLoadBatchProgress:
+    """Test starting, resuming and migrating a batch."""
+
+    def test_new_batch(self, tmp_path):
+        """A new batch plans every text file and starts the journal."""
+        novels = tmp_path / "novels"
+        novels.mkdir()
+        for name in ("b.txt", "a.txt", "notes.md"):
+            (novels / name).write_text("x")
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+
+        progress = load_batch_progress(journal, novels, Mock(spec=logging.Logger), tmp_path / "legacy.yml")
+
+        assert [Path(item["path"]).name for item in progress["files"]] == ["a.txt", "b.txt"]
+        assert journal.load() == progress
+
+    def test_resume_does_not_rewrite(self, tmp_path):
+        """A resumed batch keeps its journal as it is."""
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+        progress = make_progress("a.txt")
+        journal.begin(progress)
+        journal.record(progress["files"][0], "completed")
+        content = journal.path.read_text(encoding="utf-8")
+
+        resumed = load_batch_progress(journal, tmp_path, Mock(spec=logging.Logger), tmp_path / "legacy.yml")
+
+        assert resumed == progress
+        assert journal.path.read_text(encoding="utf-8") == content
+
+    def test_legacy_yaml_migrated(self, tmp_path):
+        """A YAML progress file of an older version becomes the journal."""
+        legacy = tmp_path / "legacy.yml"
+        progress = make_progress("a.txt")
+        progress["files"][0]["retry_count"] = 2
+        legacy.write_text(yaml.safe_dump(progress))
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+
+        loaded = load_batch_progress(journal, tmp_path, Mock(spec=logging.Logger), legacy)
+
+        assert loaded == progress
+        assert journal.load() == progress
+        assert not legacy.exists()
+
+    def test_empty_directory_writes_nothing(self, tmp_path):
+        """A batch without files does not start a journal."""
+        journal = BatchJournal(tmp_path / "batch.jsonl")
+
+        progress = load_batch_progress(journal, tmp_path, Mock(spec=logging.Logger), tmp_path / "legacy.yml")
+
+        assert progress["files"] == []
+        assert not journal.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
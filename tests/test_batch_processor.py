@@ -17,6 +17,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from enchant_book_manager.batch_journal import BatchJournal
 from enchant_book_manager.batch_processor import (
     load_safe_yaml,
     process_batch,
@@ -106,6 +107,11 @@ class TestLoadSafeYaml:
 class TestProcessBatch:
     """Test the main process_batch function."""
 
+    @pytest.fixture(autouse=True)
+    def in_tmp_path(self, tmp_path, monkeypatch):
+        """Keep the batch journal of every test in its own directory."""
+        monkeypatch.chdir(tmp_path)
+
     @patch("enchant_book_manager.batch_processor.filelock.FileLock")
     @patch("enchant_book_manager.batch_processor.save_translated_book")
     @patch("enchant_book_manager.batch_processor.import_book_from_txt")
@@ -324,10 +330,44 @@ class TestProcessBatch:
                 progress_file.unlink()
 
     @patch("enchant_book_manager.batch_processor.filelock.FileLock")
-    @patch("enchant_book_manager.batch_processor.yaml.safe_dump")
     @patch("enchant_book_manager.batch_processor.save_translated_book")
     @patch("enchant_book_manager.batch_processor.import_book_from_txt")
-    def test_process_batch_progress_save_error(self, mock_import, mock_save, mock_yaml_dump, mock_filelock, tmp_path):
+    def test_process_batch_skip_save_error(self, mock_import, mock_save, mock_filelock, tmp_path):
+        """Test a skip event that cannot be saved does not abort the batch."""
+        input_dir = tmp_path / "novels"
+        input_dir.mkdir()
+        for name in ("book1.txt", "book2.txt"):
+            (input_dir / name).write_text("Chinese text")
+        progress_data = {
+            "created": "2024-01-01T00:00:00",
+            "input_folder": str(input_dir),
+            "files": [
+                {"path": str(input_dir / "book1.txt"), "status": "failed", "retry_count": 3, "end_time": None},
+                {"path": str(input_dir / "book2.txt"), "status": "planned", "retry_count": 0, "end_time": None},
+            ],
+        }
+        Path("translation_batch_progress.yml").write_text(yaml.safe_dump(progress_data))
+        mock_translator = Mock()
+        mock_translator.is_remote = False
+        logger = Mock(spec=logging.Logger)
+        record = BatchJournal.record
+
+        def record_except_skip(journal, item, kind, **fields):
+            if kind == "skipped":
+                raise OSError("Disk full")
+            record(journal, item, kind, **fields)
+
+        with patch.object(BatchJournal, "record", record_except_skip):
+            process_batch(input_path=input_dir, translator=mock_translator, logger=logger)
+
+        mock_import.assert_called_once()
+        assert mock_import.call_args[0][0] == str(input_dir / "book2.txt")
+        assert any("Disk full" in str(call_args) for call_args in logger.error.call_args_list)
+
+    @patch("enchant_book_manager.batch_processor.filelock.FileLock")
+    @patch("enchant_book_manager.batch_processor.save_translated_book")
+    @patch("enchant_book_manager.batch_processor.import_book_from_txt")
+    def test_process_batch_progress_save_error(self, mock_import, mock_save, mock_filelock, tmp_path):
         """Test batch processing when progress save fails."""
         input_dir = tmp_path / "novels"
         input_dir.mkdir()
@@ -339,11 +379,13 @@ class TestProcessBatch:
         mock_translator.is_remote = False
         logger = Mock(spec=logging.Logger)
 
-        # Make yaml.safe_dump fail first time, then succeed
-        mock_yaml_dump.side_effect = [yaml.YAMLError("Save failed"), None, None]
+        # Make the "started" event fail
+        with patch.object(BatchJournal, "record", side_effect=OSError("Save failed")):
+            with pytest.raises(OSError):
+                process_batch(input_path=input_dir, translator=mock_translator, logger=logger)
 
-        with pytest.raises(yaml.YAMLError):
-            process_batch(input_path=input_dir, translator=mock_translator, logger=logger)
+        assert mock_import.call_count == 0
+        assert any("Error saving progress file" in str(call) for call in logger.error.call_args_list)
 
     @patch("enchant_book_manager.batch_processor.filelock.FileLock")
     @patch("enchant_book_manager.batch_processor.save_translated_book")
@@ -424,8 +466,8 @@ class TestProcessBatch:
     @patch("enchant_book_manager.batch_processor.filelock.FileLock")
     @patch("enchant_book_manager.batch_processor.save_translated_book")
     @patch("enchant_book_manager.batch_processor.import_book_from_txt")
-    def test_process_batch_finally_block_errors(self, mock_import, mock_save, mock_filelock, tmp_path):
-        """Test batch processing with errors in finally block."""
+    def test_process_batch_result_save_errors(self, mock_import, mock_save, mock_filelock, tmp_path):
+        """Test batch processing when the result of a file cannot be saved."""
         input_dir = tmp_path / "novels"
         input_dir.mkdir()
         file1 = input_dir / "book1.txt"
@@ -436,31 +478,23 @@ class TestProcessBatch:
         mock_translator.is_remote = False
         logger = Mock(spec=logging.Logger)
 
-        # Ensure progress file doesn't exist
-        progress_file = Path("translation_batch_progress.yml")
-        if progress_file.exists():
-            progress_file.unlink()
-
-        # Make yaml.safe_dump fail in the finally block
-        original_yaml_dump = yaml.safe_dump
-        yaml_dump_call_count = 0
+        # The "started" event is saved, the "failed" event is not
+        original_record = BatchJournal.record
+        record_calls = 0
 
-        def mock_yaml_dump(*args, **kwargs):
-            nonlocal yaml_dump_call_count
-            yaml_dump_call_count += 1
-            # First call succeeds (initial save), second fails (in finally block)
-            if yaml_dump_call_count == 2:
-                raise yaml.YAMLError("Save failed in finally")
-            return original_yaml_dump(*args, **kwargs)
+        def mock_record(journal, item, kind, **fields):
+            nonlocal record_calls
+            record_calls += 1
+            if record_calls == 2:
+                raise OSError("Save failed")
+            return original_record(journal, item, kind, **fields)
 
-        with patch(
-            "enchant_book_manager.batch_processor.yaml.safe_dump",
-            side_effect=mock_yaml_dump,
-        ):
+        with patch.object(BatchJournal, "record", mock_record):
             process_batch(input_path=input_dir, translator=mock_translator, logger=logger)
 
-        # Should log error from finally block
-        assert any("Error saving progress file in finally block" in str(call) for call in logger.error.call_args_list)
+        # Should log the error and keep the journal of the unfinished batch
+        assert any("Error saving progress of" in str(call) for call in logger.error.call_args_list)
+        assert BatchJournal(tmp_path / "translation_batch_progress.jsonl").load()["files"][0]["status"] == "processing"
 
     @patch("enchant_book_manager.batch_processor.filelock.FileLock")
     @patch("enchant_book_manager.batch_processor.save_translated_book")
@@ -525,7 +559,7 @@ class TestProcessBatch:
         original_unlink = Path.unlink
 
         def mock_unlink(self):
-            if "translation_batch_progress.yml" in str(self):
+            if "translation_batch_progress.jsonl" in str(self):
                 raise PermissionError("Cannot delete file")
             return original_unlink(self)
 
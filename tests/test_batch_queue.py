@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for batch_queue module.
+"""
+
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.batch_queue import LeaseQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """A queue holding novels a.txt and b.txt."""
+    novels = tmp_path / "novels"
+    novels.mkdir()
+    for name in ("a.txt", "b.txt"):
+        (novels / name).write_text("x")
+    queue = LeaseQueue(novels / "queue.sqlite3", max_attempts=2)
+    queue.enqueue(sorted(novels.glob("*.txt")), novels)
+    return queue
+
+
+class TestEnqueueAndClaim:
+    """Filling the queue and leasing novels."""
+
+    def test_enqueue_is_idempotent(self, queue, tmp_path):
+        """Every host enqueues the directory; novels are added once."""
+        novels = tmp_path / "novels"
+        (novels / "c.txt").write_text("x")
+
+        assert queue.enqueue(sorted(novels.glob("*.txt")), novels) == 1
+        assert queue.counts() == {"queued": 3, "leased": 0, "completed": 0, "failed": 0}
+
+    def test_hosts_with_different_mounts(self, queue, tmp_path):
+        """A host that sees the directory under another path adds no novels twice."""
+        # A copy stands in for the same directory mounted elsewhere
+        mount = tmp_path / "mount"
+        shutil.copytree(tmp_path / "novels", mount)
+        link = tmp_path / "link"
+        link.symlink_to(mount, target_is_directory=True)
+
+        assert queue.enqueue(sorted(mount.glob("*.txt")), mount) == 0
+        assert queue.enqueue(sorted(link.glob("*.txt")), link) == 0
+        assert queue.enqueue([(link / "a.txt").resolve()], link) == 0
+        lease, _ = queue.claim("w1", 60)
+        assert lease.path == "a.txt"
+        assert queue.counts() == {"queued": 1, "leased": 1, "completed": 0, "failed": 0}
+
+    def test_claims_are_exclusive(self, queue):
+        """Two workers never lease the same novel."""
+        first, _ = queue.claim("w1", 60)
+        second, _ = queue.claim("w2", 60)
+        third, _ = queue.claim("w3", 60)
+
+        assert Path(first.path).name == "a.txt" and first.attempt == 1
+        assert Path(second.path).name == "b.txt"
+        assert third is None
+        assert queue.counts()["leased"] == 2
+
+
+class TestLeases:
+    """Heartbeats, expiry and release."""
+
+    def test_expired_lease_is_requeued(self, queue):
+        """A novel of a worker that stopped sending heartbeats goes to the next claim."""
+        dead, _ = queue.claim("dead", 0.05)
+        time.sleep(0.1)
+
+        lease, expired = queue.claim("alive", 60)
+
+        assert expired == [(dead.path, "dead")]
+        assert lease.path == dead.path and lease.attempt == 2
+        assert not queue.heartbeat(dead, 60)
+        assert queue.heartbeat(lease, 60)
+
+    def test_heartbeat_keeps_lease(self, queue):
+        """An extended lease is not taken over."""
+        lease, _ = queue.claim("w1", 1)
+        time.sleep(0.6)
+        assert queue.heartbeat(lease, 1)
+        time.sleep(0.6)
+
+        _, expired = queue.claim("w2", 60)
+
+        assert expired == []
+
+    def test_expired_out_of_attempts_fails(self, queue):
+        """A novel whose leases keep expiring is failed after max_attempts."""
+        queue.claim("w1", 0.01)
+        time.sleep(0.05)
+        queue.claim("w2", 0.01)  # a.txt again, attempt 2
+        time.sleep(0.05)
+        queue.claim("w3", 60)  # fails a.txt, leases b.txt
+
+        assert queue.counts() == {"queued": 0, "leased": 1, "completed": 0, "failed": 1}
+
+    def test_release_keeps_attempts(self, queue):
+        """A released novel does not use up an attempt and waits retry_seconds."""
+        lease, _ = queue.claim("w1", 60)
+        assert queue.release(lease, retry_seconds=60)
+
+        other, _ = queue.claim("w1", 60)
+
+        assert Path(other.path).name == "b.txt"
+        assert queue.counts()["queued"] == 1
+
+
+class TestCommits:
+    """Result commits and finishing the batch."""
+
+    def test_commit_is_idempotent(self, queue):
+        """Committing the same lease twice records one result."""
+        lease, _ = queue.claim("w1", 60)
+
+        assert queue.complete(lease, True)
+        assert queue.complete(lease, True)
+
+        assert queue.counts()["completed"] == 1
+
+    def test_commit_of_taken_over_lease_is_ignored(self, queue):
+        """A worker that lost its lease cannot overwrite the new holder's result."""
+        stale, _ = queue.claim("slow", 0.05)
+        time.sleep(0.1)
+        current, _ = queue.claim("fast", 60)
+
+        assert not queue.complete(stale, False, "late failure")
+        assert queue.complete(current, True)
+        assert not queue.complete(stale, True)
+        assert queue.counts()["completed"] == 1
+
+    def test_commit_after_expiry_without_new_claim(self, queue):
+        """A late result is kept if nobody claimed the novel in the meantime."""
+        lease, _ = queue.claim("slow", 0.05)
+        time.sleep(0.1)
+        with queue._transaction() as conn:
+            assert queue._requeue_expired(conn, time.time()) == [(lease.path, "slow")]
+
+        assert queue.complete(lease, True)
+        assert queue.counts() == {"queued": 1, "leased": 0, "completed": 1, "failed": 0}
+
+    def test_failure_is_retried_then_failed(self, queue):
+        """A failed novel is queued again until it is out of attempts."""
+        for attempt in (1, 2):
+            lease, _ = queue.claim("w1", 60)
+            assert Path(lease.path).name == "a.txt" and lease.attempt == attempt
+            queue.complete(lease, False, "Boom")
+
+        assert queue.counts() == {"queued": 1, "leased": 0, "completed": 0, "failed": 1}
+
+    def test_finish_batch_once(self, queue, tmp_path):
+        """The final progress goes to exactly one caller, once every novel is done."""
+        first, _ = queue.claim("w1", 60)
+        queue.complete(first, True)
+        assert queue.finish_batch(tmp_path / "novels") is None
+
+        second, _ = queue.claim("w2", 60)
+        queue.complete(second, False, "Boom")
+        retry, _ = queue.claim("w2", 60)
+        queue.complete(retry, False, "Boom again")
+
+        progress = queue.finish_batch(tmp_path / "novels")
+        assert queue.finish_batch(tmp_path / "novels") is None
+        assert progress["distributed"] is True
+        assert progress["input_folder"] == str((tmp_path / "novels").resolve())
+        assert [(item["path"], item["status"], item["retry_count"]) for item in progress["files"]] == [
+            (str((tmp_path / "novels" / "a.txt").resolve()), "completed", 0),
+            (str((tmp_path / "novels" / "b.txt").resolve()), "failed/skipped", 2),
+        ]
+        assert progress["files"][1]["error"] == "Boom again"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
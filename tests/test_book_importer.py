@@ -18,6 +18,8 @@ from enchant_book_manager.book_importer import (
     foreign_book_title_splitter,
     import_book_from_txt,
 )
+from enchant_book_manager.models import Book, VARIATION_DB
+from enchant_book_manager.text_splitter import DEFAULT_MAX_CHARS
 
 
 class TestForeignBookTitleSplitter:
@@ -326,3 +328,26 @@ class TestImportBookFromTxt:
 
                         # The import should succeed
                         assert result == "test-uuid"
+
+    def test_import_records_chapter_map(self, tmp_path):
+        """Test a real import snaps chunks to Chinese headings and stores the map."""
+        body = "他走了很远的路。" * 8
+        text = "".join(f"第{number}章 路\n\n" + f"{body}\n\n" * 3 for number in ("一", "二", "三"))
+        path = tmp_path / "chapter map book.txt"
+        path.write_text(text, encoding="utf-8")
+
+        book = Book.get_by_id(import_book_from_txt(path, max_chars=300))
+        chunks = sorted(book.chunks, key=lambda chunk: chunk.chunk_number)
+
+        assert [(span.number, span.first_chunk, span.last_chunk, span.paragraph) for span in book.chapter_map] == [(1, 1, 1, 0), (2, 2, 2, 0), (3, 3, 3, 0)]
+        assert all(VARIATION_DB[chunk.original_variation_id].text_content.startswith("第") for chunk in chunks)
+
+    def test_import_without_chapter_awareness(self, tmp_path):
+        """Test chapter_aware=False packs greedily and leaves the map empty."""
+        path = tmp_path / "plain book.txt"
+        path.write_text("第一章\n\n正文。\n\n", encoding="utf-8")
+
+        book = Book.get_by_id(import_book_from_txt(path, chapter_aware=False))
+
+        assert book.chapter_map == []
+        assert book.chunking == {"max_chars": DEFAULT_MAX_CHARS, "balanced": False, "chapter_aware": False}
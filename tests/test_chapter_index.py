@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for chapter_index module.
+"""
+
+import json
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager import epub_validation
+from enchant_book_manager.chapter_index import (
+    index_path_for,
+    load_chapter_index,
+    parser_fingerprint,
+    save_chapter_index,
+)
+from enchant_book_manager.chapter_issues import detect_issues
+from enchant_book_manager.chapter_parser import split_text
+from enchant_book_manager.make_epub import create_epub_from_txt_file
+
+SAMPLE = "Preface – ünïcödé 前言\n\nChapter 1\nFirst “chapter” body.\n\nChapter 3\nThird body 第三章\n"
+
+
+def write_index(tmp_path: Path, text: str = SAMPLE) -> Path:
+    """Write a text file and its chapter index."""
+    txt = tmp_path / "translated_Book by Author.txt"
+    txt.write_text(text, encoding="utf-8")
+    chapters, seq = split_text(text, detect_headings=True)
+    assert save_chapter_index(txt, text, chapters, seq, detect_issues(seq))
+    return txt
+
+
+class TestChapterIndexRoundTrip:
+    """Test saving and loading chapter indexes."""
+
+    def test_round_trip_matches_split_text(self, tmp_path):
+        """Test that a loaded index reproduces split_text and detect_issues."""
+        txt = write_index(tmp_path)
+        chapters, seq = split_text(SAMPLE, detect_headings=True)
+
+        index = load_chapter_index(txt, SAMPLE)
+
+        assert index is not None
+        assert index.chapters == chapters
+        assert index.sequence == seq
+        assert index.issues == detect_issues(seq)
+
+    def test_sidecar_stores_byte_offsets(self, tmp_path):
+        """Test that offsets address the UTF-8 encoded text."""
+        txt = write_index(tmp_path)
+        data = json.loads(index_path_for(txt).read_text(encoding="utf-8"))
+        raw = SAMPLE.encode("utf-8")
+
+        for title, start, end in data["chapters"]:
+            assert raw[start:end].decode("utf-8") in SAMPLE
+
+    def test_changed_text_invalidates(self, tmp_path):
+        """Test that an index is ignored once the text changes."""
+        txt = write_index(tmp_path)
+        assert load_chapter_index(txt, SAMPLE + "Chapter 4\n") is None
+
+    def test_changed_parser_invalidates(self, tmp_path):
+        """Test that an index is ignored when the parser fingerprint changes."""
+        txt = write_index(tmp_path)
+        with patch("enchant_book_manager.chapter_index.parser_fingerprint", return_value="other"):
+            assert load_chapter_index(txt, SAMPLE) is None
+
+    def test_missing_or_corrupt_index(self, tmp_path):
+        """Test that missing and corrupt sidecars are treated as absent."""
+        txt = tmp_path / "book.txt"
+        assert load_chapter_index(txt, SAMPLE) is None
+
+        index_path_for(txt).write_text("{not json", encoding="utf-8")
+        assert load_chapter_index(txt, SAMPLE) is None
+
+    def test_non_verbatim_chapters_not_saved(self, tmp_path):
+        """Test that chapters that are not substrings of the text are not indexed."""
+        txt = tmp_path / "book.txt"
+        assert not save_chapter_index(txt, "abc", [("Content", "xyz")], [], [])
+        assert not index_path_for(txt).exists()
+
+    def test_fingerprint_is_stable(self):
+        """Test that the fingerprint does not change between calls."""
+        assert parser_fingerprint() == parser_fingerprint()
+
+
+class TestEpubBuildReusesIndex:
+    """Test that EPUB builds reuse the index."""
+
+    def test_second_build_skips_parsing(self, tmp_path, monkeypatch):
+        """Test that an unchanged text is not re-parsed on rebuild."""
+        # The missing chapter 2 is logged to the per-run error log
+        monkeypatch.setattr(epub_validation, "_ERROR_LOG", tmp_path / "errors.log")
+        txt = tmp_path / "translated_Book by Author.txt"
+        txt.write_text(SAMPLE, encoding="utf-8")
+
+        first = create_epub_from_txt_file(txt, tmp_path / "a.epub", "Book", "Author")
+        assert index_path_for(txt).exists()
+
+        with patch("enchant_book_manager.make_epub.split_text") as mock_split:
+            second = create_epub_from_txt_file(txt, tmp_path / "b.epub", "Book", "Author")
+
+        mock_split.assert_not_called()
+        assert first == second
+        assert (tmp_path / "b.epub").exists()
@@ -11,7 +11,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from enchant_book_manager.chapter_issues import detect_issues
+from enchant_book_manager.chapter_issues import MissingNumberTracker, detect_issues, predecessors_and_run_lengths
 
 
 class TestDetectIssues:
@@ -228,3 +228,44 @@ class TestDetectIssues:
         assert "number 250 is repeated 1 time after number 500" in result
         assert "number 251 is repeated 1 time after number 250" in result
         assert "number 252 is repeated 1 time after number 251" in result
+
+    def test_long_run_of_repeats(self):
+        """Test every repeat in a long run reports the rest of the run and its predecessor."""
+        result = detect_issues([1, 2] + [3] * 20000 + [4])
+
+        repeats = [r for r in result if "repeated" in r]
+        assert len(repeats) == 19999
+        assert repeats[0] == "number 3 is repeated 19999 times after number 2"
+        assert repeats[-1] == "number 3 is repeated 1 time after number 2"
+
+    def test_back_and_forth_jumps_report_missing_once(self):
+        """Test jumps over the same gap report each missing number only once."""
+        result = detect_issues([1, 5000, 2, 5001, 3, 5002, 4])
+
+        missing = [r for r in result if "missing" in r]
+        assert missing[:4998] == [f"number {m} is missing" for m in range(2, 5000)]
+        assert len(missing) == len(set(missing))
+        assert "number 2 is out of place after number 5000" in result
+
+
+class TestSequenceHelpers:
+    """Test the helpers used by detect_issues."""
+
+    def test_predecessors_and_run_lengths(self):
+        """Test predecessors skip equal values and run lengths count what is left of the run."""
+        predecessors, run_lengths = predecessors_and_run_lengths([5, 5, 6, 6, 6, 5, 7])
+        assert predecessors == [None, None, 5, 5, 5, 6, 5]
+        assert run_lengths == [2, 1, 3, 2, 1, 1, 1]
+
+    def test_predecessors_and_run_lengths_empty(self):
+        """Test an empty sequence gives empty lists."""
+        assert predecessors_and_run_lengths([]) == ([], [])
+
+    def test_missing_number_tracker(self):
+        """Test numbers are yielded once across overlapping ranges."""
+        tracker = MissingNumberTracker()
+        assert list(tracker.take(3, 6)) == [3, 4, 5]
+        assert list(tracker.take(1, 8)) == [1, 2, 6, 7]
+        assert list(tracker.take(2, 8)) == []
+        assert list(tracker.take(8, 8)) == []
+        assert list(tracker.take(-2, 0)) == [-2, -1]
@@ -18,6 +18,7 @@ from enchant_book_manager.chapter_parser import (
     split_text,
     DB_OPTIMIZED,
 )
+from enchant_book_manager.chapter_segmenter import ChapterScanStats
 
 
 class TestSplitText:
@@ -285,6 +286,47 @@ or headings"""
         assert chapters[0][0] == "Chapter 1"
 
 
+class TestScanStats:
+    """Test the ChapterScanStats counters reported by split_text."""
+
+    def test_counters(self):
+        """Test lines scanned, prefilter hits, regex matches and headings."""
+        text = "Intro\nChapter 1\nBody\n1st place\nBook of Ages\nChapter 2\nEnd"
+        stats = ChapterScanStats()
+
+        chapters, seq = split_text(text, detect_headings=True, stats=stats)
+
+        assert seq == [1, 2]
+        assert stats.lines_scanned == 7
+        # "Chapter 1", "1st place", "Book of Ages" and "Chapter 2" pass the prefilter
+        assert stats.prefilter_hits == 4
+        # "1st place" and "Book of Ages" fail the full regex
+        assert stats.regex_matches == 2
+        assert stats.headings == 2
+
+    def test_counters_accumulate(self):
+        """Test that one stats object can collect several scans."""
+        stats = ChapterScanStats()
+        split_text("Chapter 1\nA", detect_headings=True, stats=stats)
+        split_text("Chapter 1\nA", detect_headings=True, stats=stats)
+
+        assert stats.lines_scanned == 4
+        assert stats.headings == 2
+
+    @patch("enchant_book_manager.chapter_parser.DB_OPTIMIZATION_THRESHOLD", 3)
+    def test_counters_on_large_file_path(self):
+        """Test that the large-file engine fills the same counters."""
+        text = "Chapter 1\nA\nthe chapter\nChapter 2\nB"
+        stats = ChapterScanStats()
+
+        split_text(text, detect_headings=True, stats=stats)
+
+        assert stats.lines_scanned == 5
+        assert stats.prefilter_hits == 3
+        assert stats.regex_matches == 2
+        assert stats.headings == 2
+
+
 class TestSplitTextDB:
     """Test the split_text_db function."""
 
@@ -12,6 +12,7 @@ while still validating the core functionality.
 """
 
 import pytest
+import shutil
 import sys
 import zipfile
 import xml.etree.ElementTree as ET
@@ -33,9 +34,11 @@ class TestChapterParsingPhase3:
     """Test that enchant_cli.py correctly generates EPUB with proper chapter TOC"""
 
     @pytest.fixture
-    def sample_novel_path(self):
-        """Path to the sample translated novel"""
-        return project_root / "tests" / "sample_novel" / "sample_chapters.txt"
+    def sample_novel_path(self, tmp_path):
+        """Copy of the sample translated novel, so the run writes nothing next to the checked-in files"""
+        novel_path = tmp_path / sample_novel_path.name
+        shutil.copyfile(sample_novel_path, novel_path)
+        return novel_path
 
     @pytest.fixture
     def expected_chapters_path(self):
@@ -207,8 +210,6 @@ class TestChapterParsingPhase3:
 
         finally:
             # Clean up temp directory
-            import shutil
-
             if temp_dir.exists():
                 shutil.rmtree(temp_dir)
                 print(f"Cleaned up temp directory: {temp_dir}")
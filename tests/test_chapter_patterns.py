@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enchant_book_manager.chapter_patterns import (
     HEADING_RE,
+    HEADING_PREFILTER_RE,
     PART_PATTERNS,
     DB_OPTIMIZATION_THRESHOLD,
 )
@@ -167,6 +168,25 @@ class TestHeadingRegex:
         assert HEADING_RE.match("Chapter MCMXCIX")  # 1999 in Roman
 
 
+class TestHeadingPrefilter:
+    """Test the HEADING_PREFILTER_RE prefilter."""
+
+    @pytest.mark.parametrize(
+        "line",
+        ["Chapter 1", "  ch. 5", "CHAP 3", "Part One", "Section 2", "Book IV", "§ 42", "12) Title", "** Chapter 7 **", "ſection 9"],
+    )
+    def test_accepts_every_heading(self, line):
+        """Test that headings matched by HEADING_RE pass the prefilter."""
+        assert HEADING_RE.match(line.strip())
+        assert HEADING_PREFILTER_RE.match(line)
+
+    @pytest.mark.parametrize("line", ["He said hello.", "第一章", "", "   ", "_1 note", "The chapter ended."])
+    def test_rejects_prose(self, line):
+        """Test that ordinary lines are rejected before the full regex."""
+        assert not HEADING_PREFILTER_RE.match(line)
+        assert not HEADING_RE.match(line.strip())
+
+
 class TestPartPatterns:
     """Test the PART_PATTERNS regex list."""
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for chapter_segmenter module.
+"""
+
+import contextlib
+import io
+import random
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager import epub_db_optimized
+from enchant_book_manager.chapter_patterns import HEADING_RE
+from enchant_book_manager.chapter_segmenter import (
+    build_chapters,
+    find_heading_lines,
+    normalize_line_breaks,
+    process_text_optimized,
+)
+from enchant_book_manager.chapter_validators import is_valid_chapter_line, parse_num
+
+
+def db_reference(text: str) -> tuple:
+    """Run the SQLite implementation, silencing its progress output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return epub_db_optimized.process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line)
+
+
+def segment(text: str) -> tuple:
+    """Run the in-memory engine with the production patterns."""
+    return process_text_optimized(text, HEADING_RE, parse_num, is_valid_chapter_line)
+
+
+class TestNormalizeLineBreaks:
+    """Test the normalize_line_breaks function."""
+
+    def test_matches_splitlines(self):
+        """Test that every splitlines boundary becomes a newline."""
+        text = "a\r\nb\rc\x0bd\x0ce\x1cf\x85g\u2028h\u2029i\nj"
+        assert normalize_line_breaks(text).split("\n") == text.splitlines()
+
+    def test_plain_text_returned_unchanged(self):
+        """Test that text with only newlines is returned as is."""
+        text = "a\nb\n"
+        assert normalize_line_breaks(text) is text
+
+
+class TestFindHeadingLines:
+    """Test the find_heading_lines function."""
+
+    def test_line_numbers_and_offsets(self):
+        """Test that headings carry 1-based line numbers and line offsets."""
+        text = "intro\n\nChapter 1\nbody\nChapter 2: End"
+        headings = find_heading_lines(text, HEADING_RE, parse_num, is_valid_chapter_line)
+
+        assert [h.line_number for h in headings] == [3, 5]
+        assert [h.number for h in headings] == [1, 2]
+        assert [text[h.start : h.end] for h in headings] == ["Chapter 1", "Chapter 2: End"]
+
+    def test_duplicate_within_window_skipped(self):
+        """Test that repeated heading text within 4 lines is ignored."""
+        text = "Chapter 1\n\nChapter 1\nbody\n\n\n\n\nChapter 1"
+        headings = find_heading_lines(text, HEADING_RE, parse_num, is_valid_chapter_line)
+
+        assert [h.line_number for h in headings] == [1, 9]
+
+    def test_lines_without_keyword_never_matched(self):
+        """Test that the prefilter keeps non-chapter headings out, as the DB path did."""
+        text = "Part 1\n第一章\n§ 2\nChapter 3"
+        headings = find_heading_lines(text, HEADING_RE, parse_num, is_valid_chapter_line)
+
+        assert [h.title for h in headings] == ["Chapter 3"]
+
+
+class TestBuildChapters:
+    """Test the build_chapters function."""
+
+    def test_no_headings(self):
+        """Test that text without headings becomes one Content chapter."""
+        assert build_chapters("a\nb\n", []) == ([("Content", "a\nb")], [])
+
+
+class TestProcessTextOptimized:
+    """Test output compatibility with the SQLite implementation."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            " \n\t\n",
+            "no chapters here\n",
+            "Front\nChapter 1\nA\n\nChapter 2\nB\n\n",
+            "Chapter 1\r\nA\r\nCHAPTER 2\r\nB",
+            '"Chapter 1" she said\nChapter 1\nbody',
+            "Ch. 1\nx\nchap 2\ny\nChapter Three\nz",
+            "Chapter 1\u2028body\u2029Chapter 2\x85tail",
+        ],
+    )
+    def test_matches_database_path(self, text):
+        """Test fixed edge cases against the SQLite implementation."""
+        assert segment(text) == db_reference(text)
+
+    def test_random_texts_match_database_path(self):
+        """Test randomized texts against the SQLite implementation."""
+        pieces = ["Chapter 1", "chapter 2: x", "CHAPTER III", "Ch. 4", "Chap 6", " Chapter 7 ", "see chapter 9", "Chapter", "text", "", "第一章", "Chapter 14 (Part 1 of 2)"]
+        separators = ["\n", "\r\n", "\r", "\x85", "\n\n"]
+        for seed in range(200):
+            rng = random.Random(seed)
+            text = "".join(rng.choice(pieces) + rng.choice(separators) for _ in range(rng.randint(0, 30)))
+            assert segment(text) == db_reference(text), repr(text)
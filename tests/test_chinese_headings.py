@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for chinese_headings module.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.chinese_headings import match_chinese_heading, parse_chinese_number
+
+
+class TestParseChineseNumber:
+    """Test the Chinese numeral parser."""
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("12", 12),
+            ("１２", 12),
+            ("十", 10),
+            ("十二", 12),
+            ("二十", 20),
+            ("二十一", 21),
+            ("一百零五", 105),
+            ("一百一十", 110),
+            ("两千", 2000),
+            ("两千零五", 2005),
+            ("一〇五", 105),
+            ("一二三", 123),
+            ("叁拾", 30),
+            ("壹佰贰拾叁", 123),
+            ("十万", 100_000),
+            ("一万零一", 10_001),
+            ("一亿二千万", 120_000_000),
+        ],
+    )
+    def test_values(self, text, expected):
+        """Test positional, unit and financial numerals."""
+        assert parse_chinese_number(text) == expected
+
+    @pytest.mark.parametrize("text", ["", "  ", "第", "十a", "one"])
+    def test_not_a_number(self, text):
+        """Test text that is not a number gives None."""
+        assert parse_chinese_number(text) is None
+
+
+class TestMatchChineseHeading:
+    """Test the heading detector."""
+
+    @pytest.mark.parametrize(
+        "paragraph, number, unit",
+        [
+            ("第十二章 风起\n\n", 12, "章"),
+            ("第一百零五回\n\n", 105, "回"),
+            ("第3节：开始\n\n", 3, "节"),
+            ("  第 二 卷 归来\n\n", 2, "卷"),
+            ("第１２章\n\n", 12, "章"),
+        ],
+    )
+    def test_headings(self, paragraph, number, unit):
+        """Test the heading forms and the parsed number and unit."""
+        heading = match_chinese_heading(paragraph)
+
+        assert heading is not None
+        assert (heading.number, heading.unit, heading.title) == (number, unit, paragraph.strip())
+
+    def test_heading_followed_by_text(self):
+        """Test a heading line followed by the chapter text without a blank line."""
+        heading = match_chinese_heading("第五章 雨\n他走进了雨里。\n\n")
+
+        assert heading is not None
+        assert (heading.number, heading.title) == (5, "第五章 雨")
+
+    @pytest.mark.parametrize(
+        "paragraph",
+        [
+            "他说第五章很好看。\n\n",
+            "第三回合，他赢了。\n\n",
+            "第三节课开始了。\n\n",
+            "第五章" + "的内容" * 20 + "\n\n",
+            "第几章\n\n",
+        ],
+    )
+    def test_not_headings(self, paragraph):
+        """Test sentences that only look like headings."""
+        assert match_chinese_heading(paragraph) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -64,6 +64,8 @@ class BaseChunkRetryTest:
             mock_chapters.append(chapter)
 
         mock_book.chunks = mock_chapters
+        mock_book.chapter_map = []
+        mock_book.chunking = {}
         return mock_book
 
     def _create_mock_variations(self):
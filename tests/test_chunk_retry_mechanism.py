@@ -43,6 +43,8 @@ class TestChunkRetryMechanism:
             self.mock_chapters.append(chapter)
 
         self.mock_book.chunks = self.mock_chapters
+        self.mock_book.chapter_map = []
+        self.mock_book.chunking = {}
 
         # Create mock variations
         self.mock_variations = {
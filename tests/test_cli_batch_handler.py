@@ -11,28 +11,63 @@ import datetime as dt
 import logging
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open, call
+import json
+import multiprocessing
+import os
+import shutil
+import time
 import yaml
 import filelock
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from enchant_book_manager import cli_setup
+from enchant_book_manager.batch_journal import BatchJournal
 from enchant_book_manager.cli_batch_handler import (
+    get_batch_workers,
+    get_stage_workers,
     process_batch,
-    _save_batch_progress,
+    _process_book,
+    _record_event,
     _archive_batch_history,
     _cleanup_progress_file,
 )
+from enchant_book_manager.batch_queue import QUEUE_FILE, LeaseQueue
+from enchant_book_manager.workflow_progress import get_book_lock_path
+
+
+def run_node(novels, worker_id, record_path, dies=False):
+    """Run one host of a distributed batch; a dying host exits holding its first lease."""
+
+    def process(path, args, logger):
+        if dies:
+            os._exit(1)
+        time.sleep(0.2)
+        with open(record_path, "a") as f:
+            f.write(f"{worker_id} {path.name}\n")
+        return True
+
+    args = argparse.Namespace(filepath=str(novels), distributed=True, worker_id=worker_id, lease_seconds=1.0, batch_workers=1)
+    with patch("enchant_book_manager.cli_batch_handler.process_novel_unified", side_effect=process):
+        process_batch(args, logging.getLogger(worker_id))
 
 
 class TestProcessBatch:
     """Test the main process_batch function."""
 
+    @pytest.fixture(autouse=True)
+    def in_tmp_path(self, tmp_path, monkeypatch):
+        """Keep the batch journal of every test in its own directory."""
+        monkeypatch.chdir(tmp_path)
+
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_process_batch_success(self, mock_load_yaml, mock_process_novel, mock_filelock, tmp_path):
+    def test_process_batch_success(self, mock_process_novel, mock_filelock, tmp_path):
         """Test successful batch processing."""
         # Setup test files
         test_dir = tmp_path / "test_novels"
@@ -49,9 +84,6 @@ class TestProcessBatch:
         # Mock logger
         logger = Mock(spec=logging.Logger)
 
-        # Mock yaml loading (no existing progress)
-        mock_load_yaml.return_value = None
-
         # Mock successful processing
         mock_process_novel.return_value = True
 
@@ -59,7 +91,7 @@ class TestProcessBatch:
         mock_lock = MagicMock()
         mock_filelock.return_value = mock_lock
 
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress") as mock_save:
+        with patch("enchant_book_manager.cli_batch_handler._record_event", wraps=_record_event) as mock_save:
             with patch("enchant_book_manager.cli_batch_handler._archive_batch_history") as mock_archive:
                 with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file") as mock_cleanup:
                     process_batch(args, logger)
@@ -86,19 +118,10 @@ class TestProcessBatch:
         logger.error.assert_called_with("Batch processing requires an existing directory path.")
         mock_exit.assert_called_with(1)
 
-    @patch("enchant_book_manager.cli_batch_handler.Path")
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_process_batch_resume(
-        self,
-        mock_load_yaml,
-        mock_process_novel,
-        mock_filelock,
-        mock_path_class,
-        tmp_path,
-    ):
-        """Test resuming batch processing."""
+    def test_process_batch_resume(self, mock_process_novel, mock_filelock, tmp_path):
+        """Test resuming batch processing replays the journal."""
         # Setup test directory
         test_dir = tmp_path / "test_novels"
         test_dir.mkdir()
@@ -107,59 +130,39 @@ class TestProcessBatch:
         file1.write_text("Test content 1")
         file2.write_text("Test content 2")
 
-        # Mock existing progress (file1 already completed)
-        existing_progress = {
+        # Journal of an interrupted batch: file1 completed, file2 failed once
+        progress = {
             "created": "2024-01-01T10:00:00",
             "input_folder": str(test_dir),
-            "files": [
-                {
-                    "path": str(file1.resolve()),
-                    "status": "completed",
-                    "end_time": "2024-01-01T10:30:00",
-                    "retry_count": 0,
-                },
-                {
-                    "path": str(file2.resolve()),
-                    "status": "planned",
-                    "end_time": None,
-                    "retry_count": 0,
-                },
-            ],
+            "files": [{"path": str(file.resolve()), "status": "planned", "end_time": None, "retry_count": 0} for file in (file1, file2)],
         }
+        journal = BatchJournal(tmp_path / "translation_batch_progress.jsonl")
+        journal.begin(progress)
+        journal.record(progress["files"][0], "started")
+        journal.record(progress["files"][0], "completed")
+        journal.record(progress["files"][1], "started")
+        journal.record(progress["files"][1], "failed", error="Timeout", retry_count=1)
 
         args = Mock()
         args.filepath = str(test_dir)
         logger = Mock(spec=logging.Logger)
-
-        # Setup Path mocks
-        def path_side_effect(path_str):
-            if path_str == args.filepath:
-                return test_dir
-            elif "translation_batch_progress.yml" in str(path_str):
-                mock_progress_file = Mock()
-                mock_progress_file.exists.return_value = True
-                return mock_progress_file
-            else:
-                return Path(path_str)
-
-        mock_path_class.side_effect = path_side_effect
-
-        mock_load_yaml.return_value = existing_progress
         mock_process_novel.return_value = True
 
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress"):
-            with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
-                with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
-                    process_batch(args, logger)
+        process_batch(args, logger)
 
         # Should only process the second file
         assert mock_process_novel.call_count == 1
         mock_process_novel.assert_called_with(Path(str(file2.resolve())), args, logger)
 
+        # The finished batch is compacted into the history
+        history = yaml.safe_load((tmp_path / "translations_chronology.yml").read_text())
+        assert [(item["status"], item["retry_count"]) for item in history["files"]] == [("completed", 0), ("completed", 1)]
+        assert history["files"][1]["error"] == "Timeout"
+        assert not journal.exists()
+
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_process_batch_with_failures(self, mock_load_yaml, mock_process_novel, mock_filelock, tmp_path):
+    def test_process_batch_with_failures(self, mock_process_novel, mock_filelock, tmp_path):
         """Test batch processing with some failures."""
         # Setup test directory
         test_dir = tmp_path / "test_novels"
@@ -173,12 +176,10 @@ class TestProcessBatch:
         args.filepath = str(test_dir)
         logger = Mock(spec=logging.Logger)
 
-        mock_load_yaml.return_value = None
-
         # First file fails, second succeeds
         mock_process_novel.side_effect = [False, True]
 
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress") as mock_save:
+        with patch("enchant_book_manager.cli_batch_handler._record_event", wraps=_record_event) as mock_save:
             with patch("enchant_book_manager.cli_batch_handler._archive_batch_history") as mock_archive:
                 with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file") as mock_cleanup:
                     process_batch(args, logger)
@@ -189,25 +190,16 @@ class TestProcessBatch:
         # Should still archive when done
         assert mock_archive.call_count == 1
 
-    @patch("enchant_book_manager.cli_batch_handler.Path")
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_process_batch_max_retries(
-        self,
-        mock_load_yaml,
-        mock_process_novel,
-        mock_filelock,
-        mock_path_class,
-        tmp_path,
-    ):
-        """Test batch processing respects max retries."""
+    def test_process_batch_max_retries(self, mock_process_novel, mock_filelock, tmp_path):
+        """Test batch processing respects max retries of a YAML progress file of older versions."""
         test_dir = tmp_path / "test_novels"
         test_dir.mkdir()
         file1 = test_dir / "novel1.txt"
         file1.write_text("Test content 1")
 
-        # Mock file with max retries reached
+        # Progress file with max retries reached
         existing_progress = {
             "created": "2024-01-01T10:00:00",
             "input_folder": str(test_dir),
@@ -220,30 +212,16 @@ class TestProcessBatch:
                 }
             ],
         }
+        legacy_file = tmp_path / "translation_batch_progress.yml"
+        legacy_file.write_text(yaml.safe_dump(existing_progress))
 
         args = Mock()
         args.filepath = str(test_dir)
         logger = Mock(spec=logging.Logger)
 
-        # Setup Path mocks
-        def path_side_effect(path_str):
-            if path_str == args.filepath:
-                return test_dir
-            elif "translation_batch_progress.yml" in str(path_str):
-                mock_progress_file = Mock()
-                mock_progress_file.exists.return_value = True
-                return mock_progress_file
-            else:
-                return Path(path_str)
-
-        mock_path_class.side_effect = path_side_effect
-
-        mock_load_yaml.return_value = existing_progress
-
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress"):
-            with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
-                with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
-                    process_batch(args, logger)
+        with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
+            with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
+                process_batch(args, logger)
 
         # Should not process the file
         mock_process_novel.assert_not_called()
@@ -251,10 +229,82 @@ class TestProcessBatch:
         # Should log warning
         logger.warning.assert_called_with(f"Skipping {str(file1.resolve())} after 3 failed attempts.")
 
+        # The YAML file was migrated into the journal
+        assert not legacy_file.exists()
+        progress = BatchJournal(tmp_path / "translation_batch_progress.jsonl").load()
+        assert progress["created"] == "2024-01-01T10:00:00"
+        assert progress["files"][0]["status"] == "failed/skipped"
+
+    @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_process_batch_skip_save_error(self, mock_process_novel, mock_filelock, tmp_path):
+        """Test a skip event that cannot be saved does not abort the batch."""
+        test_dir = tmp_path / "test_novels"
+        test_dir.mkdir()
+        file1 = test_dir / "novel1.txt"
+        file2 = test_dir / "novel2.txt"
+        file1.write_text("Test content 1")
+        file2.write_text("Test content 2")
+        existing_progress = {
+            "created": "2024-01-01T10:00:00",
+            "input_folder": str(test_dir),
+            "files": [
+                {"path": str(file1.resolve()), "status": "failed", "end_time": None, "retry_count": 3},
+                {"path": str(file2.resolve()), "status": "planned", "end_time": None, "retry_count": 0},
+            ],
+        }
+        (tmp_path / "translation_batch_progress.yml").write_text(yaml.safe_dump(existing_progress))
+        mock_process_novel.return_value = True
+        args = argparse.Namespace(filepath=str(test_dir))
+        logger = Mock(spec=logging.Logger)
+        record = BatchJournal.record
+
+        def record_except_skip(journal, item, kind, **fields):
+            if kind == "skipped":
+                raise OSError("Disk full")
+            record(journal, item, kind, **fields)
+
+        with patch.object(BatchJournal, "record", record_except_skip):
+            process_batch(args, logger)
+
+        mock_process_novel.assert_called_once_with(file2.resolve(), args, logger)
+        assert any("Disk full" in str(call_args) for call_args in logger.error.call_args_list)
+
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_process_batch_exception_handling(self, mock_load_yaml, mock_process_novel, mock_filelock, tmp_path):
+    def test_process_batch_archived_before_skipped_entry(self, mock_process_novel, mock_filelock, tmp_path):
+        """Test no journal is left when an entry out of retries follows the last processed one."""
+        test_dir = tmp_path / "test_novels"
+        test_dir.mkdir()
+        file1 = test_dir / "novel1.txt"
+        file2 = test_dir / "novel2.txt"
+        file1.write_text("Test content 1")
+        file2.write_text("Test content 2")
+
+        # Journal of an interrupted batch: file2 is out of retries
+        progress = {
+            "created": "2024-01-01T10:00:00",
+            "input_folder": str(test_dir),
+            "files": [{"path": str(file.resolve()), "status": "planned", "end_time": None, "retry_count": 0} for file in (file1, file2)],
+        }
+        journal = BatchJournal(tmp_path / "translation_batch_progress.jsonl")
+        journal.begin(progress)
+        journal.record(progress["files"][1], "failed", error="Timeout", retry_count=3)
+
+        args = argparse.Namespace(filepath=str(test_dir))
+        logger = Mock(spec=logging.Logger)
+        mock_process_novel.return_value = True
+
+        process_batch(args, logger)
+
+        mock_process_novel.assert_called_once_with(file1.resolve(), args, logger)
+        history = yaml.safe_load((tmp_path / "translations_chronology.yml").read_text())
+        assert [item["status"] for item in history["files"]] == ["completed", "failed/skipped"]
+        assert not journal.exists()
+
+    @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_process_batch_exception_handling(self, mock_process_novel, mock_filelock, tmp_path):
         """Test batch processing handles exceptions properly."""
         test_dir = tmp_path / "test_novels"
         test_dir.mkdir()
@@ -265,12 +315,10 @@ class TestProcessBatch:
         args.filepath = str(test_dir)
         logger = Mock(spec=logging.Logger)
 
-        mock_load_yaml.return_value = None
-
         # Raise exception during processing
         mock_process_novel.side_effect = Exception("Processing error")
 
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress") as mock_save:
+        with patch("enchant_book_manager.cli_batch_handler._record_event", wraps=_record_event) as mock_save:
             with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
                 with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
                     process_batch(args, logger)
@@ -282,50 +330,335 @@ class TestProcessBatch:
         assert mock_save.call_count >= 1
 
 
-class TestSaveBatchProgress:
-    """Test _save_batch_progress function."""
-
-    def test_save_batch_progress_success(self, tmp_path):
-        """Test successful progress save."""
-        progress_file = tmp_path / "progress.yml"
-        progress = {"status": "test", "files": [{"path": "test.txt"}]}
-        logger = Mock(spec=logging.Logger)
+class TestParallelBatch:
+    """Test --batch-workers and the per-book locks."""
 
-        _save_batch_progress(progress_file, progress, logger)
+    def make_novels(self, tmp_path, count):
+        """Create a directory of novels and return it."""
+        novels = tmp_path / "novels"
+        novels.mkdir()
+        for index in range(count):
+            (novels / f"novel{index}.txt").write_text(f"Content {index}")
+        return novels
 
-        # Check file was written
-        assert progress_file.exists()
-        loaded = yaml.safe_load(progress_file.read_text())
-        assert loaded == progress
+    def test_get_batch_workers(self):
+        """Test the worker count falls back to 1 for missing or invalid values."""
+        assert get_batch_workers(argparse.Namespace(batch_workers=4)) == 4
+        assert get_batch_workers(argparse.Namespace(batch_workers=0)) == 1
+        assert get_batch_workers(argparse.Namespace()) == 1
+        assert get_batch_workers(Mock()) == 1
 
-    def test_save_batch_progress_yaml_error(self, tmp_path):
-        """Test handling YAML error during save."""
-        progress_file = tmp_path / "progress.yml"
-        # Create object that can't be serialized to YAML
-        progress = {"obj": object()}
+    @patch("enchant_book_manager.cli_batch_handler.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_novels_run_concurrently(self, mock_process_novel, tmp_path, monkeypatch):
+        """Test novels overlap, each holds its own lock, and the batch is archived."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 4)
+        barrier = threading.Barrier(2, timeout=10)
+        held = []
+
+        def process(path, args, logger):
+            # Both workers must be inside a novel at the same time to pass
+            barrier.wait()
+            lock = filelock.FileLock(str(get_book_lock_path(path)), timeout=0)
+            with pytest.raises(filelock.Timeout):
+                lock.acquire()
+            held.append(path.name)
+            return path.name != "novel3.txt"
+
+        mock_process_novel.side_effect = process
+        args = argparse.Namespace(filepath=str(novels), batch_workers=2)
         logger = Mock(spec=logging.Logger)
 
-        with pytest.raises(Exception):
-            _save_batch_progress(progress_file, progress, logger)
+        process_batch(args, logger)
 
-        logger.error.assert_called()
+        assert sorted(held) == ["novel0.txt", "novel1.txt", "novel2.txt", "novel3.txt"]
+        history = list(yaml.safe_load_all((tmp_path / "translations_chronology.yml").read_text()))
+        statuses = {Path(item["path"]).name: (item["status"], item["retry_count"]) for item in history[0]["files"]}
+        assert statuses == {
+            "novel0.txt": ("completed", 0),
+            "novel1.txt": ("completed", 0),
+            "novel2.txt": ("completed", 0),
+            "novel3.txt": ("failed/skipped", 1),
+        }
+        assert not (tmp_path / "translation_batch_progress.yml").exists()
 
-    def test_save_batch_progress_permission_error(self, tmp_path):
-        """Test handling permission error during save."""
-        progress_file = tmp_path / "readonly" / "progress.yml"
-        progress_file.parent.mkdir()
-        progress_file.parent.chmod(0o444)  # Read-only directory
+    @patch("enchant_book_manager.cli_batch_handler.ProcessPoolExecutor", ThreadPoolExecutor)
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_progress_marks_only_running_novels(self, mock_process_novel, tmp_path, monkeypatch):
+        """Test at most batch_workers entries are marked processing at a time."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 5)
+        mock_process_novel.return_value = True
+        args = argparse.Namespace(filepath=str(novels), batch_workers=2)
+
+        # Keep the journal to read the order of the events
+        with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
+            process_batch(args, Mock(spec=logging.Logger))
+
+        processing = 0
+        processing_counts = []
+        with (tmp_path / "translation_batch_progress.jsonl").open() as f:
+            for event in map(json.loads, f):
+                processing += {"started": 1, "completed": -1}.get(event["event"], 0)
+                processing_counts.append(processing)
+        assert mock_process_novel.call_count == 5
+        assert max(processing_counts) == 2
+        assert processing_counts[-1] == 0
 
-        progress = {"status": "test"}
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_locked_novel_left_for_later(self, mock_process_novel, tmp_path, monkeypatch):
+        """Test a novel locked elsewhere is skipped without counting as a failure."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 2)
+        mock_process_novel.return_value = True
         logger = Mock(spec=logging.Logger)
 
+        locked = (novels / "novel0.txt").resolve()
+        with filelock.FileLock(str(get_book_lock_path(locked))):
+            assert _process_book(locked, argparse.Namespace(), logger) is None
+            process_batch(argparse.Namespace(filepath=str(novels), batch_workers=1), logger)
+
+        mock_process_novel.assert_called_once_with((novels / "novel1.txt").resolve(), argparse.Namespace(filepath=str(novels), batch_workers=1), logger)
+        progress = BatchJournal(tmp_path / "translation_batch_progress.jsonl").load()
+        assert [(item["status"], item["retry_count"]) for item in progress["files"]] == [("planned", 0), ("completed", 0)]
+        assert "locked by another process" in logger.warning.call_args[0][0]
+
+    def test_spawned_workers_log(self, tmp_path, monkeypatch):
+        """Test workers started with spawn write to the log file of the main process."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(cli_setup, "_logging_config", None)
+        novels = self.make_novels(tmp_path, 2)
+        log_file = tmp_path / "enchant.log"
+        config = {"logging": {"level": "INFO", "format": "%(process)d %(message)s", "file_enabled": True, "file_path": str(log_file)}}
+        logger = cli_setup.setup_logging(config)
+        spawn_pool = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+        args = argparse.Namespace(filepath=str(novels), batch_workers=2, resume=False, skip_renaming=True, skip_translating=True, skip_epub=True)
+
         try:
-            with pytest.raises(Exception):
-                _save_batch_progress(progress_file, progress, logger)
-            logger.error.assert_called()
+            with patch("enchant_book_manager.cli_batch_handler.ProcessPoolExecutor", spawn_pool):
+                process_batch(args, logger)
         finally:
-            # Restore permissions for cleanup
-            progress_file.parent.chmod(0o755)
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
+                handler.close()
+
+        worker_lines = [line for line in log_file.read_text().splitlines() if not line.startswith(f"{os.getpid()} ")]
+        assert sum("Skipping renaming phase" in line for line in worker_lines) == 2
+
+
+@patch("enchant_book_manager.cli_batch_handler.ProcessPoolExecutor", ThreadPoolExecutor)
+class TestPipelineBatch:
+    """Test --pipeline with thread pools standing in for the stage process pools."""
+
+    def make_novels(self, tmp_path, count):
+        """Create a directory of novels and return it."""
+        novels = tmp_path / "novels"
+        novels.mkdir()
+        for index in range(count):
+            (novels / f"novel{index}.txt").write_text(f"Content {index}")
+        return novels
+
+    def test_get_stage_workers(self):
+        """Test the stage worker counts fall back to 1 for missing or invalid values."""
+        args = argparse.Namespace(rename_workers=2, translate_workers=3, epub_workers=0)
+
+        assert get_stage_workers(args) == {"rename": 2, "translate": 3, "epub": 1}
+        assert get_stage_workers(Mock()) == {"rename": 1, "translate": 1, "epub": 1}
+
+    def test_stages_of_different_novels_overlap(self, tmp_path, monkeypatch):
+        """Test novel N+1 is renamed while N translates and N-1 gets its EPUB."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 4)
+        events = []
+        renamed = {f"novel{index}.txt": threading.Event() for index in range(4)}
+        epub_started = {f"novel{index}.txt": threading.Event() for index in range(4)}
+        overlaps = []
+
+        def rename(path, args, logger):
+            events.append(("rename", path.name))
+            renamed[path.name].set()
+            return path.name
+
+        def translate(name, args, logger):
+            events.append(("translate", name))
+            index = int(name[5])
+            if index + 1 < 4:
+                overlaps.append(renamed[f"novel{index + 1}.txt"].wait(10))
+            if index > 0:
+                overlaps.append(epub_started[f"novel{index - 1}.txt"].wait(10))
+            return name
+
+        def epub(name, args, logger):
+            events.append(("epub", name))
+            epub_started[name].set()
+            return True
+
+        args = argparse.Namespace(filepath=str(novels), pipeline=True, rename_workers=1, translate_workers=1, epub_workers=1)
+        with (
+            patch("enchant_book_manager.cli_batch_handler.run_rename_stage", side_effect=rename),
+            patch("enchant_book_manager.cli_batch_handler.run_translation_stage", side_effect=translate),
+            patch("enchant_book_manager.cli_batch_handler.run_epub_stage", side_effect=epub),
+        ):
+            process_batch(args, Mock(spec=logging.Logger))
+
+        assert overlaps and all(overlaps)
+        for index in range(4):
+            name = f"novel{index}.txt"
+            assert events.index(("rename", name)) < events.index(("translate", name)) < events.index(("epub", name))
+        history = yaml.safe_load((tmp_path / "translations_chronology.yml").read_text())
+        assert [item["status"] for item in history["files"]] == ["completed"] * 4
+
+    def test_locked_novel_left_planned(self, tmp_path, monkeypatch):
+        """Test a novel locked elsewhere is not admitted to the pipeline."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 2)
+        args = argparse.Namespace(filepath=str(novels), pipeline=True)
+
+        with (
+            filelock.FileLock(str(get_book_lock_path((novels / "novel0.txt").resolve()))),
+            patch("enchant_book_manager.cli_batch_handler.run_rename_stage", side_effect=lambda path, args, logger: path) as mock_rename,
+            patch("enchant_book_manager.cli_batch_handler.run_translation_stage", side_effect=lambda state, args, logger: state),
+            patch("enchant_book_manager.cli_batch_handler.run_epub_stage", return_value=True),
+        ):
+            process_batch(args, Mock(spec=logging.Logger))
+
+        mock_rename.assert_called_once()
+        progress = BatchJournal(tmp_path / "translation_batch_progress.jsonl").load()
+        assert [item["status"] for item in progress["files"]] == ["planned", "completed"]
+
+    def test_stage_error_fails_novel_and_releases_lock(self, tmp_path, monkeypatch):
+        """Test an exception in a stage fails only that novel and frees its lock."""
+        monkeypatch.chdir(tmp_path)
+        novels = self.make_novels(tmp_path, 2)
+
+        def translate(state, args, logger):
+            if state.name == "novel1.txt":
+                raise RuntimeError("model crashed")
+            return state
+
+        args = argparse.Namespace(filepath=str(novels), pipeline=True)
+        with (
+            patch("enchant_book_manager.cli_batch_handler.run_rename_stage", side_effect=lambda path, args, logger: path),
+            patch("enchant_book_manager.cli_batch_handler.run_translation_stage", side_effect=translate),
+            patch("enchant_book_manager.cli_batch_handler.run_epub_stage", return_value=True) as mock_epub,
+        ):
+            process_batch(args, Mock(spec=logging.Logger))
+
+        assert mock_epub.call_count == 1
+        history = yaml.safe_load((tmp_path / "translations_chronology.yml").read_text())
+        assert [(item["status"], item.get("error")) for item in history["files"]] == [
+            ("completed", None),
+            ("failed/skipped", "translate stage: model crashed"),
+        ]
+        lock = filelock.FileLock(str(get_book_lock_path((novels / "novel1.txt").resolve())), timeout=0)
+        lock.acquire()
+        lock.release()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+class TestDistributedBatch:
+    """Test --distributed with local processes standing in for hosts."""
+
+    def test_hosts_share_batch_and_take_over_dead_host(self, tmp_path, monkeypatch):
+        """Every novel is processed once, including the one a dead host held."""
+        monkeypatch.chdir(tmp_path)
+        novels = tmp_path / "shared"
+        novels.mkdir()
+        for index in range(6):
+            (novels / f"novel{index}.txt").write_text(f"Content {index}")
+        record = tmp_path / "processed.txt"
+        context = multiprocessing.get_context("fork")
+
+        # The first host dies while holding the lease on novel0
+        dead = context.Process(target=run_node, args=(novels, "dead", record, True))
+        dead.start()
+        dead.join(30)
+        assert dead.exitcode == 1
+
+        hosts = [context.Process(target=run_node, args=(novels, f"host{index}", record)) for index in range(3)]
+        for host in hosts:
+            host.start()
+        for host in hosts:
+            host.join(60)
+        assert [host.exitcode for host in hosts] == [0, 0, 0]
+
+        lines = [line.split() for line in record.read_text().splitlines()]
+        assert sorted(name for _, name in lines) == [f"novel{index}.txt" for index in range(6)]
+        assert len({worker for worker, _ in lines}) >= 2
+        assert LeaseQueue(novels / QUEUE_FILE).counts() == {"queued": 0, "leased": 0, "completed": 6, "failed": 0}
+
+        history = list(yaml.safe_load_all((novels / "translations_chronology.yml").read_text()))
+        assert len(history) == 1
+        files = {Path(item["path"]).name: item for item in history[0]["files"]}
+        assert all(item["status"] == "completed" for item in files.values())
+        assert files["novel0.txt"]["retry_count"] == 1
+        assert files["novel0.txt"]["worker"].startswith("host")
+
+    @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_distributed_skips_directory_lock(self, mock_process_novel, mock_filelock, tmp_path, monkeypatch):
+        """A distributed host does not serialize on translation_batch.lock or use the journal."""
+        monkeypatch.chdir(tmp_path)
+        novels = tmp_path / "shared"
+        novels.mkdir()
+        (novels / "novel.txt").write_text("Content")
+        mock_process_novel.return_value = True
+        args = argparse.Namespace(filepath=str(novels), distributed=True, worker_id="solo", lease_seconds=30, batch_workers=1)
+
+        process_batch(args, Mock(spec=logging.Logger))
+
+        assert all(call_args[0][0] != "translation_batch.lock" for call_args in mock_filelock.call_args_list)
+        assert not (tmp_path / "translation_batch_progress.jsonl").exists()
+        assert mock_process_novel.call_count == 1
+
+    @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
+    def test_hosts_with_different_mounts(self, mock_process_novel, tmp_path, monkeypatch):
+        """A host that mounts the shared directory elsewhere works on the same queue rows."""
+        monkeypatch.chdir(tmp_path)
+        novels = tmp_path / "shared"
+        novels.mkdir()
+        for index in range(2):
+            (novels / f"novel{index}.txt").write_text(f"Content {index}")
+        LeaseQueue(novels / QUEUE_FILE).enqueue(sorted(novels.glob("*.txt")), novels)
+        # A copy stands in for the same directory mounted elsewhere
+        mount = tmp_path / "mount"
+        shutil.copytree(novels, mount)
+        mock_process_novel.return_value = True
+        args = argparse.Namespace(filepath=str(mount), distributed=True, worker_id="other", lease_seconds=30, batch_workers=1)
+
+        process_batch(args, Mock(spec=logging.Logger))
+
+        assert [call_args[0][0] for call_args in mock_process_novel.call_args_list] == [(mount / "novel0.txt").resolve(), (mount / "novel1.txt").resolve()]
+        assert LeaseQueue(mount / QUEUE_FILE).counts() == {"queued": 0, "leased": 0, "completed": 2, "failed": 0}
+
+
+class TestRecordEvent:
+    """Test _record_event function."""
+
+    def test_record_event_success(self, tmp_path):
+        """Test the event is applied to the entry and appended to the journal."""
+        journal = BatchJournal(tmp_path / "progress.jsonl")
+        item = {"path": "test.txt", "status": "planned", "retry_count": 0}
+        journal.begin({"files": [dict(item)]})
+        logger = Mock(spec=logging.Logger)
+
+        _record_event(journal, item, "failed", logger, error="Boom", retry_count=1)
+
+        assert (item["status"], item["error"], item["retry_count"]) == ("failed/skipped", "Boom", 1)
+        assert journal.load()["files"] == [item]
+        logger.error.assert_not_called()
+
+    def test_record_event_write_error(self, tmp_path):
+        """Test a journal that cannot be written is logged and re-raised."""
+        journal = BatchJournal(tmp_path / "missing" / "progress.jsonl")
+        logger = Mock(spec=logging.Logger)
+
+        with pytest.raises(OSError):
+            _record_event(journal, {"path": "test.txt"}, "started", logger)
+
+        logger.error.assert_called()
+        assert "Error saving batch progress" in logger.error.call_args[0][0]
 
 
 class TestArchiveBatchHistory:
@@ -423,9 +756,13 @@ class TestCleanupProgressFile:
 class TestEdgeCases:
     """Test edge cases and special scenarios."""
 
+    @pytest.fixture(autouse=True)
+    def in_tmp_path(self, tmp_path, monkeypatch):
+        """Keep the batch journal of every test in its own directory."""
+        monkeypatch.chdir(tmp_path)
+
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    def test_empty_directory(self, mock_load_yaml, mock_filelock, tmp_path):
+    def test_empty_directory(self, mock_filelock, tmp_path):
         """Test processing empty directory."""
         empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
@@ -434,21 +771,18 @@ class TestEdgeCases:
         args.filepath = str(empty_dir)
         logger = Mock(spec=logging.Logger)
 
-        mock_load_yaml.return_value = None
-
-        with patch("enchant_book_manager.cli_batch_handler._save_batch_progress"):
-            with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
-                with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
-                    process_batch(args, logger)
+        with patch("enchant_book_manager.cli_batch_handler._archive_batch_history") as mock_archive:
+            process_batch(args, logger)
 
         # Should handle empty directory gracefully
         logger.info.assert_not_called()
+        mock_archive.assert_not_called()
+        assert not (tmp_path / "translation_batch_progress.jsonl").exists()
 
     @patch("enchant_book_manager.cli_batch_handler.filelock.FileLock")
     @patch("enchant_book_manager.cli_batch_handler.process_novel_unified")
-    @patch("enchant_book_manager.cli_batch_handler.load_safe_yaml")
-    @patch("enchant_book_manager.cli_batch_handler.dt.datetime")
-    def test_timestamp_handling(self, mock_datetime, mock_load_yaml, mock_process_novel, mock_filelock, tmp_path):
+    @patch("enchant_book_manager.batch_journal.dt.datetime")
+    def test_timestamp_handling(self, mock_datetime, mock_process_novel, mock_filelock, tmp_path):
         """Test proper timestamp handling."""
         test_dir = tmp_path / "test_novels"
         test_dir.mkdir()
@@ -464,24 +798,13 @@ class TestEdgeCases:
         args.filepath = str(test_dir)
         logger = Mock(spec=logging.Logger)
 
-        mock_load_yaml.return_value = None
         mock_process_novel.return_value = True
 
-        saved_progress = None
-
-        def capture_progress(file, progress, logger):
-            nonlocal saved_progress
-            saved_progress = progress
-
-        with patch(
-            "enchant_book_manager.cli_batch_handler._save_batch_progress",
-            side_effect=capture_progress,
-        ):
-            with patch("enchant_book_manager.cli_batch_handler._archive_batch_history"):
-                with patch("enchant_book_manager.cli_batch_handler._cleanup_progress_file"):
-                    process_batch(args, logger)
+        with patch("enchant_book_manager.cli_batch_handler._archive_batch_history") as mock_archive:
+            process_batch(args, logger)
 
         # Check timestamps were set
+        saved_progress = mock_archive.call_args[0][1]
         assert saved_progress["created"] == "2024-01-01T12:00:00"
         assert saved_progress["files"][0]["start_time"] == "2024-01-01T12:00:00"
         assert saved_progress["files"][0]["end_time"] == "2024-01-01T12:00:00"
@@ -201,6 +201,41 @@ class TestCreateParser:
         assert args.json_log == "log.json"
         assert args.validate_only
 
+    def test_parse_check_epubs(self):
+        """Test parsing the EPUB structure check options."""
+        parser = create_parser({"text_processing": {"default_encoding": "utf-8", "max_chars_per_chunk": 12000}})
+        args = parser.parse_args(["--check-epubs", "a.epub", "library/", "--check-report", "qa.json", "--check-workers", "3"])
+
+        assert args.filepath is None
+        assert args.check_epubs == ["a.epub", "library/"]
+        assert args.check_report == "qa.json"
+        assert args.check_workers == 3
+
+    def test_parse_batch_workers(self):
+        """Test parsing --batch-workers and its default."""
+        parser = create_parser({"text_processing": {"default_encoding": "utf-8", "max_chars_per_chunk": 12000}})
+
+        assert parser.parse_args(["novels/", "--batch"]).batch_workers == 1
+        assert parser.parse_args(["novels/", "--batch", "--batch-workers", "4"]).batch_workers == 4
+
+    def test_parse_distributed(self):
+        """Test parsing the distributed batch options and their defaults."""
+        parser = create_parser({"text_processing": {"default_encoding": "utf-8", "max_chars_per_chunk": 12000}})
+
+        args = parser.parse_args(["novels/", "--batch"])
+        assert (args.distributed, args.worker_id, args.lease_seconds) == (False, None, 300)
+        args = parser.parse_args(["novels/", "--batch", "--distributed", "--worker-id", "node1", "--lease-seconds", "60"])
+        assert (args.distributed, args.worker_id, args.lease_seconds) == (True, "node1", 60.0)
+
+    def test_parse_pipeline(self):
+        """Test parsing the pipeline options and their defaults."""
+        parser = create_parser({"text_processing": {"default_encoding": "utf-8", "max_chars_per_chunk": 12000}})
+
+        args = parser.parse_args(["novels/", "--batch"])
+        assert (args.pipeline, args.rename_workers, args.translate_workers, args.epub_workers) == (False, 1, 1, 1)
+        args = parser.parse_args(["novels/", "--batch", "--pipeline", "--rename-workers", "2", "--translate-workers", "3", "--epub-workers", "4"])
+        assert (args.pipeline, args.rename_workers, args.translate_workers, args.epub_workers) == (True, 2, 3, 4)
+
     def test_parse_model_overrides(self):
         """Test parsing model override options."""
         config = {
@@ -351,12 +386,78 @@ class TestValidateArgs:
         args = Mock()
         args.translated = None
         args.filepath = None
+        args.check_epubs = None
 
         validate_args(args, parser)
 
         # Should call parser.error
         parser.error.assert_called_with("filepath is required unless using --translated option")
 
+    def test_validate_args_check_epubs_without_filepath(self):
+        """Test --check-epubs needs no filepath."""
+        parser = Mock(spec=argparse.ArgumentParser)
+        args = Mock()
+        args.translated = None
+        args.filepath = None
+        args.check_epubs = ["library"]
+
+        validate_args(args, parser)
+
+        parser.error.assert_not_called()
+
+    def test_validate_args_batch_workers_below_one(self):
+        """Test --batch-workers must be at least 1."""
+        parser = Mock(spec=argparse.ArgumentParser)
+        args = Mock()
+        args.translated = None
+        args.filepath = "novels"
+        args.batch_workers = 0
+
+        validate_args(args, parser)
+
+        parser.error.assert_called_with("--batch-workers must be at least 1")
+
+    def test_validate_args_distributed(self):
+        """Test --distributed needs --batch and a positive lease."""
+        parser = Mock(spec=argparse.ArgumentParser)
+        args = argparse.Namespace(translated=None, filepath="novels", batch=False, batch_workers=1, distributed=True, lease_seconds=300)
+
+        validate_args(args, parser)
+        parser.error.assert_called_with("--distributed requires --batch")
+
+        parser.reset_mock()
+        args.batch = True
+        args.lease_seconds = 0
+        validate_args(args, parser)
+        parser.error.assert_called_with("--lease-seconds must be positive")
+
+    def test_validate_args_pipeline(self):
+        """Test --pipeline needs --batch, no --distributed or --batch-workers and at least one worker per stage."""
+        parser = Mock(spec=argparse.ArgumentParser)
+        args = argparse.Namespace(translated=None, filepath="novels", batch=False, batch_workers=1, pipeline=True, rename_workers=1, translate_workers=1, epub_workers=1)
+
+        validate_args(args, parser)
+        parser.error.assert_called_with("--pipeline requires --batch")
+
+        parser.reset_mock()
+        args.batch = True
+        args.translate_workers = 0
+        validate_args(args, parser)
+        parser.error.assert_called_with("--translate-workers must be at least 1")
+
+        parser.reset_mock()
+        args.translate_workers = 1
+        args.distributed = True
+        args.lease_seconds = 300
+        validate_args(args, parser)
+        parser.error.assert_called_with("--pipeline cannot be combined with --distributed")
+
+        parser.reset_mock()
+        args.distributed = False
+        args.batch_workers = 4
+        validate_args(args, parser)
+        parser.error.assert_called_with("--batch-workers cannot be combined with --pipeline; use --rename-workers, --translate-workers and --epub-workers")
+
     @patch("enchant_book_manager.cli_parser.Path")
     def test_validate_args_both_filepath_and_translated(self, mock_path_class):
         """Test validation when both filepath and translated are provided."""
@@ -19,6 +19,7 @@ import enchant_book_manager.cli_translator
 from enchant_book_manager.cli_translator import (
     translate_novel,
     save_translated_book,
+    get_import_workers,
     APP_NAME,
     APP_VERSION,
     MIN_PYTHON_VERSION_REQUIRED,
@@ -48,6 +49,29 @@ class TestGlobalVariables:
         assert enchant_book_manager.cli_translator._module_config is None
 
 
+class TestGetImportWorkers:
+    """Test the get_import_workers function."""
+
+    def test_default(self):
+        """Test that a missing key means one worker."""
+        assert get_import_workers({}) == 1
+
+    def test_numeric_string_is_coerced(self):
+        """Test that numeric strings from YAML are converted to int."""
+        assert get_import_workers({"import_workers": "4"}) == 4
+
+    def test_clamped_to_one(self):
+        """Test that zero and negative values fall back to one worker."""
+        assert get_import_workers({"import_workers": 0}) == 1
+        assert get_import_workers({"import_workers": -3}) == 1
+
+    def test_invalid_value_warns(self):
+        """Test that non-numeric values log a warning and use one worker."""
+        mock_logger = Mock()
+        assert get_import_workers({"import_workers": "many"}, mock_logger) == 1
+        mock_logger.warning.assert_called_once()
+
+
 class TestSaveTranslatedBook:
     """Test the save_translated_book wrapper function."""
 
@@ -187,7 +211,7 @@ class TestTranslateNovel:
         )
 
         # Verify book was imported and saved
-        mock_import_book.assert_called_once_with("test.txt", encoding="utf-8", max_chars=12000, logger=mock_logger)
+        mock_import_book.assert_called_once_with("test.txt", encoding="utf-8", max_chars=12000, logger=mock_logger, workers=1, balanced=False, chapter_aware=True)
         mock_save_book.assert_called_once()
 
     @patch("enchant_book_manager.cli_translator.sys.exit")
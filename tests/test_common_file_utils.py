@@ -24,6 +24,7 @@ from enchant_book_manager.common_file_utils import (
     decode_file_content,
     decode_full_file,
     decode_file_preview,
+    decode_file_prefix,
     safe_write_file,
 )
 
@@ -270,6 +271,51 @@ class TestDecodeFileContent:
         assert result is None
 
 
+class TestDecodeFilePrefix:
+    """Test the decode_file_prefix function."""
+
+    @pytest.mark.parametrize("encoding", ["gb18030", "big5", "utf-8"])
+    def test_cuts_at_character_boundary(self, tmp_path, encoding):
+        """Test that a prefix ending mid-character is cut cleanly."""
+        text = "第一章 這是一個很長的故事。\n" * 2000
+        test_file = tmp_path / "novel.txt"
+        test_file.write_bytes(text.encode(encoding))
+
+        # An odd byte count lands inside a multibyte character
+        content, bytes_read = decode_file_prefix(test_file, 1001, fallback_encodings=[encoding])
+
+        assert "\ufffd" not in content
+        assert text.startswith(content)
+        assert bytes_read <= 1001
+        assert len(content.encode(encoding)) == bytes_read
+
+    def test_small_file_read_completely(self, tmp_path):
+        """Test that a file shorter than the limit is fully decoded."""
+        test_file = tmp_path / "short.txt"
+        test_file.write_text("Hello 世界", encoding="utf-8")
+
+        content, bytes_read = decode_file_prefix(test_file, 4096)
+
+        assert content == "Hello 世界"
+        assert bytes_read == test_file.stat().st_size
+
+    def test_error_replacement(self, tmp_path):
+        """Test that undecodable bytes fall back to replacement characters."""
+        test_file = tmp_path / "bad.txt"
+        test_file.write_bytes(b"\x80\x81\x82 Hello \x83\x84\x85")
+
+        content, bytes_read = decode_file_prefix(test_file, 1024, confidence_threshold=0.99, fallback_encodings=["utf-8"])
+
+        assert "Hello" in content
+        assert "\ufffd" in content
+        assert bytes_read == test_file.stat().st_size
+
+    def test_nonexistent_file(self, tmp_path):
+        """Test that a missing file raises."""
+        with pytest.raises(OSError):
+            decode_file_prefix(tmp_path / "missing.txt", 1024)
+
+
 class TestConvenienceFunctions:
     """Test the convenience wrapper functions."""
 
@@ -66,10 +66,10 @@ class TestEdgeCases:
         # Test 2: Single paragraph that exceeds limit when "\n\n" is added
         text = "A" * 11999  # 11999 + "\n\n" = 12001, exceeds 11999
         chunks = split_chinese_text_in_parts(text, max_chars=11999, logger=mock_logger)
-        # This creates 1 chunk because we keep paragraphs together when possible
-        # The >= check allows a single paragraph to slightly exceed the limit
-        assert len(chunks) == 1
-        assert len(chunks[0]) == 12001
+        # Oversized paragraphs are sub-split so no chunk exceeds the limit
+        assert len(chunks) == 2
+        assert all(len(chunk) <= 11999 for chunk in chunks)
+        assert "".join(chunks) == text + "\n\n"
 
         # Test 3: Multiple paragraphs that require splitting
         para1 = "A" * 6000
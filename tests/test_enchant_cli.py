@@ -11,6 +11,8 @@ from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, call
 import logging
 
+import filelock
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enchant_book_manager.enchant_cli import (
@@ -21,6 +23,14 @@ from enchant_book_manager.enchant_cli import (
 )
 
 
+@pytest.fixture(autouse=True)
+def book_lock_path(tmp_path):
+    """Put the book lock of the (mocked) novel path in tmp_path."""
+    lock_path = tmp_path / ".novel.lock"
+    with patch("enchant_book_manager.enchant_cli.get_book_lock_path", return_value=lock_path):
+        yield lock_path
+
+
 class TestEnchantCliMain:
     """Test the main CLI entry point."""
 
@@ -64,6 +74,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = False
+        mock_args.check_epubs = None
         mock_args.filepath = "/path/to/file.txt"
         mock_args.translated = None
         mock_parser.parse_args.return_value = mock_args
@@ -96,6 +107,45 @@ class TestEnchantCliMain:
         mock_print.assert_called_with("[bold green]Novel processing completed successfully![/bold green]")
         mock_exit.assert_not_called()
 
+    @patch("enchant_book_manager.enchant_cli.setup_signal_handler")
+    @patch("enchant_book_manager.enchant_cli.check_colorama")
+    @patch("enchant_book_manager.enchant_cli.setup_global_services")
+    @patch("enchant_book_manager.enchant_cli.setup_logging")
+    @patch("enchant_book_manager.enchant_cli.setup_configuration")
+    @patch("enchant_book_manager.enchant_cli.create_parser")
+    @patch("enchant_book_manager.enchant_cli.validate_args")
+    @patch("enchant_book_manager.enchant_cli.process_novel_unified")
+    @patch("enchant_book_manager.enchant_cli.safe_print")
+    def test_main_single_file_locked(
+        self,
+        mock_print,
+        mock_process_novel,
+        mock_validate_args,
+        mock_create_parser,
+        mock_setup_config,
+        mock_setup_logging,
+        mock_setup_global,
+        mock_check_colorama,
+        mock_signal_handler,
+        book_lock_path,
+        tmp_path,
+    ):
+        """Test a novel locked by a batch worker or another run is not processed."""
+        novel = tmp_path / "novel.txt"
+        novel.write_text("content")
+        mock_setup_config.return_value = (Mock(), {"log_level": "INFO"})
+        mock_logger = Mock(spec=logging.Logger)
+        mock_setup_logging.return_value = mock_logger
+        mock_args = Mock(batch=False, check_epubs=None, filepath=str(novel), translated=None)
+        mock_create_parser.return_value.parse_args.return_value = mock_args
+
+        with filelock.FileLock(str(book_lock_path)), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        mock_process_novel.assert_not_called()
+        mock_logger.error.assert_called_once_with(f"{novel} is being processed by another run")
+
     @patch("enchant_book_manager.enchant_cli.setup_signal_handler")
     @patch("enchant_book_manager.enchant_cli.check_colorama")
     @patch("enchant_book_manager.enchant_cli.setup_global_services")
@@ -134,6 +184,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = False
+        mock_args.check_epubs = None
         mock_args.filepath = "/path/to/missing.txt"
         mock_args.translated = None
         mock_parser.parse_args.return_value = mock_args
@@ -195,6 +246,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = True
+        mock_args.check_epubs = None
         mock_args.filepath = "/path/to/batch/dir"
         mock_args.translated = None
         mock_parser.parse_args.return_value = mock_args
@@ -206,6 +258,56 @@ class TestEnchantCliMain:
         # Verify batch processing was called
         mock_process_batch.assert_called_once_with(mock_args, mock_logger)
 
+    @patch("enchant_book_manager.enchant_cli.setup_signal_handler")
+    @patch("enchant_book_manager.enchant_cli.check_colorama")
+    @patch("enchant_book_manager.enchant_cli.setup_global_services")
+    @patch("enchant_book_manager.enchant_cli.setup_logging")
+    @patch("enchant_book_manager.enchant_cli.setup_configuration")
+    @patch("enchant_book_manager.enchant_cli.create_parser")
+    @patch("enchant_book_manager.enchant_cli.validate_args")
+    @patch("enchant_book_manager.enchant_cli.check_epub_files")
+    @patch("enchant_book_manager.enchant_cli.process_batch")
+    @patch("enchant_book_manager.enchant_cli.safe_print")
+    @patch("enchant_book_manager.enchant_cli.sys.exit")
+    def test_main_check_epubs(
+        self,
+        mock_exit,
+        mock_print,
+        mock_process_batch,
+        mock_check_epub_files,
+        mock_validate_args,
+        mock_create_parser,
+        mock_setup_config,
+        mock_setup_logging,
+        mock_setup_global,
+        mock_check_colorama,
+        mock_signal_handler,
+    ):
+        """Test --check-epubs runs the structure check instead of processing, and fails on errors."""
+        mock_config_manager = Mock()
+        mock_setup_config.return_value = (mock_config_manager, {})
+        mock_logger = Mock(spec=logging.Logger)
+        mock_setup_logging.return_value = mock_logger
+
+        mock_parser = Mock()
+        mock_args = Mock()
+        mock_args.translated = None
+        mock_args.check_epubs = ["library"]
+        mock_parser.parse_args.return_value = mock_args
+        mock_create_parser.return_value = mock_parser
+
+        mock_check_epub_files.return_value = True
+        main()
+        mock_check_epub_files.assert_called_once_with(mock_args, mock_logger)
+        mock_exit.assert_not_called()
+
+        mock_check_epub_files.return_value = False
+        mock_exit.side_effect = SystemExit(1)
+        with pytest.raises(SystemExit):
+            main()
+        mock_exit.assert_called_once_with(1)
+        mock_process_batch.assert_not_called()
+
     @patch("enchant_book_manager.enchant_cli.setup_signal_handler")
     @patch("enchant_book_manager.enchant_cli.check_colorama")
     @patch("enchant_book_manager.enchant_cli.setup_global_services")
@@ -246,6 +348,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = False
+        mock_args.check_epubs = None
         mock_args.filepath = None
         mock_args.translated = "/path/to/translated.txt"
         mock_parser.parse_args.return_value = mock_args
@@ -310,6 +413,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = False
+        mock_args.check_epubs = None
         mock_args.filepath = "/path/to/file.txt"
         mock_args.translated = None
         mock_parser.parse_args.return_value = mock_args
@@ -370,6 +474,7 @@ class TestEnchantCliMain:
         mock_parser = Mock()
         mock_args = Mock()
         mock_args.batch = False
+        mock_args.check_epubs = None
         mock_args.filepath = "/path/to/file.txt"
         mock_args.translated = None
         mock_parser.parse_args.return_value = mock_args
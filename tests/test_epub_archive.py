@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for epub_archive module.
+"""
+
+import stat
+import zipfile
+import zlib
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.epub_archive import EpubArchiveWriter, compress_entry, read_raw_entry
+from enchant_book_manager.epub_builder import create_epub_from_chapters
+from enchant_book_manager.epub_generator import write_new_epub
+
+
+class TestEpubArchiveWriter:
+    """Test the EpubArchiveWriter class."""
+
+    def test_mimetype_first_and_stored(self, tmp_path):
+        """The mimetype entry is first and uncompressed, the rest are deflated."""
+        out = tmp_path / "book.epub"
+        with EpubArchiveWriter(out) as archive:
+            archive.write_text("META-INF/container.xml", "<container/>")
+            archive.write_bytes("OEBPS/Images/cover.png", b"\x89PNG data")
+
+        with zipfile.ZipFile(out) as z:
+            infos = z.infolist()
+            assert infos[0].filename == "mimetype"
+            assert infos[0].compress_type == zipfile.ZIP_STORED
+            assert z.read("mimetype") == b"application/epub+zip"
+            assert [info.compress_type for info in infos[1:]] == [zipfile.ZIP_DEFLATED] * 2
+            assert z.read("META-INF/container.xml") == b"<container/>"
+            assert z.testzip() is None
+
+    def test_entries_are_regular_files(self, tmp_path):
+        """Generated entries carry regular file permissions like ZipFile.write."""
+        out = tmp_path / "book.epub"
+        with EpubArchiveWriter(out) as archive:
+            archive.write_text("OEBPS/Text/chapter1.xhtml", "<html/>")
+
+        with zipfile.ZipFile(out) as z:
+            mode = z.getinfo("OEBPS/Text/chapter1.xhtml").external_attr >> 16
+            assert stat.S_ISREG(mode)
+            assert not z.getinfo("OEBPS/Text/chapter1.xhtml").is_dir()
+
+    def test_write_file_streams_source(self, tmp_path):
+        """Files on disk are added under the given archive name."""
+        cover = tmp_path / "cover.jpg"
+        cover.write_bytes(b"\xff\xd8 jpeg data")
+        out = tmp_path / "book.epub"
+        with EpubArchiveWriter(out) as archive:
+            archive.write_file("OEBPS/Images/cover.jpg", cover)
+
+        with zipfile.ZipFile(out) as z:
+            assert z.namelist() == ["mimetype", "OEBPS/Images/cover.jpg"]
+            assert z.read("OEBPS/Images/cover.jpg") == b"\xff\xd8 jpeg data"
+
+    def test_compresslevel(self, tmp_path):
+        """A higher compression level gives a smaller archive for repetitive text."""
+        text = "The quick brown fox jumps over the lazy dog. " * 2000
+        sizes = []
+        for level in (1, 9):
+            out = tmp_path / f"book{level}.epub"
+            with EpubArchiveWriter(out, compresslevel=level) as archive:
+                archive.write_text("OEBPS/Text/chapter1.xhtml", text)
+            with zipfile.ZipFile(out) as z:
+                assert z.read("OEBPS/Text/chapter1.xhtml").decode() == text
+            sizes.append(out.stat().st_size)
+        assert sizes[1] <= sizes[0]
+
+    @patch("enchant_book_manager.epub_archive.time.time", return_value=1_700_000_000)
+    def test_write_compressed_matches_write_bytes(self, mock_time, tmp_path):
+        """Entries deflated ahead of time give a byte-identical archive."""
+        entries = [("OEBPS/Text/chapter1.xhtml", "Ünïcödé chapter text. " * 500), ("OEBPS/empty.txt", "")]
+        archives = []
+        for precompressed in (False, True):
+            out = tmp_path / f"book_{precompressed}.epub"
+            with EpubArchiveWriter(out, compresslevel=9) as archive:
+                for arcname, text in entries:
+                    if precompressed:
+                        archive.write_compressed(arcname, compress_entry(text.encode(), 9))
+                    else:
+                        archive.write_text(arcname, text)
+            archives.append(out.read_bytes())
+
+        assert archives[0] == archives[1]
+        with zipfile.ZipFile(tmp_path / "book_True.epub") as z:
+            assert z.testzip() is None
+            assert z.read("OEBPS/Text/chapter1.xhtml").decode() == entries[0][1]
+
+    @patch("enchant_book_manager.epub_archive.time.time", return_value=1_700_000_000)
+    def test_write_stream_matches_write_text(self, mock_time, tmp_path):
+        """A streamed entry gives the same archive as writing the joined text."""
+        pieces = [f"<navPoint id='nav{i}'>Ünïcödé {i}</navPoint>\n" for i in range(5000)]
+        archives = []
+        for streamed in (False, True):
+            out = tmp_path / f"book_{streamed}.epub"
+            with EpubArchiveWriter(out, compresslevel=9) as archive:
+                if streamed:
+                    archive.write_stream("OEBPS/toc.ncx", iter(pieces))
+                else:
+                    archive.write_text("OEBPS/toc.ncx", "".join(pieces))
+                archive.write_text("OEBPS/content.opf", "<package/>")
+            archives.append(out.read_bytes())
+
+        assert archives[0] == archives[1]
+        with zipfile.ZipFile(tmp_path / "book_True.epub") as z:
+            assert z.testzip() is None
+            assert z.read("OEBPS/toc.ncx").decode() == "".join(pieces)
+
+    def test_compress_entry(self):
+        """compress_entry records the size and CRC of the uncompressed data."""
+        data = b"chapter " * 100
+        entry = compress_entry(data)
+        assert entry.file_size == len(data)
+        assert entry.crc == zlib.crc32(data)
+        assert zlib.decompress(entry.data, -15) == data
+
+    def test_copy_entry_keeps_stored_data(self, tmp_path):
+        """copy_entry copies the compressed data, timestamp and method as is."""
+        source_path = tmp_path / "source.zip"
+        with zipfile.ZipFile(source_path, "w") as source:
+            source.writestr(zipfile.ZipInfo("OEBPS/Text/chapter1.xhtml", (2020, 5, 17, 10, 30, 0)), "chapter one " * 300, zipfile.ZIP_DEFLATED, 1)
+            source.writestr("OEBPS/Images/cover.png", b"\x89PNG stored", zipfile.ZIP_STORED)
+
+        out = tmp_path / "book.epub"
+        with zipfile.ZipFile(source_path) as source, EpubArchiveWriter(out, compresslevel=9) as archive:
+            for info in source.infolist():
+                archive.copy_entry(source, info)
+            raw = {info.filename: read_raw_entry(source, info) for info in source.infolist()}
+
+        with zipfile.ZipFile(out) as z:
+            assert z.testzip() is None
+            chapter = z.getinfo("OEBPS/Text/chapter1.xhtml")
+            assert chapter.date_time == (2020, 5, 17, 10, 30, 0)
+            assert z.read("OEBPS/Text/chapter1.xhtml") == b"chapter one " * 300
+            assert z.getinfo("OEBPS/Images/cover.png").compress_type == zipfile.ZIP_STORED
+            for info in z.infolist()[1:]:
+                assert read_raw_entry(z, info) == raw[info.filename]
+
+    def test_read_raw_entry_rejects_encrypted(self, tmp_path):
+        """Encrypted entries cannot be copied."""
+        source_path = tmp_path / "source.zip"
+        with zipfile.ZipFile(source_path, "w") as source:
+            source.writestr("a.txt", "data")
+        with zipfile.ZipFile(source_path) as source:
+            info = source.getinfo("a.txt")
+            info.flag_bits |= 0x1
+            with pytest.raises(ValueError, match="encrypted"):
+                read_raw_entry(source, info)
+
+
+class TestStreamingWriters:
+    """Test the EPUB writers that use EpubArchiveWriter."""
+
+    def test_write_new_epub_entry_order(self, tmp_path):
+        """write_new_epub writes its entries in a fixed order."""
+        cover = tmp_path / "cover.png"
+        cover.write_bytes(b"\x89PNG data")
+        out = tmp_path / "book.epub"
+        write_new_epub([("Chapter 1", "<p>One</p>"), ("Chapter 2", "<p>Two</p>")], out, "Title", "Author", cover)
+
+        with zipfile.ZipFile(out) as z:
+            assert z.namelist() == [
+                "mimetype",
+                "META-INF/container.xml",
+                "OEBPS/Styles/style.css",
+                "OEBPS/Images/cover.png",
+                "OEBPS/Text/cover.xhtml",
+                "OEBPS/Text/chapter1.xhtml",
+                "OEBPS/Text/chapter2.xhtml",
+                "OEBPS/content.opf",
+                "OEBPS/toc.ncx",
+            ]
+            assert z.read("OEBPS/Images/cover.png") == b"\x89PNG data"
+
+    @patch("enchant_book_manager.epub_archive.time.time", return_value=1_700_000_000)
+    @patch("enchant_book_manager.epub_generator.uuid.uuid4", return_value="fixed-uuid")
+    def test_write_new_epub_threads_identical(self, mock_uuid, mock_time, tmp_path):
+        """Rendering chapters in worker threads gives a byte-identical EPUB."""
+        chapters = [(f"Chapter {i}", f"<p>Paragraph {i} &amp; more</p>" * (i % 7 + 1)) for i in range(1, 60)]
+        archives = []
+        for threads in (1, 4):
+            out = tmp_path / f"book{threads}.epub"
+            write_new_epub(chapters, out, "Title", "Author", None, threads=threads, compression_level=1)
+            archives.append(out.read_bytes())
+        assert archives[0] == archives[1]
+
+    def test_create_epub_from_chapters_entries(self, tmp_path):
+        """create_epub_from_chapters writes the layout of write_new_epub."""
+        cover = tmp_path / "cover.jpg"
+        cover.write_bytes(b"\xff\xd8 jpeg data")
+        out = tmp_path / "book.epub"
+        create_epub_from_chapters([("Chapter 1", "Chapter 1: Start", "<p>One</p>")], out, "Title", "Author", cover)
+
+        with zipfile.ZipFile(out) as z:
+            assert z.infolist()[0].compress_type == zipfile.ZIP_STORED
+            assert sorted(z.namelist()) == [
+                "META-INF/container.xml",
+                "OEBPS/Images/cover.jpg",
+                "OEBPS/Styles/style.css",
+                "OEBPS/Text/chapter1.xhtml",
+                "OEBPS/Text/cover.xhtml",
+                "OEBPS/content.opf",
+                "OEBPS/toc.ncx",
+                "mimetype",
+            ]
+            assert z.namelist()[0] == "mimetype"
+            assert "<h1>Chapter 1: Start</h1>" in z.read("OEBPS/Text/chapter1.xhtml").decode()
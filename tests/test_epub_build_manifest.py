@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for epub_build_manifest module.
+"""
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.epub_build_manifest import (
+    check_build_manifest,
+    compute_build_inputs,
+    generator_fingerprint,
+    manifest_path_for,
+    remove_build_manifest,
+    save_build_manifest,
+)
+
+
+@pytest.fixture
+def book(tmp_path):
+    """A translated text, a cover and a built EPUB."""
+    txt = tmp_path / "translated.txt"
+    txt.write_text("Chapter 1\nOne\n", encoding="utf-8")
+    cover = tmp_path / "cover.png"
+    cover.write_bytes(b"\x89PNG data")
+    output = tmp_path / "book.epub"
+    output.write_bytes(b"epub bytes")
+    config = {"title": "T", "author": "A", "cover_path": cover, "custom_css": "p {}", "metadata": {"b": 1, "a": 2}}
+    return txt, cover, output, config
+
+
+class TestComputeBuildInputs:
+    """Test the compute_build_inputs function."""
+
+    def test_inputs_hashed(self, book):
+        """Every input has its own hash, absent cover and CSS are None."""
+        txt, cover, output, config = book
+        inputs = compute_build_inputs(txt, config)
+        assert set(inputs) == {"generator", "text", "cover", "custom_css", "metadata", "options"}
+        assert inputs["generator"] == generator_fingerprint()
+
+        bare = compute_build_inputs(txt, {"title": "T", "author": "A"})
+        assert bare["cover"] is None and bare["custom_css"] is None
+
+    def test_metadata_order_and_threads_ignored(self, book):
+        """Dict order and the worker thread count do not change the hashes."""
+        txt, cover, output, config = book
+        reordered = dict(config, metadata={"a": 2, "b": 1}, threads=8)
+        assert compute_build_inputs(txt, reordered) == compute_build_inputs(txt, config)
+
+    def test_cover_bytes_hashed(self, book):
+        """A cover with the same name but new bytes changes the cover hash."""
+        txt, cover, output, config = book
+        before = compute_build_inputs(txt, config)
+        cover.write_bytes(b"\x89PNG other")
+        assert compute_build_inputs(txt, config)["cover"] != before["cover"]
+
+    def test_missing_text_raises(self, tmp_path):
+        """A missing text file cannot be hashed."""
+        with pytest.raises(OSError):
+            compute_build_inputs(tmp_path / "missing.txt", {})
+
+
+class TestManifest:
+    """Test saving and checking the manifest."""
+
+    def test_round_trip(self, book):
+        """A saved manifest matches the same inputs and returns the stored result."""
+        txt, cover, output, config = book
+        inputs = compute_build_inputs(txt, config)
+        assert save_build_manifest(output, inputs, 12.5, ["Chapter 2 is missing"])
+        assert manifest_path_for(output) == output.with_name("book.epub.build.json")
+
+        previous = check_build_manifest(output, inputs)
+        assert previous is not None
+        assert previous.build_seconds == 12.5
+        assert previous.issues == ["Chapter 2 is missing"]
+
+    def test_stale_manifest(self, book):
+        """Changed inputs, a replaced EPUB or a corrupt manifest are not reused."""
+        txt, cover, output, config = book
+        inputs = compute_build_inputs(txt, config)
+        save_build_manifest(output, inputs, 1.0, [])
+
+        assert check_build_manifest(output, dict(inputs, text="0" * 64)) is None
+
+        output.write_bytes(b"replaced epub bytes")
+        assert check_build_manifest(output, inputs) is None
+
+        save_build_manifest(output, inputs, 1.0, [])
+        data = json.loads(manifest_path_for(output).read_text())
+        data["format_version"] = 0
+        manifest_path_for(output).write_text(json.dumps(data))
+        assert check_build_manifest(output, inputs) is None
+
+        manifest_path_for(output).write_text("{not json")
+        assert check_build_manifest(output, inputs) is None
+
+    def test_remove(self, book):
+        """remove_build_manifest deletes the manifest and ignores a missing one."""
+        txt, cover, output, config = book
+        save_build_manifest(output, compute_build_inputs(txt, config), 1.0, [])
+        remove_build_manifest(output)
+        assert not manifest_path_for(output).exists()
+        remove_build_manifest(output)
@@ -57,6 +57,15 @@ class TestDetectChapterIssues:
         assert any("Chapter 2 is repeated 1 time after Chapter 1" in issue[1] for issue in issues)
         assert any("Chapter 2 is out of place after Chapter 2" in issue[1] for issue in issues)
 
+    def test_long_run_of_repeats(self):
+        """Test repeats in a long run carry their position, remaining run and predecessor."""
+        issues = detect_chapter_issues([1] + [2] * 10000 + [3])
+
+        repeats = [issue for issue in issues if "repeated" in issue[1]]
+        assert len(repeats) == 9999
+        assert repeats[0] == (2, "Chapter 2 is repeated 9999 times after Chapter 1")
+        assert repeats[-1] == (10000, "Chapter 2 is repeated 1 time after Chapter 1")
+
     def test_multiple_duplicates(self):
         """Test detection of multiple consecutive duplicates."""
         issues = detect_chapter_issues([1, 2, 3, 3, 3, 4])
@@ -336,17 +345,23 @@ class TestCreateEpubFromChapters:
             assert "META-INF/container.xml" in namelist
             assert "OEBPS/content.opf" in namelist
             assert "OEBPS/toc.ncx" in namelist
-            assert "OEBPS/chapter1.xhtml" in namelist
-            assert "OEBPS/chapter2.xhtml" in namelist
+            assert "OEBPS/Text/chapter1.xhtml" in namelist
+            assert "OEBPS/Text/chapter2.xhtml" in namelist
 
             # Check mimetype
             assert z.read("mimetype").decode("ascii") == "application/epub+zip"
 
             # Check chapter content
-            chap1_content = z.read("OEBPS/chapter1.xhtml").decode("utf-8")
-            assert "Original Chapter 1" in chap1_content
+            chap1_content = z.read("OEBPS/Text/chapter1.xhtml").decode("utf-8")
+            assert "<h1>Original Chapter 1</h1>" in chap1_content
+            assert "<title>Chapter 1</title>" in chap1_content
             assert "<p>Content 1</p>" in chap1_content
 
+            # The TOC uses the TOC titles
+            toc = z.read("OEBPS/toc.ncx").decode("utf-8")
+            assert "<text>Chapter 2</text>" in toc
+            assert "Original Chapter 2" not in toc
+
     def test_epub_with_cover(self, tmp_path):
         """Test EPUB creation with cover image."""
         chapters = [("Chapter 1", "", "<p>Content</p>")]
@@ -358,11 +373,35 @@ class TestCreateEpubFromChapters:
 
         with zipfile.ZipFile(output_path, "r") as z:
             namelist = z.namelist()
-            assert "OEBPS/cover.jpg" in namelist
-            assert "OEBPS/cover.xhtml" in namelist
+            assert "OEBPS/Images/cover.jpg" in namelist
+            assert "OEBPS/Text/cover.xhtml" in namelist
 
             # Verify cover image was copied
-            assert z.read("OEBPS/cover.jpg") == b"fake image data"
+            assert z.read("OEBPS/Images/cover.jpg") == b"fake image data"
+            assert "href='Images/cover.jpg' media-type='image/jpeg'" in z.read("OEBPS/content.opf").decode("utf-8")
+
+    def test_png_cover_keeps_name_and_media_type(self, tmp_path):
+        """Test a PNG cover is stored as PNG, not as cover.jpg."""
+        chapters = [("Chapter 1", "", "<p>Content</p>")]
+        output_path = tmp_path / "test.epub"
+        cover_path = tmp_path / "art.png"
+        cover_path.write_bytes(b"png data")
+
+        create_epub_from_chapters(chapters, output_path, "Book", "Author", cover_path)
+
+        with zipfile.ZipFile(output_path, "r") as z:
+            assert "OEBPS/Images/art.png" in z.namelist()
+            assert not any(name.endswith("cover.jpg") for name in z.namelist())
+            assert "href='Images/art.png' media-type='image/png'" in z.read("OEBPS/content.opf").decode("utf-8")
+
+    def test_missing_cover_is_skipped(self, tmp_path):
+        """Test a cover path that does not exist is ignored."""
+        output_path = tmp_path / "test.epub"
+
+        create_epub_from_chapters([("Chapter 1", "", "<p>Content</p>")], output_path, "Book", "Author", tmp_path / "none.jpg")
+
+        with zipfile.ZipFile(output_path, "r") as z:
+            assert not any(name.startswith("OEBPS/Images/") for name in z.namelist())
 
     def test_custom_language(self, tmp_path):
         """Test EPUB with custom language."""
@@ -408,10 +447,31 @@ class TestCreateEpubFromChapters:
         create_epub_from_chapters(chapters, output_path, "Book", "Author")
 
         with zipfile.ZipFile(output_path, "r") as z:
-            chap_content = z.read("OEBPS/chapter1.xhtml").decode("utf-8")
+            chap_content = z.read("OEBPS/Text/chapter1.xhtml").decode("utf-8")
             # Should use toc_title as display heading
             assert "<h1>Chapter 1: Test</h1>" in chap_content
 
+    def test_oversized_chapter_split(self, tmp_path):
+        """Test a chapter over the size limit is written as several spine items."""
+        body = "\n".join(f"<p>Paragraph {i} {'word ' * 30}</p>" for i in range(30))
+        chapters = [("Chapter 1", "", body), ("Chapter 2", "", "<p>Short</p>")]
+        output_path = tmp_path / "test.epub"
+
+        create_epub_from_chapters(chapters, output_path, "Book", "Author", max_chapter_bytes=1000)
+
+        with zipfile.ZipFile(output_path, "r") as z:
+            names = z.namelist()
+            parts = [name for name in names if name.startswith("OEBPS/Text/chapter1")]
+            assert parts[0] == "OEBPS/Text/chapter1.xhtml" and len(parts) > 2
+            assert parts[1:] == [f"OEBPS/Text/chapter1_part{n}.xhtml" for n in range(2, len(parts) + 1)]
+            assert "<h1>Chapter 1</h1>" in z.read(parts[0]).decode("utf-8")
+            assert "<h1>" not in z.read(parts[1]).decode("utf-8")
+            opf = z.read("OEBPS/content.opf").decode("utf-8")
+            assert opf.index("idref='chap1_part2'") < opf.index("idref='chap2'")
+            toc = z.read("OEBPS/toc.ncx").decode("utf-8")
+            assert toc.count("<navPoint") == 2
+            assert "chapter1_part2" not in toc
+
 
 class TestBuildEpubFromDirectory:
     """Test the build_epub_from_directory function."""
@@ -554,7 +614,59 @@ class TestBuildEpubFromDirectory:
 
         assert success is True
         with zipfile.ZipFile(output_path, "r") as z:
-            assert "OEBPS/cover.jpg" in z.namelist()
+            assert "OEBPS/Images/cover.jpg" in z.namelist()
+
+    def test_chapter_spanning_files(self, tmp_path):
+        """A chapter continued in the next file stays one chapter, as with the joined text."""
+        texts = ["Chapter 1: Start\nFirst part", "second part\nChapter 2\nTwo", "more two\n\nChapter 3\nThree"]
+        for number, text in enumerate(texts, 1):
+            (tmp_path / f"Book by Author - Chapter {number}.txt").write_text(text)
+
+        output_path = tmp_path / "output.epub"
+        success, issues = build_epub_from_directory(tmp_path, output_path)
+
+        expected, _ = split_text("".join(text + "\n" for text in texts))
+        assert success is True
+        with zipfile.ZipFile(output_path) as z:
+            assert sorted(name for name in z.namelist() if name.startswith("OEBPS/Text/chapter")) == ["OEBPS/Text/chapter1.xhtml", "OEBPS/Text/chapter2.xhtml", "OEBPS/Text/chapter3.xhtml"]
+            for number, (toc_title, _, text) in enumerate(expected, 1):
+                assert paragraphize(text) in z.read(f"OEBPS/Text/chapter{number}.xhtml").decode()
+            assert "<p>First part second part</p>" in z.read("OEBPS/Text/chapter1.xhtml").decode()
+        assert not (tmp_path / "output.epub.tmp").exists()
+
+    def test_strict_failure_keeps_existing_output(self, tmp_path):
+        """A failed strict build leaves no partial EPUB and keeps an existing one."""
+        (tmp_path / "Book by Author - Chapter 1.txt").write_text("Chapter 1\nContent")
+        (tmp_path / "Book by Author - Chapter 4.txt").write_text("Chapter 4\nContent")
+        output_path = tmp_path / "output.epub"
+        output_path.write_bytes(b"previous build")
+
+        success, issues = build_epub_from_directory(tmp_path, output_path, strict=True, logger=self.logger)
+
+        assert success is False
+        assert output_path.read_bytes() == b"previous build"
+        assert not (tmp_path / "output.epub.tmp").exists()
+
+    def test_read_error_stops_strict_build(self, tmp_path):
+        """A file that cannot be read ends a strict build without an EPUB."""
+        (tmp_path / "Book by Author - Chapter 1.txt").write_text("Chapter 1\nContent")
+        (tmp_path / "Book by Author - Chapter 2.txt").write_text("Chapter 2\nContent")
+        output_path = tmp_path / "output.epub"
+
+        original_read_text = Path.read_text
+
+        def read_text(path, *args, **kwargs):
+            if path.name.endswith("Chapter 2.txt"):
+                raise PermissionError("denied")
+            return original_read_text(path, *args, **kwargs)
+
+        with patch.object(Path, "read_text", read_text):
+            success, issues = build_epub_from_directory(tmp_path, output_path, strict=True, logger=self.logger)
+
+        assert success is False
+        assert issues == ["Error reading chapter 2: denied"]
+        assert not output_path.exists()
+        assert not (tmp_path / "output.epub.tmp").exists()
 
 
 if __name__ == "__main__":
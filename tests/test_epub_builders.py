@@ -21,6 +21,8 @@ from enchant_book_manager.epub_builders import (
     build_style_css,
     build_content_opf,
     build_toc_ncx,
+    cover_media_type,
+    split_chapter_html,
 )
 
 
@@ -68,6 +70,70 @@ class TestParagraphize:
         result = paragraphize(text)
         assert result == "<p>Line 1<br/>Line 2</p>"
 
+    def test_paragraphize_other_line_boundaries(self):
+        """Test that every str.splitlines boundary ends a line."""
+        text = "One\r\nTwo\rThree Four\x0c\x0cFive\x85 　\nSix"
+        result = paragraphize(text)
+        assert result == "<p>One<br/>Two<br/>Three<br/>Four</p>\n<p>Five</p>\n<p>Six</p>"
+
+    def test_paragraphize_keeps_leading_spaces(self):
+        """Test that indentation is kept and single quotes are escaped."""
+        result = paragraphize("  It's\n\tindented")
+        assert result == "<p>  It&#x27;s<br/>\tindented</p>"
+
+    def test_paragraphize_join_lines(self):
+        """Test the join_lines format used by epub_builder."""
+        text = "  Line 1  \n\tLine 2\r\n\r\n\n<Para> 2 still\n \n"
+        result = paragraphize(text, join_lines=True)
+        assert result == "<p>Line 1 Line 2</p>\n<p>&lt;Para&gt; 2 still</p>"
+
+    def test_paragraphize_join_lines_whitespace_only(self):
+        """Test that join_lines drops whitespace-only text."""
+        assert paragraphize(" \n\r\n\t", join_lines=True) == ""
+
+
+class TestSplitChapterHtml:
+    """Test the split_chapter_html function."""
+
+    def test_small_body_not_split(self):
+        """A body under the limit is returned as is."""
+        body = paragraphize("One\n\nTwo")
+        assert split_chapter_html(body, 1000) == [body]
+
+    def test_disabled(self):
+        """A limit of 0 never splits."""
+        body = "\n".join(f"<p>{'x' * 100}</p>" for _ in range(50))
+        assert split_chapter_html(body, 0) == [body]
+
+    def test_split_at_paragraph_boundaries(self):
+        """Parts stay under the limit, end on whole paragraphs and rejoin to the body."""
+        body = paragraphize("\n\n".join(f"Paragraph {i} " + "word " * (i % 9 + 5) for i in range(200)))
+        parts = split_chapter_html(body, 1000)
+
+        assert len(parts) > 1
+        assert "\n".join(parts) == body
+        for part in parts:
+            assert len(part.encode("utf-8")) <= 1000
+            assert part.startswith("<p>") and part.endswith("</p>")
+
+    def test_limit_counts_utf8_bytes(self):
+        """The limit applies to the encoded size, not the number of characters."""
+        body = "\n".join(f"<p>{'章' * 100}</p>" for _ in range(10))
+        parts = split_chapter_html(body, 700)
+        assert len(parts) == 5
+        assert all(len(part.encode("utf-8")) <= 700 for part in parts)
+
+    def test_oversized_paragraph_kept_whole(self):
+        """A paragraph larger than the limit becomes a part of its own."""
+        big = f"<p>{'y' * 500}</p>"
+        body = f"<p>a</p>\n{big}\n<p>b</p>"
+        assert split_chapter_html(body, 100) == ["<p>a</p>", big, "<p>b</p>"]
+
+    def test_line_breaks_inside_paragraph_not_split(self):
+        """Only newlines between paragraphs are boundaries."""
+        body = "<p>line one<br/>line two</p>\n<div>\n" + "z" * 200 + "\n</div>"
+        assert split_chapter_html(body, 100) == ["<p>line one<br/>line two</p>", "<div>\n" + "z" * 200 + "\n</div>"]
+
 
 class TestBuildChapXhtml:
     """Test the build_chap_xhtml function."""
@@ -117,6 +183,38 @@ class TestBuildChapXhtml:
         assert "<title>Chapter</title>" in result
         assert "<h1>Chapter</h1>" in result
 
+    def test_build_chap_xhtml_without_heading(self):
+        """Test continuation parts keep the title but have no heading."""
+        result = build_chap_xhtml("Chapter 3", "<p>More</p>", heading=False)
+
+        assert "<title>Chapter 3</title>" in result
+        assert "<h1>" not in result
+        assert "<p>More</p>" in result
+
+    def test_build_chap_xhtml_display_heading(self):
+        """Test the heading can differ from the title."""
+        result = build_chap_xhtml("Chapter 3: Trial", "<p>Text</p>", display_heading="CHAPTER THREE - Trial")
+
+        assert "<title>Chapter 3: Trial</title>" in result
+        assert "<h1>CHAPTER THREE - Trial</h1>" in result
+
+
+class TestCoverMediaType:
+    """Test the cover_media_type function."""
+
+    def test_known_suffixes(self):
+        """Test the media type follows the image suffix, in any case."""
+        assert cover_media_type(Path("cover.jpg")) == "image/jpeg"
+        assert cover_media_type(Path("cover.JPEG")) == "image/jpeg"
+        assert cover_media_type(Path("art.png")) == "image/png"
+        assert cover_media_type(Path("art.gif")) == "image/gif"
+        assert cover_media_type(Path("art.svg")) == "image/svg+xml"
+        assert cover_media_type(Path("art.webp")) == "image/webp"
+
+    def test_unknown_suffix(self):
+        """Test a file that is not an image gets the generic media type."""
+        assert cover_media_type(Path("cover")) == "application/octet-stream"
+
 
 class TestBuildCoverXhtml:
     """Test the build_cover_xhtml function."""
@@ -11,12 +11,14 @@ import zipfile
 import shutil
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open, call
+import re
 import xml.etree.ElementTree as ET
 import sys
+from datetime import datetime, timezone
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from enchant_book_manager.epub_generator import write_new_epub, extend_epub
+from enchant_book_manager.epub_generator import write_new_epub, extend_epub, write_epub, flat_toc, hierarchical_toc
 
 
 class TestWriteNewEpub:
@@ -117,10 +119,8 @@ class TestWriteNewEpub:
     @patch("enchant_book_manager.epub_generator.build_content_opf")
     @patch("enchant_book_manager.epub_generator.build_toc_ncx")
     @patch("enchant_book_manager.epub_generator.build_cover_xhtml")
-    @patch("enchant_book_manager.epub_generator.shutil.copy2")
     def test_write_new_epub_with_cover(
         self,
-        mock_copy,
         mock_cover_xhtml,
         mock_toc,
         mock_opf,
@@ -158,11 +158,6 @@ class TestWriteNewEpub:
                 cover_path,
             )
 
-            # Verify cover was processed
-            mock_copy.assert_called_once()
-            copy_args = mock_copy.call_args[0]
-            assert copy_args[0] == cover_path
-
             # Verify cover XHTML was built
             mock_cover_xhtml.assert_called_once_with(f"Images/{cover_path.name}")
 
@@ -175,6 +170,7 @@ class TestWriteNewEpub:
             with zipfile.ZipFile(output_path, "r") as z:
                 namelist = z.namelist()
                 assert "OEBPS/Text/cover.xhtml" in namelist
+                assert z.read(f"OEBPS/Images/{cover_path.name}") == b"fake image data"
 
         finally:
             # Cleanup
@@ -246,7 +242,7 @@ class TestWriteNewEpub:
                 output_path.unlink()
 
     @patch("enchant_book_manager.epub_generator.TOC_ENHANCED", True)
-    @patch("enchant_book_manager.epub_generator.build_enhanced_toc_ncx")
+    @patch("enchant_book_manager.epub_generator.iter_enhanced_toc_ncx")
     @patch("enchant_book_manager.epub_generator.uuid.uuid4")
     @patch("enchant_book_manager.epub_generator.build_container_xml")
     @patch("enchant_book_manager.epub_generator.build_style_css")
@@ -268,7 +264,7 @@ class TestWriteNewEpub:
         mock_css.return_value = "css"
         mock_chap.return_value = "<html/>"
         mock_opf.return_value = "<package/>"
-        mock_enhanced_toc.return_value = "<ncx>Enhanced</ncx>"
+        mock_enhanced_toc.return_value = iter(["<ncx>", "Enhanced</ncx>"])
 
         with tempfile.NamedTemporaryFile(suffix=".epub", delete=False) as tmp_file:
             output_path = Path(tmp_file.name)
@@ -291,6 +287,8 @@ class TestWriteNewEpub:
                 "test-uuid",
                 hierarchical=True,
             )
+            with zipfile.ZipFile(output_path) as z:
+                assert z.read("OEBPS/toc.ncx") == b"<ncx>Enhanced</ncx>"
 
         finally:
             if output_path.exists():
@@ -478,6 +476,236 @@ class TestExtendEpub:
             if epub_path.exists():
                 epub_path.unlink()
 
+    def test_extend_epub_copies_existing_entries_raw(self, tmp_path):
+        """Test existing entries are copied without recompression."""
+        epub_path = tmp_path / "book.epub"
+        chapters = [(f"Chapter {i}", f"<p>Content {i}</p>" * 50) for i in range(1, 4)]
+        write_new_epub(chapters, epub_path, "Serial", "Author", None, compression_level=1)
+
+        with zipfile.ZipFile(epub_path) as z:
+            before = {info.filename: (info.CRC, info.compress_size, info.date_time) for info in z.infolist()}
+
+        extend_epub(epub_path, self.new_chapters, compression_level=9)
+
+        with zipfile.ZipFile(epub_path) as z:
+            assert z.testzip() is None
+            assert z.infolist()[0].filename == "mimetype"
+            assert z.infolist()[0].compress_type == zipfile.ZIP_STORED
+            after = {info.filename: (info.CRC, info.compress_size, info.date_time) for info in z.infolist()}
+            for name, entry in before.items():
+                if name not in ("OEBPS/content.opf", "OEBPS/toc.ncx"):
+                    # A level 9 recompression would give a different compressed size
+                    assert after[name] == entry
+            assert "OEBPS/Text/chapter4.xhtml" in after
+            assert "OEBPS/Text/chapter5.xhtml" in after
+            assert z.namelist()[-2:] == ["OEBPS/content.opf", "OEBPS/toc.ncx"]
+
+            toc_ncx = z.read("OEBPS/toc.ncx").decode("utf-8")
+            assert "New Chapter 2" in toc_ncx
+            assert 'playOrder="5"' in toc_ncx
+            content_opf = z.read("OEBPS/content.opf").decode("utf-8")
+            assert "Text/chapter5.xhtml" in content_opf
+
+        assert not epub_path.with_suffix(".tmp.epub").exists()
+
+    def test_extend_epub_invalid_structure_leaves_epub_untouched(self, tmp_path):
+        """Test a failed append does not modify the EPUB or leave a temp file."""
+        epub_path = tmp_path / "book.epub"
+        with zipfile.ZipFile(epub_path, "w") as z:
+            z.writestr("mimetype", "application/epub+zip")
+            z.writestr("OEBPS/content.opf", '<package xmlns="http://www.idpf.org/2007/opf"/>')
+            z.writestr("OEBPS/toc.ncx", '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/"/>')
+        original = epub_path.read_bytes()
+
+        with pytest.raises(ValueError, match="Invalid EPUB structure"):
+            extend_epub(epub_path, self.new_chapters)
+
+        assert epub_path.read_bytes() == original
+        assert not epub_path.with_suffix(".tmp.epub").exists()
+
+
+class TestChapterSplitting:
+    """Test the splitting of oversized chapters into several XHTML files."""
+
+    NS = {"opf": "http://www.idpf.org/2007/opf", "ncx": "http://www.daisy.org/z3986/2005/ncx/"}
+
+    def big_body(self, paragraphs=40):
+        """Chapter body of about 4 KB."""
+        return "\n".join(f"<p>Paragraph {i} {'text ' * 18}</p>" for i in range(paragraphs))
+
+    def read_book(self, path):
+        """Return the spine hrefs and the TOC targets of an EPUB."""
+        with zipfile.ZipFile(path) as z:
+            assert z.testzip() is None
+            opf = ET.fromstring(z.read("OEBPS/content.opf"))
+            ncx = ET.fromstring(z.read("OEBPS/toc.ncx"))
+            hrefs = {item.get("id"): item.get("href") for item in opf.iterfind(".//opf:manifest/opf:item", self.NS)}
+            spine = [hrefs[ref.get("idref")] for ref in opf.iterfind(".//opf:spine/opf:itemref", self.NS)]
+            toc = [content.get("src") for content in ncx.iterfind(".//ncx:content", self.NS)]
+            names = set(z.namelist())
+            assert all(f"OEBPS/{href}" in names for href in spine)
+        return spine, toc
+
+    def test_oversized_chapter_split_into_spine_items(self, tmp_path):
+        """A large chapter becomes sequential files; the TOC points at the first one."""
+        out = tmp_path / "book.epub"
+        chapters = [("Chapter 1", "<p>Short</p>"), ("Chapter 2", self.big_body()), ("Chapter 3", "<p>End</p>")]
+        write_new_epub(chapters, out, "Title", "Author", None, max_chapter_bytes=1000)
+
+        spine, toc = self.read_book(out)
+        parts = [href for href in spine if href.startswith("Text/chapter2")]
+        assert spine[0] == "Text/chapter1.xhtml" and spine[-1] == "Text/chapter3.xhtml"
+        assert parts == ["Text/chapter2.xhtml"] + [f"Text/chapter2_part{n}.xhtml" for n in range(2, len(parts) + 1)]
+        assert len(parts) > 2
+        assert toc == ["Text/chapter1.xhtml", "Text/chapter2.xhtml", "Text/chapter3.xhtml"]
+
+        with zipfile.ZipFile(out) as z:
+            texts = [z.read(f"OEBPS/{href}").decode() for href in parts]
+        assert "<h1>Chapter 2</h1>" in texts[0]
+        assert all("<h1>" not in text and "<title>Chapter 2</title>" in text for text in texts[1:])
+        assert sum(text.count("<p>Paragraph") for text in texts) == 40
+
+    def test_split_keeps_toc_hierarchy(self, tmp_path):
+        """Parts and books of the enhanced TOC keep their children when chapters are split."""
+        out = tmp_path / "book.epub"
+        chapters = [("Part 1: Beginning", "<p>Intro</p>"), ("Chapter 1", self.big_body()), ("Chapter 2", self.big_body())]
+        write_new_epub(chapters, out, "Title", "Author", None, max_chapter_bytes=1000)
+
+        with zipfile.ZipFile(out) as z:
+            ncx = ET.fromstring(z.read("OEBPS/toc.ncx"))
+        top = ncx.findall("ncx:navMap/ncx:navPoint", self.NS)
+        assert len(top) == 1
+        children = top[0].findall("ncx:navPoint", self.NS)
+        assert [child.find("ncx:content", self.NS).get("src") for child in children] == ["Text/chapter2.xhtml", "Text/chapter3.xhtml"]
+
+    def test_splitting_disabled(self, tmp_path):
+        """A limit of 0 writes one file per chapter."""
+        out = tmp_path / "book.epub"
+        write_new_epub([("Chapter 1", self.big_body())], out, "Title", "Author", None, max_chapter_bytes=0)
+
+        spine, _ = self.read_book(out)
+        assert spine == ["Text/chapter1.xhtml"]
+
+    @patch("enchant_book_manager.epub_builders.datetime")
+    @patch("enchant_book_manager.epub_archive.time.time", return_value=1_700_000_000)
+    @patch("enchant_book_manager.epub_generator.uuid.uuid4", return_value="fixed-uuid")
+    def test_split_with_threads_identical(self, mock_uuid, mock_time, mock_datetime, tmp_path):
+        """Split chapters rendered in worker threads give a byte-identical EPUB."""
+        # The OPF date must not cross a second between the two builds
+        mock_datetime.now.return_value = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        chapters = [(f"Chapter {i}", self.big_body(i * 3)) for i in range(1, 25)]
+        archives = []
+        for threads in (1, 3):
+            out = tmp_path / f"book{threads}.epub"
+            write_new_epub(chapters, out, "Title", "Author", None, threads=threads, max_chapter_bytes=2000)
+            archives.append(out.read_bytes())
+        assert archives[0] == archives[1]
+
+    def test_extend_epub_splits_and_numbers_after_parts(self, tmp_path):
+        """Appended chapters are numbered after the last chapter, not its parts, and split too."""
+        out = tmp_path / "book.epub"
+        write_new_epub([("Chapter 1", self.big_body())], out, "Title", "Author", None, max_chapter_bytes=1000)
+        extend_epub(out, [("Chapter 2", self.big_body()), ("Chapter 3", "<p>End</p>")], max_chapter_bytes=1000)
+
+        spine, toc = self.read_book(out)
+        assert toc == ["Text/chapter1.xhtml", "Text/chapter2.xhtml", "Text/chapter3.xhtml"]
+        assert "Text/chapter2_part2.xhtml" in spine
+        assert spine.index("Text/chapter1_part2.xhtml") < spine.index("Text/chapter2.xhtml") < spine.index("Text/chapter2_part2.xhtml") < spine.index("Text/chapter3.xhtml")
+
+    def test_extend_epub_with_toc_strategy(self, tmp_path):
+        """With a TOC strategy the NCX of the extended book is that of a book written in one go."""
+        chapters = [("Part 1", "<p>Intro</p>"), ("Chapter 1", "<p>One</p>"), ("Chapter 2", "<p>Two</p>")]
+        out = tmp_path / "book.epub"
+        write_new_epub(chapters[:1], out, "Title", "Author", None)
+        extend_epub(out, chapters[1:], toc=hierarchical_toc, toc_chapters=[(title, "") for title, _ in chapters])
+        whole = tmp_path / "whole.epub"
+        write_new_epub(chapters, whole, "Title", "Author", None)
+
+        with zipfile.ZipFile(out) as z, zipfile.ZipFile(whole) as w:
+            extended_ncx, whole_ncx = z.read("OEBPS/toc.ncx").decode(), w.read("OEBPS/toc.ncx").decode()
+            uid = ET.fromstring(z.read("OEBPS/toc.ncx")).find("ncx:head/ncx:meta[@name='dtb:uid']", self.NS).get("content")
+            assert uid in z.read("OEBPS/content.opf").decode()
+        assert len(ET.fromstring(extended_ncx).findall("ncx:navMap/ncx:navPoint/ncx:navPoint", self.NS)) == 2
+        assert re.sub(r"urn:uuid:[0-9a-f-]+", "", extended_ncx) == re.sub(r"urn:uuid:[0-9a-f-]+", "", whole_ncx)
+
+    def test_extend_epub_toc_strategy_needs_chapters(self, tmp_path):
+        """A TOC strategy without the chapter titles is rejected before anything is written."""
+        out = tmp_path / "book.epub"
+        write_new_epub([("Chapter 1", "<p>One</p>")], out, "Title", "Author", None)
+        before = out.read_bytes()
+
+        with pytest.raises(ValueError, match="toc_chapters"):
+            extend_epub(out, [("Chapter 2", "<p>Two</p>")], toc=hierarchical_toc)
+        assert out.read_bytes() == before
+
+
+class TestWriteEpub:
+    """Test the write_epub engine and its TOC strategies."""
+
+    NS = TestChapterSplitting.NS
+
+    def test_streamed_chapters_with_headings(self, tmp_path):
+        """Chapters from a generator are written in order; the heading goes into <h1> only."""
+        out = tmp_path / "book.epub"
+        chapters = ((f"Chapter {i}", f"CHAPTER {i}!" if i == 2 else "", f"<p>Text {i}</p>") for i in range(1, 4))
+        write_epub(chapters, out, "Title", "Author", toc=flat_toc)
+
+        with zipfile.ZipFile(out) as z:
+            second = z.read("OEBPS/Text/chapter2.xhtml").decode("utf-8")
+            assert "<title>Chapter 2</title>" in second and "<h1>CHAPTER 2!</h1>" in second
+            assert "<h1>Chapter 1</h1>" in z.read("OEBPS/Text/chapter1.xhtml").decode("utf-8")
+            ncx = ET.fromstring(z.read("OEBPS/toc.ncx"))
+        labels = [text.text for text in ncx.iterfind(".//ncx:navPoint/ncx:navLabel/ncx:text", self.NS)]
+        assert labels == ["Chapter 1", "Chapter 2", "Chapter 3"]
+
+    def test_hierarchical_and_flat_toc(self, tmp_path):
+        """The hierarchical strategy nests chapters under parts, the flat one does not."""
+        chapters = [("Part 1", "", "<p>Intro</p>"), ("Chapter 1", "", "<p>One</p>"), ("Chapter 2", "", "<p>Two</p>")]
+        depths = {}
+        for strategy in (flat_toc, hierarchical_toc):
+            out = tmp_path / f"{strategy.__name__}.epub"
+            write_epub(iter(chapters), out, "Title", "Author", toc=strategy)
+            with zipfile.ZipFile(out) as z:
+                ncx = ET.fromstring(z.read("OEBPS/toc.ncx"))
+            depths[strategy.__name__] = len(ncx.findall("ncx:navMap/ncx:navPoint/ncx:navPoint", self.NS))
+        assert depths == {"flat_toc": 0, "hierarchical_toc": 2}
+
+    def test_custom_toc_strategy(self, tmp_path):
+        """A TOC strategy receives the chapter titles collected while writing."""
+        received = []
+
+        def strategy(chapters, title, author, uid):
+            received.extend(chapters)
+            yield "<ncx/>"
+
+        out = tmp_path / "book.epub"
+        big = "\n".join(f"<p>{'word ' * 50}</p>" for _ in range(20))
+        write_epub(iter([("One", "", big), ("Two", "", "<p>2</p>")]), out, "Title", "Author", max_chapter_bytes=1000, toc=strategy)
+
+        assert received == [("One", ""), ("Two", "")]
+        with zipfile.ZipFile(out) as z:
+            assert z.read("OEBPS/toc.ncx") == b"<ncx/>"
+
+
+    @pytest.mark.parametrize("failure", ["chapters", "cover"])
+    def test_failed_build_leaves_existing_epub(self, tmp_path, failure):
+        """A build that fails midway does not replace the EPUB or leave a temp file."""
+        out = tmp_path / "book.epub"
+        write_epub(iter([("One", "", "<p>1</p>")]), out, "Title", "Author")
+        original = out.read_bytes()
+
+        def chapters():
+            yield ("One", "", "<p>1</p>")
+            raise RuntimeError("render failed")
+
+        with pytest.raises((RuntimeError, FileNotFoundError)):
+            if failure == "chapters":
+                write_epub(chapters(), out, "Title", "Author")
+            else:
+                write_epub(iter([("One", "", "<p>1</p>")]), out, "Title", "Author", cover=tmp_path / "missing.jpg")
+
+        assert out.read_bytes() == original
+        assert not out.with_suffix(".tmp.epub").exists()
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for epub_structure module.
+"""
+
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.epub_builder import create_epub_from_chapters
+from enchant_book_manager.epub_generator import extend_epub, write_new_epub
+from enchant_book_manager.epub_structure import (
+    build_report,
+    check_epub_structure,
+    check_epubs,
+    collect_epub_paths,
+    write_json_report,
+)
+
+NCX = """<?xml version='1.0' encoding='utf-8'?>
+<ncx xmlns='http://www.daisy.org/z3986/2005/ncx/' version='2005-1'><head/><docTitle><text>T</text></docTitle>
+<navMap>{points}</navMap></ncx>"""
+
+
+def nav_point(order, src):
+    """One navPoint of the NCX template."""
+    return f"<navPoint id='n{order}' playOrder='{order}'><navLabel><text>x</text></navLabel><content src='{src}'/></navPoint>"
+
+
+def make_book(path, chapters=3):
+    """Write a valid book with a cover and return its path."""
+    cover = path.parent / "cover.png"
+    cover.write_bytes(b"png")
+    write_new_epub([(f"Chapter {i}", f"<p>Text {i}</p>") for i in range(1, chapters + 1)], path, "Title", "Author", cover)
+    return path
+
+
+def rewrite(path, replace=None, order=None, compress_mimetype=False):
+    """Rewrite an EPUB with entries replaced (None deletes) or reordered."""
+    replace = replace or {}
+    with zipfile.ZipFile(path) as z:
+        entries = {info.filename: z.read(info) for info in z.infolist()}
+    names = order or list(entries)
+    with zipfile.ZipFile(path, "w") as z:
+        for name in names:
+            data = replace.get(name, entries[name])
+            if data is None:
+                continue
+            stored = name == "mimetype" and not compress_mimetype
+            z.writestr(name, data, zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+    return path
+
+
+class TestValidBooks:
+    """Books written by this package pass the check."""
+
+    def test_write_new_epub_split_and_extended(self, tmp_path):
+        """A book with a cover, split chapters and appended chapters is valid."""
+        path = make_book(tmp_path / "book.epub")
+        extend_epub(path, [("Chapter 4", "\n".join(f"<p>{'word ' * 40}</p>" for _ in range(20)))], max_chapter_bytes=1000)
+
+        result = check_epub_structure(path)
+
+        assert result.valid and result.warnings == []
+        assert result.nav_points == 4
+        assert result.spine_items > 5
+        assert result.entries > result.spine_items
+
+    def test_create_epub_from_chapters(self, tmp_path):
+        """A book from the chapter directory builder is valid."""
+        path = tmp_path / "book.epub"
+        create_epub_from_chapters([("Chapter 1", "", "<p>One</p>"), ("Chapter 2", "", "<p>Two</p>")], path, "Title", "Author")
+
+        result = check_epub_structure(path)
+
+        assert result.valid and result.warnings == []
+        assert result.to_dict()["valid"] is True
+
+
+class TestArchiveErrors:
+    """Problems of the ZIP container and the mimetype entry."""
+
+    def test_not_a_zip(self, tmp_path):
+        """A file that is not a ZIP archive is reported, not raised."""
+        path = tmp_path / "broken.epub"
+        path.write_bytes(b"not a zip")
+
+        result = check_epub_structure(path)
+
+        assert not result.valid
+        assert result.errors[0].startswith("Cannot read the archive")
+
+    def test_corrupt_compressed_entry(self, tmp_path):
+        """A corrupt deflate stream is reported for its book and the batch goes on."""
+        path = make_book(tmp_path / "corrupt.epub")
+        with zipfile.ZipFile(path) as z:
+            info = z.getinfo("OEBPS/content.opf")
+        data = bytearray(path.read_bytes())
+        # Local header: 30 bytes, then the name and extra field lengths at 26 and 28
+        start = info.header_offset + 30 + int.from_bytes(data[info.header_offset + 26 : info.header_offset + 28], "little")
+        start += int.from_bytes(data[info.header_offset + 28 : info.header_offset + 30], "little")
+        for offset in range(start + 2, start + 12):
+            data[offset] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        results = check_epubs([path, make_book(tmp_path / "good.epub")], workers=1)
+
+        assert results[0].errors[0].startswith("Cannot read the archive")
+        assert results[1].valid
+
+    def test_mimetype_not_first(self, tmp_path):
+        """The mimetype entry must be the first entry."""
+        path = make_book(tmp_path / "book.epub")
+        with zipfile.ZipFile(path) as z:
+            names = z.namelist()
+        rewrite(path, order=names[1:] + names[:1])
+
+        assert "mimetype is not the first entry" in check_epub_structure(path).errors
+
+    def test_mimetype_compressed(self, tmp_path):
+        """The mimetype entry must be stored."""
+        path = rewrite(make_book(tmp_path / "book.epub"), compress_mimetype=True)
+
+        assert "mimetype entry is compressed" in check_epub_structure(path).errors
+
+    def test_mimetype_missing_or_wrong(self, tmp_path):
+        """A missing or wrong mimetype entry is an error."""
+        missing = rewrite(make_book(tmp_path / "missing.epub"), {"mimetype": None})
+        wrong = rewrite(make_book(tmp_path / "wrong.epub"), {"mimetype": b"application/zip"})
+
+        assert check_epub_structure(missing).errors[0] == "mimetype entry is missing"
+        assert check_epub_structure(wrong).errors == ["mimetype entry does not contain application/epub+zip"]
+
+
+class TestPackageErrors:
+    """Problems of container.xml, the manifest and the spine."""
+
+    def test_missing_container(self, tmp_path):
+        """Without container.xml nothing else can be checked."""
+        path = rewrite(make_book(tmp_path / "book.epub"), {"META-INF/container.xml": None})
+
+        assert check_epub_structure(path).errors == ["Container META-INF/container.xml is missing"]
+
+    def test_malformed_opf(self, tmp_path):
+        """An OPF that is not well-formed XML is an error."""
+        path = rewrite(make_book(tmp_path / "book.epub"), {"OEBPS/content.opf": b"<package>"})
+
+        errors = check_epub_structure(path).errors
+        assert len(errors) == 1 and errors[0].startswith("Package OEBPS/content.opf is not well-formed")
+
+    def test_manifest_file_missing(self, tmp_path):
+        """A manifest href must exist in the archive."""
+        path = rewrite(make_book(tmp_path / "book.epub"), {"OEBPS/Text/chapter2.xhtml": None})
+
+        assert check_epub_structure(path).errors == [
+            "Manifest item chap2 points at missing file OEBPS/Text/chapter2.xhtml",
+            "navPoint nav2 points at missing file OEBPS/Text/chapter2.xhtml",
+        ]
+
+    def test_spine_and_manifest_inconsistent(self, tmp_path):
+        """Unknown spine idrefs, duplicated ids and a bad toc attribute are errors."""
+        path = make_book(tmp_path / "book.epub")
+        with zipfile.ZipFile(path) as z:
+            opf = z.read("OEBPS/content.opf").decode("utf-8")
+        opf = opf.replace("<itemref idref='chap3'/>", "<itemref idref='chap9'/>")
+        opf = opf.replace("<item id='chap2'", "<item id='chap1'")
+        opf = opf.replace("<spine toc='ncx'>", "<spine toc='css'>")
+        rewrite(path, {"OEBPS/content.opf": opf.encode("utf-8")})
+
+        result = check_epub_structure(path)
+
+        assert "Spine itemref chap9 is not in the manifest" in result.errors
+        assert "Manifest id chap1 is used twice" in result.errors
+        assert "Spine toc css is not an NCX item of the manifest" in result.errors
+        assert any("not in the spine" in warning for warning in result.warnings)
+
+    def test_empty_spine(self, tmp_path):
+        """A spine without itemrefs is an error."""
+        path = make_book(tmp_path / "book.epub", chapters=1)
+        with zipfile.ZipFile(path) as z:
+            opf = z.read("OEBPS/content.opf").decode("utf-8")
+        opf = opf.replace("<itemref idref='coverpage' linear='yes'/>", "").replace("<itemref idref='chap1'/>", "")
+        rewrite(path, {"OEBPS/content.opf": opf.encode("utf-8")})
+
+        assert "Spine is empty" in check_epub_structure(path).errors
+
+
+class TestNcxErrors:
+    """Problems of the NCX navPoints."""
+
+    def check_ncx(self, tmp_path, points):
+        """Check a book whose NCX holds the given navPoints."""
+        path = make_book(tmp_path / "book.epub")
+        rewrite(path, {"OEBPS/toc.ncx": NCX.format(points="".join(points)).encode("utf-8")})
+        return check_epub_structure(path)
+
+    def test_sane_play_order(self, tmp_path):
+        """Nested navPoints count up in document order; one target may repeat its value."""
+        points = [nav_point(1, "Text/chapter1.xhtml"), nav_point(1, "Text/chapter1.xhtml"), nav_point(2, "Text/chapter2.xhtml#top")]
+        result = self.check_ncx(tmp_path, points)
+
+        assert result.valid
+        assert result.nav_points == 3
+
+    def test_play_order_gap_and_reuse(self, tmp_path):
+        """A gap and a value reused for another target are errors."""
+        points = [nav_point(1, "Text/chapter1.xhtml"), nav_point(3, "Text/chapter2.xhtml"), nav_point(3, "Text/chapter3.xhtml")]
+        errors = self.check_ncx(tmp_path, points).errors
+
+        assert errors == ["navPoint n3 has playOrder 3, expected 2", "navPoint n3 reuses playOrder 3 for another target"]
+
+    def test_play_order_not_integer(self, tmp_path):
+        """A playOrder that is not an integer is an error."""
+        errors = self.check_ncx(tmp_path, [nav_point("one", "Text/chapter1.xhtml")]).errors
+
+        assert errors == ["navPoint none has playOrder 'one', not an integer"]
+
+    def test_missing_target_and_outside_spine(self, tmp_path):
+        """A navPoint to a missing file is an error, one outside the spine a warning."""
+        points = [nav_point(1, "Text/chapter1.xhtml"), nav_point(2, "Text/none.xhtml"), nav_point(3, "Styles/style.css")]
+        result = self.check_ncx(tmp_path, points)
+
+        assert result.errors == ["navPoint n2 points at missing file OEBPS/Text/none.xhtml"]
+        assert result.warnings == ["1 navPoint(s) point outside the spine"]
+
+
+class TestBatch:
+    """Checking many books and the JSON report."""
+
+    def test_collect_epub_paths(self, tmp_path):
+        """Directories are searched recursively and paths de-duplicated."""
+        (tmp_path / "shelf" / "sub").mkdir(parents=True)
+        first = tmp_path / "shelf" / "a.epub"
+        second = tmp_path / "shelf" / "sub" / "b.epub"
+        for path in (first, second):
+            path.write_bytes(b"")
+        (tmp_path / "shelf" / "notes.txt").write_text("x")
+
+        assert collect_epub_paths([tmp_path / "shelf", first]) == [first, second]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_check_epubs_keeps_order(self, tmp_path, workers):
+        """Results come back in the order of the paths, with or without workers."""
+        paths = [make_book(tmp_path / f"book{i}.epub") for i in range(5)]
+        (tmp_path / "book2.epub").write_bytes(b"broken")
+
+        results = check_epubs(paths, workers=workers)
+
+        assert [result.path for result in results] == [str(path) for path in paths]
+        assert [result.valid for result in results] == [True, True, False, True, True]
+
+    def test_json_report(self, tmp_path):
+        """The report counts valid and invalid books and lists every result."""
+        good = make_book(tmp_path / "good.epub")
+        bad = tmp_path / "bad.epub"
+        bad.write_bytes(b"broken")
+        results = check_epubs([good, bad], workers=1)
+        report_path = tmp_path / "qa.json"
+
+        write_json_report(results, report_path)
+
+        report = json.loads(report_path.read_text(encoding="utf-8"))
+        assert report == build_report(results)
+        assert (report["checked"], report["valid"], report["invalid"], report["with_warnings"]) == (2, 1, 1, 0)
+        assert report["results"][1]["path"] == str(bad) and report["results"][1]["valid"] is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
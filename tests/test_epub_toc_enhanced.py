@@ -4,6 +4,7 @@
 """Tests for enhanced TOC generation"""
 
 import unittest
+import xml.etree.ElementTree as ET
 from pathlib import Path
 import sys
 
@@ -14,6 +15,7 @@ from enchant_book_manager.epub_toc_enhanced import (
     EnhancedTocBuilder,
     TocEntry,
     build_enhanced_toc_ncx,
+    iter_enhanced_toc_ncx,
 )
 
 
@@ -185,6 +187,29 @@ class TestEnhancedTocBuilder(unittest.TestCase):
         self.assertIn("<navMap>", toc)
         self.assertIn("</navMap>", toc)
 
+    def test_iter_ncx_matches_build(self):
+        """Test the streamed NCX pieces join to the built document"""
+        for hierarchical in (True, False):
+            pieces = list(iter_enhanced_toc_ncx(self.test_chapters, "Book", "Author", "uid", hierarchical=hierarchical))
+            self.assertGreater(len(pieces), 1)
+            self.assertEqual("".join(pieces), build_enhanced_toc_ncx(self.test_chapters, "Book", "Author", "uid", hierarchical=hierarchical))
+
+    def test_iter_nav_xhtml_matches_build(self):
+        """Test the streamed nav document pieces join to the built document"""
+        pieces = "".join(EnhancedTocBuilder().iter_nav_xhtml(self.test_chapters, "Book"))
+        self.assertEqual(pieces, EnhancedTocBuilder().build_nav_xhtml(self.test_chapters, "Book"))
+
+    def test_large_toc(self):
+        """Test a 20k-entry TOC with wide parts is well-formed and complete"""
+        chapters = [(f"Part {i // 5000 + 1}" if i % 5000 == 0 else f"Chapter {i}", "") for i in range(20000)]
+        ncx = ET.fromstring(build_enhanced_toc_ncx(chapters, "Book", "Author", "uid").encode("utf-8"))
+
+        ns = {"ncx": "http://www.daisy.org/z3986/2005/ncx/"}
+        parts = ncx.findall("ncx:navMap/ncx:navPoint", ns)
+        self.assertEqual(len(parts), 4)
+        self.assertEqual([len(part.findall("ncx:navPoint", ns)) for part in parts], [4999] * 4)
+        self.assertEqual(len(ncx.findall(".//ncx:navPoint", ns)), 20000)
+
 
 if __name__ == "__main__":
     unittest.main()
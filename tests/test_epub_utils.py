@@ -15,7 +15,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enchant_book_manager.epub_utils import (
     create_epub_with_config,
+    get_epub_build_threads,
+    get_epub_compression_level,
     get_epub_config_from_book_info,
+    get_epub_max_chapter_bytes,
 )
 
 
@@ -61,6 +64,9 @@ class TestCreateEpubWithConfig:
             language="en",
             custom_css="body { font-family: serif; }",
             metadata={"publisher": "Test Publisher"},
+            threads=1,
+            compression_level=None,
+            max_chapter_bytes=256 * 1024,
         )
         logger.info.assert_any_call("Creating EPUB for: Test Book by Test Author")
         logger.info.assert_any_call(f"EPUB created successfully: {output_path}")
@@ -207,6 +213,156 @@ class TestCreateEpubWithConfig:
         assert call_args["language"] == "en"
         assert call_args["custom_css"] is None
         assert call_args["metadata"] is None
+        assert call_args["threads"] == 1
+        assert call_args["compression_level"] is None
+
+    @patch("enchant_book_manager.epub_utils.epub_available", True)
+    @patch("enchant_book_manager.epub_utils.create_epub_from_txt_file")
+    def test_build_options_passed(self, mock_create_epub):
+        """Test threads and compression level are passed to the EPUB writer."""
+        mock_create_epub.return_value = (True, [])
+        config = {"title": "Test Book", "author": "Test Author", "threads": "4", "compression_level": 9}
+
+        create_epub_with_config(Path("test.txt"), Path("test.epub"), config)
+
+        call_args = mock_create_epub.call_args[1]
+        assert call_args["threads"] == 4
+        assert call_args["compression_level"] == 9
+
+    @patch("enchant_book_manager.epub_utils.epub_available", True)
+    @patch("enchant_book_manager.epub_utils.create_epub_from_txt_file")
+    def test_max_chapter_kb_passed(self, mock_create_epub):
+        """Test the chapter size limit is passed to the EPUB writer in bytes."""
+        mock_create_epub.return_value = (True, [])
+        config = {"title": "Test Book", "author": "Test Author", "max_chapter_kb": 64}
+
+        create_epub_with_config(Path("test.txt"), Path("test.epub"), config)
+
+        assert mock_create_epub.call_args[1]["max_chapter_bytes"] == 64 * 1024
+
+
+class TestBuildCache:
+    """Test that unchanged EPUB builds are skipped."""
+
+    def make_book(self, tmp_path):
+        """Write a translated text and return it with a build config."""
+        txt = tmp_path / "translated.txt"
+        txt.write_text("Chapter 1\nOne\n\nChapter 2\nTwo\n", encoding="utf-8")
+        config = {"title": "Test Novel", "author": "Test Author", "metadata": {"publisher": "P"}}
+        return txt, config
+
+    def test_unchanged_build_skipped(self, tmp_path):
+        """A second build with the same inputs reuses the EPUB and logs the skip."""
+        txt, config = self.make_book(tmp_path)
+        output = tmp_path / "book.epub"
+        logger = Mock()
+
+        assert create_epub_with_config(txt, output, config, logger) == (True, [])
+        assert (tmp_path / "book.epub.build.json").exists()
+        built = output.read_bytes()
+
+        with patch("enchant_book_manager.epub_utils.create_epub_from_txt_file") as mock_create_epub:
+            success, issues = create_epub_with_config(txt, output, config, logger)
+
+        mock_create_epub.assert_not_called()
+        assert (success, issues) == (True, [])
+        assert output.read_bytes() == built
+        assert any("skipping rebuild" in str(c) and "saved about" in str(c) for c in logger.info.call_args_list)
+
+    @pytest.mark.parametrize(
+        "change",
+        ["text", "metadata", "css", "title", "output"],
+    )
+    def test_changed_input_rebuilds(self, tmp_path, change):
+        """Any changed input, or a replaced EPUB, triggers a rebuild."""
+        txt, config = self.make_book(tmp_path)
+        output = tmp_path / "book.epub"
+        create_epub_with_config(txt, output, config)
+
+        if change == "text":
+            txt.write_text("Chapter 1\nOne changed\n", encoding="utf-8")
+        elif change == "metadata":
+            config["metadata"] = {"publisher": "Other"}
+        elif change == "css":
+            config["custom_css"] = "body { margin: 0; }"
+        elif change == "title":
+            config["title"] = "Other Title"
+        else:
+            output.write_bytes(b"not the built EPUB")
+
+        with patch("enchant_book_manager.epub_utils.create_epub_from_txt_file", return_value=(True, [])) as mock_create_epub:
+            create_epub_with_config(txt, output, config)
+        mock_create_epub.assert_called_once()
+
+    def test_build_cache_disabled(self, tmp_path):
+        """With build_cache off, every build runs and no manifest is written."""
+        txt, config = self.make_book(tmp_path)
+        config["build_cache"] = False
+        output = tmp_path / "book.epub"
+
+        create_epub_with_config(txt, output, config)
+        assert output.exists()
+        assert not (tmp_path / "book.epub.build.json").exists()
+
+    def test_failed_build_removes_manifest(self, tmp_path):
+        """A failed build removes the manifest of the previous one."""
+        txt, config = self.make_book(tmp_path)
+        output = tmp_path / "book.epub"
+        create_epub_with_config(txt, output, config)
+
+        config["title"] = "Other Title"
+        with patch("enchant_book_manager.epub_utils.create_epub_from_txt_file", return_value=(False, ["error"])):
+            assert create_epub_with_config(txt, output, config) == (False, ["error"])
+        assert not (tmp_path / "book.epub.build.json").exists()
+
+
+class TestEpubBuildOptions:
+    """Test the coercion of the EPUB build options."""
+
+    def test_threads(self):
+        """Test thread counts are coerced to an int of at least 1."""
+        assert get_epub_build_threads({}) == 1
+        assert get_epub_build_threads({"threads": None}) == 1
+        assert get_epub_build_threads({"threads": 8}) == 8
+        assert get_epub_build_threads({"threads": "3"}) == 3
+        assert get_epub_build_threads({"threads": 0}) == 1
+        assert get_epub_build_threads({"threads": -2}) == 1
+
+    def test_invalid_threads_warns(self):
+        """Test non-numeric thread counts fall back to 1 with a warning."""
+        logger = Mock()
+        assert get_epub_build_threads({"threads": "many"}, logger) == 1
+        logger.warning.assert_called_once()
+
+    def test_compression_level(self):
+        """Test compression levels are clamped to the zlib range."""
+        assert get_epub_compression_level({}) is None
+        assert get_epub_compression_level({"compression_level": None}) is None
+        assert get_epub_compression_level({"compression_level": 6}) == 6
+        assert get_epub_compression_level({"compression_level": "1"}) == 1
+        assert get_epub_compression_level({"compression_level": 12}) == 9
+        assert get_epub_compression_level({"compression_level": -5}) == 0
+
+    def test_invalid_compression_level_warns(self):
+        """Test invalid compression levels fall back to the zlib default."""
+        logger = Mock()
+        assert get_epub_compression_level({"compression_level": "best"}, logger) is None
+        logger.warning.assert_called_once()
+
+    def test_max_chapter_bytes(self):
+        """Test the chapter size limit is converted from KB, 0 disabling splits."""
+        assert get_epub_max_chapter_bytes({}) == 256 * 1024
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": 100}) == 100 * 1024
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": "8"}) == 8 * 1024
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": 0}) == 0
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": None}) == 0
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": -1}) == 0
+
+    def test_invalid_max_chapter_kb_warns(self):
+        """Test invalid chapter size limits fall back to the default."""
+        logger = Mock()
+        assert get_epub_max_chapter_bytes({"max_chapter_kb": "big"}, logger) == 256 * 1024
+        logger.warning.assert_called_once()
 
 
 class TestGetEpubConfigFromBookInfo:
@@ -269,6 +425,17 @@ class TestGetEpubConfigFromBookInfo:
         assert config["custom_css"] == "body { color: red; }"
         assert config["chapter_patterns"] == ["Chapter", "Part"]
 
+    def test_build_options_from_settings(self):
+        """Test threads and compression level are read from the EPUB settings."""
+        book_info = {"title_english": "Test Novel", "author_english": "Test Author"}
+
+        config = get_epub_config_from_book_info(book_info, {"threads": 4, "compression_level": 9, "build_cache": False, "max_chapter_kb": 32})
+
+        assert config["threads"] == 4
+        assert config["compression_level"] == 9
+        assert config["build_cache"] is False
+        assert config["max_chapter_kb"] == 32
+
     def test_with_metadata_settings(self):
         """Test with metadata settings."""
         book_info = {
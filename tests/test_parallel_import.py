@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for parallel_import module.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.parallel_import import (
+    _read_paragraphs,
+    _split_mapped_segment,
+    find_segment_boundaries,
+    split_chinese_text_in_parts_parallel,
+    split_text_by_actual_paragraphs_parallel,
+)
+from enchant_book_manager.text_splitter import (
+    split_chinese_text_in_parts,
+    split_text_by_actual_paragraphs,
+)
+
+
+def make_novel(paragraphs: int = 3000) -> str:
+    """Build a synthetic novel with mixed newlines, spaces and adverts."""
+    parts = []
+    for i in range(paragraphs):
+        parts.append(f"第{i}段  这是一个测试段落，内容比较长。（注释）" * (1 + i % 5))
+        if i % 97 == 0:
+            parts.append("吉米小说网（www.jimixs.com）免费电子书下载")
+        parts.append("\r\n\r\n" if i % 3 == 0 else "\n \n\n")
+        if i % 211 == 0:
+            parts.append(" ")
+    return "".join(parts)
+
+
+class TestFindSegmentBoundaries:
+    """Test the find_segment_boundaries function."""
+
+    def test_boundaries_follow_blank_lines(self):
+        """Test that every inner cut is placed right after an empty line."""
+        text = "a\n\nb\n\nc\n\nd\n\ne"
+        boundaries = find_segment_boundaries(text, 3)
+
+        assert boundaries[0] == 0
+        assert boundaries[-1] == len(text)
+        assert boundaries == sorted(boundaries)
+        for pos in boundaries[1:-1]:
+            assert text[pos - 2 : pos] == "\n\n"
+
+    def test_no_paragraph_breaks(self):
+        """Test that text without paragraph breaks stays in one segment."""
+        text = "x" * 1000
+        assert find_segment_boundaries(text, 4) == [0, 1000]
+
+    def test_advert_across_cut_is_avoided(self):
+        """Test that a cut is never placed inside an advert spanning a blank line."""
+        text = "正文。" * 10 + "吉米小说网\n\n（www.jimixs.com）" + "正文。" * 10 + "\n\n" + "结尾"
+        boundaries = find_segment_boundaries(text, 2)
+
+        advert_cut = text.index("（www")
+        assert advert_cut not in boundaries
+
+
+class TestSegmentWorker:
+    """Test the worker that splits one mapped segment."""
+
+    def test_worker_returns_only_lengths(self, tmp_path):
+        """Test that paragraphs go through the output file, not the return value."""
+        segment = "第一段  内容。\n\n第二段\n \n第三段"
+        mapped = tmp_path / "input.txt"
+        mapped.write_bytes(b"prefix" + segment.encode("utf-8"))
+        output = tmp_path / "out.txt"
+
+        lengths = _split_mapped_segment(str(mapped), len(b"prefix"), mapped.stat().st_size, str(output))
+
+        assert all(isinstance(length, int) for length in lengths)
+        assert _read_paragraphs(str(output), lengths) == split_text_by_actual_paragraphs(segment)
+
+
+class TestParallelSplitting:
+    """Test that parallel splitting matches the sequential splitter."""
+
+    @patch("enchant_book_manager.parallel_import.PARALLEL_IMPORT_MIN_CHARS", 0)
+    def test_paragraphs_identical(self):
+        """Test paragraph lists are identical to split_text_by_actual_paragraphs."""
+        text = make_novel()
+        assert split_text_by_actual_paragraphs_parallel(text, 4) == split_text_by_actual_paragraphs(text)
+
+    @patch("enchant_book_manager.parallel_import.PARALLEL_IMPORT_MIN_CHARS", 0)
+    @pytest.mark.parametrize("max_chars", [500, 2000, 11999])
+    def test_chunks_identical(self, max_chars):
+        """Test chunking is identical to split_chinese_text_in_parts."""
+        text = make_novel()
+        expected = split_chinese_text_in_parts(text, max_chars)
+        assert split_chinese_text_in_parts_parallel(text, max_chars, workers=3) == expected
+
+    def test_small_text_stays_sequential(self):
+        """Test that small texts never start a process pool."""
+        with patch("enchant_book_manager.parallel_import.ProcessPoolExecutor") as mock_pool:
+            result = split_text_by_actual_paragraphs_parallel("段落一\n\n段落二", 4)
+
+        mock_pool.assert_not_called()
+        assert result == ["段落一\n\n", "段落二\n\n"]
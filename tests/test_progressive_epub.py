@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for progressive_epub module.
+"""
+
+import random
+import re
+import zipfile
+from pathlib import Path
+import sys
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.chapter_parser import split_text
+from enchant_book_manager.chinese_headings import ChapterSpan
+from enchant_book_manager.epub_builders import paragraphize
+from enchant_book_manager.epub_generator import extend_epub, write_new_epub
+from enchant_book_manager.progressive_epub import ProgressiveEpubBuilder
+
+
+def collect_chapters(chunks, chapter_map=None):
+    """Feed chunks to a builder that records chapters instead of writing them."""
+    builder = ProgressiveEpubBuilder(Path("unused.epub"), "Title", "Author")
+    written = []
+    builder._write_chapters = lambda chapters: written.extend(chapters)
+    if chapter_map is not None:
+        builder.use_chapter_map(chapter_map)
+    for number, chunk in enumerate(chunks, start=1):
+        builder.add_chunk(chunk, number)
+    builder.finish()
+    return written, builder
+
+
+class TestChapterSplitting:
+    """Test how chunks are cut into chapters."""
+
+    def test_chapters_emitted_when_next_heading_arrives(self):
+        """A chapter is written as soon as the following heading is seen."""
+        builder = ProgressiveEpubBuilder(Path("unused.epub"), "Title", "Author")
+        written = []
+        builder._write_chapters = lambda chapters: written.extend(chapters)
+
+        builder.add_chunk("Preface line\n\nChapter 1: Start\nFirst body")
+        assert written == [("Front Matter", "Preface line")]
+
+        builder.add_chunk("more of one\nChapter 2: Next\nSecond")
+        assert written[1:] == [("Chapter 1: Start", "First body\n\n\nmore of one")]
+
+        builder.finish()
+        assert written[2:] == [("Chapter 2: Next", "Second")]
+        assert builder.sequence == [1, 2]
+        assert builder.issues == []
+
+    def test_heading_split_across_chunks(self):
+        """A heading at the start of a chunk ends the chapter of the previous chunk."""
+        written, builder = collect_chapters(["Chapter 1\nOne", "Chapter 2\nTwo", "Chapter 4\nFour"])
+        assert written == [("Chapter 1", "One"), ("Chapter 2", "Two"), ("Chapter 4", "Four")]
+        assert builder.sequence == [1, 2, 4]
+        assert builder.issues
+
+    def test_no_headings(self):
+        """A book without headings becomes one "Content" chapter, like split_text."""
+        written, builder = collect_chapters(["Just prose.", "More prose."])
+        assert written == [("Content", "Just prose.\n\n\nMore prose.")]
+        assert builder.sequence == []
+
+    def test_matches_split_text(self):
+        """Chapters match split_text on the full text, for books without repeated numbers."""
+        rng = random.Random(5)
+        lines = []
+        for number in range(1, 40):
+            lines.append(rng.choice([f"Chapter {number}", f"CHAPTER {number}: The Road", f"Chapter {number} - x"]))
+            lines.extend(rng.choice(["Text line.", "He said chapter 5 was good.", "", "The chapter ended."]) for _ in range(rng.randint(0, 6)))
+        chunks = []
+        i = 0
+        while i < len(lines):
+            j = i + rng.randint(1, 9)
+            chunks.append("\n".join(lines[i:j]))
+            i = j
+
+        expected, sequence = split_text("\n".join(f"\n{chunk}\n" for chunk in chunks), True, force_no_db=True)
+        written, builder = collect_chapters(chunks)
+        # An empty "Front Matter" chapter is not written
+        assert written == [(title, body.strip()) for title, body in expected if body.strip() or title != "Front Matter"]
+        assert builder.sequence == sequence
+
+
+class TestChapterMap:
+    """Test cutting chapters with the chapter to chunk map of the import."""
+
+    def test_chunk_starts_need_no_scan(self):
+        """Chapters starting chunks are cut without any heading scan."""
+        chapter_map = [ChapterSpan(12, "章", "第十二章", 2, 2, 0), ChapterSpan(13, "章", "第十三章", 3, 4, 0)]
+        chunks = ["Preface", "Chapter Twelve: Wind\nOne", "Chapter 13\nTwo", "more two"]
+        with patch("enchant_book_manager.progressive_epub.find_heading_lines") as mock_find:
+            written, builder = collect_chapters(chunks, chapter_map)
+
+        mock_find.assert_not_called()
+        assert written == [("Front Matter", "Preface"), ("Chapter Twelve: Wind", "One"), ("Chapter 13", "Two\n\nmore two")]
+        assert builder.sequence == [12, 13]
+
+    def test_chapters_inside_a_chunk(self):
+        """Chapters after the first paragraph are found in their own chunk."""
+        chapter_map = [ChapterSpan(1, "回", "第一回", 1, 1, 0), ChapterSpan(2, "回", "第二回", 1, 1, 2), ChapterSpan(3, "回", "第三回", 1, 2, 4)]
+        written, builder = collect_chapters(["Chapter 1\nOne\n\nChapter 2\nTwo\n\nChapter 3\nThree", "still three"], chapter_map)
+
+        assert written == [("Chapter 1", "One"), ("Chapter 2", "Two"), ("Chapter 3", "Three\n\nstill three")]
+        assert builder.sequence == [1, 2, 3]
+
+    def test_missing_translated_heading(self):
+        """If the translation lost a heading, the numbers of the headings found are used."""
+        chapter_map = [ChapterSpan(1, "章", "第一章", 1, 1, 0), ChapterSpan(2, "章", "第二章", 1, 1, 2), ChapterSpan(3, "章", "第三章", 1, 1, 4)]
+        logger = Mock()
+        builder = ProgressiveEpubBuilder(Path("unused.epub"), "Title", "Author", logger=logger)
+        written = []
+        builder._write_chapters = lambda chapters: written.extend(chapters)
+        builder.use_chapter_map(chapter_map)
+        builder.add_chunk("Chapter 1\nOne\n\nTwo\n\nChapter 3\nThree", 1)
+        builder.finish()
+
+        assert written == [("Chapter 1", "One\n\nTwo"), ("Chapter 3", "Three")]
+        assert builder.sequence == [1, 3]
+        assert "expected 2 translated headings, found 1" in logger.debug.call_args[0][0]
+
+    def test_epub_written_from_map(self, tmp_path):
+        """The EPUB built from the map has one file per chapter."""
+        out = tmp_path / "book.epub"
+        builder = ProgressiveEpubBuilder(out, "Title", "Author")
+        builder.use_chapter_map([ChapterSpan(1, "章", "第一章", 1, 1, 0), ChapterSpan(2, "章", "第二章", 2, 2, 0)])
+        builder.add_chunk("Chapter 1\nOne", 1)
+        builder.add_chunk("Chapter 2\nTwo", 2)
+        assert builder.finish()
+
+        with zipfile.ZipFile(out) as z:
+            assert "Two" in z.read("OEBPS/Text/chapter2.xhtml").decode()
+        assert builder.chapters_written == 2
+        assert builder.issues == []
+
+
+class TestEpubOutput:
+    """Test the EPUB written by the builder."""
+
+    def test_partial_epub_readable_after_each_chapter(self, tmp_path):
+        """The EPUB exists and grows while chunks arrive."""
+        out = tmp_path / "out" / "book.epub"
+        builder = ProgressiveEpubBuilder(out, "Title", "Author")
+
+        builder.add_chunk("Chapter 1\nOne")
+        assert not out.exists()
+
+        builder.add_chunk("Chapter 2\nTwo")
+        with zipfile.ZipFile(out) as z:
+            assert z.testzip() is None
+            assert "OEBPS/Text/chapter1.xhtml" in z.namelist()
+            assert "OEBPS/Text/chapter2.xhtml" not in z.namelist()
+
+        assert builder.finish()
+        with zipfile.ZipFile(out) as z:
+            assert "Two" in z.read("OEBPS/Text/chapter2.xhtml").decode()
+            toc = z.read("OEBPS/toc.ncx").decode()
+            assert "Chapter 1" in toc and "Chapter 2" in toc
+        assert builder.chapters_written == 2
+        assert builder.completed
+
+    def test_appends_batched_with_hierarchical_toc(self, tmp_path):
+        """Chapters are appended in doubling batches and the TOC is that of write_new_epub."""
+        out = tmp_path / "book.epub"
+        builder = ProgressiveEpubBuilder(out, "Title", "Author")
+        chunks = ["Part 1\nIntro"] + [f"Chapter {n}\nBody {n}" for n in range(1, 40)]
+
+        with patch("enchant_book_manager.progressive_epub.extend_epub", wraps=extend_epub) as mock_extend:
+            for chunk in chunks:
+                builder.add_chunk(chunk)
+            assert builder.finish()
+
+        assert mock_extend.call_count <= 7
+        assert builder.chapters_written == 40
+        written, _ = collect_chapters(chunks)
+        whole = tmp_path / "whole.epub"
+        write_new_epub([(title, paragraphize(body)) for title, body in written], whole, "Title", "Author", None)
+        with zipfile.ZipFile(out) as z, zipfile.ZipFile(whole) as w:
+            toc, whole_toc = z.read("OEBPS/toc.ncx").decode(), w.read("OEBPS/toc.ncx").decode()
+            assert z.namelist() == w.namelist()
+        assert re.sub(r"urn:uuid:[0-9a-f-]+", "", toc) == re.sub(r"urn:uuid:[0-9a-f-]+", "", whole_toc)
+        assert '<navPoint id="nav40" playOrder="40">' in toc and toc.index("Part 1") < toc.index("Chapter 1")
+
+    def test_oversized_chapters_split(self, tmp_path):
+        """Chapters over max_chapter_bytes are split in new and appended chapters."""
+        out = tmp_path / "book.epub"
+        body = "\n\n".join(f"Paragraph {i} of the chapter." for i in range(40))
+        builder = ProgressiveEpubBuilder(out, "Title", "Author", max_chapter_bytes=400)
+        builder.add_chunk(f"Chapter 1\n{body}\nChapter 2\n{body}")
+        builder.add_chunk(f"Chapter 3\n{body}")
+        assert builder.finish()
+
+        with zipfile.ZipFile(out) as z:
+            names = z.namelist()
+            toc = z.read("OEBPS/toc.ncx").decode()
+        for number in (1, 2, 3):
+            assert f"OEBPS/Text/chapter{number}_part2.xhtml" in names
+            assert f"Text/chapter{number}.xhtml" in toc
+        assert "_part" not in toc
+
+    def test_write_error_disables_builder(self, tmp_path):
+        """A failed write is logged and the builder stops."""
+        logger = Mock()
+        builder = ProgressiveEpubBuilder(tmp_path / "book.epub", "Title", "Author", logger=logger)
+        with patch("enchant_book_manager.progressive_epub.write_new_epub", side_effect=OSError("disk full")):
+            builder.add_chunk("Chapter 1\nOne\nChapter 2\nTwo")
+
+        assert builder.failed
+        assert not builder.finish()
+        assert not builder.completed
+        logger.warning.assert_called_once()
+        assert "disk full" in logger.warning.call_args[0][0]
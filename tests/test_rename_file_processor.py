@@ -122,22 +122,23 @@ class TestDecodeFileContent:
         """Set up test fixtures."""
         self.logger = logging.getLogger("test")
 
-    @patch("enchant_book_manager.rename_file_processor.decode_full_file")
+    @patch("enchant_book_manager.rename_file_processor.decode_file_prefix")
     def test_successful_decode(self, mock_decode):
         """Test successful file decoding."""
         file_path = Path("/test/file.txt")
         mock_icloud = Mock()
         mock_icloud.ensure_synced.return_value = file_path
-        mock_decode.return_value = "Test content " * 100
+        mock_decode.return_value = ("Test content " * 100, 1300)
 
         result = decode_file_content(file_path, 10, mock_icloud)
 
-        assert result is not None
-        assert len(result) <= 10 * 1024  # Should be limited
+        assert result == "Test content " * 100
         mock_icloud.ensure_synced.assert_called_once_with(file_path)
         mock_decode.assert_called_once()
+        # Only the requested prefix should be read
+        assert mock_decode.call_args[0][1] == 10 * 1024
 
-    @patch("enchant_book_manager.rename_file_processor.decode_full_file")
+    @patch("enchant_book_manager.rename_file_processor.decode_file_prefix")
     def test_icloud_sync_error(self, mock_decode):
         """Test handling of iCloud sync error."""
         file_path = Path("/test/file.txt")
@@ -149,7 +150,7 @@ class TestDecodeFileContent:
         assert result is None
         mock_decode.assert_not_called()
 
-    @patch("enchant_book_manager.rename_file_processor.decode_full_file")
+    @patch("enchant_book_manager.rename_file_processor.decode_file_prefix")
     def test_decode_failure(self, mock_decode):
         """Test handling of decode failure."""
         file_path = Path("/test/file.txt")
@@ -174,18 +175,32 @@ class TestDecodeFileContent:
         # Should return full content
         assert result == "Test content " * 1000
 
-    @patch("enchant_book_manager.rename_file_processor.decode_full_file")
+    @patch("enchant_book_manager.rename_file_processor.decode_file_prefix")
     def test_empty_content(self, mock_decode):
         """Test handling of empty content."""
         file_path = Path("/test/file.txt")
         mock_icloud = Mock()
         mock_icloud.ensure_synced.return_value = file_path
-        mock_decode.return_value = ""
+        mock_decode.return_value = ("", 0)
 
         result = decode_file_content(file_path, 10, mock_icloud)
 
         assert result == ""
 
+    def test_reads_only_prefix_of_real_file(self, tmp_path):
+        """Test that a large GB18030 file is cut cleanly at the requested size."""
+        file_path = tmp_path / "novel.txt"
+        file_path.write_bytes(("第一章 开始\n" + "这是一个很长的故事。" * 20000).encode("gb18030"))
+        mock_icloud = Mock()
+        mock_icloud.ensure_synced.return_value = file_path
+
+        result = decode_file_content(file_path, 1, mock_icloud)
+
+        assert result is not None
+        assert result.startswith("第一章 开始")
+        assert "\ufffd" not in result
+        assert len(result.encode("gb18030")) <= 1024
+
 
 class TestExtractJson:
     """Test the extract_json function."""
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test suite for repeated_chars module.
+"""
+
+import random
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enchant_book_manager.repeated_chars import (
+    LIMIT_RULES,
+    build_limit_rules,
+    cap_runs,
+    limit_runs,
+)
+from enchant_book_manager.text_constants import ALL_PUNCTUATION
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from repeated_chars_reference import reference_cap, reference_limit
+
+
+def random_text(seed: int, length: int = 3000) -> str:
+    """Build text with many runs of mixed characters."""
+    rng = random.Random(seed)
+    alphabet = list("ab中文一二Ⅳ7 \n\t.!?。，！？…—\\[]^-\"'") + sorted(ALL_PUNCTUATION)
+    parts = []
+    while sum(len(p) for p in parts) < length:
+        parts.append(rng.choice(alphabet) * rng.randint(1, 7))
+    return "".join(parts)
+
+
+class TestLimitRuns:
+    """Test limit_runs against the previous implementation."""
+
+    @pytest.mark.parametrize("force_chinese", [False, True])
+    @pytest.mark.parametrize("force_english", [False, True])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed, force_chinese, force_english):
+        """Test identical output for every rule variant."""
+        text = random_text(seed)
+        assert limit_runs(text, force_chinese, force_english) == reference_limit(text, force_chinese, force_english)
+
+    def test_rule_table_covers_all_variants(self):
+        """Test that every force flag combination is precompiled."""
+        assert set(LIMIT_RULES) == {(False, False), (False, True), (True, False), (True, True)}
+        assert build_limit_rules().limit_to_one == LIMIT_RULES[(False, False)].limit_to_one
+
+    def test_numbers_preserved(self):
+        """Test that numeric runs in any script are preserved."""
+        assert limit_runs("一一一一一 Ⅳ Ⅳ ⅣⅣⅣⅣⅣ 11111") == "一一一一一 Ⅳ Ⅳ ⅣⅣⅣⅣⅣ 11111"
+
+
+class TestCapRuns:
+    """Test cap_runs against the previous implementation."""
+
+    @pytest.mark.parametrize("max_allowed", [0, 1, 2, 4, 6])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_reference(self, seed, max_allowed):
+        """Test identical output for different limits."""
+        text = random_text(seed)
+        assert cap_runs(text, max_allowed) == reference_cap(text, max_allowed)
@@ -16,6 +16,7 @@ from enchant_book_manager.text_processing import (
     replace_repeated_chars,
     limit_repeated_chars,
     remove_excess_empty_lines,
+    iter_without_excess_empty_lines,
     normalize_spaces,
     clean_adverts,
 )
@@ -214,6 +215,29 @@ class TestRemoveExcessEmptyLines:
         assert remove_excess_empty_lines("\n\n\n\n\n") == "\n\n"
         assert remove_excess_empty_lines("\n\n\n\n\n", max_empty_lines=0) == ""
 
+
+class TestIterWithoutExcessEmptyLines:
+    """Test the iter_without_excess_empty_lines function."""
+
+    def test_runs_across_pieces(self):
+        """Newline runs split between pieces are collapsed like in the joined text."""
+        pieces = ["\nChunk 1\n\n", "\n", "\n\nChunk 2\n", "", "\n"]
+        assert "".join(iter_without_excess_empty_lines(pieces)) == remove_excess_empty_lines("".join(pieces))
+
+    def test_matches_remove_excess_empty_lines(self):
+        """Every way of cutting the text gives the same result as the joined text."""
+        text = "A\n\n\n\nB\n\nC\n\n\n"
+        for max_empty_lines in (0, 1, 2, 3):
+            expected = remove_excess_empty_lines(text, max_empty_lines)
+            for cut in range(len(text) + 1):
+                for cut2 in range(cut, len(text) + 1):
+                    pieces = [text[:cut], text[cut:cut2], text[cut2:]]
+                    assert "".join(iter_without_excess_empty_lines(pieces, max_empty_lines)) == expected
+
+    def test_no_pieces(self):
+        """No input gives no output."""
+        assert list(iter_without_excess_empty_lines([])) == []
+
     def test_mixed_spacing(self):
         """Test with mixed line breaks."""
         text = "A\n\n\nB\nC\n\n\n\n\nD"
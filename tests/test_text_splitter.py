@@ -21,6 +21,11 @@ from enchant_book_manager.text_splitter import (
     split_on_punctuation_contextual,
     split_text_by_actual_paragraphs,
     split_chinese_text_in_parts,
+    pack_paragraphs_balanced,
+    pack_paragraphs_in_parts,
+    split_oversized_paragraph,
+    split_oversized_paragraphs,
+    split_oversized_with_headings,
 )
 
 # Create a safe version of ALL_PUNCTUATION for testing without problematic characters
@@ -367,8 +372,9 @@ class TestSplitChineseTextInParts:
         """Test single paragraph longer than max_chars."""
         text = "A" * 150  # 150 characters
         result = split_chinese_text_in_parts(text, max_chars=100)
-        assert len(result) == 1  # Still one chunk since it's one paragraph
-        assert len(result[0]) > 100  # Paragraph kept intact
+        assert len(result) == 2  # No punctuation, so the paragraph is hard-cut
+        assert all(len(chunk) <= 100 for chunk in result)
+        assert "".join(result) == text + "\n\n"
 
     def test_multiple_paragraphs_under_limit(self):
         """Test multiple paragraphs all under limit."""
@@ -394,14 +400,17 @@ class TestSplitChineseTextInParts:
         assert "C" in result[2]
 
     def test_preserves_paragraph_integrity(self):
-        """Test that paragraphs are never split mid-paragraph."""
+        """Test that only paragraphs over the limit are split mid-paragraph."""
         # Create a paragraph longer than max_chars
         long_para = "X" * 200
         text = f"Short para.\n\n{long_para}\n\nAnother short para."
 
         result = split_chinese_text_in_parts(text, max_chars=100)
-        # The long paragraph should be in its own chunk
-        assert any(long_para in chunk for chunk in result)
+        # Short paragraphs stay whole, the long one is cut to fit
+        assert any("Short para.\n\n" in chunk for chunk in result)
+        assert any("Another short para.\n\n" in chunk for chunk in result)
+        assert all(len(chunk) <= 100 for chunk in result)
+        assert "".join(result).replace("\n", "").count("X") == 200
 
     def test_with_logger(self):
         """Test logging functionality."""
@@ -444,9 +453,9 @@ class TestSplitChineseTextInParts:
         text = f"{para1}\n\n{para2}"
 
         result = split_chinese_text_in_parts(text, max_chars=50)
-        assert len(result) == 2
-        assert para1 in result[0]
-        assert para2 in result[1]
+        # Each paragraph plus its "\n\n" is 52 characters, so both get cut
+        assert all(len(chunk) <= 50 for chunk in result)
+        assert "".join(result) == f"{para1}\n\n{para2}\n\n"
 
     def test_buffer_accumulation(self):
         """Test proper buffer accumulation and flushing."""
@@ -469,3 +478,172 @@ class TestSplitChineseTextInParts:
         split_chinese_text_in_parts("test text")
 
         mock_split.assert_called_once_with("test text")
+
+
+class TestPackParagraphsBalanced:
+    """Test the balanced packing mode."""
+
+    def make_paragraphs(self, count=800):
+        """Build paragraphs of varying length."""
+        return [("段" * (20 + (i * 37) % 580)) + "\n\n" for i in range(count)]
+
+    def test_same_chunk_count_and_content_as_greedy(self):
+        """Test balanced packing needs no more chunks and keeps all text in order."""
+        paragraphs = self.make_paragraphs()
+        greedy = pack_paragraphs_in_parts(paragraphs, 11999)
+        balanced = pack_paragraphs_balanced(paragraphs, 11999)
+
+        assert len(balanced) == len(greedy)
+        assert "".join(balanced) == "".join(greedy)
+        assert all(len(chunk) <= 11999 for chunk in balanced)
+
+    def test_no_tiny_final_chunk(self):
+        """Test chunk sizes are close to each other."""
+        paragraphs = self.make_paragraphs()
+        sizes = [len(chunk) for chunk in pack_paragraphs_balanced(paragraphs, 11999)]
+
+        # Spread is bounded by one paragraph, not by a whole chunk
+        assert max(sizes) - min(sizes) <= 2 * 600
+
+    def test_oversized_paragraph_is_sub_split(self):
+        """Test a paragraph over the limit is cut so no chunk exceeds it."""
+        paragraphs = ["A" * 40 + "\n\n", "B。" * 100 + "\n\n", "C" * 40 + "\n\n", "D" * 40 + "\n\n"]
+        result = pack_paragraphs_balanced(paragraphs, 100)
+
+        assert all(len(chunk) <= 100 for chunk in result)
+        assert "".join(result) == "".join(paragraphs)
+
+    def test_empty_input(self):
+        """Test empty input returns one empty chunk like the greedy packer."""
+        assert pack_paragraphs_balanced([], 100) == [""]
+
+    def test_split_chinese_text_in_parts_balanced(self):
+        """Test the balanced flag of split_chinese_text_in_parts."""
+        text = "\n\n".join("段" * 30 for _ in range(7))
+        result = split_chinese_text_in_parts(text, max_chars=100, balanced=True)
+
+        # Greedy would give 3+3+1 paragraphs, balanced gives 3+2+2 or 2+3+2
+        assert sorted(chunk.count("段" * 30) for chunk in result) == [2, 2, 3]
+
+
+class TestChapterAwarePacking:
+    """Test chunk boundaries snapping to Chinese chapter headings."""
+
+    def test_chapter_moves_whole_to_next_chunk(self):
+        """Test a chapter that would straddle two chunks starts the next one."""
+        paragraphs = ["第一章 开始\n\n", "甲" * 40 + "\n\n", "第二章\n\n", "乙" * 40 + "\n\n", "乙" * 20 + "\n\n", "第三章\n\n", "丙" * 10 + "\n\n"]
+        chapters = []
+
+        result = pack_paragraphs_in_parts(paragraphs, 100, chapters=chapters)
+
+        assert pack_paragraphs_in_parts(paragraphs, 100) == ["".join(paragraphs[:4]), "".join(paragraphs[4:])]
+        assert result == ["".join(paragraphs[:2]), "".join(paragraphs[2:])]
+        assert [(span.number, span.title, span.first_chunk, span.last_chunk, span.paragraph) for span in chapters] == [
+            (1, "第一章 开始", 1, 1, 0),
+            (2, "第二章", 2, 2, 0),
+            (3, "第三章", 2, 2, 3),
+        ]
+
+    def test_oversized_chapter_starts_a_chunk(self):
+        """Test a chapter larger than a chunk starts one and spans the following."""
+        paragraphs = ["第一章\n\n", "甲" * 20 + "\n\n", "第二章\n\n"] + ["乙" * 40 + "\n\n"] * 4
+        chapters = []
+
+        result = pack_paragraphs_in_parts(paragraphs, 100, chapters=chapters)
+
+        assert "".join(result) == "".join(paragraphs)
+        assert all(len(chunk) <= 100 for chunk in result)
+        assert result[1].startswith("第二章")
+        assert (chapters[1].first_chunk, chapters[1].last_chunk, chapters[1].paragraph) == (2, len(result), 0)
+
+    def test_without_headings_same_as_greedy(self):
+        """Test text without headings is packed exactly like before."""
+        paragraphs = [("段" * (20 + (i * 37) % 580)) + "\n\n" for i in range(200)]
+        chapters = []
+
+        assert pack_paragraphs_in_parts(paragraphs, 11999, chapters=chapters) == pack_paragraphs_in_parts(paragraphs, 11999)
+        assert chapters == []
+
+    def test_heading_on_sub_split_paragraph(self):
+        """Test only the first piece of a sub-split paragraph carries its heading."""
+        pieces, headings, oversized = split_oversized_with_headings(["第十二章 长\n" + "句。" * 60 + "\n\n", "正文\n\n"], 50)
+
+        assert oversized == 1
+        assert headings[0].number == 12
+        assert headings[1:] == [None] * (len(pieces) - 1)
+
+    def test_balanced_boundary_snaps_within_capacity(self):
+        """Test a balanced boundary moves to a chapter start if every chunk still fits."""
+        paragraphs = [("第一章\n" if i == 0 else "第二章\n" if i == 4 else "") + "段" * 30 + "\n\n" for i in range(7)]
+        chapters = []
+
+        result = pack_paragraphs_balanced(paragraphs, 110, chapters=chapters)
+
+        assert len(result) == len(pack_paragraphs_balanced(paragraphs, 110))
+        assert all(len(chunk) <= 110 for chunk in result)
+        assert result[2].startswith("第二章")
+        assert (chapters[1].first_chunk, chapters[1].paragraph) == (3, 0)
+
+    def test_split_chinese_text_in_parts_chapters(self):
+        """Test split_chinese_text_in_parts fills the chapters list."""
+        text = "序言\n\n第一回 甲\n\n正文\n\n第二回 乙\n\n正文"
+        chapters = []
+
+        result = split_chinese_text_in_parts(text, max_chars=100, chapters=chapters)
+
+        assert len(result) == 1
+        assert [(span.number, span.unit, span.paragraph) for span in chapters] == [(1, "回", 1), (2, "回", 3)]
+
+
+class TestSplitOversizedParagraph:
+    """Test sentence-level fallback splitting."""
+
+    def test_short_paragraph_unchanged(self):
+        """Test paragraphs within the limit are returned as is."""
+        assert split_oversized_paragraph("短段落。\n\n", 100) == ["短段落。\n\n"]
+
+    def test_splits_after_sentence_endings_and_quotes(self):
+        """Test pieces end after sentence punctuation plus closing quotes."""
+        paragraph = "他说：“走吧。”" * 3 + "然后离开了！" * 3 + "\n\n"
+        pieces = split_oversized_paragraph(paragraph, 20)
+
+        assert "".join(pieces) == paragraph
+        assert pieces[0] == "他说：“走吧。”"
+        assert pieces[-1] == "然后离开了！\n\n"
+        assert all(len(piece) <= 20 for piece in pieces)
+
+    def test_falls_back_to_clause_punctuation(self):
+        """Test a sentence over the limit is cut after commas."""
+        paragraph = "一二三四五，" * 10 + "结束。\n\n"
+        pieces = split_oversized_paragraph(paragraph, 15)
+
+        assert "".join(pieces) == paragraph
+        assert all(len(piece) <= 15 for piece in pieces)
+        assert all(piece.endswith("，") for piece in pieces[:-1])
+
+    def test_hard_cut_without_punctuation(self):
+        """Test text without any punctuation is cut at the limit."""
+        paragraph = "字" * 95 + "\n\n"
+        pieces = split_oversized_paragraph(paragraph, 30)
+
+        assert "".join(pieces) == paragraph
+        assert all(len(piece) <= 30 for piece in pieces)
+
+    def test_counts_oversized_paragraphs(self):
+        """Test the number of sub-split paragraphs is reported."""
+        paragraphs = ["短。\n\n", "长。" * 50 + "\n\n", "又长。" * 50 + "\n\n"]
+        pieces, oversized = split_oversized_paragraphs(paragraphs, 40)
+
+        assert oversized == 2
+        assert "".join(pieces) == "".join(paragraphs)
+
+    def test_packer_logs_oversized_count(self):
+        """Test the packer reports sub-split paragraphs through the logger."""
+        logger = Mock()
+        text = "正常段落。\n\n" + "很长的句子。" * 30
+
+        result = split_chinese_text_in_parts(text, max_chars=50, logger=logger)
+
+        assert all(len(chunk) <= 50 for chunk in result)
+        logger.info.assert_called_once()
+        assert "1 paragraph(s)" in logger.info.call_args[0][0]
@@ -19,7 +19,6 @@ from enchant_book_manager.text_validators import (
     clean_repeated_chars,
     remove_thinking_block,
     validate_translation_output,
-    _repeated_chars,
 )
 
 
@@ -218,14 +217,6 @@ class TestCleanRepeatedChars:
         """Test empty string."""
         assert clean_repeated_chars("") == ""
 
-    def test_repeated_chars_regex(self):
-        """Test the precompiled regex pattern."""
-        # Verify the regex pattern works correctly
-        match = _repeated_chars.search("aaa")
-        assert match is not None
-        assert match.group(0) == "aaa"
-        assert match.group(1) == "a"
-
 
 class TestRemoveThinkingBlock:
     """Test the remove_thinking_block function."""
@@ -12,16 +12,25 @@ import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, mock_open, call
 import errno
+import hashlib
+import json
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enchant_book_manager.translation_orchestrator import (
     format_chunk_error_message,
     save_translated_book,
+    CHUNKING_FILE,
+    _save_chunk_sources,
     DEFAULT_MAX_CHUNK_RETRIES,
     MAX_RETRY_WAIT_SECONDS,
 )
-from enchant_book_manager.models import Book, Chunk, Variation
+from enchant_book_manager.chapter_index import load_chapter_index
+from enchant_book_manager.make_epub import create_epub_from_txt_file
+from enchant_book_manager.chinese_headings import ChapterSpan
+from enchant_book_manager.models import Book, Chunk, Variation, VARIATION_DB
+from enchant_book_manager.book_importer import import_book_from_txt
+from enchant_book_manager.text_splitter import split_chinese_text_in_parts
 
 
 class TestFormatChunkErrorMessage:
@@ -88,6 +97,8 @@ class TestSaveTranslatedBook:
         self.mock_chunk2.original_variation_id = "var2"
 
         self.mock_book.chunks = [self.mock_chunk1, self.mock_chunk2]
+        self.mock_book.chapter_map = []
+        self.mock_book.chunking = {}
 
         # Create mock variations
         self.mock_var1 = Mock(spec=Variation)
@@ -108,10 +119,8 @@ class TestSaveTranslatedBook:
     @patch("enchant_book_manager.translation_orchestrator.Path")
     @patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log")
     @patch("enchant_book_manager.translation_orchestrator.prepare_for_write")
-    @patch("enchant_book_manager.translation_orchestrator.remove_excess_empty_lines")
     def test_successful_translation(
         self,
-        mock_remove_lines,
         mock_prepare,
         mock_save_cost,
         mock_path,
@@ -147,7 +156,6 @@ class TestSaveTranslatedBook:
         mock_book_dir.__truediv__.side_effect = mock_division
 
         mock_prepare.return_value = mock_output_file
-        mock_remove_lines.return_value = "\nTranslated text 1\n\nTranslated text 2\n"
 
         mock_logger = Mock()
 
@@ -172,7 +180,8 @@ class TestSaveTranslatedBook:
         # Verify final file was written
         mock_file.assert_called_once()
         handle = mock_file()
-        handle.write.assert_called_once()
+        handle.writelines.assert_called_once()
+        assert "".join(handle.writelines.call_args[0][0]) == "\nTranslated text 1\n\nTranslated text 2\n"
 
         # Verify cost logging
         mock_save_cost.assert_called_once()
@@ -397,6 +406,198 @@ class TestSaveTranslatedBook:
         # with realistic fixtures instead of heavy mocking
         pass
 
+    @patch("enchant_book_manager.translation_orchestrator.Book")
+    @patch("enchant_book_manager.translation_orchestrator.VARIATION_DB")
+    @patch("enchant_book_manager.translation_orchestrator.Path")
+    def test_progressive_epub_builder(self, mock_path, mock_var_db, mock_book_class):
+        """Every chunk, resumed or translated, is fed to the EPUB builder in order."""
+        mock_book_class.get_by_id.return_value = self.mock_book
+        mock_var_db.get.side_effect = [self.mock_var1, self.mock_var2]
+
+        mock_existing_file = Mock()
+        mock_existing_file.name = "Test Book by Test Author - Chunk_000001.txt"
+        mock_existing_file.read_text.return_value = "Previously translated text 1"
+
+        mock_book_dir = MagicMock()
+        mock_book_dir.glob.return_value = [mock_existing_file]
+        mock_book_dir.__truediv__.side_effect = [mock_existing_file, Mock(), Mock()]
+        mock_path.return_value = mock_book_dir
+        mock_path.cwd.return_value = Path("/current/dir")
+
+        epub_builder = Mock()
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            with patch(
+                "enchant_book_manager.translation_orchestrator.prepare_for_write",
+                return_value=Mock(),
+            ):
+                with patch("builtins.open", mock_open()):
+                    save_translated_book(
+                        book_id="test_book_id",
+                        translator=self.mock_translator,
+                        resume=True,
+                        logger=Mock(),
+                        epub_builder=epub_builder,
+                    )
+
+        assert epub_builder.add_chunk.call_args_list == [call("Previously translated text 1", 1), call("Translated text 1", 2)]
+        epub_builder.finish.assert_called_once_with()
+        epub_builder.use_chapter_map.assert_not_called()
+
+    def _import_chapter_book(self, tmp_path, name):
+        """Import a book whose chapter-aware chunks differ from the greedy ones."""
+        body = "他走了很远的路。" * 8
+        text = "".join(f"第{number}章 路\n\n" + f"{body}\n\n" * 3 for number in ("一", "二", "三"))
+        path = tmp_path / f"Test Book by Test Author - {name}.txt"
+        path.write_text(text, encoding="utf-8")
+        book = Book.get_by_id(import_book_from_txt(path, max_chars=300))
+        book_dir = tmp_path / "book"
+        book_dir.mkdir()
+        return book, book_dir
+
+    @staticmethod
+    def _chunk_texts(book):
+        return [VARIATION_DB[chunk.original_variation_id].text_content for chunk in sorted(book.chunks, key=lambda chunk: chunk.chunk_number)]
+
+    @staticmethod
+    def _write_chunks(book_dir, count):
+        for number in range(1, count + 1):
+            (book_dir / f"Test Book by Test Author - Chunk_{number:06d}.txt").write_text(f"Old chunk {number}", encoding="utf-8")
+
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    def test_resume_book_translated_before_chunking_record(self, mock_prepare_dir, tmp_path):
+        """Chunks without a chunking record are reused with the book split as they were."""
+        book, book_dir = self._import_chapter_book(tmp_path, "legacy")
+        legacy_texts = split_chinese_text_in_parts("".join(self._chunk_texts(book)), 300)
+        assert legacy_texts != self._chunk_texts(book)
+        self._write_chunks(book_dir, len(legacy_texts))
+        mock_prepare_dir.return_value = book_dir
+
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            save_translated_book(book_id=book.book_id, translator=self.mock_translator, resume=True, logger=Mock())
+
+        self.mock_translator.translate.assert_not_called()
+        assert self._chunk_texts(book) == legacy_texts
+        text = (book_dir / "translated_Test Book by Test Author.txt").read_text(encoding="utf-8")
+        assert all(f"Old chunk {number}" in text for number in range(1, len(legacy_texts) + 1))
+        record = json.loads((book_dir / CHUNKING_FILE).read_text(encoding="utf-8"))
+        assert record["parameters"] == {"max_chars": 300, "balanced": False, "chapter_aware": False}
+        assert len(record["sources"]) == len(legacy_texts)
+
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    def test_resume_translates_chunks_whose_source_changed(self, mock_prepare_dir, tmp_path):
+        """Only the chunks whose source text differs from the record are translated again."""
+        book, book_dir = self._import_chapter_book(tmp_path, "changed")
+        texts = self._chunk_texts(book)
+        sources = {str(number): hashlib.sha256(text.encode("utf-8")).hexdigest() for number, text in enumerate(texts, start=1)}
+        sources["2"] = "0" * 64
+        (book_dir / CHUNKING_FILE).write_text(json.dumps({"parameters": book.chunking, "sources": sources}), encoding="utf-8")
+        self._write_chunks(book_dir, len(texts))
+        mock_prepare_dir.return_value = book_dir
+        self.mock_translator.translate.side_effect = ["New chunk 2"]
+
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            save_translated_book(book_id=book.book_id, translator=self.mock_translator, resume=True, logger=Mock())
+
+        self.mock_translator.translate.assert_called_once_with(texts[1], False)
+        assert [(book_dir / f"Test Book by Test Author - Chunk_{number:06d}.txt").read_text(encoding="utf-8") for number in (1, 2, 3)] == ["Old chunk 1", "New chunk 2", "Old chunk 3"]
+        record = json.loads((book_dir / CHUNKING_FILE).read_text(encoding="utf-8"))
+        assert record["sources"]["2"] == hashlib.sha256(texts[1].encode("utf-8")).hexdigest()
+
+    @patch("enchant_book_manager.translation_orchestrator.CHUNK_SOURCES_SAVE_INTERVAL", 2)
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    def test_chunking_record_saved_at_intervals(self, mock_prepare_dir, tmp_path):
+        """The chunking record is replaced every few chunks and once at the end."""
+        book, book_dir = self._import_chapter_book(tmp_path, "intervals")
+        texts = self._chunk_texts(book)
+        mock_prepare_dir.return_value = book_dir
+        self.mock_translator.translate.side_effect = [f"New chunk {number}" for number in range(1, len(texts) + 1)]
+
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            with patch("enchant_book_manager.translation_orchestrator._save_chunk_sources", wraps=_save_chunk_sources) as mock_save:
+                save_translated_book(book_id=book.book_id, translator=self.mock_translator, logger=Mock())
+
+        assert (len(texts), mock_save.call_count) == (3, 2)
+        record = json.loads((book_dir / CHUNKING_FILE).read_text(encoding="utf-8"))
+        assert sorted(record["sources"]) == ["1", "2", "3"]
+        assert not (book_dir / f"{CHUNKING_FILE}.tmp").exists()
+
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    def test_resume_with_unreadable_chunking_record(self, mock_prepare_dir, tmp_path):
+        """An unreadable chunking record keeps every existing chunk."""
+        book, book_dir = self._import_chapter_book(tmp_path, "unreadable")
+        texts = self._chunk_texts(book)
+        (book_dir / CHUNKING_FILE).write_text("{", encoding="utf-8")
+        self._write_chunks(book_dir, len(texts))
+        mock_prepare_dir.return_value = book_dir
+
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            save_translated_book(book_id=book.book_id, translator=self.mock_translator, resume=True, logger=Mock())
+
+        self.mock_translator.translate.assert_not_called()
+        assert self._chunk_texts(book) == texts
+        text = (book_dir / "translated_Test Book by Test Author.txt").read_text(encoding="utf-8")
+        assert all(f"Old chunk {number}" in text for number in range(1, len(texts) + 1))
+
+    @patch("enchant_book_manager.translation_orchestrator.Book")
+    @patch("enchant_book_manager.translation_orchestrator.VARIATION_DB")
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    def test_chapter_map_saved_as_chapter_index(self, mock_prepare_dir, mock_var_db, mock_book_class, tmp_path):
+        """The chapter map becomes the chapter index the EPUB phase slices the book file with."""
+        chunk3 = Mock(spec=Chunk)
+        chunk3.chunk_number = 3
+        chunk3.original_variation_id = "var3"
+        self.mock_book.chunks.append(chunk3)
+        self.mock_book.chapter_map = [
+            ChapterSpan(1, "章", "第一章", 1, 1, 1),
+            ChapterSpan(2, "章", "第二章", 1, 2, 3),
+            ChapterSpan(3, "章", "第三章", 3, 3, 0),
+        ]
+        mock_book_class.get_by_id.return_value = self.mock_book
+        mock_var_db.get.return_value = self.mock_var1
+        mock_prepare_dir.return_value = tmp_path
+        self.mock_translator.translate.side_effect = [
+            "Preface line\n\nChapter 1: Start\n\nBody one.\n\nChapter 2: Next\n\nBody two.",
+            "More of two.",
+            "Chapter 3: End\n\nBody three.",
+        ]
+
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            save_translated_book(book_id="test_book_id", translator=self.mock_translator, logger=Mock())
+
+        book_file = tmp_path / "translated_Test Book by Test Author.txt"
+        index = load_chapter_index(book_file, book_file.read_text(encoding="utf-8"))
+        assert index is not None
+        assert index.chapters == [
+            ("Front Matter", "Preface line"),
+            ("Chapter 1: Start", "Body one."),
+            ("Chapter 2: Next", "Body two.\n\nMore of two."),
+            ("Chapter 3: End", "Body three."),
+        ]
+        assert (index.sequence, index.issues) == ([1, 2, 3], [])
+
+        # The EPUB phase slices the chapters from the index without scanning the text
+        with patch("enchant_book_manager.make_epub.split_text", side_effect=AssertionError("text scanned")):
+            assert create_epub_from_txt_file(book_file, tmp_path / "book.epub", "Test Book", "Test Author") == (True, [])
+
+    @patch("enchant_book_manager.translation_orchestrator.Book")
+    @patch("enchant_book_manager.translation_orchestrator.VARIATION_DB")
+    @patch("enchant_book_manager.translation_orchestrator._prepare_book_directory")
+    @patch("enchant_book_manager.translation_orchestrator._save_chunk_file")
+    @patch("enchant_book_manager.translation_orchestrator._save_final_book")
+    def test_progressive_epub_builder_gets_chapter_map(self, mock_save_final, mock_save_chunk, mock_prepare_dir, mock_var_db, mock_book_class):
+        """The chapter map of the import is handed to the EPUB builder before the first chunk."""
+        self.mock_book.chapter_map = [ChapterSpan(1, "章", "第一章", 1, 2, 0)]
+        mock_book_class.get_by_id.return_value = self.mock_book
+        mock_var_db.get.side_effect = [self.mock_var1, self.mock_var2]
+        mock_prepare_dir.return_value = Path("/tmp/book")
+
+        epub_builder = Mock()
+        with patch("enchant_book_manager.translation_orchestrator.save_translation_cost_log"):
+            save_translated_book(book_id="test_book_id", translator=self.mock_translator, logger=Mock(), epub_builder=epub_builder)
+
+        assert epub_builder.method_calls[0] == call.use_chapter_map(self.mock_book.chapter_map)
+        assert [c.args[1] for c in epub_builder.add_chunk.call_args_list] == [1, 2]
+
     @patch("enchant_book_manager.translation_orchestrator.Book")
     @patch("enchant_book_manager.translation_orchestrator.VARIATION_DB")
     @patch("enchant_book_manager.translation_orchestrator.Path")
@@ -21,7 +21,11 @@ from enchant_book_manager.workflow_epub import (
     apply_epub_overrides,
     validate_epub_only,
     process_epub_generation,
+    start_progressive_epub,
+    check_epub_files,
 )
+from enchant_book_manager.epub_generator import write_new_epub
+from enchant_book_manager.progressive_epub import ProgressiveEpubBuilder
 
 
 class TestFindTranslatedFile:
@@ -645,5 +649,73 @@ class TestProcessEpubGeneration:
         assert result is False
 
 
+class TestCheckEpubFiles:
+    """Test the check_epub_files function."""
+
+    def test_valid_and_broken_books_with_report(self, tmp_path):
+        """Errors fail the check and every book is in the JSON report."""
+        write_new_epub([("Chapter 1", "<p>One</p>")], tmp_path / "good.epub", "Title", "Author", None)
+        (tmp_path / "bad.epub").write_bytes(b"broken")
+        report = tmp_path / "qa.json"
+        args = argparse.Namespace(check_epubs=[str(tmp_path)], check_report=str(report), check_workers=1)
+        logger = Mock()
+
+        assert check_epub_files(args, logger) is False
+
+        data = json.loads(report.read_text(encoding="utf-8"))
+        assert (data["checked"], data["valid"], data["invalid"]) == (2, 1, 1)
+        assert any(str(tmp_path / "bad.epub") in str(c) for c in logger.error.call_args_list)
+
+    def test_all_valid(self, tmp_path):
+        """Only valid books pass."""
+        write_new_epub([("Chapter 1", "<p>One</p>")], tmp_path / "good.epub", "Title", "Author", None)
+        args = argparse.Namespace(check_epubs=[str(tmp_path / "good.epub")], check_report=None, check_workers=None)
+
+        assert check_epub_files(args, Mock()) is True
+
+    def test_nothing_to_check(self, tmp_path):
+        """A directory without EPUBs fails the check."""
+        args = argparse.Namespace(check_epubs=[str(tmp_path)], check_report=None, check_workers=1)
+
+        assert check_epub_files(args, Mock()) is False
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestStartProgressiveEpub:
+    """Test the start_progressive_epub function."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.current_path = Path("/test/Novel by Author.txt")
+        self.logger = Mock(spec=logging.Logger)
+
+    def test_disabled(self):
+        """No builder without --progressive-epub or when phase 3 would not build from it."""
+        assert start_progressive_epub(self.current_path, argparse.Namespace(), self.logger) is None
+        for extra in ({"skip_epub": True}, {"validate_only": True}, {"translated": "other.txt"}):
+            args = argparse.Namespace(progressive_epub=True, **extra)
+            assert start_progressive_epub(self.current_path, args, self.logger) is None
+
+    @patch("enchant_book_manager.workflow_epub.get_config")
+    def test_strict_mode_disables(self, mock_get_config):
+        """Strict mode needs the whole book, so no builder is created."""
+        mock_get_config.return_value = {"epub": {"strict_mode": True}}
+        args = argparse.Namespace(progressive_epub=True)
+        assert start_progressive_epub(self.current_path, args, self.logger) is None
+
+    @patch("enchant_book_manager.workflow_epub.get_config")
+    def test_builder_created(self, mock_get_config):
+        """The builder writes the EPUB where phase 3 would."""
+        mock_get_config.return_value = {"epub": {"language": "fr", "compression_level": 9}}
+        args = argparse.Namespace(progressive_epub=True, epub_title="My Title")
+
+        builder = start_progressive_epub(self.current_path, args, self.logger)
+
+        assert isinstance(builder, ProgressiveEpubBuilder)
+        assert builder.output_path == Path("/test/My Title.epub")
+        assert builder.title == "My Title"
+        assert builder.language == "fr"
+        assert builder.compression_level == 9
@@ -16,7 +16,13 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from enchant_book_manager.workflow_orchestrator import process_novel_unified
+from enchant_book_manager.workflow_orchestrator import (
+    NovelState,
+    process_novel_unified,
+    run_epub_stage,
+    run_rename_stage,
+    run_translation_stage,
+)
 
 
 class TestProcessNovelUnified:
@@ -472,3 +478,54 @@ class TestProcessNovelUnified:
         mock_renaming.assert_called_once()
         mock_translation.assert_called_once()
         mock_epub.assert_called_once()
+
+
+class TestPipelineStages:
+    """Test the stages run separately by the batch --pipeline."""
+
+    @patch("enchant_book_manager.workflow_orchestrator.get_progress_file_path")
+    @patch("enchant_book_manager.workflow_orchestrator.create_initial_progress")
+    @patch("enchant_book_manager.workflow_orchestrator.process_renaming_phase")
+    @patch("enchant_book_manager.workflow_orchestrator.process_translation_phase")
+    @patch("enchant_book_manager.workflow_orchestrator.process_epub_phase")
+    def test_stages_hand_on_state(
+        self,
+        mock_epub,
+        mock_translation,
+        mock_renaming,
+        mock_create_progress,
+        mock_get_progress_path,
+    ):
+        """Test each stage gets the renamed path and progress of the previous one."""
+        args = Mock(spec=argparse.Namespace)
+        args.resume = False
+        logger = Mock(spec=logging.Logger)
+        progress_file = MagicMock()
+        progress_file.exists.return_value = True
+        mock_get_progress_path.return_value = progress_file
+        progress = {"phases": {name: {"status": "pending", "result": None} for name in ("renaming", "translation", "epub")}}
+        mock_create_progress.return_value = progress
+        renamed_path = Path("/test/renamed_novel.txt")
+        mock_renaming.return_value = renamed_path
+
+        def complete_phase(name):
+            def phase(*phase_args):
+                progress["phases"][name]["status"] = "completed"
+
+            return phase
+
+        mock_translation.side_effect = complete_phase("translation")
+        mock_epub.side_effect = complete_phase("epub")
+        progress["phases"]["renaming"]["status"] = "completed"
+
+        state = run_rename_stage(Path("/test/novel.txt"), args, logger)
+        assert state == NovelState(Path("/test/novel.txt"), renamed_path, progress, progress_file)
+        mock_translation.assert_not_called()
+
+        state = run_translation_stage(state, args, logger)
+        mock_translation.assert_called_once_with(renamed_path, args, progress, progress_file, logger)
+        mock_epub.assert_not_called()
+
+        assert run_epub_stage(state, args, logger) is True
+        mock_epub.assert_called_once_with(renamed_path, args, progress, progress_file, logger)
+        progress_file.unlink.assert_called_once()
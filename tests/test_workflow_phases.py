@@ -370,6 +370,43 @@ class TestProcessTranslationPhase:
             remote=False,  # default
         )
 
+    @patch("enchant_book_manager.workflow_phases.translation_available", True)
+    @patch("enchant_book_manager.workflow_phases.translate_novel")
+    @patch("enchant_book_manager.workflow_phases.save_progress")
+    @patch("enchant_book_manager.workflow_epub.start_progressive_epub")
+    def test_progressive_epub(self, mock_start, mock_save, mock_translate):
+        """A completed progressive EPUB marks the EPUB phase completed."""
+        self.args.skip_translating = False
+        self.args.progressive_epub = True
+        self.progress["phases"]["epub"] = {"status": "pending"}
+        builder = Mock(completed=True, output_path=Path("/test/novel.epub"))
+        mock_start.return_value = builder
+        mock_translate.return_value = True
+
+        process_translation_phase(self.current_path, self.args, self.progress, self.progress_file, self.logger)
+
+        mock_start.assert_called_once_with(self.current_path, self.args, self.logger)
+        assert mock_translate.call_args.kwargs["epub_builder"] is builder
+        assert self.progress["phases"]["epub"]["status"] == "completed"
+        assert self.progress["phases"]["epub"]["result"] == "/test/novel.epub"
+
+    @patch("enchant_book_manager.workflow_phases.translation_available", True)
+    @patch("enchant_book_manager.workflow_phases.translate_novel")
+    @patch("enchant_book_manager.workflow_phases.save_progress")
+    @patch("enchant_book_manager.workflow_epub.start_progressive_epub")
+    def test_progressive_epub_failed(self, mock_start, mock_save, mock_translate):
+        """A failed progressive EPUB leaves the EPUB phase to build the book."""
+        self.args.skip_translating = False
+        self.args.progressive_epub = True
+        self.progress["phases"]["epub"] = {"status": "pending"}
+        mock_start.return_value = Mock(completed=False)
+        mock_translate.return_value = True
+
+        process_translation_phase(self.current_path, self.args, self.progress, self.progress_file, self.logger)
+
+        assert self.progress["phases"]["translation"]["status"] == "completed"
+        assert self.progress["phases"]["epub"]["status"] == "pending"
+
 
 class TestProcessEpubPhase:
     """Test the process_epub_phase function."""
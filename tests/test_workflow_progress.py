@@ -5,6 +5,7 @@
 Test suite for workflow_progress module.
 """
 
+import filelock
 import pytest
 import yaml
 import logging
@@ -21,6 +22,7 @@ from enchant_book_manager.workflow_progress import (
     is_phase_completed,
     are_all_phases_completed,
     get_progress_file_path,
+    get_book_lock_path,
 )
 
 
@@ -517,5 +519,24 @@ class TestGetProgressFilePath:
         assert result == Path("/.novel_progress.yml")
 
 
+class TestGetBookLockPath:
+    """Test the get_book_lock_path function."""
+
+    def test_locks_share_one_directory(self):
+        """Test the locks of a directory's novels are kept in one lock directory."""
+        assert get_book_lock_path(Path("/novels/book.txt")) == Path("/novels/.enchant_locks/book.txt.lock")
+        assert get_book_lock_path(Path("/novels/book.md")).parent == get_book_lock_path(Path("/novels/other.txt")).parent
+
+    def test_lock_leaves_novel_directory_clean(self, tmp_path):
+        """Test holding a book lock creates nothing but the lock directory."""
+        novel = tmp_path / "book.txt"
+        novel.write_text("text")
+
+        with filelock.FileLock(str(get_book_lock_path(novel)), timeout=0):
+            pass
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [".enchant_locks", "book.txt"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])